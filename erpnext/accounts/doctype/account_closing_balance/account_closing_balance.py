@@ -1,14 +1,26 @@
 # Copyright (c) 2023, Frappe Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
 
+import datetime
+import hashlib
+
 import frappe
 from frappe.model.document import Document
-from frappe.utils import cint, cstr
+from frappe.utils import cint, cstr, getdate
 
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 )
 
+# cached opening balances of a company are dropped by changing its version
+OPENING_BALANCE_CACHE_VERSION_KEY = "opening_balance_cache_version"
+
+# from dates of the cached opening balances of a company, a GL Entry posted before
+# one of them drops the cache
+OPENING_BALANCE_CACHE_DATES_KEY = "opening_balance_cache_dates"
+
+OPENING_BALANCE_CACHE_EXPIRY = 24 * 60 * 60
+
 
 class AccountClosingBalance(Document):
 	# begin: auto-generated types
@@ -59,6 +71,8 @@ def make_closing_entries(closing_entries, voucher_name, company, closing_date):
 		cle.flags.ignore_links = True
 		cle.submit()
 
+	clear_opening_balance_cache([{"company": company, "posting_date": closing_date}])
+
 
 def aggregate_with_last_account_closing_balance(entries, accounting_dimensions):
 	merged_entries = {}
@@ -144,3 +158,56 @@ def get_previous_closing_entries(company, closing_date, accounting_dimensions):
 		entries = query.run(as_dict=1)
 
 	return entries
+
+
+def get_cached_opening_balance(company, from_date, query):
+	"""Result of the opening balance `query` of a report starting on `from_date`.
+
+	Results are cached per company and query, which includes the dimension and finance
+	book filters, until a GL Entry is posted before `from_date`."""
+
+	from_date = cstr(getdate(from_date))
+	frappe.cache.hset(f"{OPENING_BALANCE_CACHE_DATES_KEY}:{company}", from_date, from_date)
+
+	version = frappe.cache.hget(OPENING_BALANCE_CACHE_VERSION_KEY, company)
+	if not version:
+		version = frappe.generate_hash(length=10)
+		frappe.cache.hset(OPENING_BALANCE_CACHE_VERSION_KEY, company, version)
+
+	key = f"erpnext:opening_balance:{company}:{version}:" + hashlib.md5(query.get_sql().encode()).hexdigest()
+	result = frappe.cache.get_value(key)
+	if result is None:
+		result = query.run(as_dict=1)
+		frappe.cache.set_value(key, result, expires_in_sec=OPENING_BALANCE_CACHE_EXPIRY)
+
+	return [frappe._dict(d) for d in result]
+
+
+def clear_opening_balance_cache(gl_entries):
+	"""Drop the cached opening balances which include dates of `gl_entries`.
+
+	Called whenever GL Entries are added, cancelled or deleted. The cache is dropped again
+	after commit, for reports which read the old entries in between."""
+
+	first_posting_dates = {}
+	for d in gl_entries:
+		company = d.get("company") or frappe.get_cached_value("Account", d.get("account"), "company")
+		# opening entries are part of the opening balance irrespective of the date
+		posting_date = datetime.date.min if d.get("is_opening") == "Yes" else getdate(d.get("posting_date"))
+		if company not in first_posting_dates or posting_date < first_posting_dates[company]:
+			first_posting_dates[company] = posting_date
+
+	if not first_posting_dates:
+		return
+
+	_clear_opening_balance_cache(first_posting_dates)
+	frappe.db.after_commit.add(lambda: _clear_opening_balance_cache(first_posting_dates))
+
+
+def _clear_opening_balance_cache(first_posting_dates):
+	for company, posting_date in first_posting_dates.items():
+		dates_key = f"{OPENING_BALANCE_CACHE_DATES_KEY}:{company}"
+		cached_dates = frappe.cache.hgetall(dates_key) or {}
+		if any(getdate(from_date) > posting_date for from_date in cached_dates):
+			frappe.cache.hset(OPENING_BALANCE_CACHE_VERSION_KEY, company, frappe.generate_hash(length=10))
+			frappe.cache.delete_value(dates_key)
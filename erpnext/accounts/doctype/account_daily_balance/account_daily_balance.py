@@ -0,0 +1,375 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import hashlib
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Min
+from frappe.utils import add_days, cint, flt, get_last_day, getdate, now, nowdate
+
+# GL Entries of all days up to this date are rolled up, kept per company
+DAILY_BALANCE_UPTO_KEY = "account_daily_balance_upto"
+
+# currency precision the rolled up amounts are rounded to
+DAILY_BALANCE_PRECISION_KEY = "account_daily_balance_precision"
+
+# days before today which are not rolled up, so that entries posted for recent
+# dates never wait for the rollup
+ROLLUP_LAG_DAYS = 3
+
+DAILY_BALANCE_AMOUNT_FIELDS = ("debit", "credit", "debit_in_account_currency", "credit_in_account_currency")
+
+
+class AccountDailyBalance(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		account: DF.Link
+		company: DF.Link | None
+		cost_center: DF.Link | None
+		credit: DF.Currency
+		credit_in_account_currency: DF.Currency
+		debit: DF.Currency
+		debit_in_account_currency: DF.Currency
+		party: DF.DynamicLink | None
+		party_type: DF.Link | None
+		posting_date: DF.Date
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Account Daily Balance", ["account", "posting_date"])
+	frappe.db.add_index("Account Daily Balance", ["company", "posting_date"])
+
+
+def get_daily_balance_upto_key(company):
+	return f"{DAILY_BALANCE_UPTO_KEY}::{company}"
+
+
+def get_daily_balance_upto(company):
+	"""Returns the date up to which balances of the company are rolled up, if they are
+	rolled up with the current currency precision"""
+	from erpnext.accounts.utils import get_currency_precision
+
+	if frappe.db.get_global(DAILY_BALANCE_PRECISION_KEY) != str(get_currency_precision()):
+		return None
+
+	return frappe.db.get_global(get_daily_balance_upto_key(company))
+
+
+def set_daily_balance_upto(company, date):
+	frappe.db.set_global(get_daily_balance_upto_key(company), date and str(getdate(date)))
+
+
+def lock_daily_balance_upto(company, shared=False):
+	lock = "for update"
+	if shared:
+		lock = "for share" if frappe.db.db_type == "postgres" else "lock in share mode"
+
+	value = frappe.db.sql(
+		f"""select defvalue from `tabDefaultValue`
+		where parent = '__global' and defkey = %s {lock}""",
+		get_daily_balance_upto_key(company),
+	)
+
+	return value and value[0][0] or None
+
+
+def build_account_daily_balances():
+	"""Roll up the GL Entries of all days which are not rolled up yet, up to
+	`ROLLUP_LAG_DAYS` before today"""
+	from erpnext.accounts.utils import get_currency_precision
+
+	build_upto = getdate(add_days(nowdate(), -ROLLUP_LAG_DAYS))
+	precision = str(get_currency_precision())
+	companies = frappe.get_all("Company", pluck="name")
+
+	if frappe.db.get_global(DAILY_BALANCE_PRECISION_KEY) != precision:
+		# amounts are rounded with the currency precision, rebuild if it was changed
+		frappe.db.delete("Account Daily Balance")
+		for company in companies:
+			set_daily_balance_upto(company, None)
+		frappe.db.set_global(DAILY_BALANCE_PRECISION_KEY, precision)
+
+	for company in companies:
+		build_company_daily_balances(company, build_upto)
+
+
+def build_company_daily_balances(company, build_upto):
+	if not frappe.db.get_global(get_daily_balance_upto_key(company)):
+		gle = frappe.qb.DocType("GL Entry")
+		first_posting_date = (
+			frappe.qb.from_(gle)
+			.select(Min(gle.posting_date))
+			.where((gle.company == company) & (gle.is_cancelled == 0))
+			.run()[0][0]
+		)
+		if not first_posting_date:
+			return
+
+		set_daily_balance_upto(company, add_days(first_posting_date, -1))
+		commit()
+
+	while True:
+		# Lock the marker so that entries posted for the days being rolled up wait
+		upto = getdate(lock_daily_balance_upto(company))
+		if upto >= build_upto:
+			break
+
+		from_date = add_days(upto, 1)
+		to_date = min(get_last_day(from_date), build_upto)
+
+		frappe.db.delete(
+			"Account Daily Balance",
+			{"company": company, "posting_date": ("between", [from_date, to_date])},
+		)
+		make_account_daily_balances(
+			"company = %(company)s and posting_date between %(from_date)s and %(to_date)s",
+			{"company": company, "from_date": from_date, "to_date": to_date},
+		)
+		set_daily_balance_upto(company, to_date)
+		commit()
+
+
+def commit():
+	if not frappe.flags.in_test:
+		frappe.db.commit()
+
+
+def make_account_daily_balances(conditions, values):
+	"""Roll up the GL Entries matching `conditions` by account, posting date, cost center and party.
+
+	Amounts are rounded per entry like in `get_balance_on`. The name is derived from the
+	key so that a rollup row can not be inserted twice, see `get_daily_balance_name`."""
+	from erpnext.accounts.utils import get_currency_precision
+
+	values = {
+		**values,
+		"precision": get_currency_precision(),
+		"timestamp": now(),
+		"user": frappe.session.user,
+	}
+
+	frappe.db.sql(
+		f"""
+		insert into `tabAccount Daily Balance`
+			(name, creation, modified, owner, modified_by, docstatus, idx,
+			company, account, posting_date, cost_center, party_type, party,
+			debit, credit, debit_in_account_currency, credit_in_account_currency)
+		select
+			md5(concat_ws('::', account, posting_date,
+				coalesce(cost_center, ''), coalesce(party_type, ''), coalesce(party, ''))),
+			%(timestamp)s, %(timestamp)s, %(user)s, %(user)s, 0, 0,
+			company, account, posting_date, cost_center, party_type, party,
+			sum(round(debit, %(precision)s)), sum(round(credit, %(precision)s)),
+			sum(round(debit_in_account_currency, %(precision)s)),
+			sum(round(credit_in_account_currency, %(precision)s))
+		from `tabGL Entry`
+		where is_cancelled = 0 and {conditions}
+		group by company, account, posting_date, cost_center, party_type, party
+		""",
+		values,
+	)
+
+
+def get_daily_balance_name(account, posting_date, cost_center, party_type, party):
+	key = "::".join((account, str(getdate(posting_date)), cost_center or "", party_type or "", party or ""))
+	return hashlib.md5(key.encode()).hexdigest()
+
+
+def update_account_daily_balances(gl_entries, cancelled=False):
+	"""Add the amounts of `gl_entries` to the rolled up balances of their days, or subtract
+	them if the entries are `cancelled` or deleted.
+
+	Called whenever GL Entries are added, cancelled or deleted. Only the rows of the days
+	changed are locked. Entries posted after the rolled up days are read from the GL Entries
+	directly. Postings for days the rollup job may be rolling up hold a shared lock on the
+	marker, so that they only wait for the job and not for each other."""
+
+	entries_by_company = {}
+	for d in gl_entries or []:
+		if cancelled or not cint(d.get("is_cancelled")):
+			entries_by_company.setdefault(d.get("company"), []).append(d)
+
+	rollup_upto = getdate(add_days(nowdate(), -ROLLUP_LAG_DAYS))
+	for company, entries in entries_by_company.items():
+		if not get_daily_balance_upto(company):
+			continue
+
+		if min(getdate(d.get("posting_date")) for d in entries) > rollup_upto:
+			continue
+
+		upto = getdate(lock_daily_balance_upto(company, shared=True))
+		apply_account_daily_balance_deltas(
+			[d for d in entries if getdate(d.get("posting_date")) <= upto], -1 if cancelled else 1
+		)
+
+
+def apply_account_daily_balance_deltas(gl_entries, sign):
+	from erpnext.accounts.utils import get_currency_precision
+
+	precision = get_currency_precision()
+	rows = {}
+	for d in gl_entries:
+		key = (
+			d.get("company"),
+			d.get("account"),
+			getdate(d.get("posting_date")),
+			d.get("cost_center") or None,
+			d.get("party_type") or None,
+			d.get("party") or None,
+		)
+		row = rows.setdefault(key, dict.fromkeys(DAILY_BALANCE_AMOUNT_FIELDS, 0.0))
+		for field in DAILY_BALANCE_AMOUNT_FIELDS:
+			row[field] += sign * flt(d.get(field), precision)
+
+	if not rows:
+		return
+
+	timestamp = now()
+	values = []
+	# rows are locked in the order of their names, so that postings do not deadlock
+	for name, key, row in sorted((get_daily_balance_name(*key[1:]), key, row) for key, row in rows.items()):
+		values.append(
+			(
+				name,
+				timestamp,
+				timestamp,
+				frappe.session.user,
+				frappe.session.user,
+				*key,
+				*(row[field] for field in DAILY_BALANCE_AMOUNT_FIELDS),
+			)
+		)
+
+	if frappe.db.db_type == "postgres":
+		on_conflict = "on conflict (name) do update set " + ", ".join(
+			f'{field} = "tabAccount Daily Balance".{field} + excluded.{field}'
+			for field in DAILY_BALANCE_AMOUNT_FIELDS
+		)
+	else:
+		on_conflict = "on duplicate key update " + ", ".join(
+			f"{field} = {field} + values({field})" for field in DAILY_BALANCE_AMOUNT_FIELDS
+		)
+
+	placeholders = ", ".join(["(" + ", ".join(["%s"] * len(values[0])) + ")"] * len(values))
+	frappe.db.sql(
+		f"""
+		insert into `tabAccount Daily Balance`
+			(name, creation, modified, owner, modified_by,
+			company, account, posting_date, cost_center, party_type, party,
+			{", ".join(DAILY_BALANCE_AMOUNT_FIELDS)})
+		values {placeholders}
+		{on_conflict}
+		""",
+		[value for row in values for value in row],
+	)
+
+
+def rebuild_account_daily_balances(account_dates):
+	posting_dates_by_account = {}
+	for account, posting_date in account_dates:
+		posting_dates_by_account.setdefault(account, set()).add(getdate(posting_date))
+
+	for account, posting_dates in posting_dates_by_account.items():
+		posting_dates = sorted(posting_dates)
+		frappe.db.delete("Account Daily Balance", {"account": account, "posting_date": ("in", posting_dates)})
+		make_account_daily_balances(
+			"account = %(account)s and posting_date in %(posting_dates)s",
+			{"account": account, "posting_dates": tuple(posting_dates)},
+		)
+
+
+def get_gl_entry_balances(filters):
+	"""Amounts of the GL Entries matching `filters` with their keys in the rollup, to update
+	the rolled up balances and cached openings before the entries are cancelled or deleted
+	with a query"""
+
+	return frappe.get_all(
+		"GL Entry",
+		filters={**filters, "is_cancelled": 0},
+		fields=[
+			"company",
+			"account",
+			"posting_date",
+			"cost_center",
+			"party_type",
+			"party",
+			"is_opening",
+			*DAILY_BALANCE_AMOUNT_FIELDS,
+		],
+	)
+
+
+def get_balance_from_daily_balances(company, conditions, fields, precision):
+	"""Balance of the rolled up GL Entries and of the entries after them matching `conditions`.
+
+	`conditions` are the filters of `get_balance_on` on the GL Entry table aliased as `gle`,
+	which also apply to the rollup. Returns None if balances of the company are not rolled up."""
+
+	upto = company and get_daily_balance_upto(company)
+	if not upto:
+		return None
+
+	debit, credit = fields
+	rolled_up = frappe.db.sql(
+		f"""
+		select sum({debit}) - sum({credit})
+		from `tabAccount Daily Balance` gle
+		where gle.posting_date <= %s and {" and ".join(conditions)}""",
+		upto,
+	)[0][0]
+
+	tail = frappe.db.sql(
+		f"""
+		select sum(round({debit}, %s)) - sum(round({credit}, %s))
+		from `tabGL Entry` gle
+		where is_cancelled = 0 and gle.posting_date > %s and {" and ".join(conditions)}""",
+		(precision, precision, upto),
+	)[0][0]
+
+	return flt(rolled_up) + flt(tail)
+
+
+def check_account_daily_balances(company, from_date, to_date):
+	"""Returns the accounts and posting dates of the company whose rolled up balances do not
+	match their GL Entries"""
+	from erpnext.accounts.utils import get_currency_precision
+
+	upto = get_daily_balance_upto(company)
+	if not upto:
+		return []
+
+	to_date = min(getdate(to_date), getdate(upto))
+	precision = get_currency_precision()
+
+	def get_balances(table, amount):
+		return {
+			(d.account, getdate(d.posting_date)): (flt(d.debit, precision), flt(d.credit, precision))
+			for d in frappe.db.sql(
+				f"""
+				select account, posting_date,
+					sum({amount.format("debit")}) as debit, sum({amount.format("credit")}) as credit
+				from `{table}`
+				where company = %(company)s and posting_date between %(from_date)s and %(to_date)s
+				{"and is_cancelled = 0" if table == "tabGL Entry" else ""}
+				group by account, posting_date""",
+				{"company": company, "from_date": from_date, "to_date": to_date},
+				as_dict=True,
+			)
+		}
+
+	rolled_up = get_balances("tabAccount Daily Balance", "{}")
+	ledger = get_balances("tabGL Entry", f"round({{}}, {precision})")
+
+	return sorted(
+		key for key in set(rolled_up) | set(ledger) if rolled_up.get(key, (0, 0)) != ledger.get(key, (0, 0))
+	)
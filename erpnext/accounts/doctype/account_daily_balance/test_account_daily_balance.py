@@ -0,0 +1,71 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import add_days, getdate, nowdate
+
+from erpnext.accounts.doctype.account_daily_balance.account_daily_balance import (
+	DAILY_BALANCE_PRECISION_KEY,
+	build_account_daily_balances,
+	check_account_daily_balances,
+	get_daily_balance_upto,
+	lock_daily_balance_upto,
+	set_daily_balance_upto,
+)
+from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+from erpnext.accounts.utils import get_balance_on
+
+
+class TestAccountDailyBalance(IntegrationTestCase):
+	def tearDown(self):
+		for company in frappe.get_all("Company", pluck="name"):
+			set_daily_balance_upto(company, None)
+		frappe.db.set_global(DAILY_BALANCE_PRECISION_KEY, None)
+
+	def test_balance_from_daily_balances(self):
+		account = "_Test Bank - _TC"
+		posting_date = add_days(nowdate(), -10)
+
+		make_journal_entry(account, "_Test Cash - _TC", 100, posting_date=posting_date, submit=True)
+		balance = get_balance_on(account)
+		balance_on_posting_date = get_balance_on(account, date=posting_date)
+
+		build_account_daily_balances()
+		self.assertEqual(getdate(get_daily_balance_upto("_Test Company")), getdate(add_days(nowdate(), -3)))
+		self.assertEqual(get_balance_on(account), balance)
+		self.assertEqual(get_balance_on(account, date=posting_date), balance_on_posting_date)
+
+		# Backdated and recent entries are both included, only the backdated ones share the
+		# lock of the marker with the rollup job
+		module = "erpnext.accounts.doctype.account_daily_balance.account_daily_balance"
+		with patch(f"{module}.lock_daily_balance_upto", wraps=lock_daily_balance_upto) as lock:
+			backdated = make_journal_entry(
+				account, "_Test Cash - _TC", 50, posting_date=posting_date, submit=True
+			)
+			lock.assert_called_with("_Test Company", shared=True)
+
+			lock.reset_mock()
+			make_journal_entry(account, "_Test Cash - _TC", 25, submit=True)
+			lock.assert_not_called()
+		self.assertEqual(get_balance_on(account), balance + 75)
+
+		self.assertFalse(check_account_daily_balances("_Test Company", posting_date, nowdate()))
+
+		backdated.cancel()
+		self.assertEqual(get_balance_on(account), balance + 25)
+		self.assertEqual(get_balance_on(account, date=posting_date), balance_on_posting_date)
+		self.assertFalse(check_account_daily_balances("_Test Company", posting_date, nowdate()))
+
+		frappe.db.set_value(
+			"Account Daily Balance",
+			{"account": account, "posting_date": posting_date},
+			"debit",
+			0,
+		)
+		self.assertIn(
+			(account, getdate(posting_date)),
+			check_account_daily_balances("_Test Company", posting_date, nowdate()),
+		)
@@ -92,32 +92,38 @@ class GLEntry(Document):
 			validate_balance_type(self.account, adv_adj)
 			validate_frozen_account(self.account, adv_adj)
 
+			if against_voucher := self.get_against_voucher_to_update():
+				update_outstanding_amt(*against_voucher)
+
+	def get_against_voucher_to_update(self):
+		"""Returns the arguments of `update_outstanding_amt` if the outstanding of the
+		against voucher is to be updated for this entry"""
+
+		if (
+			self.voucher_type == "Journal Entry"
+			and frappe.get_cached_value("Journal Entry", self.voucher_no, "voucher_type")
+			== "Exchange Gain Or Loss"
+		):
+			return
+
+		if frappe.get_cached_value("Account", self.account, "account_type") not in [
+			"Receivable",
+			"Payable",
+		]:
+			# Update outstanding amt on against voucher
 			if (
-				self.voucher_type == "Journal Entry"
-				and frappe.get_cached_value("Journal Entry", self.voucher_no, "voucher_type")
-				== "Exchange Gain Or Loss"
+				self.against_voucher_type in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
+				and self.against_voucher
+				and self.flags.update_outstanding == "Yes"
+				and not frappe.flags.is_reverse_depr_entry
 			):
-				return
-
-			if frappe.get_cached_value("Account", self.account, "account_type") not in [
-				"Receivable",
-				"Payable",
-			]:
-				# Update outstanding amt on against voucher
-				if (
-					self.against_voucher_type
-					in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
-					and self.against_voucher
-					and self.flags.update_outstanding == "Yes"
-					and not frappe.flags.is_reverse_depr_entry
-				):
-					update_outstanding_amt(
-						self.account,
-						self.party_type,
-						self.party,
-						self.against_voucher_type,
-						self.against_voucher,
-					)
+				return (
+					self.account,
+					self.party_type,
+					self.party,
+					self.against_voucher_type,
+					self.against_voucher,
+				)
 
 	def check_mandatory(self):
 		mandatory = ["account", "voucher_type", "voucher_no", "company"]
@@ -217,15 +223,10 @@ class GLEntry(Document):
 				)
 			)
 
-	def validate_account_details(self, adv_adj):
+	def validate_account_details(self, adv_adj, account_details=None):
 		"""Account must be ledger, active and not freezed"""
 
-		ret = frappe.db.sql(
-			"""select is_group, docstatus, company
-			from tabAccount where name=%s""",
-			self.account,
-			as_dict=1,
-		)[0]
+		ret = (account_details or {}).get(self.account) or get_account_details([self.account])[self.account]
 
 		if ret.is_group == 1:
 			frappe.throw(
@@ -297,6 +298,20 @@ class GLEntry(Document):
 		frappe.throw(msg)
 
 
+def get_account_details(accounts):
+	"""Returns the group, status, company and account type of `accounts` by account name"""
+
+	return {
+		d.name: d
+		for d in frappe.db.sql(
+			"""select name, is_group, docstatus, company, account_type
+			from tabAccount where name in %s""",
+			[tuple(set(accounts))],
+			as_dict=1,
+		)
+	}
+
+
 def validate_balance_type(account, adv_adj=False):
 	if not adv_adj and account:
 		balance_must_be = frappe.get_cached_value("Account", account, "balance_must_be")
@@ -1,6 +1,8 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: GNU General Public License v3. See license.txt
+import copy
 import unittest
+from unittest.mock import patch
 
 import frappe
 from frappe.model.naming import parse_naming_series
@@ -8,6 +10,7 @@ from frappe.tests import IntegrationTestCase
 
 from erpnext.accounts.doctype.gl_entry.gl_entry import rename_gle_sle_docs
 from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+from erpnext.accounts.utils import bulk_insert_docs, validate_links_in_bulk
 
 
 class TestGLEntry(IntegrationTestCase):
@@ -78,3 +81,93 @@ class TestGLEntry(IntegrationTestCase):
 			"SELECT current from tabSeries where name = %s", naming_series
 		)[0][0]
 		self.assertEqual(old_naming_series_current_value + 2, new_naming_series_current_value)
+
+	@patch("erpnext.accounts.general_ledger.BULK_INSERT_MIN_ENTRIES", 2)
+	def test_bulk_insert_entries(self):
+		jv = make_journal_entry("_Test Bank - _TC", "Debtors - _TC", 100, save=False)
+		jv.accounts[1].update({"party_type": "Customer", "party": "_Test Customer"})
+		jv.submit()
+
+		gl_entries = frappe.get_all(
+			"GL Entry",
+			fields=["account", "debit", "credit", "fiscal_year", "docstatus"],
+			filters={"voucher_type": "Journal Entry", "voucher_no": jv.name, "is_cancelled": 0},
+			order_by="account",
+		)
+		self.assertEqual(
+			[(d.account, d.debit, d.credit, d.docstatus) for d in gl_entries],
+			[("Debtors - _TC", 0, 100, 1), ("_Test Bank - _TC", 100, 0, 1)],
+		)
+		self.assertTrue(all(d.fiscal_year for d in gl_entries))
+
+		pl_entries = frappe.get_all(
+			"Payment Ledger Entry",
+			fields=["account_type", "amount", "delinked"],
+			filters={"voucher_type": "Journal Entry", "voucher_no": jv.name},
+		)
+		self.assertEqual(
+			[(d.account_type, d.amount, d.delinked) for d in pl_entries], [("Receivable", -100, 0)]
+		)
+
+		jv.cancel()
+		self.assertEqual(frappe.db.count("GL Entry", {"voucher_no": jv.name, "is_cancelled": 1}), 4)
+		self.assertFalse(frappe.db.count("Payment Ledger Entry", {"voucher_no": jv.name, "delinked": 0}))
+
+	@patch("erpnext.accounts.general_ledger.BULK_INSERT_MIN_ENTRIES", 2)
+	def test_bulk_insert_runs_wildcard_hooks(self):
+		doc_hooks = copy.deepcopy(frappe.get_doc_hooks())
+		for event in ("validate", "on_submit"):
+			doc_hooks.setdefault("*", {}).setdefault(event, []).append(
+				"erpnext.accounts.doctype.gl_entry.test_gl_entry.record_doc_event"
+			)
+
+		frappe.flags.recorded_doc_events = []
+		with patch("frappe.get_doc_hooks", return_value=doc_hooks):
+			jv = make_journal_entry("_Test Bank - _TC", "Debtors - _TC", 100, save=False)
+			jv.accounts[1].update({"party_type": "Customer", "party": "_Test Customer"})
+			jv.submit()
+
+		recorded = frappe.flags.pop("recorded_doc_events")
+		for doctype, count in (("GL Entry", 2), ("Payment Ledger Entry", 1)):
+			for event in ("validate", "on_submit"):
+				self.assertEqual(recorded.count((doctype, event)), count)
+
+	def test_bulk_insert_validates_fields(self):
+		gle = frappe.get_doc(
+			{
+				"doctype": "GL Entry",
+				"name": frappe.generate_hash(length=10),
+				"account": "Debtors - _TC",
+				"company": "_Test Company",
+				"is_opening": "Maybe",
+			}
+		)
+		self.assertRaises(frappe.ValidationError, bulk_insert_docs, [gle])
+		self.assertFalse(frappe.db.exists("GL Entry", gle.name))
+
+	def test_validate_dynamic_links_in_bulk(self):
+		def make_gl_entry(party_type, party):
+			return frappe.get_doc(
+				{
+					"doctype": "GL Entry",
+					"account": "Debtors - _TC",
+					"party_type": party_type,
+					"party": party,
+					"company": "_Test Company",
+				}
+			)
+
+		validate_links_in_bulk(
+			[make_gl_entry("Customer", "_Test Customer"), make_gl_entry("Supplier", "_Test Supplier")]
+		)
+
+		# a customer is not a supplier
+		self.assertRaises(
+			frappe.LinkValidationError,
+			validate_links_in_bulk,
+			[make_gl_entry("Customer", "_Test Customer"), make_gl_entry("Supplier", "_Test Customer")],
+		)
+
+
+def record_doc_event(doc, method):
+	frappe.flags.recorded_doc_events.append((doc.doctype, method))
@@ -0,0 +1,269 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import json
+
+import frappe
+from frappe.model.document import Document
+from frappe.model.meta import get_field_precision
+from frappe.utils import cint, flt, now
+from frappe.utils.data import create_batch
+from frappe.utils.xlsxutils import handle_html
+
+# Taxes of all submitted invoices are apportioned, registers can read them instead of
+# the item wise tax detail of the invoices
+INVOICE_ITEM_TAX_BUILT_KEY = "invoice_item_tax_built"
+
+# invoice doctype: tax doctype
+INVOICE_TAX_DOCTYPES = {
+	"Sales Invoice": "Sales Taxes and Charges",
+	"Purchase Invoice": "Purchase Taxes and Charges",
+}
+
+
+class InvoiceItemTax(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		account_head: DF.Link | None
+		description: DF.Data | None
+		is_other_charges: DF.Check
+		tax_amount: DF.Currency
+		tax_rate: DF.Data | None
+		voucher_detail_no: DF.Data
+		voucher_no: DF.DynamicLink
+		voucher_type: DF.Link
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Invoice Item Tax", ["voucher_type", "voucher_no"])
+
+
+def is_invoice_item_tax_built():
+	return cint(frappe.db.get_global(INVOICE_ITEM_TAX_BUILT_KEY))
+
+
+def build_invoice_item_taxes():
+	"""Apportion the taxes of the invoices submitted before the item taxes were kept once.
+	Submitting an invoice apportions its taxes afterwards."""
+
+	if is_invoice_item_tax_built():
+		return
+
+	for doctype, tax_doctype in INVOICE_TAX_DOCTYPES.items():
+		invoice = frappe.qb.DocType(doctype)
+		invoice_item_tax = frappe.qb.DocType("Invoice Item Tax")
+		invoices = (
+			frappe.qb.from_(invoice)
+			.select(invoice.name)
+			.where(
+				(invoice.docstatus == 1)
+				& invoice.name.notin(
+					frappe.qb.from_(invoice_item_tax)
+					.select(invoice_item_tax.voucher_no)
+					.where(invoice_item_tax.voucher_type == doctype)
+				)
+			)
+			.run(pluck=True)
+		)
+
+		for batch in create_batch(invoices, 500):
+			make_invoice_item_taxes_for_batch(doctype, tax_doctype, batch)
+			commit()
+
+	frappe.db.set_global(INVOICE_ITEM_TAX_BUILT_KEY, 1)
+	commit()
+
+
+def commit():
+	if not frappe.flags.in_test:
+		frappe.db.commit()
+
+
+def make_invoice_item_taxes_for_batch(doctype, tax_doctype, invoices):
+	details = frappe.get_all(
+		doctype, filters={"name": ("in", invoices)}, fields=["name", "company", "base_net_total"]
+	)
+	items = frappe.get_all(
+		f"{doctype} Item",
+		filters={"parent": ("in", invoices), "parenttype": doctype},
+		fields=["name", "parent", "item_code", "item_name", "base_net_amount"],
+	)
+	tax_fields = [
+		"parent",
+		"description",
+		"item_wise_tax_detail",
+		"account_head",
+		"charge_type",
+		"base_tax_amount_after_discount_amount",
+	]
+	if doctype == "Purchase Invoice":
+		tax_fields += ["category", "add_deduct_tax"]
+
+	taxes = frappe.get_all(
+		tax_doctype,
+		filters={"parent": ("in", invoices), "parenttype": doctype},
+		fields=tax_fields,
+		order_by="idx",
+	)
+
+	items_by_invoice, taxes_by_invoice = {}, {}
+	for d in items:
+		items_by_invoice.setdefault(d.parent, []).append(d)
+	for d in taxes:
+		taxes_by_invoice.setdefault(d.parent, []).append(d)
+
+	rows = []
+	for d in details:
+		rows += get_invoice_item_taxes(
+			doctype,
+			d.name,
+			d.company,
+			items_by_invoice.get(d.name, []),
+			taxes_by_invoice.get(d.name, []),
+			d.base_net_total,
+		)
+
+	insert_invoice_item_taxes(rows)
+
+
+def make_invoice_item_taxes(doc, method=None):
+	"""Apportion the taxes of a submitted invoice to its item rows"""
+
+	if doc.doctype not in INVOICE_TAX_DOCTYPES:
+		return
+
+	insert_invoice_item_taxes(
+		get_invoice_item_taxes(
+			doc.doctype, doc.name, doc.company, doc.get("items"), doc.get("taxes"), doc.base_net_total
+		)
+	)
+
+
+def delete_invoice_item_taxes(doc, method=None):
+	frappe.db.delete("Invoice Item Tax", {"voucher_type": doc.doctype, "voucher_no": doc.name})
+
+
+def get_invoice_item_taxes(voucher_type, voucher_no, company, items, taxes, base_net_total):
+	"""Tax amount of every tax for every item row of an invoice, apportioned from the item wise
+	tax detail of the taxes by the net amount of the rows of each item. Taxes without an amount
+	are skipped, like in the item-wise registers."""
+
+	tax_amount_precision = (
+		get_field_precision(
+			frappe.get_meta(INVOICE_TAX_DOCTYPES[voucher_type]).get_field("tax_amount"),
+			currency=frappe.get_cached_value("Company", company, "default_currency"),
+		)
+		or 2
+	)
+
+	items_by_code = {}
+	for d in items:
+		items_by_code.setdefault(d.item_code or d.item_name, []).append(d)
+
+	item_taxes = []
+	for tax in taxes:
+		tax_row_amount = tax.base_tax_amount_after_discount_amount
+		if not tax.description or not tax_row_amount:
+			continue
+
+		if voucher_type == "Purchase Invoice" and tax.category not in ("Total", "Valuation and Total"):
+			continue
+
+		sign = -1 if voucher_type == "Purchase Invoice" and tax.add_deduct_tax == "Deduct" else 1
+		tax_details = {
+			"voucher_type": voucher_type,
+			"voucher_no": voucher_no,
+			"description": handle_html(tax.description),
+			"account_head": tax.account_head,
+			"is_other_charges": 0
+			if frappe.get_cached_value("Account", tax.account_head, "account_type") == "Tax"
+			else 1,
+		}
+
+		if tax.item_wise_tax_detail:
+			try:
+				item_wise_tax_detail = json.loads(tax.item_wise_tax_detail)
+			except ValueError:
+				continue
+
+			for item_code, tax_data in item_wise_tax_detail.items():
+				if isinstance(tax_data, list):
+					tax_rate, tax_amount = tax_data
+				else:
+					tax_rate, tax_amount = tax_data, 0
+
+				if tax.charge_type == "Actual" and not tax_rate:
+					tax_rate = "NA"
+
+				item_rows = items_by_code.get(item_code, [])
+				item_net_amount = sum(flt(d.base_net_amount) for d in item_rows)
+				for d in item_rows:
+					item_tax_amount = (
+						flt((tax_amount * d.base_net_amount) / item_net_amount) if item_net_amount else 0
+					)
+					if item_tax_amount:
+						item_taxes.append(
+							{
+								**tax_details,
+								"voucher_detail_no": d.name,
+								"tax_rate": tax_rate,
+								"tax_amount": sign * flt(item_tax_amount, tax_amount_precision),
+							}
+						)
+
+		elif tax.charge_type == "Actual" and base_net_total:
+			for d in items:
+				item_taxes.append(
+					{
+						**tax_details,
+						"voucher_detail_no": d.name,
+						"is_other_charges": 0,
+						"tax_rate": "NA",
+						"tax_amount": flt(
+							(tax_row_amount * d.base_net_amount) / base_net_total, tax_amount_precision
+						),
+					}
+				)
+
+	return item_taxes
+
+
+def insert_invoice_item_taxes(item_taxes):
+	if not item_taxes:
+		return
+
+	fields = [
+		"voucher_type",
+		"voucher_no",
+		"voucher_detail_no",
+		"description",
+		"account_head",
+		"is_other_charges",
+		"tax_rate",
+		"tax_amount",
+	]
+	timestamp = now()
+	frappe.db.bulk_insert(
+		"Invoice Item Tax",
+		["name", "creation", "modified", "owner", "modified_by", *fields],
+		[
+			(
+				frappe.generate_hash(length=10),
+				timestamp,
+				timestamp,
+				frappe.session.user,
+				frappe.session.user,
+				*(d[field] for field in fields),
+			)
+			for d in item_taxes
+		],
+	)
@@ -0,0 +1,84 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import nowdate
+
+from erpnext.accounts.doctype.invoice_item_tax.invoice_item_tax import (
+	INVOICE_ITEM_TAX_BUILT_KEY,
+	build_invoice_item_taxes,
+)
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+from erpnext.accounts.report.item_wise_sales_register.item_wise_sales_register import execute
+
+
+class TestInvoiceItemTax(IntegrationTestCase):
+	def tearDown(self):
+		frappe.db.set_global(INVOICE_ITEM_TAX_BUILT_KEY, None)
+
+	def make_sales_invoice(self):
+		si = create_sales_invoice(qty=2, rate=100, do_not_save=1)
+		item = si.items[0]
+		si.append(
+			"items",
+			{
+				"item_code": item.item_code,
+				"warehouse": item.warehouse,
+				"qty": 3,
+				"rate": 100,
+				"uom": item.uom,
+				"conversion_factor": 1,
+				"income_account": item.income_account,
+				"expense_account": item.expense_account,
+				"cost_center": item.cost_center,
+			},
+		)
+		si.append(
+			"taxes",
+			{
+				"account_head": "_Test Account VAT - _TC",
+				"charge_type": "On Net Total",
+				"cost_center": "_Test Cost Center - _TC",
+				"description": "VAT",
+				"rate": 10,
+			},
+		)
+		si.append(
+			"taxes",
+			{
+				"account_head": "_Test Account Service Tax - _TC",
+				"charge_type": "Actual",
+				"cost_center": "_Test Cost Center - _TC",
+				"description": "Service Tax",
+				"tax_amount": 50,
+			},
+		)
+		return si.submit()
+
+	def test_register_from_invoice_item_taxes(self):
+		si = self.make_sales_invoice()
+		item_taxes = frappe.get_all(
+			"Invoice Item Tax",
+			filters={"voucher_type": "Sales Invoice", "voucher_no": si.name, "description": "VAT"},
+			fields=["voucher_detail_no", "tax_amount"],
+		)
+		self.assertEqual(
+			{d.voucher_detail_no: d.tax_amount for d in item_taxes},
+			{d.name: d.base_net_amount * 0.1 for d in si.items},
+		)
+
+		filters = frappe._dict(company="_Test Company", from_date=nowdate(), to_date=nowdate())
+		columns, data = execute(filters.copy())[:2]
+
+		build_invoice_item_taxes()
+		built_columns, built_data = execute(filters.copy())[:2]
+
+		self.assertEqual(built_columns, columns)
+		self.assertEqual(
+			sorted(built_data, key=lambda row: (row["invoice"], row["amount"])),
+			sorted(data, key=lambda row: (row["invoice"], row["amount"])),
+		)
+
+		si.cancel()
+		self.assertFalse(frappe.db.exists("Invoice Item Tax", {"voucher_no": si.name}))
@@ -29,6 +29,21 @@ class ItemTaxTemplate(Document):
 	def validate(self):
 		self.validate_tax_accounts()
 
+	def on_update(self):
+		from erpnext.stock.get_item_details import clear_item_details_cache
+
+		clear_item_details_cache()
+
+	def on_trash(self):
+		from erpnext.stock.get_item_details import clear_item_details_cache
+
+		clear_item_details_cache()
+
+	def after_rename(self, old_name, new_name, merge=False):
+		from erpnext.stock.get_item_details import clear_item_details_cache
+
+		clear_item_details_cache()
+
 	def autoname(self):
 		if self.company and self.title:
 			abbr = frappe.get_cached_value("Company", self.company, "abbr")
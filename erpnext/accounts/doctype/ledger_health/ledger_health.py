@@ -14,10 +14,13 @@ class LedgerHealth(Document):
 	if TYPE_CHECKING:
 		from frappe.types import DF
 
+		account: DF.Link | None
+		account_balance_mismatch: DF.Check
 		checked_on: DF.Datetime | None
 		debit_credit_mismatch: DF.Check
 		general_and_payment_ledger_mismatch: DF.Check
 		name: DF.Int | None
+		posting_date: DF.Date | None
 		voucher_no: DF.Data | None
 		voucher_type: DF.Data | None
 	# end: auto-generated types
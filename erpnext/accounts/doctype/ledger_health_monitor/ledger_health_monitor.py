@@ -18,6 +18,7 @@ class LedgerHealthMonitor(Document):
 			LedgerHealthMonitorCompany,
 		)
 
+		account_balance_mismatch: DF.Check
 		companies: DF.Table[LedgerHealthMonitorCompany]
 		debit_credit_mismatch: DF.Check
 		enable_health_monitor: DF.Check
@@ -13,9 +13,11 @@ from erpnext.accounts.doctype.accounting_dimension_filter.accounting_dimension_f
 	get_dimension_filter_map,
 )
 from erpnext.accounts.doctype.gl_entry.gl_entry import (
+	get_account_details,
 	validate_balance_type,
 	validate_frozen_account,
 )
+from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import update_voucher_outstandings
 from erpnext.accounts.utils import update_voucher_outstanding
 from erpnext.exceptions import InvalidAccountDimensionError, MandatoryAccountDimensionError
 
@@ -50,25 +52,26 @@ class PaymentLedgerEntry(Document):
 		voucher_type: DF.Link | None
 	# end: auto-generated types
 
-	def validate_account(self):
-		valid_account = frappe.db.get_list(
-			"Account",
-			"name",
-			filters={"name": self.account, "account_type": self.account_type, "company": self.company},
-			ignore_permissions=True,
-		)
+	def validate_account(self, account_details=None):
+		if account_details:
+			account = account_details.get(self.account)
+			valid_account = (
+				account and account.account_type == self.account_type and account.company == self.company
+			)
+		else:
+			valid_account = frappe.db.get_list(
+				"Account",
+				"name",
+				filters={"name": self.account, "account_type": self.account_type, "company": self.company},
+				ignore_permissions=True,
+			)
 		if not valid_account:
 			frappe.throw(_("{0} account is not of type {1}").format(self.account, self.account_type))
 
-	def validate_account_details(self):
+	def validate_account_details(self, account_details=None):
 		"""Account must be ledger, active and not freezed"""
 
-		ret = frappe.db.sql(
-			"""select is_group, docstatus, company
-			from tabAccount where name=%s""",
-			self.account,
-			as_dict=1,
-		)[0]
+		ret = (account_details or {}).get(self.account) or get_account_details([self.account])[self.account]
 
 		if ret.is_group == 1:
 			frappe.throw(
@@ -168,6 +171,8 @@ class PaymentLedgerEntry(Document):
 				self.validate_allowed_dimensions()
 				validate_balance_type(self.account, adv_adj)
 
+		update_voucher_outstandings([(self.against_voucher_type, self.against_voucher_no)])
+
 		# update outstanding amount
 		if (
 			self.against_voucher_type in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
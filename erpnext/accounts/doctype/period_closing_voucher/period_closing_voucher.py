@@ -10,6 +10,7 @@ from frappe.query_builder.functions import Sum
 from frappe.utils import add_days, flt, formatdate, getdate
 
 from erpnext.accounts.doctype.account_closing_balance.account_closing_balance import (
+	clear_opening_balance_cache,
 	make_closing_entries,
 )
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
@@ -483,6 +484,11 @@ def delete_closing_entries(voucher_no):
 		closing_balance.period_closing_voucher == voucher_no
 	).run()
 
+	company, period_end_date = frappe.db.get_value(
+		"Period Closing Voucher", voucher_no, ["company", "period_end_date"]
+	)
+	clear_opening_balance_cache([{"company": company, "posting_date": period_end_date}])
+
 
 @frappe.whitelist()
 def get_period_start_end_date(fiscal_year, company):
@@ -93,6 +93,7 @@ class POSInvoice(SalesInvoice):
 		from_date: DF.Date | None
 		grand_total: DF.Currency
 		group_same_items: DF.Check
+		idempotency_key: DF.Data | None
 		ignore_pricing_rule: DF.Check
 		in_words: DF.Data | None
 		inter_company_invoice_reference: DF.Link | None
@@ -231,6 +232,7 @@ class POSInvoice(SalesInvoice):
 			self.apply_loyalty_points()
 		self.check_phone_payments()
 		self.set_status(update=True)
+		update_pos_reserved_qty(self.items)
 		self.make_bundle_for_sales_purchase_return()
 		for table_name in ["items", "packed_items"]:
 			self.make_bundle_using_old_serial_batch_fields(table_name)
@@ -276,6 +278,9 @@ class POSInvoice(SalesInvoice):
 
 			update_coupon_code_count(self.coupon_code, "cancelled")
 
+		if not self.consolidated_invoice:
+			update_pos_reserved_qty(self.items, sign=-1)
+
 		self.delink_serial_and_batch_bundle()
 
 	def delink_serial_and_batch_bundle(self):
@@ -323,6 +328,10 @@ class POSInvoice(SalesInvoice):
 		if self.is_return:
 			return
 
+		# checked once for all the invoices synced together by the POS
+		if self.flags.stock_availability_validated:
+			return
+
 		if self.docstatus.is_draft() and not frappe.db.get_value(
 			"POS Profile", self.pos_profile, "validate_stock_on_save"
 		):
@@ -330,12 +339,21 @@ class POSInvoice(SalesInvoice):
 
 		from erpnext.stock.stock_ledger import is_negative_stock_allowed
 
+		items_by_warehouse = {}
+		for d in self.get("items"):
+			items_by_warehouse.setdefault(d.warehouse, []).append(d.item_code)
+
+		stock_availability = {
+			warehouse: get_stock_availability_for_items(item_codes, warehouse)
+			for warehouse, item_codes in items_by_warehouse.items()
+		}
+
 		for d in self.get("items"):
 			if not d.serial_and_batch_bundle:
 				if is_negative_stock_allowed(item_code=d.item_code):
 					return
 
-				available_stock, is_stock_item = get_stock_availability(d.item_code, d.warehouse)
+				available_stock, is_stock_item = stock_availability[d.warehouse][d.item_code]
 
 				item_code, warehouse, _qty = (
 					frappe.bold(d.item_code),
@@ -721,20 +739,53 @@ class POSInvoice(SalesInvoice):
 
 @frappe.whitelist()
 def get_stock_availability(item_code, warehouse):
-	if frappe.db.get_value("Item", item_code, "is_stock_item"):
-		is_stock_item = True
-		bin_qty = get_bin_qty(item_code, warehouse)
-		pos_sales_qty = get_pos_reserved_qty(item_code, warehouse)
+	return get_stock_availability_for_items([item_code], warehouse)[item_code]
 
-		return bin_qty - pos_sales_qty, is_stock_item
-	else:
-		is_stock_item = True
-		if frappe.db.exists("Product Bundle", {"name": item_code, "disabled": 0}):
-			return get_bundle_availability(item_code, warehouse), is_stock_item
+
+def get_stock_availability_for_items(item_codes, warehouse):
+	"""Available qty and whether it is a stock item, for each of the items, read with
+	a query per table for all the items"""
+
+	item_codes = list(set(item_codes))
+	if not item_codes:
+		return {}
+
+	stock_items = set(
+		frappe.get_all("Item", filters={"name": ("in", item_codes), "is_stock_item": 1}, pluck="name")
+	)
+	bins = {}
+	if stock_items:
+		bins = {
+			d.item_code: d
+			for d in frappe.get_all(
+				"Bin",
+				filters={"item_code": ("in", list(stock_items)), "warehouse": warehouse},
+				fields=["item_code", "actual_qty", "pos_reserved_qty"],
+			)
+		}
+
+	product_bundles = set()
+	if non_stock_items := set(item_codes) - stock_items:
+		product_bundles = set(
+			frappe.get_all(
+				"Product Bundle", filters={"name": ("in", list(non_stock_items)), "disabled": 0}, pluck="name"
+			)
+		)
+
+	availability = {}
+	for item_code in item_codes:
+		if item_code in bins:
+			bin = bins[item_code]
+			availability[item_code] = (flt(bin.actual_qty) - flt(bin.pos_reserved_qty), True)
+		elif item_code in stock_items:
+			availability[item_code] = (0, True)
+		elif item_code in product_bundles:
+			availability[item_code] = (get_bundle_availability(item_code, warehouse), True)
 		else:
-			is_stock_item = False
 			# Is a service item or non_stock item
-			return 0, is_stock_item
+			availability[item_code] = (0, False)
+
+	return availability
 
 
 def get_bundle_availability(bundle_item_code, warehouse):
@@ -769,6 +820,18 @@ def get_bin_qty(item_code, warehouse):
 
 
 def get_pos_reserved_qty(item_code, warehouse):
+	pos_reserved_qty = frappe.db.get_value(
+		"Bin", {"item_code": item_code, "warehouse": warehouse}, "pos_reserved_qty"
+	)
+
+	# product bundles have no bins
+	if pos_reserved_qty is None:
+		return get_pos_reserved_qty_from_invoices(item_code, warehouse)
+
+	return flt(pos_reserved_qty)
+
+
+def get_pos_reserved_qty_from_invoices(item_code, warehouse):
 	p_inv = frappe.qb.DocType("POS Invoice")
 	p_item = frappe.qb.DocType("POS Invoice Item")
 
@@ -788,6 +851,30 @@ def get_pos_reserved_qty(item_code, warehouse):
 	return flt(reserved_qty[0].stock_qty) if reserved_qty else 0
 
 
+def update_pos_reserved_qty(items, sign=1):
+	"""Add the stock qty of POS Invoice items to the POS reserved qty of their bins,
+	or remove it with a `sign` of -1 once the invoices are consolidated or cancelled"""
+	from erpnext.stock.utils import get_or_make_bin
+
+	qty_by_bin = {}
+	for d in items:
+		if d.item_code and d.warehouse:
+			key = (d.item_code, d.warehouse)
+			qty_by_bin[key] = qty_by_bin.get(key, 0) + flt(d.stock_qty)
+
+	bin = frappe.qb.DocType("Bin")
+	for (item_code, warehouse), qty in qty_by_bin.items():
+		if not qty or not frappe.get_cached_value("Item", item_code, "is_stock_item"):
+			continue
+
+		# incremented in place, so that concurrent POS Invoices of an item are all counted
+		(
+			frappe.qb.update(bin)
+			.set(bin.pos_reserved_qty, bin.pos_reserved_qty + sign * qty)
+			.where(bin.name == get_or_make_bin(item_code, warehouse))
+		).run()
+
+
 @frappe.whitelist()
 def make_sales_return(source_name, target_doc=None):
 	from erpnext.controllers.sales_and_purchase_return import make_return_doc
@@ -933,6 +933,55 @@ class TestPOSInvoice(IntegrationTestCase):
 			frappe.db.rollback(save_point="before_test_delivered_serial_no_case")
 			frappe.set_user("Administrator")
 
+	def test_pos_reserved_qty(self):
+		from erpnext.accounts.doctype.pos_closing_entry.test_pos_closing_entry import (
+			init_user_and_profile,
+		)
+		from erpnext.accounts.doctype.pos_invoice.pos_invoice import (
+			get_pos_reserved_qty_from_invoices,
+			get_stock_availability,
+			get_stock_availability_for_items,
+		)
+		from erpnext.accounts.doctype.pos_invoice_merge_log.pos_invoice_merge_log import (
+			consolidate_pos_invoices,
+		)
+
+		frappe.db.sql("delete from `tabPOS Invoice`")
+		frappe.db.set_value(
+			"Bin", {"item_code": "_Test Item", "warehouse": "_Test Warehouse - _TC"}, "pos_reserved_qty", 0
+		)
+
+		def get_bin_pos_reserved_qty():
+			return frappe.db.get_value(
+				"Bin", {"item_code": "_Test Item", "warehouse": "_Test Warehouse - _TC"}, "pos_reserved_qty"
+			)
+
+		test_user, pos_profile = init_user_and_profile()
+		actual_qty = get_stock_availability("_Test Item", "_Test Warehouse - _TC")[0]
+
+		pos_inv = create_pos_invoice(qty=5, rate=100, do_not_submit=1)
+		pos_inv.append("payments", {"mode_of_payment": "Cash", "account": "Cash - _TC", "amount": 500})
+		pos_inv.submit()
+
+		pos_inv2 = create_pos_invoice(qty=3, rate=100, do_not_submit=1)
+		pos_inv2.append("payments", {"mode_of_payment": "Cash", "account": "Cash - _TC", "amount": 300})
+		pos_inv2.submit()
+
+		self.assertEqual(get_bin_pos_reserved_qty(), 8)
+		self.assertEqual(get_pos_reserved_qty_from_invoices("_Test Item", "_Test Warehouse - _TC"), 8)
+
+		availability = get_stock_availability_for_items(
+			["_Test Item", "_Test Non Stock Item"], "_Test Warehouse - _TC"
+		)
+		self.assertEqual(availability["_Test Item"], (actual_qty - 8, True))
+		self.assertEqual(availability["_Test Non Stock Item"], (0, False))
+
+		pos_inv2.cancel()
+		self.assertEqual(get_bin_pos_reserved_qty(), 5)
+
+		consolidate_pos_invoices()
+		self.assertEqual(get_bin_pos_reserved_qty(), 0)
+
 
 def create_pos_invoice(**args):
 	args = frappe._dict(args)
@@ -8,12 +8,26 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 from frappe.model.mapper import map_child_doc, map_doc
+from frappe.query_builder.functions import Count
 from frappe.utils import cint, flt, get_time, getdate, nowdate, nowtime
 from frappe.utils.background_jobs import enqueue, is_job_enqueued
+from frappe.utils.data import create_batch
 from frappe.utils.scheduler import is_scheduler_inactive
 
+from erpnext.accounts.doctype.pos_invoice.pos_invoice import update_pos_reserved_qty
 from erpnext.accounts.doctype.pos_profile.pos_profile import required_accounting_dimensions
 
+# merge logs are split so that the consolidated invoices are made from at most
+# this many item rows, which keeps the time taken to submit them bounded
+MAX_CONSOLIDATED_ITEM_ROWS = 1000
+
+# child tables of a POS Invoice read while consolidating: (fieldname, doctype)
+POS_INVOICE_MERGE_TABLES = (
+	("items", "POS Invoice Item"),
+	("taxes", "Sales Taxes and Charges"),
+	("payments", "Sales Invoice Payment"),
+)
+
 
 class POSInvoiceMergeLog(Document):
 	# begin: auto-generated types
@@ -111,7 +125,7 @@ class POSInvoiceMergeLog(Document):
 					frappe.throw(msg)
 
 	def on_submit(self):
-		pos_invoice_docs = [frappe.get_cached_doc("POS Invoice", d.pos_invoice) for d in self.pos_invoices]
+		pos_invoice_docs = get_pos_invoice_docs([d.pos_invoice for d in self.pos_invoices])
 
 		returns = [d for d in pos_invoice_docs if d.get("is_return") == 1]
 		sales = [d for d in pos_invoice_docs if d.get("is_return") == 0]
@@ -168,7 +182,10 @@ class POSInvoiceMergeLog(Document):
 		return credit_note.name
 
 	def merge_pos_invoice_into(self, invoice, data):
-		items, payments, taxes = [], [], []
+		items, payments, taxes = [], {}, {}
+		# items without serial and batch nos, rows of other items with the same key are added to them
+		items_by_key = {}
+		item_wise_tax_details = {}
 
 		loyalty_amount_sum, loyalty_points_sum = 0, 0
 
@@ -187,25 +204,14 @@ class POSInvoiceMergeLog(Document):
 				loyalty_amount_sum += doc.loyalty_amount
 
 			for item in doc.get("items"):
-				found = False
-				for i in items:
-					if (
-						i.item_code == item.item_code
-						and not i.serial_and_batch_bundle
-						and not i.serial_no
-						and not i.batch_no
-						and i.uom == item.uom
-						and i.net_rate == item.net_rate
-						and i.warehouse == item.warehouse
-					):
-						found = True
-						i.qty = i.qty + item.qty
-						i.amount = i.amount + item.net_amount
-						i.net_amount = i.amount
-						i.base_amount = i.base_amount + item.base_net_amount
-						i.base_net_amount = i.base_amount
-
-				if not found:
+				key = (item.item_code, item.uom, item.net_rate, item.warehouse)
+				if i := items_by_key.get(key):
+					i.qty = i.qty + item.qty
+					i.amount = i.amount + item.net_amount
+					i.net_amount = i.amount
+					i.base_amount = i.base_amount + item.base_net_amount
+					i.base_net_amount = i.base_amount
+				else:
 					item.rate = item.net_rate
 					item.amount = item.net_amount
 					item.base_amount = item.base_net_amount
@@ -215,41 +221,45 @@ class POSInvoiceMergeLog(Document):
 						si_item.serial_and_batch_bundle = item.serial_and_batch_bundle
 					items.append(si_item)
 
+					if not (si_item.serial_and_batch_bundle or si_item.serial_no or si_item.batch_no):
+						items_by_key[key] = si_item
+
 			for tax in doc.get("taxes"):
-				found = False
-				for t in taxes:
-					if t.account_head == tax.account_head and t.cost_center == tax.cost_center:
-						t.tax_amount = flt(t.tax_amount) + flt(tax.tax_amount_after_discount_amount)
-						t.base_tax_amount = flt(t.base_tax_amount) + flt(
-							tax.base_tax_amount_after_discount_amount
-						)
-						update_item_wise_tax_detail(t, tax)
-						found = True
-				if not found:
+				key = (tax.account_head, tax.cost_center)
+				if t := taxes.get(key):
+					t.tax_amount = flt(t.tax_amount) + flt(tax.tax_amount_after_discount_amount)
+					t.base_tax_amount = flt(t.base_tax_amount) + flt(
+						tax.base_tax_amount_after_discount_amount
+					)
+					merge_item_wise_tax_detail(item_wise_tax_details[key], tax)
+				else:
 					tax.charge_type = "Actual"
 					tax.idx = idx
 					idx += 1
 					tax.included_in_print_rate = 0
 					tax.tax_amount = tax.tax_amount_after_discount_amount
 					tax.base_tax_amount = tax.base_tax_amount_after_discount_amount
-					tax.item_wise_tax_detail = tax.item_wise_tax_detail
-					taxes.append(tax)
+					taxes[key] = tax
+					item_wise_tax_details[key] = json.loads(tax.item_wise_tax_detail or "{}") or {}
 
 			for payment in doc.get("payments"):
-				found = False
-				for pay in payments:
-					if pay.account == payment.account and pay.mode_of_payment == payment.mode_of_payment:
-						pay.amount = flt(pay.amount) + flt(payment.amount)
-						pay.base_amount = flt(pay.base_amount) + flt(payment.base_amount)
-						found = True
-				if not found:
-					payments.append(payment)
+				key = (payment.account, payment.mode_of_payment)
+				if pay := payments.get(key):
+					pay.amount = flt(pay.amount) + flt(payment.amount)
+					pay.base_amount = flt(pay.base_amount) + flt(payment.base_amount)
+				else:
+					payments[key] = payment
 
 			rounding_adjustment += doc.rounding_adjustment
 			rounded_total += doc.rounded_total
 			base_rounding_adjustment += doc.base_rounding_adjustment
 			base_rounded_total += doc.base_rounded_total
 
+		for key, tax in taxes.items():
+			tax.item_wise_tax_detail = json.dumps(item_wise_tax_details[key], separators=(",", ":"))
+
+		payments, taxes = list(payments.values()), list(taxes.values())
+
 		if loyalty_points_sum:
 			invoice.redeem_loyalty_points = 1
 			invoice.loyalty_points = loyalty_points_sum
@@ -301,6 +311,7 @@ class POSInvoiceMergeLog(Document):
 		return sales_invoice
 
 	def update_pos_invoices(self, invoice_docs, sales_invoice="", credit_note=""):
+		items = []
 		for doc in invoice_docs:
 			doc.load_from_db()
 			doc.update(
@@ -312,6 +323,10 @@ class POSInvoiceMergeLog(Document):
 			)
 			doc.set_status(update=True)
 			doc.save()
+			items.extend(doc.items)
+
+		# consolidated invoices reserve the stock of their items in place of the POS Invoices
+		update_pos_reserved_qty(items, sign=1 if self.docstatus == 2 else -1)
 
 	def serial_and_batch_bundle_reference_for_pos_invoice(self):
 		for d in self.pos_invoices:
@@ -328,25 +343,57 @@ class POSInvoiceMergeLog(Document):
 			si.cancel()
 
 
+def merge_item_wise_tax_detail(consolidated_tax_detail, tax_row):
+	"""Add the item wise tax detail of `tax_row` to the parsed detail of a consolidated tax"""
+
+	for item_code, tax_data in json.loads(tax_row.item_wise_tax_detail).items():
+		if consolidated_tax_data := consolidated_tax_detail.get(item_code):
+			consolidated_tax_detail[item_code] = [
+				consolidated_tax_data[0],
+				consolidated_tax_data[1] + tax_data[1],
+			]
+		else:
+			consolidated_tax_detail[item_code] = [tax_data[0], tax_data[1]]
+
+
 def update_item_wise_tax_detail(consolidate_tax_row, tax_row):
 	consolidated_tax_detail = json.loads(consolidate_tax_row.item_wise_tax_detail)
-	tax_row_detail = json.loads(tax_row.item_wise_tax_detail)
 
 	if not consolidated_tax_detail:
 		consolidated_tax_detail = {}
 
-	for item_code, tax_data in tax_row_detail.items():
-		if consolidated_tax_detail.get(item_code):
-			consolidated_tax_data = consolidated_tax_detail.get(item_code)
-			consolidated_tax_detail.update(
-				{item_code: [consolidated_tax_data[0], consolidated_tax_data[1] + tax_data[1]]}
-			)
-		else:
-			consolidated_tax_detail.update({item_code: [tax_data[0], tax_data[1]]})
+	merge_item_wise_tax_detail(consolidated_tax_detail, tax_row)
 
 	consolidate_tax_row.item_wise_tax_detail = json.dumps(consolidated_tax_detail, separators=(",", ":"))
 
 
+def get_pos_invoice_docs(pos_invoices):
+	"""POS Invoices with the tables read while consolidating, loaded with a query per table
+	for a batch of invoices instead of queries per invoice"""
+
+	docs = {}
+	for batch in create_batch(pos_invoices, 1000):
+		invoices = {
+			d.name: d for d in frappe.get_all("POS Invoice", filters={"name": ("in", batch)}, fields=["*"])
+		}
+		for fieldname, doctype in POS_INVOICE_MERGE_TABLES:
+			for d in invoices.values():
+				d[fieldname] = []
+
+			for row in frappe.get_all(
+				doctype,
+				filters={"parent": ("in", batch), "parenttype": "POS Invoice", "parentfield": fieldname},
+				fields=["*"],
+				order_by="idx",
+			):
+				invoices[row.parent][fieldname].append(row)
+
+		for name, d in invoices.items():
+			docs[name] = frappe.get_doc({**d, "doctype": "POS Invoice"})
+
+	return [docs[name] for name in pos_invoices]
+
+
 def get_all_unconsolidated_invoices():
 	filters = {
 		"consolidated_invoice": ["in", ["", None]],
@@ -459,10 +506,49 @@ def split_invoices(invoices):
 	return _invoices
 
 
+def split_invoices_by_row_count(invoices):
+	"""
+	Splits the groups of `split_invoices` further so that the invoices of a group have
+	at most `MAX_CONSOLIDATED_ITEM_ROWS` item rows. Sales are kept before returns.
+	"""
+	item_rows = get_item_row_count([d.pos_invoice for d in invoices])
+
+	_invoices = []
+	for group in split_invoices(invoices):
+		chunk, chunk_rows = [], 0
+		for d in sorted(group, key=lambda d: cint(d.is_return)):
+			rows = item_rows.get(d.pos_invoice, 0)
+			if chunk and chunk_rows + rows > MAX_CONSOLIDATED_ITEM_ROWS:
+				_invoices.append(chunk)
+				chunk, chunk_rows = [], 0
+
+			chunk.append(d)
+			chunk_rows += rows
+
+		if chunk:
+			_invoices.append(chunk)
+
+	return _invoices
+
+
+def get_item_row_count(pos_invoices):
+	if not pos_invoices:
+		return {}
+
+	pos_invoice_item = frappe.qb.DocType("POS Invoice Item")
+	return frappe._dict(
+		frappe.qb.from_(pos_invoice_item)
+		.select(pos_invoice_item.parent, Count(pos_invoice_item.name))
+		.where((pos_invoice_item.parenttype == "POS Invoice") & pos_invoice_item.parent.isin(pos_invoices))
+		.groupby(pos_invoice_item.parent)
+		.run()
+	)
+
+
 def create_merge_logs(invoice_by_customer, closing_entry=None):
 	try:
 		for customer, invoices in invoice_by_customer.items():
-			for _invoices in split_invoices(invoices):
+			for _invoices in split_invoices_by_row_count(invoices):
 				merge_log = frappe.new_doc("POS Invoice Merge Log")
 				merge_log.posting_date = (
 					getdate(closing_entry.get("posting_date")) if closing_entry else nowdate()
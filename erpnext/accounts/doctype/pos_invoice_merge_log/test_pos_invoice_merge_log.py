@@ -1,6 +1,7 @@
 # Copyright (c) 2020, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 import json
+from unittest.mock import patch
 
 import frappe
 from frappe.tests import IntegrationTestCase, UnitTestCase
@@ -455,3 +456,40 @@ class TestPOSInvoiceMergeLog(IntegrationTestCase):
 			frappe.set_user("Administrator")
 			frappe.db.sql("delete from `tabPOS Profile`")
 			frappe.db.sql("delete from `tabPOS Invoice`")
+
+	def test_consolidation_split_by_item_rows(self):
+		frappe.db.sql("delete from `tabPOS Invoice`")
+
+		try:
+			test_user, pos_profile = init_user_and_profile()
+
+			invoices = []
+			for _i in range(3):
+				pos_inv = create_pos_invoice(rate=300, do_not_submit=1)
+				pos_inv.append(
+					"payments", {"mode_of_payment": "Cash", "account": "Cash - _TC", "amount": 300}
+				)
+				pos_inv.submit()
+				invoices.append(pos_inv)
+
+			with patch(
+				"erpnext.accounts.doctype.pos_invoice_merge_log.pos_invoice_merge_log.MAX_CONSOLIDATED_ITEM_ROWS",
+				2,
+			):
+				consolidate_pos_invoices()
+
+			for pos_inv in invoices:
+				pos_inv.load_from_db()
+
+			self.assertEqual(invoices[0].consolidated_invoice, invoices[1].consolidated_invoice)
+			self.assertNotEqual(invoices[1].consolidated_invoice, invoices[2].consolidated_invoice)
+
+			# rows of the same item and rate are merged into one row
+			consolidated_invoice = frappe.get_doc("Sales Invoice", invoices[0].consolidated_invoice)
+			self.assertEqual(len(consolidated_invoice.items), 1)
+			self.assertEqual(consolidated_invoice.items[0].qty, 2)
+
+		finally:
+			frappe.set_user("Administrator")
+			frappe.db.sql("delete from `tabPOS Profile`")
+			frappe.db.sql("delete from `tabPOS Invoice`")
@@ -314,6 +314,21 @@ class PricingRule(Document):
 		if self.mixed_conditions and self.is_recursive:
 			frappe.throw(_("Recursive Discounts with Mixed condition is not supported by the system"))
 
+	def on_update(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import update_pricing_rule_index
+
+		update_pricing_rule_index(self)
+
+	def on_trash(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import update_pricing_rule_index
+
+		update_pricing_rule_index(self, deleted=True)
+
+	def after_rename(self, old_name, new_name, merge):
+		from erpnext.accounts.doctype.pricing_rule.utils import clear_pricing_rule_index_after_commit
+
+		clear_pricing_rule_index_after_commit()
+
 
 # --------------------------------------------------------------------------------
 
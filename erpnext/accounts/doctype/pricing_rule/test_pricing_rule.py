@@ -3,10 +3,12 @@
 
 
 import unittest
+from unittest.mock import patch
 
 import frappe
 from frappe.tests import IntegrationTestCase, UnitTestCase
 
+from erpnext.accounts.doctype.pricing_rule.utils import PRICING_RULE_INDEX_KEY, clear_pricing_rule_index
 from erpnext.accounts.doctype.purchase_invoice.test_purchase_invoice import make_purchase_invoice
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
 from erpnext.controllers.sales_and_purchase_return import make_return_doc
@@ -107,6 +109,7 @@ class TestPricingRule(IntegrationTestCase):
 		self.assertEqual(details.get("discount_percentage"), 5)
 
 		frappe.db.sql("update `tabPricing Rule` set priority=NULL where campaign='_Test Campaign'")
+		clear_pricing_rule_index()
 		from erpnext.accounts.doctype.pricing_rule.utils import MultiplePricingRuleConflict
 
 		self.assertRaises(MultiplePricingRuleConflict, get_item_details, args)
@@ -1393,6 +1396,88 @@ class TestPricingRule(IntegrationTestCase):
 		debit_note.delete()
 		pi.cancel()
 
+	def test_pricing_rule_index_updated_on_save(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import (
+			build_pricing_rule_index,
+			get_pricing_rule_index,
+			get_pricing_rules_for_items,
+		)
+
+		args = {
+			"item_code": "_Test Item",
+			"company": "_Test Company",
+			"transaction_type": "selling",
+			"doctype": "Sales Order Item",
+			"customer": "_Test Customer",
+			"price_list": "_Test Price List",
+		}
+
+		self.assertFalse(get_pricing_rules_for_items([args])[0])
+		pricing_rule = make_pricing_rule(selling=1, discount_percentage=10, title="_Test Pricing Rule Index")
+		# the shared index is updated after commit, the saving transaction reads the rule
+		shared_index = frappe.cache.hget(PRICING_RULE_INDEX_KEY, "_Test Company")
+		self.assertNotIn(pricing_rule.name, shared_index["rules"])
+		rules = get_pricing_rules_for_items([args, {**args, "item_code": "_Test Item 2"}])
+		self.assertEqual([d.name for d in rules[0]], [pricing_rule.name])
+		self.assertFalse(rules[1])
+
+		frappe.db.after_commit.run()
+		self.assertEqual(
+			get_pricing_rule_index("_Test Company")["rules"].keys(),
+			build_pricing_rule_index("_Test Company")["rules"].keys(),
+		)
+		self.assertIn(pricing_rule.name, get_pricing_rule_index("_Test Company")["rules"])
+
+		pricing_rule.disable = 1
+		pricing_rule.save()
+		self.assertFalse(get_pricing_rules_for_items([args])[0])
+
+		# a rolled back change is not applied to the index
+		frappe.db.after_commit.reset()
+		frappe.db.after_rollback.run()
+		self.assertIn(pricing_rule.name, get_pricing_rule_index("_Test Company")["rules"])
+
+	def test_pricing_rule_index_not_set_if_changed_while_built(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import (
+			build_pricing_rule_index,
+			clear_pricing_rule_index,
+			get_pricing_rule_index,
+		)
+
+		def build_while_saved(company):
+			index = build_pricing_rule_index(company)
+			clear_pricing_rule_index({company})
+			return index
+
+		with patch(
+			"erpnext.accounts.doctype.pricing_rule.utils.build_pricing_rule_index",
+			side_effect=build_while_saved,
+		):
+			get_pricing_rule_index("_Test Company")
+
+		self.assertIsNone(frappe.cache.hget(PRICING_RULE_INDEX_KEY, "_Test Company"))
+
+	def test_pricing_rule_index_cleared_on_item_rename(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import get_pricing_rules_for_items
+
+		item = make_item("_Test Pricing Rule Index Item").name
+		pricing_rule = make_pricing_rule(
+			selling=1, discount_percentage=10, title="_Test Pricing Rule Index", item_code=item
+		)
+		args = {
+			"item_code": item,
+			"company": "_Test Company",
+			"transaction_type": "selling",
+			"doctype": "Sales Order Item",
+			"customer": "_Test Customer",
+			"price_list": "_Test Price List",
+		}
+		self.assertEqual([d.name for d in get_pricing_rules_for_items([args])[0]], [pricing_rule.name])
+
+		new_item = frappe.rename_doc("Item", item, "_Test Pricing Rule Index Item Renamed", force=True)
+		rules = get_pricing_rules_for_items([{**args, "item_code": new_item}])
+		self.assertEqual([d.name for d in rules[0]], [pricing_rule.name])
+
 
 EXTRA_TEST_RECORD_DEPENDENCIES = ["UTM Campaign"]
 
@@ -1469,6 +1554,8 @@ def delete_existing_pricing_rules():
 	]:
 		frappe.db.sql(f"delete from `tab{doctype}`")
 
+	clear_pricing_rule_index()
+
 
 def make_item_price(item, price_list_name, item_price):
 	frappe.get_doc(
@@ -23,12 +23,33 @@ class MultiplePricingRuleConflict(frappe.ValidationError):
 
 apply_on_table = {"Item Code": "items", "Item Group": "item_groups", "Brand": "brands"}
 
+SELLING_DOCTYPES = [
+	"Quotation",
+	"Quotation Item",
+	"Sales Order",
+	"Sales Order Item",
+	"Delivery Note",
+	"Delivery Note Item",
+	"Sales Invoice",
+	"Sales Invoice Item",
+	"POS Invoice",
+	"POS Invoice Item",
+]
+
+PRICING_RULE_INDEX_KEY = "pricing_rule_index"
+PRICING_RULE_INDEX_VERSION_KEY = "pricing_rule_index_version"
+# field of the version hash which changes when the indexes of all companies are cleared
+PRICING_RULE_INDEX_ALL_COMPANIES = "*"
+
+# compiled pricing rule indexes of this process, by site and company
+_pricing_rule_indexes = {}
+
 
 def get_pricing_rules(args, doc=None):
 	pricing_rules = []
 	values = {}
 
-	if not frappe.db.exists("Pricing Rule", {"disable": 0, args.transaction_type: 1}):
+	if not get_pricing_rule_index(args.company)["transaction_types"].get(args.transaction_type):
 		return
 
 	for apply_on in ["Item Code", "Item Group", "Brand"]:
@@ -105,72 +126,340 @@ def _get_pricing_rules(apply_on, args, values):
 	if not args.get(apply_on_field):
 		return []
 
-	child_doc = f"`tabPricing Rule {apply_on}`"
-
-	conditions = item_variant_condition = item_conditions = ""
 	values[apply_on_field] = args.get(apply_on_field)
-	if apply_on_field in ["item_code", "brand"]:
-		item_conditions = f"{child_doc}.{apply_on_field}= %({apply_on_field})s"
-
-		if apply_on_field == "item_code":
-			if args.get("uom", None):
-				item_conditions += (
-					" and ({child_doc}.uom='{item_uom}' or IFNULL({child_doc}.uom, '')='')".format(
-						child_doc=child_doc, item_uom=args.get("uom")
-					)
-				)
-			if "variant_of" not in args:
-				args.variant_of = frappe.get_cached_value("Item", args.item_code, "variant_of")
-
-			if args.variant_of:
-				item_variant_condition = f" or {child_doc}.item_code=%(variant_of)s "
-				values["variant_of"] = args.variant_of
-	elif apply_on_field == "item_group":
-		item_conditions = _get_tree_conditions(args, "Item Group", child_doc, False)
-		if args.get("uom", None):
-			item_conditions += " and ({child_doc}.uom='{item_uom}' or IFNULL({child_doc}.uom, '')='')".format(
-				child_doc=child_doc, item_uom=args.get("uom")
-			)
+	if apply_on_field == "item_code":
+		if "variant_of" not in args:
+			args.variant_of = frappe.get_cached_value("Item", args.item_code, "variant_of")
 
-	conditions += get_other_conditions(conditions, values, args)
-	warehouse_conditions = _get_tree_conditions(args, "Warehouse", "`tabPricing Rule`")
-	if warehouse_conditions:
-		warehouse_conditions = f" and {warehouse_conditions}"
+		if args.variant_of:
+			values["variant_of"] = args.variant_of
 
 	if not args.price_list:
 		args.price_list = None
 
-	conditions += " and ifnull(`tabPricing Rule`.for_price_list, '') in (%(price_list)s, '')"
 	values["price_list"] = args.get("price_list")
 
-	pricing_rules = (
-		frappe.db.sql(
-			"""select `tabPricing Rule`.*,
-			{child_doc}.{apply_on_field}, {child_doc}.uom
-		from `tabPricing Rule`, {child_doc}
-		where ({item_conditions} or (`tabPricing Rule`.apply_rule_on_other is not null
-			and `tabPricing Rule`.{apply_on_other_field}=%({apply_on_field})s) {item_variant_condition})
-			and {child_doc}.parent = `tabPricing Rule`.name
-			and `tabPricing Rule`.disable = 0 and
-			`tabPricing Rule`.{transaction_type} = 1 {warehouse_cond} {conditions}
-		order by `tabPricing Rule`.priority desc,
-			`tabPricing Rule`.name desc""".format(
-				child_doc=child_doc,
-				apply_on_field=apply_on_field,
-				item_conditions=item_conditions,
-				item_variant_condition=item_variant_condition,
-				transaction_type=args.transaction_type,
-				warehouse_cond=warehouse_conditions,
-				apply_on_other_field=f"other_{apply_on_field}",
-				conditions=conditions,
-			),
-			values,
+	index = get_pricing_rule_index(args.company)
+	pricing_rules = []
+	for name, child in get_matching_child_rows(index, apply_on_field, args):
+		rule = index["rules"][name]
+		if not match_pricing_rule(rule, args):
+			continue
+
+		pricing_rule = frappe._dict(rule)
+		pricing_rule.update({apply_on_field: child[0], "uom": child[1]})
+		pricing_rules.append(pricing_rule)
+
+	return sorted(
+		pricing_rules,
+		key=lambda d: (d.priority is not None, d.priority or "", d.name),
+		reverse=True,
+	)
+
+
+def get_matching_child_rows(index, apply_on_field, args):
+	"""Rows of the apply on table (item codes, item groups or brands) of the rules
+	which apply to the item, with the name of their pricing rule"""
+
+	uom = args.get("uom") if apply_on_field != "brand" else None
+	value = args.get(apply_on_field)
+	rows = {}
+
+	lookup_values = [value]
+	if apply_on_field == "item_group":
+		lookup_values = _get_tree_values(args, "Item Group", allow_blank=False) or []
+
+	for lookup_value in lookup_values:
+		for name, row_name, row_uom in index[apply_on_field].get(lookup_value, []):
+			if not uom or not row_uom or row_uom == uom:
+				rows[row_name] = (name, (lookup_value, row_uom))
+
+	if apply_on_field == "item_code" and args.variant_of:
+		for name, row_name, row_uom in index[apply_on_field].get(args.variant_of, []):
+			rows[row_name] = (name, (args.variant_of, row_uom))
+
+	# rules applied on other items use all rows of their apply on table
+	for name in index["other_" + apply_on_field].get(value, []):
+		for row_name, row_value, row_uom in index["children"][name].get(apply_on_field, []):
+			rows[row_name] = (name, (row_value, row_uom))
+
+	return rows.values()
+
+
+def match_pricing_rule(rule, args):
+	"""Checks the party, warehouse, price list and date conditions of an indexed pricing rule"""
+
+	if not rule.get(args.transaction_type):
+		return False
+
+	if args.get("doctype") in SELLING_DOCTYPES:
+		if not rule.selling:
+			return False
+	elif not rule.buying:
+		return False
+
+	for field in ["company", "customer", "supplier", "campaign", "sales_partner"]:
+		if (rule.get(field) or "") not in (args.get(field) or "", ""):
+			return False
+
+	for parenttype in ["Warehouse", "Customer Group", "Territory", "Supplier Group"]:
+		parent_groups = _get_tree_values(args, parenttype)
+		if parent_groups and (rule.get(frappe.scrub(parenttype)) or "") not in parent_groups:
+			return False
+
+	if args.get("transaction_date"):
+		transaction_date = getdate(args.get("transaction_date"))
+		if not (
+			getdate(rule.valid_from or "2000-01-01")
+			<= transaction_date
+			<= getdate(rule.valid_upto or "2500-12-31")
+		):
+			return False
+
+	return (rule.for_price_list or "") in (args.get("price_list"), "")
+
+
+def get_pricing_rule_index(company):
+	"""Returns the compiled index of the enabled pricing rules applicable to the company.
+
+	The index is kept in redis and in the memory of each process, and is built from
+	the database only when it is missing. Saving a pricing rule updates it in place
+	after commit, until then the transaction which saved it builds the index every time."""
+
+	company = company or ""
+	changed_companies = frappe.flags.changed_pricing_rule_companies
+	if changed_companies and (company in changed_companies or "" in changed_companies):
+		return build_pricing_rule_index(company)
+
+	version = get_pricing_rule_index_version(company)
+	key = (frappe.local.site, company)
+
+	if version[0] and key in _pricing_rule_indexes and _pricing_rule_indexes[key][0] == version:
+		return _pricing_rule_indexes[key][1]
+
+	index = frappe.cache.hget(PRICING_RULE_INDEX_KEY, company) if version[0] else None
+	if index is None:
+		index = build_pricing_rule_index(company)
+		with get_pricing_rule_index_lock():
+			# a pricing rule saved while the index was built may be missing from it
+			if get_pricing_rule_index_version(company) != version:
+				return index
+
+			version = (set_pricing_rule_index(company, index), version[1])
+
+	_pricing_rule_indexes[key] = (version, index)
+	return index
+
+
+def get_pricing_rule_index_version(company):
+	return (
+		frappe.cache.hget(PRICING_RULE_INDEX_VERSION_KEY, company),
+		frappe.cache.hget(PRICING_RULE_INDEX_VERSION_KEY, PRICING_RULE_INDEX_ALL_COMPANIES),
+	)
+
+
+def get_pricing_rule_index_lock():
+	return frappe.cache.lock(frappe.cache.make_key(PRICING_RULE_INDEX_KEY + "_lock"), timeout=60)
+
+
+def set_pricing_rule_index(company, index):
+	version = frappe.generate_hash(length=10)
+	frappe.cache.hset(PRICING_RULE_INDEX_KEY, company, index)
+	frappe.cache.hset(PRICING_RULE_INDEX_VERSION_KEY, company, version)
+
+	return version
+
+
+def build_pricing_rule_index(company):
+	index = get_empty_pricing_rule_index()
+	pricing_rules = frappe.db.sql(
+		"""select * from `tabPricing Rule`
+		where disable = 0 and ifnull(company, '') in (%s, '')""",
+		company,
+		as_dict=1,
+	)
+
+	children = {}
+	for apply_on, apply_on_field in (
+		("Item Code", "item_code"),
+		("Item Group", "item_group"),
+		("Brand", "brand"),
+	):
+		for row in frappe.db.sql(
+			f"""select child.name, child.parent, child.{apply_on_field} as value, child.uom
+			from `tabPricing Rule {apply_on}` child, `tabPricing Rule` pr
+			where child.parent = pr.name and pr.disable = 0 and ifnull(pr.company, '') in (%s, '')
+			order by child.idx""",
+			company,
 			as_dict=1,
-		)
-		or []
+		):
+			children.setdefault(row.parent, {}).setdefault(apply_on_field, []).append(
+				(row.name, row.value, row.uom)
+			)
+
+	for pricing_rule in pricing_rules:
+		add_to_pricing_rule_index(index, pricing_rule, children.get(pricing_rule.name, {}))
+
+	return index
+
+
+def get_empty_pricing_rule_index():
+	index = {"rules": {}, "children": {}, "transaction_types": {"selling": 0, "buying": 0}}
+	for apply_on_field in ("item_code", "item_group", "brand"):
+		index[apply_on_field] = {}
+		index["other_" + apply_on_field] = {}
+
+	return index
+
+
+def add_to_pricing_rule_index(index, pricing_rule, children):
+	name = pricing_rule.name
+	index["rules"][name] = pricing_rule
+	index["children"][name] = children
+
+	for transaction_type in ("selling", "buying"):
+		if pricing_rule.get(transaction_type):
+			index["transaction_types"][transaction_type] += 1
+
+	for apply_on_field, rows in children.items():
+		for row_name, value, uom in rows:
+			index[apply_on_field].setdefault(value, []).append((name, row_name, uom))
+
+		other_value = pricing_rule.get("other_" + apply_on_field)
+		if pricing_rule.apply_rule_on_other is not None and other_value:
+			index["other_" + apply_on_field].setdefault(other_value, []).append(name)
+
+
+def remove_from_pricing_rule_index(index, name):
+	if name not in index["rules"]:
+		return
+
+	pricing_rule = index["rules"].pop(name)
+	for transaction_type in ("selling", "buying"):
+		if pricing_rule.get(transaction_type):
+			index["transaction_types"][transaction_type] -= 1
+
+	for apply_on_field, rows in index["children"].pop(name).items():
+		for _row_name, value, _uom in rows:
+			index[apply_on_field][value] = [d for d in index[apply_on_field].get(value, []) if d[0] != name]
+
+		other_rules = index["other_" + apply_on_field].get(pricing_rule.get("other_" + apply_on_field))
+		if other_rules and name in other_rules:
+			other_rules.remove(name)
+
+
+def update_pricing_rule_index(doc, deleted=False):
+	"""Update the compiled indexes of the companies a saved or deleted pricing rule applies
+	to, once the transaction which saved it is committed"""
+
+	if frappe.flags.skip_pricing_rule_index_update:
+		return
+
+	doc_before_save = doc.get_doc_before_save()
+	companies = {doc.company or "", (doc_before_save.company or "") if doc_before_save else ""}
+
+	set_changed_pricing_rule_companies(companies)
+	frappe.db.after_commit.add(lambda: apply_pricing_rule_index_update(doc.name, companies))
+
+
+def apply_pricing_rule_index_update(name, companies):
+	pricing_rule = frappe.db.sql(
+		"select * from `tabPricing Rule` where name = %s and disable = 0", name, as_dict=1
 	)
+	pricing_rule = pricing_rule[0] if pricing_rule else None
+
+	children = {}
+	if pricing_rule:
+		for apply_on in apply_on_table:
+			apply_on_field = frappe.scrub(apply_on)
+			rows = frappe.get_all(
+				f"Pricing Rule {apply_on}",
+				filters={"parent": name, "parenttype": "Pricing Rule"},
+				fields=["name", apply_on_field, "uom"],
+				order_by="idx",
+				as_list=1,
+			)
+			if rows:
+				children[apply_on_field] = [tuple(row) for row in rows]
+
+	with get_pricing_rule_index_lock():
+		for company in get_pricing_rule_index_companies(companies):
+			index = frappe.cache.hget(PRICING_RULE_INDEX_KEY, company)
+			if index is None:
+				continue
+
+			remove_from_pricing_rule_index(index, name)
+			if pricing_rule and (pricing_rule.company or "") in (company, ""):
+				add_to_pricing_rule_index(index, pricing_rule, children)
+
+			set_pricing_rule_index(company, index)
+
+
+def set_changed_pricing_rule_companies(companies):
+	"""Companies whose pricing rules are changed by the current transaction, their indexes
+	are built from the database until it is committed or rolled back"""
+
+	if frappe.flags.changed_pricing_rule_companies is None:
+		frappe.flags.changed_pricing_rule_companies = set()
+		frappe.db.after_commit.add(reset_changed_pricing_rule_companies)
+		frappe.db.after_rollback.add(reset_changed_pricing_rule_companies)
+
+	frappe.flags.changed_pricing_rule_companies.update(companies)
+
 
-	return pricing_rules
+def reset_changed_pricing_rule_companies():
+	frappe.flags.changed_pricing_rule_companies = None
+
+
+def get_pricing_rule_index_companies(companies):
+	"""Returns the companies whose index holds the rules of the given companies.
+
+	A rule without a company is part of the index of every company."""
+
+	if "" in companies:
+		return [frappe.safe_decode(company) for company in frappe.cache.hkeys(PRICING_RULE_INDEX_KEY)]
+
+	return list(companies)
+
+
+def clear_pricing_rule_index(companies=None):
+	with get_pricing_rule_index_lock():
+		if companies is None:
+			frappe.cache.delete_value(PRICING_RULE_INDEX_KEY)
+			version = frappe.generate_hash(length=10)
+			frappe.cache.hset(PRICING_RULE_INDEX_VERSION_KEY, PRICING_RULE_INDEX_ALL_COMPANIES, version)
+			return
+
+		for company in get_pricing_rule_index_companies(companies):
+			frappe.cache.hdel(PRICING_RULE_INDEX_KEY, company)
+			frappe.cache.hset(PRICING_RULE_INDEX_VERSION_KEY, company, frappe.generate_hash(length=10))
+
+
+def clear_pricing_rule_index_after_commit(companies=None):
+	"""Clear the compiled indexes once the transaction which changed the pricing rules of
+	the companies, or of all companies, is committed"""
+
+	set_changed_pricing_rule_companies({""} if companies is None else companies)
+	frappe.db.after_commit.add(lambda: clear_pricing_rule_index(companies))
+
+
+def clear_pricing_rule_index_on_rename(doc, method=None, *args, **kwargs):
+	"""Links in the pricing rules are renamed by SQL without saving the rules, so the
+	compiled indexes are built again from the database"""
+
+	clear_pricing_rule_index_after_commit()
+
+
+def get_pricing_rules_for_items(items, doc=None):
+	"""Resolve the pricing rules of all rows of a document.
+
+	The compiled index of each company is loaded once and shared by all rows."""
+
+	items = [frappe._dict(args) for args in items]
+	for company in {args.company for args in items}:
+		get_pricing_rule_index(company)
+
+	return [get_pricing_rules(args, doc) for args in items]
 
 
 def apply_multiple_pricing_rules(pricing_rules):
@@ -184,13 +473,27 @@ def apply_multiple_pricing_rules(pricing_rules):
 def _get_tree_conditions(args, parenttype, table, allow_blank=True):
 	field = frappe.scrub(parenttype)
 	condition = ""
-	if args.get(field):
-		if not frappe.flags.tree_conditions:
-			frappe.flags.tree_conditions = {}
-		key = (parenttype, args.get(field))
-		if key in frappe.flags.tree_conditions:
-			return frappe.flags.tree_conditions[key]
 
+	parent_groups = _get_tree_values(args, parenttype, allow_blank)
+	if parent_groups:
+		condition = "ifnull({table}.{field}, '') in ({parent_groups})".format(
+			table=table, field=field, parent_groups=", ".join(frappe.db.escape(d) for d in parent_groups)
+		)
+
+	return condition
+
+
+def _get_tree_values(args, parenttype, allow_blank=True):
+	"""Returns the value of the tree field in args with all its parents"""
+	field = frappe.scrub(parenttype)
+	if not args.get(field):
+		return []
+
+	if not frappe.flags.tree_values:
+		frappe.flags.tree_values = {}
+
+	key = (parenttype, args.get(field))
+	if key not in frappe.flags.tree_values:
 		try:
 			lft, rgt = frappe.db.get_value(parenttype, args.get(field), ["lft", "rgt"])
 		except TypeError:
@@ -215,15 +518,13 @@ def _get_tree_conditions(args, parenttype, table, allow_blank=True):
 			if root_name and root_name[0][0]:
 				parent_groups.append(root_name[0][0])
 
-		if parent_groups:
-			if allow_blank:
-				parent_groups.append("")
-			condition = "ifnull({table}.{field}, '') in ({parent_groups})".format(
-				table=table, field=field, parent_groups=", ".join(frappe.db.escape(d) for d in parent_groups)
-			)
+		frappe.flags.tree_values[key] = parent_groups
 
-			frappe.flags.tree_conditions[key] = condition
-	return condition
+	parent_groups = frappe.flags.tree_values[key]
+	if parent_groups and allow_blank:
+		return [*parent_groups, ""]
+
+	return parent_groups
 
 
 def get_other_conditions(conditions, values, args):
@@ -244,18 +545,7 @@ def get_other_conditions(conditions, values, args):
 			and ifnull(`tabPricing Rule`.valid_upto, '2500-12-31')"""
 		values["transaction_date"] = args.get("transaction_date")
 
-	if args.get("doctype") in [
-		"Quotation",
-		"Quotation Item",
-		"Sales Order",
-		"Sales Order Item",
-		"Delivery Note",
-		"Delivery Note Item",
-		"Sales Invoice",
-		"Sales Invoice Item",
-		"POS Invoice",
-		"POS Invoice Item",
-	]:
+	if args.get("doctype") in SELLING_DOCTYPES:
 		conditions += """ and ifnull(`tabPricing Rule`.selling, 0) = 1"""
 	else:
 		conditions += """ and ifnull(`tabPricing Rule`.buying, 0) = 1"""
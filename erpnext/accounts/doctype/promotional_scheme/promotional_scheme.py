@@ -241,21 +241,42 @@ class PromotionalScheme(Document):
 
 		docs = get_pricing_rules(self, rules)
 
-		for doc in docs:
-			doc.run_method("validate")
-			if doc.get("__islocal"):
-				count += 1
-				doc.insert()
-			else:
-				doc.save()
-				frappe.msgprint(_("Pricing Rule {0} is updated").format(doc.name))
+		# the compiled pricing rule indexes are cleared once for all the rules of the scheme
+		frappe.flags.skip_pricing_rule_index_update = True
+		try:
+			for doc in docs:
+				doc.run_method("validate")
+				if doc.get("__islocal"):
+					count += 1
+					doc.insert()
+				else:
+					doc.save()
+					frappe.msgprint(_("Pricing Rule {0} is updated").format(doc.name))
+		finally:
+			frappe.flags.skip_pricing_rule_index_update = False
+
+		self.clear_pricing_rule_index()
 
 		if count:
 			frappe.msgprint(_("New {0} pricing rules are created").format(count))
 
 	def on_trash(self):
-		for rule in frappe.get_all("Pricing Rule", {"promotional_scheme": self.name}):
-			frappe.delete_doc("Pricing Rule", rule.name)
+		frappe.flags.skip_pricing_rule_index_update = True
+		try:
+			for rule in frappe.get_all("Pricing Rule", {"promotional_scheme": self.name}):
+				frappe.delete_doc("Pricing Rule", rule.name)
+		finally:
+			frappe.flags.skip_pricing_rule_index_update = False
+
+		self.clear_pricing_rule_index()
+
+	def clear_pricing_rule_index(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import clear_pricing_rule_index_after_commit
+
+		doc_before_save = self.get_doc_before_save()
+		clear_pricing_rule_index_after_commit(
+			{self.company or "", (doc_before_save.company or "") if doc_before_save else ""}
+		)
 
 
 def raise_for_transaction_exists(name):
@@ -1,10 +1,12 @@
 # Copyright (c) 2019, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 import unittest
+from unittest.mock import patch
 
 import frappe
 from frappe.tests import IntegrationTestCase
 
+from erpnext.accounts.doctype.pricing_rule.utils import set_pricing_rule_index
 from erpnext.accounts.doctype.promotional_scheme.promotional_scheme import TransactionExists
 from erpnext.selling.doctype.sales_order.test_sales_order import make_sales_order
 
@@ -60,6 +62,33 @@ class TestPromotionalScheme(IntegrationTestCase):
 		)
 		self.assertEqual(price_rules, [])
 
+	def test_pricing_rule_index_updated_once_per_scheme(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import (
+			build_pricing_rule_index,
+			get_pricing_rule_index,
+		)
+
+		get_pricing_rule_index("_Test Company")
+		with patch(
+			"erpnext.accounts.doctype.pricing_rule.utils.set_pricing_rule_index",
+			wraps=set_pricing_rule_index,
+		) as set_index:
+			ps = make_promotional_scheme(applicable_for="Customer", customer="_Test Customer")
+			ps.append("customer", {"customer": "_Test Customer 2"})
+			ps.save()
+
+		set_index.assert_not_called()
+		self.assertEqual(
+			get_pricing_rule_index("_Test Company")["rules"].keys(),
+			build_pricing_rule_index("_Test Company")["rules"].keys(),
+		)
+
+		frappe.delete_doc("Promotional Scheme", ps.name)
+		self.assertEqual(
+			get_pricing_rule_index("_Test Company")["rules"].keys(),
+			build_pricing_rule_index("_Test Company")["rules"].keys(),
+		)
+
 	def test_promotional_scheme_without_applicable_for(self):
 		ps = make_promotional_scheme()
 		price_rules = frappe.get_all("Pricing Rule", filters={"promotional_scheme": ps.name})
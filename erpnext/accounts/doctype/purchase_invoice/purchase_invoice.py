@@ -10,6 +10,13 @@ from frappe.utils import cint, cstr, flt, formatdate, get_link_to_form, getdate,
 
 import erpnext
 from erpnext.accounts.deferred_revenue import validate_service_stop_date
+from erpnext.accounts.doctype.account_closing_balance.account_closing_balance import (
+	clear_opening_balance_cache,
+)
+from erpnext.accounts.doctype.account_daily_balance.account_daily_balance import (
+	get_gl_entry_balances,
+	update_account_daily_balances,
+)
 from erpnext.accounts.doctype.gl_entry.gl_entry import update_outstanding_amt
 from erpnext.accounts.doctype.repost_accounting_ledger.repost_accounting_ledger import (
 	validate_docs_for_deferred_accounting,
@@ -827,6 +834,13 @@ class PurchaseInvoice(BuyingController):
 		if rows:
 			# cancel gl entries
 			gle = qb.DocType("GL Entry")
+			gl_entries = get_gl_entry_balances(
+				{
+					"voucher_type": "Purchase Receipt",
+					"voucher_no": ("in", list(purchase_receipts)),
+					"voucher_detail_no": ("in", list(rows)),
+				}
+			)
 			gle_update_query = (
 				qb.update(gle)
 				.set(gle.is_cancelled, 1)
@@ -837,6 +851,8 @@ class PurchaseInvoice(BuyingController):
 				)
 			)
 			gle_update_query.run()
+			update_account_daily_balances(gl_entries, cancelled=True)
+			clear_opening_balance_cache(gl_entries)
 
 	def update_supplier_outstanding(self, update_outstanding):
 		if update_outstanding == "No":
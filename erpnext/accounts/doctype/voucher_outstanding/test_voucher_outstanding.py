@@ -0,0 +1,88 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import add_days, today
+
+from erpnext.accounts.doctype.payment_entry.payment_entry import get_payment_entry
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import (
+	VOUCHER_OUTSTANDING_BUILT_KEY,
+	build_voucher_outstandings,
+	check_voucher_outstandings,
+	lock_booked_vouchers,
+)
+from erpnext.accounts.report.accounts_receivable.accounts_receivable import (
+	execute as accounts_receivable,
+)
+from erpnext.accounts.report.accounts_receivable_summary.accounts_receivable_summary import (
+	execute as accounts_receivable_summary,
+)
+
+
+class TestVoucherOutstanding(IntegrationTestCase):
+	def tearDown(self):
+		frappe.db.set_global(VOUCHER_OUTSTANDING_BUILT_KEY, None)
+
+	def get_outstanding(self, voucher_no):
+		return frappe.db.get_value(
+			"Voucher Outstanding", {"voucher_type": "Sales Invoice", "voucher_no": voucher_no}, "outstanding"
+		)
+
+	def test_outstanding_follows_payment_ledger(self):
+		si = create_sales_invoice(rate=300, posting_date=add_days(today(), -45))
+		build_voucher_outstandings()
+		self.assertEqual(self.get_outstanding(si.name), 300)
+
+		pe = get_payment_entry("Sales Invoice", si.name, party_amount=100)
+		pe.reference_no = "1"
+		pe.reference_date = today()
+		pe.submit()
+		self.assertEqual(self.get_outstanding(si.name), 200)
+
+		credit_note = create_sales_invoice(
+			qty=-1, rate=50, is_return=1, return_against=si.name, do_not_submit=True
+		)
+		credit_note.update_outstanding_for_self = 0
+		credit_note.submit()
+		self.assertEqual(self.get_outstanding(si.name), 150)
+
+		pe.cancel()
+		self.assertEqual(self.get_outstanding(si.name), 250)
+		self.assertNotIn(("Sales Invoice", si.name), check_voucher_outstandings("_Test Company"))
+
+		filters = {"company": "_Test Company", "party_type": "Customer", "party": ["_Test Customer"]}
+		for execute in (accounts_receivable, accounts_receivable_summary):
+			from_outstandings = execute(filters)[1]
+			frappe.db.set_global(VOUCHER_OUTSTANDING_BUILT_KEY, None)
+			self.assertEqual(execute(filters)[1], from_outstandings)
+			frappe.db.set_global(VOUCHER_OUTSTANDING_BUILT_KEY, 1)
+
+	def test_invoice_locked_before_payment_ledger_entries(self):
+		si = create_sales_invoice(rate=300)
+		build_voucher_outstandings()
+
+		pe = get_payment_entry("Sales Invoice", si.name, party_amount=100)
+		pe.reference_no = "1"
+		pe.reference_date = today()
+
+		# concurrent payments against the invoice wait for the lock before adding their entries
+		locked_before_entries = []
+
+		def lock(vouchers):
+			if ("Sales Invoice", si.name) in vouchers:
+				locked_before_entries.append(
+					not frappe.db.exists("Payment Ledger Entry", {"voucher_no": pe.name, "delinked": 0})
+				)
+			return lock_booked_vouchers(vouchers)
+
+		module = "erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding"
+		with patch(f"{module}.lock_booked_vouchers", side_effect=lock):
+			pe.submit()
+
+		self.assertTrue(locked_before_entries)
+		self.assertTrue(locked_before_entries[0])
+		self.assertEqual(self.get_outstanding(si.name), 200)
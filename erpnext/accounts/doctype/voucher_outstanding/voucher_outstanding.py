@@ -0,0 +1,418 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import cint, flt, now
+from frappe.utils.data import create_batch
+
+# Outstanding of all vouchers is built, reports can read it instead of the Payment Ledger
+VOUCHER_OUTSTANDING_BUILT_KEY = "voucher_outstanding_built"
+
+BALANCE_FIELDS = (
+	"invoiced",
+	"paid",
+	"credit_note",
+	"invoiced_in_account_currency",
+	"paid_in_account_currency",
+	"credit_note_in_account_currency",
+)
+
+
+class VoucherOutstanding(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		account: DF.Link
+		account_currency: DF.Link | None
+		company: DF.Link | None
+		cost_center: DF.Link | None
+		credit_note: DF.Currency
+		credit_note_in_account_currency: DF.Currency
+		due_date: DF.Date | None
+		invoiced: DF.Currency
+		invoiced_in_account_currency: DF.Currency
+		outstanding: DF.Currency
+		outstanding_in_account_currency: DF.Currency
+		paid: DF.Currency
+		paid_in_account_currency: DF.Currency
+		party: DF.DynamicLink | None
+		party_type: DF.Link | None
+		posting_date: DF.Date | None
+		voucher_no: DF.DynamicLink
+		voucher_type: DF.Link
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Voucher Outstanding", ["company", "account", "party"])
+	frappe.db.add_index("Voucher Outstanding", ["voucher_no", "voucher_type"])
+
+
+def is_voucher_outstanding_built():
+	return cint(frappe.db.get_global(VOUCHER_OUTSTANDING_BUILT_KEY))
+
+
+def build_voucher_outstandings():
+	"""Build the outstanding of all vouchers once. It is kept up to date with the
+	Payment Ledger Entries afterwards."""
+
+	if is_voucher_outstanding_built():
+		return
+
+	frappe.db.delete("Voucher Outstanding")
+
+	ple = frappe.qb.DocType("Payment Ledger Entry")
+	vouchers = (
+		frappe.qb.from_(ple)
+		.select(ple.against_voucher_type, ple.against_voucher_no)
+		.distinct()
+		.where(ple.delinked == 0)
+		.run()
+	)
+
+	for batch in create_batch(vouchers, 500):
+		update_voucher_outstandings(batch)
+		commit()
+
+	frappe.db.set_global(VOUCHER_OUTSTANDING_BUILT_KEY, 1)
+	commit()
+
+
+def commit():
+	if not frappe.flags.in_test:
+		frappe.db.commit()
+
+
+def update_voucher_outstandings(vouchers):
+	"""Rebuild the outstanding of `vouchers`, a list of (voucher type, voucher no), from the
+	Payment Ledger Entries against them.
+
+	Called whenever Payment Ledger Entries are added, delinked, re-linked or deleted. Like in
+	Accounts Receivable, payments against a return are part of the outstanding of the original
+	invoice, unless the return updates its own outstanding.
+
+	Callers lock the vouchers with `lock_vouchers` before changing the entries against them. The
+	entries are read with a locking read, so that entries committed meanwhile are included."""
+
+	vouchers, return_against = get_booked_vouchers(vouchers)
+	if not vouchers:
+		return
+
+	lock_booked_vouchers(vouchers)
+	outstandings = get_voucher_outstandings(
+		vouchers, get_against_booked_vouchers(vouchers, return_against), return_against, for_update=True
+	)
+
+	for voucher_type in {voucher_type for voucher_type, _voucher_no in vouchers}:
+		frappe.db.delete(
+			"Voucher Outstanding",
+			{
+				"voucher_type": voucher_type,
+				"voucher_no": ("in", [voucher_no for vt, voucher_no in vouchers if vt == voucher_type]),
+			},
+		)
+
+	if outstandings:
+		make_voucher_outstandings(outstandings)
+
+
+def lock_vouchers(vouchers):
+	"""Lock the vouchers payments against `vouchers` are booked to, so that their outstanding is
+	updated by one transaction at a time. Taken before the Payment Ledger Entries are changed."""
+
+	lock_booked_vouchers(get_booked_vouchers(vouchers)[0])
+
+
+def lock_booked_vouchers(vouchers):
+	for voucher_type in sorted({voucher_type for voucher_type, _voucher_no in vouchers}):
+		voucher = frappe.qb.DocType(voucher_type)
+		(
+			frappe.qb.from_(voucher)
+			.select(voucher.name)
+			.where(voucher.name.isin(sorted(voucher_no for vt, voucher_no in vouchers if vt == voucher_type)))
+			.orderby(voucher.name)
+			.for_update()
+			.run()
+		)
+
+
+def get_booked_vouchers(vouchers):
+	"""Returns the vouchers payments against `vouchers` are booked to, and the returns booked to
+	another voucher"""
+
+	vouchers = {tuple(v) for v in vouchers if v[0] and v[1]}
+	if not vouchers:
+		return vouchers, {}
+
+	return_against = get_return_against(vouchers)
+	vouchers = {return_against.get(v, v) for v in vouchers}
+	return_against.update(get_return_against(vouchers))
+
+	return vouchers, return_against
+
+
+def get_outstandings(vouchers):
+	"""Returns the vouchers payments against `vouchers` are booked to and their outstanding"""
+
+	vouchers, return_against = get_booked_vouchers(vouchers)
+	if not vouchers:
+		return vouchers, []
+
+	against_vouchers = get_against_booked_vouchers(vouchers, return_against)
+	return vouchers, get_voucher_outstandings(vouchers, against_vouchers, return_against)
+
+
+def get_against_booked_vouchers(vouchers, return_against):
+	"""`vouchers` and the returns booked to them"""
+	return vouchers | {d for d, against in return_against.items() if against in vouchers}
+
+
+def get_return_against(vouchers):
+	"""Invoices in `vouchers` or against them, which are returns without their own outstanding"""
+
+	return_against = {}
+	for doctype in ("Sales Invoice", "Purchase Invoice"):
+		names = [voucher_no for voucher_type, voucher_no in vouchers if voucher_type == doctype]
+		if not names:
+			continue
+
+		for d in frappe.get_all(
+			doctype,
+			filters={"is_return": 1, "docstatus": 1, "update_outstanding_for_self": 0},
+			or_filters={"name": ("in", names), "return_against": ("in", names)},
+			fields=["name", "return_against"],
+		):
+			if d.return_against:
+				return_against[(doctype, d.name)] = (doctype, d.return_against)
+
+	return return_against
+
+
+def get_voucher_outstandings(vouchers, against_vouchers, return_against, for_update=False):
+	"""Sum the Payment Ledger Entries against `against_vouchers` into the balance of the voucher
+	they are booked against, split into invoiced, paid and credit note amounts"""
+	from erpnext.accounts.utils import get_currency_precision
+
+	entries = frappe.db.sql(
+		"""
+		select
+			company, account, party_type, party, against_voucher_type, against_voucher_no,
+			voucher_type, voucher_no, case when amount > 0 then 1 else 0 end as is_debit,
+			sum(amount) as amount, sum(amount_in_account_currency) as amount_in_account_currency,
+			max(cost_center) as cost_center
+		from `tabPayment Ledger Entry`
+		where delinked = 0 and against_voucher_no in %(voucher_nos)s
+		group by
+			company, account, party_type, party, against_voucher_type, against_voucher_no,
+			voucher_type, voucher_no, case when amount > 0 then 1 else 0 end
+		{for_update}""".format(for_update="for update" if for_update else ""),
+		{"voucher_nos": tuple({voucher_no for _voucher_type, voucher_no in against_vouchers})},
+		as_dict=True,
+	)
+
+	outstandings = {}
+	for d in entries:
+		against_voucher = (d.against_voucher_type, d.against_voucher_no)
+		if against_voucher not in against_vouchers:
+			continue
+
+		voucher_type, voucher_no = return_against.get(against_voucher, against_voucher)
+		row = outstandings.get((d.account, d.party_type, d.party, voucher_type, voucher_no))
+		if not row:
+			row = outstandings[(d.account, d.party_type, d.party, voucher_type, voucher_no)] = frappe._dict(
+				company=d.company,
+				account=d.account,
+				party_type=d.party_type,
+				party=d.party,
+				voucher_type=voucher_type,
+				voucher_no=voucher_no,
+				cost_center=d.cost_center,
+				**{field: 0.0 for field in BALANCE_FIELDS},
+			)
+
+		field = get_balance_field(d, voucher_no)
+		sign = 1 if field == "invoiced" else -1
+		row[field] += sign * d.amount
+		row[f"{field}_in_account_currency"] += sign * d.amount_in_account_currency
+		row.cost_center = row.cost_center or d.cost_center
+
+	set_voucher_details(outstandings, vouchers)
+
+	precision = get_currency_precision()
+	for key, row in list(outstandings.items()):
+		row.outstanding = row.invoiced - row.paid - row.credit_note
+		row.outstanding_in_account_currency = (
+			row.invoiced_in_account_currency
+			- row.paid_in_account_currency
+			- row.credit_note_in_account_currency
+		)
+
+		# Settled vouchers are dropped, balances of entries without a voucher of their own are
+		# kept to tell the reports that these entries are not rolled up into a voucher
+		if (
+			row.posting_date
+			and not flt(row.outstanding, precision)
+			and not flt(row.outstanding_in_account_currency, precision)
+		):
+			del outstandings[key]
+
+	return list(outstandings.values())
+
+
+def get_balance_field(entry, voucher_no):
+	"""Whether the amount of `entry` against voucher `voucher_no` is invoiced, paid or a
+	credit note. Same as `update_voucher_balance` of Accounts Receivable."""
+
+	if entry.is_debit:
+		if (
+			entry.voucher_type in ("Journal Entry", "Payment Entry")
+			and entry.voucher_no != entry.against_voucher_no
+		):
+			return "paid"
+		return "invoiced"
+
+	if entry.voucher_type in ("Sales Invoice", "Purchase Invoice"):
+		if voucher_no == entry.voucher_no == entry.against_voucher_no:
+			return "paid"
+		return "credit_note"
+
+	return "paid"
+
+
+def set_voucher_details(outstandings, vouchers):
+	"""Set the posting date, account currency and due date of the voucher's own Payment Ledger
+	Entries. Balances against a voucher without its own entries are left without a posting date."""
+
+	own_entries = frappe.db.sql(
+		"""
+		select
+			account, party_type, party, voucher_type, voucher_no, min(posting_date) as posting_date,
+			max(account_currency) as account_currency, max(cost_center) as cost_center
+		from `tabPayment Ledger Entry`
+		where delinked = 0 and voucher_no in %(voucher_nos)s
+		group by account, party_type, party, voucher_type, voucher_no
+		""",
+		{"voucher_nos": tuple({voucher_no for _voucher_type, voucher_no in vouchers})},
+		as_dict=True,
+	)
+
+	due_dates = get_due_dates(vouchers)
+	for d in own_entries:
+		row = outstandings.get((d.account, d.party_type, d.party, d.voucher_type, d.voucher_no))
+		if row:
+			row.posting_date = d.posting_date
+			row.account_currency = d.account_currency
+			row.cost_center = d.cost_center or row.cost_center
+			row.due_date = due_dates.get((d.voucher_type, d.voucher_no))
+
+
+def get_due_dates(vouchers):
+	"""Due dates of invoices and of journal entries booked as invoices"""
+
+	due_dates = {}
+	for doctype in ("Sales Invoice", "Purchase Invoice", "Journal Entry"):
+		names = [voucher_no for voucher_type, voucher_no in vouchers if voucher_type == doctype]
+		if not names:
+			continue
+
+		filters = {"name": ("in", names)}
+		if doctype == "Journal Entry":
+			filters["bill_no"] = ("is", "set")
+
+		for d in frappe.get_all(doctype, filters=filters, fields=["name", "due_date"]):
+			due_dates[(doctype, d.name)] = d.due_date
+
+	return due_dates
+
+
+def make_voucher_outstandings(outstandings):
+	fields = [
+		"name",
+		"company",
+		"account",
+		"party_type",
+		"party",
+		"voucher_type",
+		"voucher_no",
+		"posting_date",
+		"due_date",
+		"account_currency",
+		"cost_center",
+		*BALANCE_FIELDS,
+		"outstanding",
+		"outstanding_in_account_currency",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+	]
+
+	timestamp = now()
+	for row in outstandings:
+		row.update(
+			name=frappe.generate_hash(length=10),
+			creation=timestamp,
+			modified=timestamp,
+			owner=frappe.session.user,
+			modified_by=frappe.session.user,
+		)
+
+	frappe.db.bulk_insert(
+		"Voucher Outstanding", fields, [[row.get(field) for field in fields] for row in outstandings]
+	)
+
+
+def get_against_vouchers(filters):
+	"""Vouchers the Payment Ledger Entries matching `filters` are booked against, to update
+	their outstanding after the entries are changed with a query"""
+
+	return frappe.get_all(
+		"Payment Ledger Entry",
+		filters={**filters, "delinked": 0},
+		fields=["against_voucher_type", "against_voucher_no"],
+		distinct=True,
+		as_list=True,
+	)
+
+
+def check_voucher_outstandings(company):
+	"""Returns the vouchers of the company whose outstanding does not match the Payment Ledger"""
+	from erpnext.accounts.utils import get_currency_precision
+
+	vouchers = frappe.get_all(
+		"Payment Ledger Entry",
+		filters={"company": company, "delinked": 0},
+		fields=["against_voucher_type", "against_voucher_no"],
+		distinct=True,
+		as_list=True,
+	)
+
+	precision = get_currency_precision()
+	mismatched = []
+	for batch in create_batch(vouchers, 500):
+		batch, outstandings = get_outstandings(batch)
+		expected = {
+			(d.account, d.party, d.voucher_type, d.voucher_no): flt(d.outstanding, precision)
+			for d in outstandings
+		}
+		rolled_up = {
+			(d.account, d.party, d.voucher_type, d.voucher_no): flt(d.outstanding, precision)
+			for d in frappe.get_all(
+				"Voucher Outstanding",
+				filters={"company": company, "voucher_no": ("in", [voucher_no for _vt, voucher_no in batch])},
+				fields=["account", "party", "voucher_type", "voucher_no", "outstanding"],
+			)
+		}
+		mismatched.extend(
+			key[2:] for key in set(expected) | set(rolled_up) if expected.get(key) != rolled_up.get(key)
+		)
+
+	return sorted(set(mismatched))
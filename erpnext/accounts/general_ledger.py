@@ -11,6 +11,12 @@ from frappe.utils import cint, flt, formatdate, get_link_to_form, getdate, now
 from frappe.utils.dashboard import cache_source
 
 import erpnext
+from erpnext.accounts.doctype.account_closing_balance.account_closing_balance import (
+	clear_opening_balance_cache,
+)
+from erpnext.accounts.doctype.account_daily_balance.account_daily_balance import (
+	update_account_daily_balances,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 )
@@ -19,9 +25,18 @@ from erpnext.accounts.doctype.accounting_dimension_filter.accounting_dimension_f
 )
 from erpnext.accounts.doctype.accounting_period.accounting_period import ClosedAccountingPeriod
 from erpnext.accounts.doctype.budget.budget import validate_expense_against_budget
-from erpnext.accounts.utils import create_payment_ledger_entry
+from erpnext.accounts.doctype.gl_entry.gl_entry import (
+	get_account_details,
+	update_outstanding_amt,
+	validate_balance_type,
+	validate_frozen_account,
+)
+from erpnext.accounts.utils import bulk_insert_docs, create_payment_ledger_entry, validate_links_in_bulk
 from erpnext.exceptions import InvalidAccountDimensionError, MandatoryAccountDimensionError
 
+# gl maps with at least these many entries are inserted with multi-row inserts
+BULK_INSERT_MIN_ENTRIES = 100
+
 
 def make_gl_entries(
 	gl_map,
@@ -30,7 +45,13 @@ def make_gl_entries(
 	merge_entries=True,
 	update_outstanding="Yes",
 	from_repost=False,
+	bulk_insert=None,
 ):
+	"""Validate and submit the entries of `gl_map`.
+
+	With `bulk_insert` the entries are validated together and inserted with multi-row
+	inserts, by default this is done for large gl maps."""
+
 	if gl_map:
 		if not cancel:
 			make_acc_dimensions_offsetting_entry(gl_map)
@@ -38,6 +59,7 @@ def make_gl_entries(
 			validate_disabled_accounts(gl_map)
 			gl_map = process_gl_map(gl_map, merge_entries)
 			if gl_map and len(gl_map) > 1:
+				bulk_insert = use_bulk_insert(gl_map, bulk_insert)
 				if gl_map[0].voucher_type != "Period Closing Voucher":
 					create_payment_ledger_entry(
 						gl_map,
@@ -45,8 +67,11 @@ def make_gl_entries(
 						adv_adj=adv_adj,
 						update_outstanding=update_outstanding,
 						from_repost=from_repost,
+						bulk_insert=bulk_insert,
 					)
-				save_entries(gl_map, adv_adj, update_outstanding, from_repost)
+				save_entries(gl_map, adv_adj, update_outstanding, from_repost, bulk_insert)
+				update_account_daily_balances(gl_map)
+				clear_opening_balance_cache(gl_map)
 			# Post GL Map process there may no be any GL Entries
 			elif gl_map:
 				frappe.throw(
@@ -55,7 +80,19 @@ def make_gl_entries(
 					)
 				)
 		else:
-			make_reverse_gl_entries(gl_map, adv_adj=adv_adj, update_outstanding=update_outstanding)
+			make_reverse_gl_entries(
+				gl_map, adv_adj=adv_adj, update_outstanding=update_outstanding, bulk_insert=bulk_insert
+			)
+
+
+def use_bulk_insert(gl_map, bulk_insert=None):
+	"""Entries are inserted one by one if other apps hook into GL or Payment Ledger Entry,
+	hooks set for all doctypes are run by `bulk_insert_docs`"""
+	if bulk_insert is None:
+		bulk_insert = len(gl_map) >= BULK_INSERT_MIN_ENTRIES
+
+	doc_hooks = frappe.get_doc_hooks()
+	return bool(bulk_insert) and not (doc_hooks.get("GL Entry") or doc_hooks.get("Payment Ledger Entry"))
 
 
 def make_acc_dimensions_offsetting_entry(gl_map):
@@ -372,7 +409,7 @@ def update_net_values(entry):
 			entry.debit_in_account_currency = 0
 
 
-def save_entries(gl_map, adv_adj, update_outstanding, from_repost=False):
+def save_entries(gl_map, adv_adj, update_outstanding, from_repost=False, bulk_insert=False):
 	if not from_repost:
 		validate_cwip_accounts(gl_map)
 
@@ -387,7 +424,11 @@ def save_entries(gl_map, adv_adj, update_outstanding, from_repost=False):
 
 	for entry in gl_map:
 		validate_allowed_dimensions(entry, dimension_filter_map)
-		make_entry(entry, adv_adj, update_outstanding, from_repost)
+		if not bulk_insert:
+			make_entry(entry, adv_adj, update_outstanding, from_repost)
+
+	if bulk_insert and gl_map:
+		make_entries_in_bulk(gl_map, adv_adj, update_outstanding, from_repost)
 
 
 def make_entry(args, adv_adj, update_outstanding, from_repost=False):
@@ -404,6 +445,54 @@ def make_entry(args, adv_adj, update_outstanding, from_repost=False):
 		validate_expense_against_budget(args)
 
 
+def make_entries_in_bulk(gl_map, adv_adj, update_outstanding, from_repost=False):
+	"""Submit all entries of the gl map at once, with the validations of `GLEntry`.
+
+	Accounts are read with a single query, balances are checked once per account and
+	outstanding amounts are updated once per against voucher."""
+
+	gl_entries = []
+	for args in gl_map:
+		gle = frappe.new_doc("GL Entry")
+		gle.update(args)
+		gle.flags.from_repost = from_repost
+		gle.flags.adv_adj = adv_adj
+		gle.flags.update_outstanding = update_outstanding or "Yes"
+		gle.autoname()
+		gle.validate()
+		gl_entries.append(gle)
+
+	validate_links_in_bulk(gl_entries)
+
+	to_validate = [
+		gle for gle in gl_entries if not from_repost and gle.voucher_type != "Period Closing Voucher"
+	]
+	accounts = list(dict.fromkeys(gle.account for gle in to_validate))
+	if accounts:
+		account_details = get_account_details(accounts)
+		for gle in to_validate:
+			gle.validate_account_details(adv_adj, account_details)
+			gle.validate_dimensions_for_pl_and_bs()
+
+		for account in accounts:
+			validate_frozen_account(account, adv_adj)
+
+	bulk_insert_docs(gl_entries)
+
+	for account in accounts:
+		validate_balance_type(account, adv_adj)
+
+	against_vouchers = {gle.get_against_voucher_to_update(): None for gle in to_validate}
+	for against_voucher in against_vouchers:
+		if against_voucher:
+			update_outstanding_amt(*against_voucher)
+
+	if not from_repost:
+		for args in gl_map:
+			if args.voucher_type != "Period Closing Voucher":
+				validate_expense_against_budget(args)
+
+
 def validate_cwip_accounts(gl_map):
 	"""Validate that CWIP account are not used in Journal Entry"""
 	if gl_map and gl_map[0].voucher_type != "Journal Entry":
@@ -621,6 +710,7 @@ def make_reverse_gl_entries(
 	adv_adj=False,
 	update_outstanding="Yes",
 	partial_cancel=False,
+	bulk_insert=None,
 ):
 	"""
 	Get original gl entries of the voucher
@@ -683,6 +773,7 @@ def make_reverse_gl_entries(
 			if not immutable_ledger_enabled:
 				set_as_cancel(gl_entries[0]["voucher_type"], gl_entries[0]["voucher_no"])
 
+		reverse_gl_entries = []
 		for entry in gl_entries:
 			new_gle = copy.deepcopy(entry)
 			new_gle["name"] = None
@@ -705,8 +796,20 @@ def make_reverse_gl_entries(
 				new_gle["posting_date"] = frappe.form_dict.get("posting_date") or getdate()
 
 			if new_gle["debit"] or new_gle["credit"]:
+				reverse_gl_entries.append(new_gle)
+
+		if reverse_gl_entries and use_bulk_insert(reverse_gl_entries, bulk_insert):
+			make_entries_in_bulk(reverse_gl_entries, adv_adj, "Yes")
+		else:
+			for new_gle in reverse_gl_entries:
 				make_entry(new_gle, adv_adj, "Yes")
 
+		if immutable_ledger_enabled:
+			update_account_daily_balances(reverse_gl_entries)
+		else:
+			update_account_daily_balances(gl_entries, cancelled=True)
+		clear_opening_balance_cache(gl_entries + reverse_gl_entries)
+
 
 def check_freezing_date(posting_date, adv_adj=False):
 	"""
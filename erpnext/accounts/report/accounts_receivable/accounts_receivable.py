@@ -14,6 +14,9 @@ from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimension_with_children,
 )
+from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import (
+	is_voucher_outstanding_built,
+)
 from erpnext.accounts.utils import get_currency_precision, get_party_types_from_account_type
 
 #  This report gives a summary of all Outstanding Invoices considering the following
@@ -30,6 +33,18 @@ from erpnext.accounts.utils import get_currency_precision, get_party_types_from_
 #  8. Invoice details like Sales Persons, Delivery Notes are also fetched comma separated
 #  9. Report amounts are in party currency if in_party_currency is selected, otherwise company currency
 # 10. This report is based on Payment Ledger Entries
+# 11. Without filters on individual ledger entries, balances are read from Voucher Outstanding
+
+# filters which need the individual Payment Ledger Entries
+LEDGER_ENTRY_FILTERS = (
+	"show_future_payments",
+	"based_on_payment_terms",
+	"sales_person",
+	"ignore_accounts",
+	"show_remarks",
+	"finance_book",
+	"cost_center",
+)
 
 
 def execute(filters=None):
@@ -90,10 +105,14 @@ class ReceivablePayableReport:
 				self.skip_total_row = 1
 
 	def get_data(self):
-		self.get_ple_entries()
-		self.get_sales_invoices_or_customers_based_on_sales_person()
 		self.voucher_balance = OrderedDict()
-		self.init_voucher_balance()  # invoiced, paid, credit_note, outstanding
+		if self.use_voucher_outstandings():
+			self.ple_entries = []
+			self.init_voucher_balance_from_outstandings()
+		else:
+			self.get_ple_entries()
+			self.get_sales_invoices_or_customers_based_on_sales_person()
+			self.init_voucher_balance()  # invoiced, paid, credit_note, outstanding
 
 		# Build delivery note map against all sales invoices
 		self.build_delivery_note_map()
@@ -158,6 +177,72 @@ class ReceivablePayableReport:
 		if self.filters.get("group_by_party") and not self.filters.get("in_party_currency"):
 			self.init_subtotal_row("Total")
 
+	def use_voucher_outstandings(self):
+		"""Balances are read from Voucher Outstanding instead of the Payment Ledger when no filter
+		needs the individual ledger entries and the report is as on today"""
+		if not is_voucher_outstanding_built():
+			return False
+
+		if any(self.filters.get(fieldname) for fieldname in LEDGER_ENTRY_FILTERS) or any(
+			self.filters.get(dimension.fieldname) for dimension in get_accounting_dimensions(as_list=False)
+		):
+			return False
+
+		# Voucher Outstanding is the balance of all entries, settled vouchers are not kept
+		if self.filters.report_date < getdate(nowdate()) or frappe.db.exists(
+			"Payment Ledger Entry",
+			{"company": self.filters.company, "delinked": 0, "posting_date": (">", self.filters.report_date)},
+		):
+			return False
+
+		self.ple = qb.DocType("Voucher Outstanding")
+		self.prepare_conditions()
+
+		# entries against a voucher without entries of its own are balanced in a separate row
+		if (
+			self.get_voucher_outstandings_query()
+			.select(self.ple.name)
+			.where(self.ple.posting_date.isnull())
+			.limit(1)
+			.run()
+		):
+			self.ple = qb.DocType("Payment Ledger Entry")
+			return False
+
+		return True
+
+	def get_voucher_outstandings_query(self):
+		return (
+			qb.from_(self.ple)
+			.where(Criterion.all(self.qb_selection_filter))
+			.where(Criterion.any(self.or_filters))
+		)
+
+	def init_voucher_balance_from_outstandings(self):
+		in_account_currency = self.filters.get("in_party_currency") or self.filters.get("party_account")
+
+		query = self.get_voucher_outstandings_query().select(self.ple.star)
+		if self.filters.get("group_by_party"):
+			query = query.orderby(self.ple.party, self.ple.posting_date)
+		else:
+			query = query.orderby(self.ple.posting_date, self.ple.party)
+
+		for d in query.run(as_dict=True):
+			row = self.build_voucher_dict(d)
+			row.party_type = d.party_type
+			for field in ("invoiced", "paid", "credit_note"):
+				row[field] = d[f"{field}_in_account_currency"] if in_account_currency else d[field]
+				row[f"{field}_in_account_currency"] = d[f"{field}_in_account_currency"]
+
+			self.voucher_balance[(d.account, d.voucher_type, d.voucher_no, d.party)] = row
+			self.get_invoices(d)
+
+			if self.filters.get("group_by_party"):
+				self.init_subtotal_row(d.party)
+
+		if self.filters.get("group_by_party") and not self.filters.get("in_party_currency"):
+			self.init_subtotal_row("Total")
+
 	def get_invoices(self, ple):
 		if ple.voucher_type in ("Sales Invoice", "Purchase Invoice"):
 			if self.filters.get("sales_person"):
@@ -4,7 +4,9 @@
 
 import frappe
 from frappe import _, scrub
-from frappe.utils import cint, flt
+from frappe.query_builder import Case
+from frappe.query_builder.functions import Coalesce, Max, Min, Round, Sum
+from frappe.utils import add_days, cint, flt
 
 from erpnext.accounts.party import get_partywise_advanced_payment_amount
 from erpnext.accounts.report.accounts_receivable.accounts_receivable import ReceivablePayableReport
@@ -31,10 +33,13 @@ class AccountsReceivableSummary(ReceivablePayableReport):
 
 	def get_data(self, args):
 		self.data = []
-		self.receivables = ReceivablePayableReport(self.filters).run(args)[1]
 		self.currency_precision = get_currency_precision() or 2
 
-		self.get_party_total(args)
+		if self.use_voucher_outstandings_for_party_total(args):
+			self.get_party_total_from_voucher_outstandings()
+		else:
+			self.receivables = ReceivablePayableReport(self.filters).run(args)[1]
+			self.get_party_total(args)
 
 		party = None
 		for party_type in self.party_type:
@@ -103,6 +108,95 @@ class AccountsReceivableSummary(ReceivablePayableReport):
 			# set territory, customer_group, sales person etc
 			self.set_party_details(d)
 
+	def use_voucher_outstandings_for_party_total(self, args):
+		if (
+			self.filters.show_sales_person
+			or self.filters.for_revaluation_journals
+			or self.filters.ageing_based_on == "Supplier Invoice Date"
+		):
+			return False
+
+		self.filters.update(args)
+		self.set_defaults()
+		return self.use_voucher_outstandings()
+
+	def get_party_total_from_voucher_outstandings(self):
+		"""Totals and ageing of the parties with a single query grouped by party, with the same
+		rows as Accounts Receivable/Payable"""
+		self.get_exchange_rate_revaluations()
+
+		vo = self.ple
+		in_account_currency = self.filters.get("in_party_currency") or self.filters.get("party_account")
+		suffix = "_in_account_currency" if in_account_currency else ""
+		outstanding = Round(vo[f"outstanding{suffix}"], self.currency_precision)
+
+		# vouchers settled in account currency are only shown for exchange gain or loss journals
+		has_outstanding = Round(vo.outstanding_in_account_currency, self.currency_precision) != 0
+		if self.err_journals:
+			has_outstanding |= vo.voucher_no.isin(self.err_journals)
+
+		query = (
+			self.get_voucher_outstandings_query()
+			.select(
+				vo.party,
+				Max(vo.party_type).as_("party_type"),
+				Max(vo.account_currency).as_("account_currency"),
+				Sum(vo[f"invoiced{suffix}"]).as_("invoiced"),
+				Sum(vo[f"paid{suffix}"]).as_("paid"),
+				Sum(vo[f"credit_note{suffix}"]).as_("credit_note"),
+				Sum(outstanding).as_("outstanding"),
+				*self.get_ageing_buckets(outstanding),
+			)
+			.where((outstanding != 0) & has_outstanding)
+			.groupby(vo.party)
+		)
+
+		if self.filters.get("group_by_party"):
+			query = query.orderby(vo.party)
+		else:
+			query = query.orderby(Min(vo.posting_date)).orderby(vo.party)
+
+		range_fields = [f"range{i}" for i in self.range_numbers]
+		self.party_total = frappe._dict()
+		for d in query.run(as_dict=True):
+			self.init_party_total(d)
+			party_total = self.party_total[d.party]
+			for field in ("invoiced", "paid", "credit_note", "outstanding", *range_fields):
+				party_total[field] = flt(d[field])
+
+			party_total.total_due = sum(party_total[field] for field in range_fields)
+			party_total.currency = d.account_currency if in_account_currency else self.company_currency
+
+			party_details = self.get_party_details(d.party) or {}
+			for key in ("territory", "customer_group", "supplier_group"):
+				if party_details.get(key):
+					party_total[key] = party_details[key]
+
+			if self.filters.sales_partner:
+				party_total["default_sales_partner"] = party_details.get("default_sales_partner", "")
+
+	def get_ageing_buckets(self, outstanding):
+		"""Outstanding in each ageing range, as set by `set_ageing` for the rows of the report"""
+		vo = self.ple
+		if self.filters.ageing_based_on == "Due Date":
+			entry_date = Coalesce(vo.due_date, vo.posting_date)
+		else:
+			entry_date = vo.posting_date
+
+		ranges = [cint(days) for days in self.ranges]
+
+		buckets = []
+		for i in range(len(ranges) + 1):
+			condition = entry_date <= self.filters.report_date
+			if i < len(ranges):
+				condition &= entry_date >= add_days(self.age_as_on, -ranges[i])
+			if i:
+				condition &= entry_date < add_days(self.age_as_on, -ranges[i - 1])
+
+			buckets.append(Sum(Case().when(condition, outstanding).else_(0)).as_(f"range{i + 1}"))
+
+		return buckets
+
 	def init_party_total(self, row):
 		default_dict = {
 			"invoiced": 0.0,
@@ -137,6 +137,12 @@ frappe.query_reports["Consolidated Financial Statement"] = {
 			label: __("Show zero values"),
 			fieldtype: "Check",
 		},
+		{
+			fieldname: "aggregate_in_parallel",
+			label: __("Aggregate Companies in Parallel"),
+			fieldtype: "Check",
+			default: 0,
+		},
 	],
 	formatter: function (value, row, column, data, default_formatter) {
 		if (data && column.fieldname == "account") {
@@ -3,11 +3,13 @@
 
 
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import frappe
 from frappe import _
 from frappe.query_builder import Criterion
-from frappe.utils import flt, getdate
+from frappe.query_builder.functions import Max, Sum
+from frappe.utils import add_days, cstr, flt, getdate
 
 import erpnext
 from erpnext.accounts.report.balance_sheet.balance_sheet import (
@@ -39,6 +41,11 @@ from erpnext.accounts.report.profit_and_loss_statement.profit_and_loss_statement
 )
 from erpnext.accounts.report.utils import convert, convert_to_presentation_currency
 
+# companies whose GL Entries are queried at the same time with `aggregate_in_parallel`
+MAX_PARALLEL_COMPANIES = 8
+
+CLOSING_BALANCE_CACHE_EXPIRY = 24 * 60 * 60
+
 
 def execute(filters=None):
 	columns, data, message, chart = [], [], [], []
@@ -335,25 +342,21 @@ def get_data(companies, root_type, balance_must_be, fiscal_year, filters=None, i
 
 	filters.end_date = end_date
 
+	# accounts of all roots of the root type are fetched at once, one query per company
 	gl_entries_by_account = {}
-	for root in frappe.db.sql(
-		"""select lft, rgt from tabAccount
-			where root_type=%s and ifnull(parent_account, '') = ''""",
-		root_type,
-		as_dict=1,
-	):
-		set_gl_entries_by_account(
-			start_date,
-			end_date,
-			root.lft,
-			root.rgt,
-			filters,
-			gl_entries_by_account,
-			accounts_by_name,
-			accounts,
-			ignore_closing_entries=False,
-			root_type=root_type,
-		)
+	set_gl_entries_by_account(
+		start_date,
+		end_date,
+		None,
+		None,
+		filters,
+		gl_entries_by_account,
+		accounts_by_name,
+		accounts,
+		ignore_closing_entries=False,
+		root_type=root_type,
+		opening_date=get_opening_date(filters, fiscal_year),
+	)
 
 	calculate_values(accounts_by_name, gl_entries_by_account, companies, filters, fiscal_year)
 	accumulate_values_into_parents(accounts, accounts_by_name, companies)
@@ -376,11 +379,15 @@ def get_company_currency(filters=None):
 	)
 
 
-def calculate_values(accounts_by_name, gl_entries_by_account, companies, filters, fiscal_year):
-	start_date = (
+def get_opening_date(filters, fiscal_year):
+	return (
 		fiscal_year.year_start_date if filters.filter_based_on == "Fiscal Year" else filters.period_start_date
 	)
 
+
+def calculate_values(accounts_by_name, gl_entries_by_account, companies, filters, fiscal_year):
+	start_date = get_opening_date(filters, fiscal_year)
+
 	for entries in gl_entries_by_account.values():
 		for entry in entries:
 			if entry.account_number:
@@ -588,8 +595,12 @@ def set_gl_entries_by_account(
 	accounts,
 	ignore_closing_entries=False,
 	root_type=None,
+	opening_date=None,
 ):
-	"""Returns a dict like { "account": [gl entries], ... }"""
+	"""Returns a dict like { "account": [gl entries], ... }
+
+	The entries of an account are summed per company, split into the ones before and
+	after `opening_date`. With `aggregate_in_parallel`, companies are queried in parallel."""
 
 	company_lft, company_rgt = frappe.get_cached_value("Company", filters.get("company"), ["lft", "rgt"])
 
@@ -603,53 +614,13 @@ def set_gl_entries_by_account(
 		as_dict=1,
 	)
 
-	currency_info = frappe._dict(
-		{"report_date": to_date, "presentation_currency": filters.get("presentation_currency")}
-	)
-
-	for d in companies:
-		gle = frappe.qb.DocType("GL Entry")
-		account = frappe.qb.DocType("Account")
-		query = (
-			frappe.qb.from_(gle)
-			.inner_join(account)
-			.on(account.name == gle.account)
-			.select(
-				gle.posting_date,
-				gle.account,
-				gle.debit,
-				gle.credit,
-				gle.is_opening,
-				gle.company,
-				gle.fiscal_year,
-				gle.debit_in_account_currency,
-				gle.credit_in_account_currency,
-				gle.account_currency,
-				account.account_name,
-				account.account_number,
-			)
-			.where(
-				(gle.company == d.name)
-				& (gle.is_cancelled == 0)
-				& (gle.posting_date <= to_date)
-				& (account.lft >= root_lft)
-				& (account.rgt <= root_rgt)
-			)
-			.orderby(gle.account, gle.posting_date)
-		)
-
-		if root_type:
-			query = query.where(account.root_type == root_type)
-		additional_conditions = get_additional_conditions(from_date, ignore_closing_entries, filters, d)
-		if additional_conditions:
-			query = query.where(Criterion.all(additional_conditions))
-		gl_entries = query.run(as_dict=True)
-
-		if filters and filters.get("presentation_currency") != d.default_currency:
-			currency_info["company"] = d.name
-			currency_info["company_currency"] = d.default_currency
-			convert_to_presentation_currency(gl_entries, currency_info)
+	args = (from_date, to_date, root_lft, root_rgt, filters, ignore_closing_entries, root_type, opening_date)
+	if filters.get("aggregate_in_parallel") and len(companies) > 1 and not frappe.flags.in_test:
+		gl_entries_by_company = get_gl_entries_in_parallel(companies, args)
+	else:
+		gl_entries_by_company = [get_company_gl_entries(d, *args) for d in companies]
 
+	for gl_entries in gl_entries_by_company:
 		for entry in gl_entries:
 			if entry.account_number:
 				account_name = entry.account_number + " - " + entry.account_name
@@ -662,6 +633,187 @@ def set_gl_entries_by_account(
 	return gl_entries_by_account
 
 
+def get_gl_entries_in_parallel(companies, args):
+	"""Run `get_company_gl_entries` for each company in a thread with its own connection"""
+	site, sites_path, user = frappe.local.site, frappe.local.sites_path, frappe.session.user
+
+	def get_gl_entries(company):
+		frappe.init(site, sites_path=sites_path)
+		try:
+			frappe.connect()
+			frappe.set_user(user)
+			return get_company_gl_entries(company, *args)
+		finally:
+			frappe.destroy()
+
+	with ThreadPoolExecutor(max_workers=min(len(companies), MAX_PARALLEL_COMPANIES)) as executor:
+		return list(executor.map(get_gl_entries, companies))
+
+
+def get_company_gl_entries(
+	company, from_date, to_date, root_lft, root_rgt, filters, ignore_closing_entries, root_type, opening_date
+):
+	"""GL Entries of `company` summed per account, in the presentation currency.
+
+	Without `from_date`, the balances up to the last period closed before `opening_date` are
+	read from the Account Closing Balance, and only the entries after it from the GL Entry."""
+
+	gl_entries = []
+	args = (to_date, root_lft, root_rgt, filters, ignore_closing_entries, root_type, opening_date)
+	ignore_opening_entries = False
+
+	if not from_date and opening_date:
+		last_period_closing_voucher = get_last_period_closing_voucher(company.name, opening_date)
+		if last_period_closing_voucher:
+			gl_entries += get_closing_balances(company, last_period_closing_voucher.name, *args)
+			from_date = add_days(last_period_closing_voucher.period_end_date, 1)
+			ignore_opening_entries = True
+
+	gl_entries += get_accounting_entries(
+		"GL Entry", company, from_date, *args, ignore_opening_entries=ignore_opening_entries
+	)
+
+	if filters and filters.get("presentation_currency") != company.default_currency:
+		currency_info = frappe._dict(
+			{
+				"report_date": to_date,
+				"presentation_currency": filters.get("presentation_currency"),
+				"company": company.name,
+				"company_currency": company.default_currency,
+			}
+		)
+		convert_to_presentation_currency(gl_entries, currency_info)
+
+	return gl_entries
+
+
+def get_last_period_closing_voucher(company, opening_date):
+	if frappe.db.get_single_value("Accounts Settings", "ignore_account_closing_balance"):
+		return None
+
+	period_closing_vouchers = frappe.get_all(
+		"Period Closing Voucher",
+		filters={"docstatus": 1, "company": company, "period_end_date": ("<", opening_date)},
+		fields=["name", "period_end_date"],
+		order_by="period_end_date desc",
+		limit=1,
+	)
+
+	return period_closing_vouchers[0] if period_closing_vouchers else None
+
+
+def get_closing_balances(
+	company,
+	period_closing_voucher,
+	to_date,
+	root_lft,
+	root_rgt,
+	filters,
+	ignore_closing_entries,
+	root_type,
+	opening_date,
+):
+	"""Account Closing Balances of `period_closing_voucher`, which do not change once the
+	period is closed, so they are cached per voucher"""
+
+	key = "erpnext:consolidated_closing_balance:" + "::".join(
+		cstr(value)
+		for value in (
+			period_closing_voucher,
+			root_lft,
+			root_rgt,
+			root_type,
+			ignore_closing_entries,
+			filters.get("finance_book"),
+			filters.get("include_default_book_entries"),
+		)
+	)
+
+	closing_balances = frappe.cache.get_value(key)
+	if closing_balances is None:
+		closing_balances = get_accounting_entries(
+			"Account Closing Balance",
+			company,
+			None,
+			to_date,
+			root_lft,
+			root_rgt,
+			filters,
+			ignore_closing_entries,
+			root_type,
+			opening_date,
+			period_closing_voucher=period_closing_voucher,
+		)
+		frappe.cache.set_value(key, closing_balances, expires_in_sec=CLOSING_BALANCE_CACHE_EXPIRY)
+
+	# entries are converted to the presentation currency in place
+	return [frappe._dict(d) for d in closing_balances]
+
+
+def get_accounting_entries(
+	doctype,
+	company,
+	from_date,
+	to_date,
+	root_lft,
+	root_rgt,
+	filters,
+	ignore_closing_entries,
+	root_type,
+	opening_date,
+	period_closing_voucher=None,
+	ignore_opening_entries=False,
+):
+	gle = frappe.qb.DocType(doctype)
+	account = frappe.qb.DocType("Account")
+	fields = [gle.account, gle.company, gle.account_currency, account.account_name, account.account_number]
+	amount_fields = [gle.debit, gle.credit, gle.debit_in_account_currency, gle.credit_in_account_currency]
+
+	if doctype == "GL Entry":
+		posting_date = gle.posting_date
+	else:
+		posting_date = gle.closing_date
+
+	query = (
+		frappe.qb.from_(gle)
+		.inner_join(account)
+		.on(account.name == gle.account)
+		.select(
+			*fields,
+			*[Sum(field).as_(field.name) for field in amount_fields],
+			Max(posting_date).as_("posting_date"),
+		)
+		.where((gle.company == company.name) & (posting_date <= to_date))
+		.groupby(*fields)
+	)
+
+	if doctype == "GL Entry":
+		query = query.where(gle.is_cancelled == 0)
+
+		if ignore_opening_entries:
+			query = query.where(gle.is_opening == "No")
+	else:
+		query = query.where(gle.period_closing_voucher == period_closing_voucher)
+
+	if opening_date:
+		# entries before the opening date are part of the opening balance
+		query = query.groupby(posting_date < opening_date)
+
+	if root_lft and root_rgt:
+		query = query.where((account.lft >= root_lft) & (account.rgt <= root_rgt))
+
+	if root_type:
+		query = query.where(account.root_type == root_type)
+
+	additional_conditions = get_additional_conditions(
+		from_date, ignore_closing_entries, filters, company, doctype
+	)
+	if additional_conditions:
+		query = query.where(Criterion.all(additional_conditions))
+
+	return query.run(as_dict=True)
+
+
 def get_account_details(account):
 	return frappe.get_cached_value(
 		"Account",
@@ -714,12 +866,15 @@ def validate_entries(key, entry, accounts_by_name, accounts):
 		accounts.insert(idx + 1, args)
 
 
-def get_additional_conditions(from_date, ignore_closing_entries, filters, d):
-	gle = frappe.qb.DocType("GL Entry")
+def get_additional_conditions(from_date, ignore_closing_entries, filters, d, doctype="GL Entry"):
+	gle = frappe.qb.DocType(doctype)
 	additional_conditions = []
 
 	if ignore_closing_entries:
-		additional_conditions.append(gle.voucher_type != "Period Closing Voucher")
+		if doctype == "GL Entry":
+			additional_conditions.append(gle.voucher_type != "Period Closing Voucher")
+		else:
+			additional_conditions.append(gle.is_period_closing_voucher_entry == 0)
 
 	if from_date:
 		additional_conditions.append(gle.posting_date >= from_date)
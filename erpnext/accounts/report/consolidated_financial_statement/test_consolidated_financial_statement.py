@@ -0,0 +1,33 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# MIT License. See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import add_days, today
+
+from erpnext.accounts.report.consolidated_financial_statement.consolidated_financial_statement import (
+	get_company_gl_entries,
+	get_gl_entries_in_parallel,
+)
+
+
+class TestConsolidatedFinancialStatement(IntegrationTestCase):
+	def test_gl_entries_in_parallel(self):
+		# threads open their own connections, so they only see committed entries
+		companies = frappe.get_all(
+			"Company",
+			filters={"name": ("in", ["_Test Company 3", "_Test Company 4", "_Test Company 5"])},
+			fields=["name", "default_currency"],
+			order_by="name",
+		)
+		filters = frappe._dict(company="_Test Company 3", presentation_currency="INR")
+		args = (add_days(today(), -365), today(), None, None, filters, False, "Asset", None)
+
+		parallel_entries = get_gl_entries_in_parallel(companies, args)
+		serial_entries = [get_company_gl_entries(d, *args) for d in companies]
+
+		self.assertEqual(parallel_entries, serial_entries)
+
+		# the connection of the request is left as it was
+		self.assertEqual(frappe.session.user, "Administrator")
+		self.assertTrue(frappe.db.sql("select 1"))
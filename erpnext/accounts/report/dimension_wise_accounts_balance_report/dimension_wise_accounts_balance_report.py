@@ -8,6 +8,7 @@ from frappe.utils import cstr, flt
 
 import erpnext
 from erpnext.accounts.report.financial_statements import (
+	accumulate_values_by_lft_rgt,
 	filter_accounts,
 	filter_out_zero_value_rows,
 )
@@ -94,8 +95,7 @@ def set_gl_entries_by_account(dimension_list, filters, account, gl_entries_by_ac
 	gl_entries = frappe.db.sql(
 		"""
 		select
-			posting_date, account, {dimension}, debit, credit, is_opening, fiscal_year,
-			debit_in_account_currency, credit_in_account_currency, account_currency
+			account, {dimension}, sum(debit) as debit, sum(credit) as credit
 		from
 			`tabGL Entry`
 		where
@@ -104,7 +104,7 @@ def set_gl_entries_by_account(dimension_list, filters, account, gl_entries_by_ac
 		and posting_date >= %(from_date)s
 		and posting_date <= %(to_date)s
 		and is_cancelled = 0
-		order by account, posting_date""".format(
+		group by account, {dimension}""".format(
 			dimension=frappe.scrub(filters.get("dimension")), condition=condition
 		),
 		gl_filters,
@@ -168,12 +168,9 @@ def prepare_data(accounts, filters, company_currency, dimension_list):
 
 def accumulate_values_into_parents(accounts, accounts_by_name, dimension_list):
 	"""accumulate children's values in parent accounts"""
-	for d in reversed(accounts):
-		if d.parent_account:
-			for dimension in dimension_list:
-				accounts_by_name[d.parent_account][frappe.scrub(dimension)] = accounts_by_name[
-					d.parent_account
-				].get(frappe.scrub(dimension), 0.0) + d.get(frappe.scrub(dimension), 0.0)
+	accumulate_values_by_lft_rgt(
+		accounts_by_name.values(), [frappe.scrub(dimension) for dimension in dimension_list]
+	)
 
 
 def get_condition(dimension):
@@ -7,7 +7,10 @@ import math
 import re
 
 import frappe
+import numpy as np
 from frappe import _
+from frappe.query_builder import Case
+from frappe.query_builder.functions import Max, Sum
 from frappe.utils import add_days, add_months, cint, cstr, flt, formatdate, get_first_day, getdate
 from pypika.terms import ExistsCriterion
 
@@ -188,6 +191,7 @@ def get_data(
 			root.rgt,
 			root_type=root_type,
 			ignore_closing_entries=ignore_closing_entries,
+			period_list=period_list,
 		)
 
 	calculate_values(
@@ -227,41 +231,89 @@ def calculate_values(
 	accumulated_values,
 	ignore_accumulated_values_for_fy,
 ):
-	for entries in gl_entries_by_account.values():
-		for entry in entries:
-			d = accounts_by_name.get(entry.account)
-			if not d:
-				frappe.msgprint(
-					_("Could not retrieve information for {0}.").format(entry.account),
-					title="Error",
-					raise_exception=1,
-				)
-			for period in period_list:
-				# check if posting date is within the period
+	"""Add the amounts of the GL Entries to the values of their accounts for each period, with
+	the amounts of all entries bucketed into an account x period matrix at once"""
+	entries = [entry for entries in gl_entries_by_account.values() for entry in entries]
+	if not entries:
+		return
+
+	accounts = list(dict.fromkeys(entry.account for entry in entries))
+	for account in accounts:
+		if account not in accounts_by_name:
+			frappe.msgprint(
+				_("Could not retrieve information for {0}.").format(account),
+				title="Error",
+				raise_exception=1,
+			)
+
+	account_index = {account: i for i, account in enumerate(accounts)}
+	rows = np.array([account_index[entry.account] for entry in entries])
+	amounts = np.array([flt(entry.debit) - flt(entry.credit) for entry in entries])
+	posting_dates = np.array([getdate(entry.posting_date).toordinal() for entry in entries])
+
+	from_dates = np.array([getdate(period.from_date).toordinal() for period in period_list])
+	to_dates = np.array([getdate(period.to_date).toordinal() for period in period_list])
+
+	# entries x periods, whether the entry is part of the period's value
+	in_period = posting_dates[:, None] <= to_dates
+	if not accumulated_values:
+		in_period &= posting_dates[:, None] >= from_dates
+
+	if ignore_accumulated_values_for_fy:
+		fiscal_years = np.array([entry.fiscal_year for entry in entries], dtype=object)
+		period_fiscal_years = np.array([period.to_date_fiscal_year for period in period_list], dtype=object)
+		in_period &= fiscal_years[:, None] == period_fiscal_years
+
+	values = np.zeros((len(accounts), len(period_list)))
+	np.add.at(values, rows, amounts[:, None] * in_period)
 
-				if entry.posting_date <= period.to_date:
-					if (accumulated_values or entry.posting_date >= period.from_date) and (
-						not ignore_accumulated_values_for_fy
-						or entry.fiscal_year == period.to_date_fiscal_year
-					):
-						d[period.key] = d.get(period.key, 0.0) + flt(entry.debit) - flt(entry.credit)
+	opening_balances = np.zeros(len(accounts))
+	is_opening = posting_dates < getdate(period_list[0].year_start_date).toordinal()
+	np.add.at(opening_balances, rows[is_opening], amounts[is_opening])
 
-			if entry.posting_date < period_list[0].year_start_date:
-				d["opening_balance"] = d.get("opening_balance", 0.0) + flt(entry.debit) - flt(entry.credit)
+	for account, account_values, opening_balance, has_opening in zip(
+		accounts,
+		values.tolist(),
+		opening_balances.tolist(),
+		np.bincount(rows[is_opening], minlength=len(accounts)).tolist(),
+		strict=True,
+	):
+		d = accounts_by_name[account]
+		for period, value in zip(period_list, account_values, strict=True):
+			d[period.key] = d.get(period.key, 0.0) + value
+
+		if has_opening:
+			d["opening_balance"] = d.get("opening_balance", 0.0) + opening_balance
 
 
 def accumulate_values_into_parents(accounts, accounts_by_name, period_list):
 	"""accumulate children's values in parent accounts"""
-	for d in reversed(accounts):
-		if d.parent_account:
-			for period in period_list:
-				accounts_by_name[d.parent_account][period.key] = accounts_by_name[d.parent_account].get(
-					period.key, 0.0
-				) + d.get(period.key, 0.0)
+	accumulate_values_by_lft_rgt(
+		accounts_by_name.values(), [period.key for period in period_list] + ["opening_balance"]
+	)
+
 
-			accounts_by_name[d.parent_account]["opening_balance"] = accounts_by_name[d.parent_account].get(
-				"opening_balance", 0.0
-			) + d.get("opening_balance", 0.0)
+def accumulate_values_by_lft_rgt(accounts, keys):
+	"""Add the values of `keys` of all accounts to their parents, up to the root.
+
+	All accounts are rolled up in a single pass: the accounts ordered by lft between the
+	lft and rgt of an account are the account and its descendants."""
+	accounts = sorted(accounts, key=lambda d: d.lft)
+	if not accounts:
+		return
+
+	lft = np.array([d.lft for d in accounts])
+	rgt = np.array([d.rgt for d in accounts])
+
+	# the last row is zero, as the end of the range of the last accounts
+	values = np.zeros((len(accounts) + 1, len(keys)))
+	values[:-1] = [[flt(d.get(key, 0.0)) for key in keys] for d in accounts]
+
+	ranges = np.column_stack((np.arange(len(accounts)), np.searchsorted(lft, rgt, side="right")))
+	totals = np.add.reduceat(values, ranges.ravel(), axis=0)[::2]
+
+	for d, account_totals in zip(accounts, totals.tolist(), strict=True):
+		d.update(zip(keys, account_totals, strict=True))
 
 
 def prepare_data(accounts, balance_must_be, period_list, company_currency, accumulated_values):
@@ -427,8 +479,11 @@ def set_gl_entries_by_account(
 	root_type=None,
 	ignore_closing_entries=False,
 	ignore_opening_entries=False,
+	period_list=None,
 ):
-	"""Returns a dict like { "account": [gl entries], ... }"""
+	"""Returns a dict like { "account": [gl entries], ... }
+
+	With `period_list`, the entries of an account are summed per period instead"""
 	gl_entries = []
 
 	# For balance sheet
@@ -458,6 +513,7 @@ def set_gl_entries_by_account(
 				root_type,
 				ignore_closing_entries,
 				last_period_closing_voucher[0].name,
+				period_list=period_list,
 			)
 			from_date = add_days(last_period_closing_voucher[0].period_end_date, 1)
 			ignore_opening_entries = True
@@ -472,6 +528,7 @@ def set_gl_entries_by_account(
 		root_type,
 		ignore_closing_entries,
 		ignore_opening_entries=ignore_opening_entries,
+		period_list=period_list,
 	)
 
 	if filters and filters.get("presentation_currency"):
@@ -494,32 +551,42 @@ def get_accounting_entries(
 	ignore_closing_entries=None,
 	period_closing_voucher=None,
 	ignore_opening_entries=False,
+	period_list=None,
 ):
 	gl_entry = frappe.qb.DocType(doctype)
-	query = (
-		frappe.qb.from_(gl_entry)
-		.select(
-			gl_entry.account,
-			gl_entry.debit,
-			gl_entry.credit,
-			gl_entry.debit_in_account_currency,
-			gl_entry.credit_in_account_currency,
-			gl_entry.account_currency,
-		)
-		.where(gl_entry.company == filters.company)
-	)
+	fields = [gl_entry.account, gl_entry.account_currency]
+	amount_fields = [
+		gl_entry.debit,
+		gl_entry.credit,
+		gl_entry.debit_in_account_currency,
+		gl_entry.credit_in_account_currency,
+	]
+	query = frappe.qb.from_(gl_entry).where(gl_entry.company == filters.company)
 
 	if doctype == "GL Entry":
-		query = query.select(gl_entry.posting_date, gl_entry.is_opening, gl_entry.fiscal_year)
+		posting_date = gl_entry.posting_date
+		fields += [gl_entry.is_opening, gl_entry.fiscal_year]
 		query = query.where(gl_entry.is_cancelled == 0)
 		query = query.where(gl_entry.posting_date <= to_date)
 
 		if ignore_opening_entries:
 			query = query.where(gl_entry.is_opening == "No")
 	else:
-		query = query.select(gl_entry.closing_date.as_("posting_date"))
+		posting_date = gl_entry.closing_date
 		query = query.where(gl_entry.period_closing_voucher == period_closing_voucher)
 
+	if period_list is None:
+		query = query.select(*fields, *amount_fields, posting_date.as_("posting_date"))
+	else:
+		# dates within a period range compare the same with all period dates, so one entry
+		# per account and period range is enough
+		period_range = get_period_range(posting_date, period_list)
+		query = query.select(
+			*fields,
+			*[Sum(field).as_(field.name) for field in amount_fields],
+			Max(posting_date).as_("posting_date"),
+		).groupby(*fields, period_range)
+
 	query = apply_additional_conditions(doctype, query, from_date, ignore_closing_entries, filters)
 
 	if (root_lft and root_rgt) or root_type:
@@ -531,6 +598,22 @@ def get_accounting_entries(
 	return entries
 
 
+def get_period_range(posting_date, period_list):
+	"""Index of the range between period from, to and year start dates `posting_date` falls in"""
+	boundaries = set()
+	for period in period_list:
+		boundaries.add(getdate(period.to_date))
+		for key in ("from_date", "year_start_date"):
+			if period.get(key):
+				boundaries.add(getdate(add_days(period[key], -1)))
+
+	period_range = Case()
+	for i, boundary in enumerate(sorted(boundaries)):
+		period_range = period_range.when(posting_date <= boundary, i)
+
+	return period_range.else_(len(boundaries))
+
+
 def get_account_filter_query(root_lft, root_rgt, root_type, gl_entry):
 	acc = frappe.qb.DocType("Account")
 	exists_query = (
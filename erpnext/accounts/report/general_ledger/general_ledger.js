@@ -215,6 +215,41 @@ frappe.query_reports["General Ledger"] = {
 			fieldtype: "Check",
 		},
 	],
+
+	onload: function (report) {
+		report.page.add_menu_item(__("Export in Background"), function () {
+			frappe.prompt(
+				{
+					fieldname: "file_format",
+					label: __("File Format"),
+					fieldtype: "Select",
+					options: ["CSV", "Excel"],
+					default: "CSV",
+					reqd: 1,
+				},
+				(values) => {
+					frappe.call({
+						method: "erpnext.accounts.report.general_ledger.general_ledger.export_report",
+						args: {
+							filters: report.get_values(),
+							file_format: values.file_format,
+						},
+					});
+				},
+				__("Export General Ledger")
+			);
+		});
+
+		// onload runs every time the report is opened
+		frappe.realtime.off("general_ledger_export");
+		frappe.realtime.on("general_ledger_export", (data) => {
+			frappe.msgprint(
+				__("The General Ledger export is ready: {0}", [
+					`<a href="${data.file_url}" target="_blank">${__("Download")}</a>`,
+				])
+			);
+		});
+	},
 };
 
 erpnext.utils.add_dimensions("General Ledger", 15);
@@ -3,12 +3,15 @@
 
 
 import copy
+import csv
 from collections import OrderedDict
+from itertools import groupby
 
 import frappe
+import openpyxl
 from frappe import _, _dict
 from frappe.query_builder import Criterion
-from frappe.utils import cstr, getdate
+from frappe.utils import cstr, flt, getdate
 
 from erpnext import get_company_currency, get_default_company
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
@@ -16,7 +19,7 @@ from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_dimension_with_children,
 )
 from erpnext.accounts.report.financial_statements import get_cost_centers_with_children
-from erpnext.accounts.report.utils import convert_to_presentation_currency, get_currency
+from erpnext.accounts.report.utils import convert, convert_to_presentation_currency, get_currency
 from erpnext.accounts.utils import get_account_currency
 
 
@@ -24,6 +27,16 @@ def execute(filters=None):
 	if not filters:
 		return [], []
 
+	filters, account_details = prepare_filters(filters)
+
+	columns = get_columns(filters)
+
+	res = get_result(filters, account_details)
+
+	return columns, res
+
+
+def prepare_filters(filters):
 	account_details = {}
 
 	if filters and filters.get("print_in_account_currency") and not filters.get("account"):
@@ -44,11 +57,7 @@ def execute(filters=None):
 
 	filters = set_account_currency(filters)
 
-	columns = get_columns(filters)
-
-	res = get_result(filters, account_details)
-
-	return columns, res
+	return filters, account_details
 
 
 def validate_filters(filters, account_details):
@@ -152,6 +161,20 @@ def get_result(filters, account_details):
 
 def get_gl_entries(filters, accounting_dimensions):
 	currency_map = get_currency(filters)
+
+	gl_entries = frappe.db.sql(
+		get_gl_entries_query(filters, accounting_dimensions, get_conditions(filters)),
+		filters,
+		as_dict=1,
+	)
+
+	if filters.get("presentation_currency"):
+		return convert_to_presentation_currency(gl_entries, currency_map)
+	else:
+		return gl_entries
+
+
+def get_gl_entries_query(filters, accounting_dimensions, conditions, order_by_fields=None):
 	select_fields = """, debit, credit, debit_in_account_currency,
 		credit_in_account_currency """
 
@@ -171,10 +194,8 @@ def get_gl_entries(filters, accounting_dimensions):
 	if filters.get("group_by") == "Group by Account":
 		order_by_statement = "order by account, posting_date, creation"
 
-	if filters.get("include_default_book_entries"):
-		filters["company_fb"] = frappe.get_cached_value(
-			"Company", filters.get("company"), "default_finance_book"
-		)
+	if order_by_fields:
+		order_by_statement = "order by {}, posting_date, creation".format(", ".join(order_by_fields))
 
 	dimension_fields = ""
 	if accounting_dimensions:
@@ -186,8 +207,7 @@ def get_gl_entries(filters, accounting_dimensions):
 			"debit_in_transaction_currency, credit_in_transaction_currency, transaction_currency,"
 		)
 
-	gl_entries = frappe.db.sql(
-		f"""
+	return f"""
 		select
 			name as gl_entry, posting_date, account, party_type, party,
 			voucher_type, voucher_subtype, voucher_no, {dimension_fields}
@@ -195,22 +215,19 @@ def get_gl_entries(filters, accounting_dimensions):
 			against_voucher_type, against_voucher, account_currency,
 			against, is_opening, creation {select_fields}
 		from `tabGL Entry`
-		where company=%(company)s {get_conditions(filters)}
+		where company=%(company)s {conditions}
 		{order_by_statement}
-	""",
-		filters,
-		as_dict=1,
-	)
-
-	if filters.get("presentation_currency"):
-		return convert_to_presentation_currency(gl_entries, currency_map)
-	else:
-		return gl_entries
+	"""
 
 
 def get_conditions(filters):
 	conditions = []
 
+	if filters.get("include_default_book_entries"):
+		filters["company_fb"] = frappe.get_cached_value(
+			"Company", filters.get("company"), "default_finance_book"
+		)
+
 	if filters.get("account"):
 		filters.account = get_accounts_with_children(filters.account)
 		if filters.account:
@@ -435,17 +452,7 @@ def initialize_gle_map(gl_entries, filters, totals_dict):
 	return gle_map
 
 
-def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map, totals):
-	entries = []
-	consolidated_gle = OrderedDict()
-	group_by = group_by_field(filters.get("group_by"))
-	group_by_voucher_consolidated = filters.get("group_by") == "Group by Voucher (Consolidated)"
-
-	if filters.get("show_net_values_in_party_account"):
-		account_type_map = get_account_type_map(filters.get("company"))
-
-	immutable_ledger = frappe.db.get_single_value("Accounts Settings", "enable_immutable_ledger")
-
+def get_value_updater(filters, account_type_map=None):
 	def update_value_in_dict(data, key, gle):
 		data[key].debit += gle.debit
 		data[key].credit += gle.credit
@@ -481,6 +488,23 @@ def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map, tot
 		if data[key].against_voucher and gle.against_voucher:
 			data[key].against_voucher += ", " + gle.against_voucher
 
+	return update_value_in_dict
+
+
+def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map, totals):
+	entries = []
+	consolidated_gle = OrderedDict()
+	group_by = group_by_field(filters.get("group_by"))
+	group_by_voucher_consolidated = filters.get("group_by") == "Group by Voucher (Consolidated)"
+
+	account_type_map = None
+	if filters.get("show_net_values_in_party_account"):
+		account_type_map = get_account_type_map(filters.get("company"))
+
+	update_value_in_dict = get_value_updater(filters, account_type_map)
+
+	immutable_ledger = frappe.db.get_single_value("Accounts Settings", "enable_immutable_ledger")
+
 	from_date, to_date = getdate(filters.from_date), getdate(filters.to_date)
 	show_opening_entries = filters.get("show_opening_entries")
 
@@ -549,6 +573,10 @@ def get_account_type_map(company):
 
 
 def get_result_as_list(data, filters):
+	return list(iter_result_as_list(data, filters))
+
+
+def iter_result_as_list(data, filters):
 	balance, _balance_in_account_currency = 0, 0
 
 	for d in data:
@@ -560,7 +588,255 @@ def get_result_as_list(data, filters):
 
 		d["account_currency"] = filters.account_currency
 
-	return data
+		yield d
+
+
+def iter_result(filters):
+	"""Yields the rows of `get_result` for the export, reading the GL Entries with an
+	unbuffered cursor ordered by group so that only the entries of one group are held in
+	memory.
+
+	Groups are listed in the order of their key instead of the order of their first entry,
+	the report itself keeps listing them chronologically."""
+
+	accounting_dimensions = []
+	if filters.get("include_dimensions"):
+		accounting_dimensions = get_accounting_dimensions()
+
+	data = iter_data_with_opening_closing(filters, accounting_dimensions)
+	yield from iter_result_as_list(data, filters)
+
+
+def iter_data_with_opening_closing(filters, accounting_dimensions):
+	group_by_voucher_consolidated = filters.get("group_by") == "Group by Voucher (Consolidated)"
+	from_date, to_date = getdate(filters.from_date), getdate(filters.to_date)
+	show_opening_entries = filters.get("show_opening_entries")
+
+	conditions = get_conditions(filters)
+	totals = get_totals_dict()
+	account_currencies = set_opening_totals(filters, conditions, totals)
+
+	account_type_map = None
+	if filters.get("show_net_values_in_party_account"):
+		account_type_map = get_account_type_map(filters.get("company"))
+
+	update_value_in_dict = get_value_updater(filters, account_type_map)
+
+	if group_by_voucher_consolidated:
+		group_fields = ["posting_date", "voucher_type", "voucher_no", "account", "party_type", "party"]
+		if frappe.db.get_single_value("Accounts Settings", "enable_immutable_ledger"):
+			group_fields.append("creation")
+
+		if filters.get("include_dimensions"):
+			group_fields += [*accounting_dimensions, "cost_center"]
+	else:
+		group_fields = [group_by_field(filters.get("group_by"))]
+
+	inv_details = get_supplier_invoice_details()
+
+	# Opening for filtered account
+	yield totals.opening
+
+	gl_entries = iter_gl_entries(filters, accounting_dimensions, conditions, group_fields, account_currencies)
+	for _key, entries in groupby(gl_entries, key=lambda gle: tuple(gle.get(f) for f in group_fields)):
+		group_totals = get_totals_dict()
+		group_entries = []
+
+		for gle in entries:
+			gle["bill_no"] = inv_details.get(gle.get("against_voucher"), "")
+			gle.voucher_subtype = _(gle.voucher_subtype)
+			gle.against_voucher_type = _(gle.against_voucher_type)
+			gle.remarks = _(gle.remarks)
+			gle.party_type = _(gle.party_type)
+
+			if gle.posting_date < from_date or (cstr(gle.is_opening) == "Yes" and not show_opening_entries):
+				update_value_in_dict(group_totals, "opening", gle)
+				update_value_in_dict(group_totals, "closing", gle)
+
+			elif gle.posting_date <= to_date or (cstr(gle.is_opening) == "Yes" and show_opening_entries):
+				update_value_in_dict(group_totals, "total", gle)
+				update_value_in_dict(group_totals, "closing", gle)
+
+				if group_by_voucher_consolidated and group_entries:
+					update_value_in_dict({"gle": group_entries[0]}, "gle", gle)
+				else:
+					group_entries.append(gle)
+
+		if group_by_voucher_consolidated:
+			for value in group_entries:
+				update_value_in_dict(totals, "total", value)
+				update_value_in_dict(totals, "closing", value)
+
+			yield from group_entries
+			continue
+
+		update_value_in_dict(totals, "total", group_totals.total)
+		update_value_in_dict(totals, "closing", group_totals.total)
+
+		if group_entries:
+			yield {"debit_in_transaction_currency": None, "credit_in_transaction_currency": None}
+			if filters.get("group_by") != "Group by Voucher":
+				yield group_totals.opening
+
+			yield from group_entries
+
+			# totals
+			yield group_totals.total
+
+			# closing
+			if filters.get("group_by") != "Group by Voucher":
+				yield group_totals.closing
+
+	if not group_by_voucher_consolidated:
+		yield {"debit_in_transaction_currency": None, "credit_in_transaction_currency": None}
+
+	# totals
+	yield totals.total
+
+	# closing
+	yield totals.closing
+
+
+def set_opening_totals(filters, conditions, totals):
+	"""Sets the opening and closing of the report to the aggregate of the GL Entries before
+	the period, the entries in the period are added to the closing as they are read.
+
+	Returns the account currencies of all GL Entries in the report, which decide how they
+	are converted to the presentation currency."""
+
+	opening_condition = "posting_date < %(from_date)s"
+	if not filters.get("show_opening_entries"):
+		opening_condition += " or is_opening = 'Yes'"
+
+	balances = frappe.db.sql(
+		f"""
+		select account_currency,
+			sum(if({opening_condition}, debit, 0)) as debit,
+			sum(if({opening_condition}, credit, 0)) as credit,
+			sum(if({opening_condition}, debit_in_account_currency, 0)) as debit_in_account_currency,
+			sum(if({opening_condition}, credit_in_account_currency, 0)) as credit_in_account_currency
+		from `tabGL Entry`
+		where company=%(company)s {conditions}
+		group by account_currency
+	""",
+		filters,
+		as_dict=1,
+	)
+
+	opening = totals.opening
+	for d in balances:
+		for field in ("debit", "credit", "debit_in_account_currency", "credit_in_account_currency"):
+			opening[field] += flt(d[field])
+
+	account_currencies = [d.account_currency for d in balances]
+
+	if filters.get("presentation_currency"):
+		currency_map = get_currency(filters)
+		if len(account_currencies) == 1 and account_currencies[0] == currency_map["presentation_currency"]:
+			opening.debit = opening.debit_in_account_currency
+			opening.credit = opening.credit_in_account_currency
+		else:
+			for field in ("debit", "credit"):
+				opening[field] = convert(
+					opening[field],
+					currency_map["presentation_currency"],
+					currency_map["company_currency"],
+					currency_map["report_date"],
+				)
+
+	for field in ("debit", "credit", "debit_in_account_currency", "credit_in_account_currency"):
+		totals.closing[field] = opening[field]
+
+	return account_currencies
+
+
+def iter_gl_entries(filters, accounting_dimensions, conditions, order_by_fields, account_currencies):
+	if filters.get("presentation_currency"):
+		currency_map = get_currency(filters)
+
+	with frappe.db.unbuffered_cursor():
+		gl_entries = frappe.db.sql(
+			get_gl_entries_query(filters, accounting_dimensions, conditions, order_by_fields),
+			filters,
+			as_dict=1,
+			as_iterator=True,
+		)
+
+		for gle in gl_entries:
+			if filters.get("presentation_currency"):
+				convert_to_presentation_currency([gle], currency_map, account_currencies)
+
+			yield gle
+
+
+@frappe.whitelist()
+def export_report(filters, file_format="CSV"):
+	"""Export the report to a file in the background, for periods too large to be prepared in memory"""
+
+	if not frappe.get_cached_doc("Report", "General Ledger").is_permitted():
+		frappe.throw(_("You are not permitted to export the General Ledger"), frappe.PermissionError)
+
+	if file_format not in ("CSV", "Excel"):
+		frappe.throw(_("Invalid file format {0}").format(file_format))
+
+	filters = frappe._dict(frappe.parse_json(filters))
+	prepare_filters(copy.deepcopy(filters))
+
+	frappe.enqueue(
+		generate_report_file,
+		queue="long",
+		timeout=14400,
+		filters=filters,
+		file_format=file_format,
+		user=frappe.session.user,
+	)
+
+	frappe.msgprint(
+		_("The General Ledger is being exported in the background. You will be notified when it is ready."),
+		alert=True,
+	)
+
+
+def generate_report_file(filters, file_format, user):
+	"""Write the rows of the report to a private file of the user as they are generated"""
+
+	filters, _account_details = prepare_filters(frappe._dict(filters))
+	columns = [column for column in get_columns(filters) if not column.get("hidden")]
+	extension = "csv" if file_format == "CSV" else "xlsx"
+
+	file_name = f"general-ledger-{frappe.generate_hash(length=10)}.{extension}"
+	file_path = frappe.get_site_path("private", "files", file_name)
+
+	header = [column["label"] for column in columns]
+	rows = ([row.get(column["fieldname"]) for column in columns] for row in iter_result(filters))
+
+	if file_format == "CSV":
+		with open(file_path, "w", newline="") as f:
+			writer = csv.writer(f)
+			writer.writerow(header)
+			writer.writerows(rows)
+	else:
+		wb = openpyxl.Workbook(write_only=True)
+		ws = wb.create_sheet(_("General Ledger"))
+		ws.append(header)
+		for row in rows:
+			ws.append(row)
+
+		wb.save(file_path)
+
+	file = frappe.get_doc(
+		{
+			"doctype": "File",
+			"file_name": file_name,
+			"file_url": f"/private/files/{file_name}",
+			"is_private": 1,
+			# the file of the user, not of the Report which all its users can read
+			"attached_to_doctype": "User",
+			"attached_to_name": user,
+		}
+	).insert(ignore_permissions=True)
+
+	frappe.publish_realtime("general_ledger_export", {"file_url": file.file_url}, user=user)
 
 
 def get_supplier_invoice_details():
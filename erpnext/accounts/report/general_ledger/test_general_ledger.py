@@ -4,10 +4,16 @@
 import frappe
 from frappe import qb
 from frappe.tests import IntegrationTestCase
-from frappe.utils import flt, today
+from frappe.utils import add_days, flt, today
 
+from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
-from erpnext.accounts.report.general_ledger.general_ledger import execute
+from erpnext.accounts.report.general_ledger.general_ledger import (
+	execute,
+	generate_report_file,
+	iter_result,
+	prepare_filters,
+)
 from erpnext.controllers.sales_and_purchase_return import make_return_doc
 
 
@@ -332,3 +338,70 @@ class TestGeneralLedger(IntegrationTestCase):
 		)
 		actual = set([x.voucher_no for x in data if x.voucher_no])
 		self.assertEqual(expected, actual)
+
+	def test_report_and_streamed_rows(self):
+		make_journal_entry(
+			"_Test Bank - _TC", "_Test Cash - _TC", 100, posting_date=add_days(today(), -5), submit=True
+		)
+		je1 = make_journal_entry("_Test Bank - _TC", "_Test Cash - _TC", 200, submit=True)
+		je2 = make_journal_entry("_Test Cash - _TC", "_Test Bank - _TC", 50, submit=True)
+
+		def get_rows(rows):
+			return [
+				(row.get("voucher_no"), row.get("debit"), row.get("credit"), row.get("balance"))
+				for row in rows
+			]
+
+		opening, total, closing = (None, 100, 0, 100), (None, 200, 50, 150), (None, 300, 50, 250)
+		expected = {
+			"Group by Voucher (Consolidated)": [
+				opening,
+				(je1.name, 200, 0, 300),
+				(je2.name, 0, 50, 250),
+				total,
+				closing,
+			],
+			"Group by Voucher": [
+				opening,
+				(None, None, None, 0),
+				(je1.name, 200, 0, 200),
+				(None, 200, 0, 200),
+				(None, None, None, 0),
+				(je2.name, 0, 50, -50),
+				(None, 0, 50, -50),
+				(None, None, None, 0),
+				total,
+				closing,
+			],
+		}
+
+		for group_by, rows in expected.items():
+			filters = {
+				"company": self.company,
+				"from_date": today(),
+				"to_date": today(),
+				"account": ["_Test Bank - _TC"],
+				"group_by": group_by,
+			}
+			data = execute(frappe._dict(filters))[1]
+			streamed, _account_details = prepare_filters(frappe._dict(filters))
+			streamed = list(iter_result(streamed))
+
+			self.assertEqual(get_rows(data), rows)
+			self.assertEqual(get_rows(streamed), rows)
+
+	def test_export_is_a_private_file_of_the_user(self):
+		je = make_journal_entry("_Test Bank - _TC", "_Test Cash - _TC", 200, submit=True)
+		filters = {
+			"company": self.company,
+			"from_date": today(),
+			"to_date": today(),
+			"account": ["_Test Bank - _TC"],
+			"group_by": "Group by Voucher (Consolidated)",
+		}
+		generate_report_file(filters, "CSV", "Administrator")
+
+		file = frappe.get_last_doc("File", filters={"attached_to_doctype": "User"})
+		self.assertEqual(file.attached_to_name, "Administrator")
+		self.assertTrue(file.is_private)
+		self.assertIn(je.name, file.get_content())
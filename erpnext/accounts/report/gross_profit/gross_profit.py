@@ -6,7 +6,7 @@ from collections import OrderedDict
 import frappe
 from frappe import _, qb, scrub
 from frappe.query_builder import Order
-from frappe.utils import cint, flt, formatdate
+from frappe.utils import cint, create_batch, flt, formatdate
 
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
@@ -414,7 +414,6 @@ def get_column_names():
 
 class GrossProfitGenerator:
 	def __init__(self, filters=None):
-		self.sle = {}
 		self.data = []
 		self.average_buying_rate = {}
 		self.filters = frappe._dict(filters)
@@ -426,6 +425,7 @@ class GrossProfitGenerator:
 
 		self.load_product_bundle()
 		self.load_non_stock_items()
+		self.load_stock_ledger_entries()
 		self.get_returned_invoice_items()
 		self.process()
 
@@ -636,54 +636,44 @@ class GrossProfitGenerator:
 
 		return flt(buying_amount, self.currency_precision)
 
-	def calculate_buying_amount_from_sle(self, row, my_sle, parenttype, parent, item_row, item_code):
-		for i, sle in enumerate(my_sle):
-			# find the stock valution rate from stock ledger entry
-			if (
-				sle.voucher_type == parenttype
-				and parent == sle.voucher_no
-				and sle.voucher_detail_no == item_row
-			):
-				previous_stock_value = len(my_sle) > i + 1 and flt(my_sle[i + 1].stock_value) or 0.0
-
-				if previous_stock_value:
-					return abs(previous_stock_value - flt(sle.stock_value)) * flt(row.qty) / abs(flt(sle.qty))
-				else:
-					return flt(row.qty) * self.get_average_buying_rate(row, item_code)
-		return 0.0
+	def calculate_buying_amount_from_sle(self, row, sle, item_code):
+		if not sle:
+			return 0.0
+
+		# stock value before the entry, the entries of an item-warehouse are chained by their difference
+		previous_stock_value = flt(
+			flt(sle.stock_value) - flt(sle.stock_value_difference), self.currency_precision
+		)
+
+		if previous_stock_value:
+			return abs(flt(sle.stock_value_difference)) * flt(row.qty) / abs(flt(sle.qty))
+		else:
+			return flt(row.qty) * self.get_average_buying_rate(row, item_code)
 
 	def get_buying_amount(self, row, item_code):
-		# IMP NOTE
-		# stock_ledger_entries should already be filtered by item_code and warehouse and
-		# sorted by posting_date desc, posting_time desc
 		if item_code in self.non_stock_items and (row.project or row.cost_center):
 			# Issue 6089-Get last purchasing rate for non-stock item
 			item_rate = self.get_last_purchase_rate(item_code, row)
 			return flt(row.qty) * item_rate
 
 		else:
-			my_sle = self.get_stock_ledger_entries(item_code, row.warehouse)
-			if (row.update_stock or row.dn_detail) and my_sle:
+			sle = None
+			if row.update_stock or row.dn_detail:
 				parenttype, parent = row.parenttype, row.parent
 				if row.dn_detail:
 					parenttype, parent = "Delivery Note", row.delivery_note
 
-				return self.calculate_buying_amount_from_sle(
-					row, my_sle, parenttype, parent, row.item_row, item_code
-				)
+				sle = self.get_stock_ledger_entry(parenttype, parent, row.item_row, item_code, row.warehouse)
+
+			if sle:
+				return self.calculate_buying_amount_from_sle(row, sle, item_code)
 			elif self.delivery_notes.get((row.parent, row.item_code), None):
 				#  check if Invoice has delivery notes
 				dn = self.delivery_notes.get((row.parent, row.item_code))
-				parenttype, parent, item_row, dn_warehouse = (
-					"Delivery Note",
-					dn["delivery_note"],
-					dn["item_row"],
-					dn["warehouse"],
-				)
-				my_sle = self.get_stock_ledger_entries(item_code, dn_warehouse)
-				return self.calculate_buying_amount_from_sle(
-					row, my_sle, parenttype, parent, item_row, item_code
+				sle = self.get_stock_ledger_entry(
+					"Delivery Note", dn["delivery_note"], dn["item_row"], item_code, dn["warehouse"]
 				)
+				return self.calculate_buying_amount_from_sle(row, sle, item_code)
 			elif row.sales_order and row.so_detail:
 				incoming_amount = self.get_buying_amount_from_so_dn(row.sales_order, row.so_detail, item_code)
 				if incoming_amount:
@@ -995,11 +985,25 @@ class GrossProfitGenerator:
 	def get_bundle_item_details(self, item_code):
 		return frappe.db.get_value("Item", item_code, ["item_name", "description", "item_group", "brand"])
 
-	def get_stock_ledger_entries(self, item_code, warehouse):
-		if item_code and warehouse:
-			if (item_code, warehouse) not in self.sle:
-				sle = qb.DocType("Stock Ledger Entry")
-				res = (
+	def load_stock_ledger_entries(self):
+		"""Load the stock ledger entries of the invoices and delivery notes in the report,
+		indexed by the voucher row, item and warehouse"""
+
+		self.sle = {}
+		vouchers = {}
+		for row in self.si_list:
+			if row.update_stock and row.parent:
+				vouchers.setdefault(row.parenttype, set()).add(row.parent)
+			elif row.dn_detail and row.delivery_note:
+				vouchers.setdefault("Delivery Note", set()).add(row.delivery_note)
+
+		for dn in self.delivery_notes.values():
+			vouchers.setdefault("Delivery Note", set()).add(dn.delivery_note)
+
+		sle = qb.DocType("Stock Ledger Entry")
+		for voucher_type, voucher_nos in vouchers.items():
+			for batch in create_batch(list(voucher_nos), 1000):
+				entries = (
 					qb.from_(sle)
 					.select(
 						sle.item_code,
@@ -1007,24 +1011,33 @@ class GrossProfitGenerator:
 						sle.voucher_no,
 						sle.voucher_detail_no,
 						sle.stock_value,
+						sle.stock_value_difference,
 						sle.warehouse,
 						sle.actual_qty.as_("qty"),
 					)
 					.where(
 						(sle.company == self.filters.company)
-						& (sle.item_code == item_code)
-						& (sle.warehouse == warehouse)
+						& (sle.voucher_type == voucher_type)
+						& (sle.voucher_no.isin(batch))
 						& (sle.is_cancelled == 0)
 					)
-					.orderby(sle.item_code)
-					.orderby(sle.warehouse, sle.posting_datetime, sle.creation, order=Order.desc)
+					.orderby(sle.posting_datetime, sle.creation, order=Order.desc)
 					.run(as_dict=True)
 				)
 
-				self.sle[(item_code, warehouse)] = res
+				for entry in entries:
+					key = (
+						entry.voucher_type,
+						entry.voucher_no,
+						entry.voucher_detail_no,
+						entry.item_code,
+						entry.warehouse,
+					)
+					# keep the latest entry of the row, like the ledger scan did
+					self.sle.setdefault(key, entry)
 
-			return self.sle[(item_code, warehouse)]
-		return []
+	def get_stock_ledger_entry(self, voucher_type, voucher_no, voucher_detail_no, item_code, warehouse):
+		return self.sle.get((voucher_type, voucher_no, voucher_detail_no, item_code, warehouse))
 
 	def load_product_bundle(self):
 		self.product_bundles = {}
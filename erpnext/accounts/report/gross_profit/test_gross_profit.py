@@ -1,11 +1,11 @@
 import frappe
 from frappe import qb
 from frappe.tests import IntegrationTestCase
-from frappe.utils import flt, nowdate
+from frappe.utils import add_days, flt, nowdate
 
 from erpnext.accounts.doctype.sales_invoice.sales_invoice import make_delivery_note
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
-from erpnext.accounts.report.gross_profit.gross_profit import execute
+from erpnext.accounts.report.gross_profit.gross_profit import GrossProfitGenerator, execute
 from erpnext.stock.doctype.delivery_note.delivery_note import make_sales_invoice
 from erpnext.stock.doctype.delivery_note.test_delivery_note import create_delivery_note
 from erpnext.stock.doctype.item.test_item import create_item
@@ -612,3 +612,36 @@ class TestGrossProfit(IntegrationTestCase):
 		item_from_sinv2 = [x for x in data if x.parent_invoice == sinv2.name]
 		self.assertEqual(len(item_from_sinv2), 1)
 		self.assertEqual(1800, item_from_sinv2[0].valuation_rate)
+
+	def test_stock_ledger_entries_loaded_for_vouchers_in_report(self):
+		"""
+		Only the stock ledger entries of the vouchers in the report are loaded
+		"""
+		for days in (-60, -30):
+			make_stock_entry(
+				company=self.company,
+				item_code=self.item,
+				target=self.warehouse,
+				qty=5,
+				basic_rate=200,
+				posting_date=add_days(nowdate(), days),
+			)
+
+		old_sinv = self.create_sales_invoice(qty=2, rate=500, do_not_submit=True)
+		old_sinv.posting_date = add_days(nowdate(), -10)
+		old_sinv.set_posting_time = 1
+		old_sinv.update_stock = 1
+		old_sinv.save().submit()
+
+		sinv = self.create_sales_invoice(qty=2, rate=500, do_not_submit=True)
+		sinv.update_stock = 1
+		sinv.save().submit()
+
+		filters = frappe._dict(
+			company=self.company, from_date=nowdate(), to_date=nowdate(), group_by="Invoice"
+		)
+		gross_profit = GrossProfitGenerator(filters)
+
+		self.assertEqual({key[1] for key in gross_profit.sle}, {sinv.name})
+		item_row = [x for x in gross_profit.si_list if x.parent_invoice == sinv.name and x.indent == 1.0]
+		self.assertEqual(item_row[0].buying_amount, 400.0)
@@ -8,13 +8,17 @@ from frappe.utils import flt
 from pypika import Order
 
 import erpnext
+from erpnext.accounts.doctype.invoice_item_tax.invoice_item_tax import is_invoice_item_tax_built
 from erpnext.accounts.report.item_wise_sales_register.item_wise_sales_register import (
 	add_sub_total_row,
+	add_tax_columns,
 	add_total_row,
 	apply_group_by_conditions,
 	get_grand_total,
 	get_group_by_and_display_fields,
+	get_invoice_item_tax_columns,
 	get_tax_accounts,
+	iter_items_with_taxes,
 )
 from erpnext.accounts.report.utils import get_query_columns, get_values_for_columns
 
@@ -30,28 +34,42 @@ def _execute(filters=None, additional_table_columns=None):
 
 	company_currency = erpnext.get_company_currency(filters.company)
 
-	item_list = get_items(filters, additional_table_columns)
 	aii_account_map = get_aii_accounts()
-	if item_list:
-		itemised_tax, tax_columns = get_tax_accounts(
-			item_list,
-			columns,
-			company_currency,
-			doctype="Purchase Invoice",
-			tax_doctype="Purchase Taxes and Charges",
+	if is_invoice_item_tax_built():
+		items_query = get_invoice_items_query(filters)
+		pii = frappe.qb.DocType("Purchase Invoice Item")
+
+		tax_columns = get_invoice_item_tax_columns("Purchase Invoice", items_query)
+		po_pr_map = get_purchase_receipts_against_po_details(items_query.select(pii.po_detail))
+		item_list = iter_items_with_taxes(
+			"Purchase Invoice", get_items_query(filters, additional_table_columns)
 		)
+	else:
+		item_list = get_items(filters, additional_table_columns)
+		itemised_tax, tax_columns = {}, []
+		if item_list:
+			itemised_tax, tax_columns = get_tax_accounts(
+				item_list,
+				columns,
+				company_currency,
+				doctype="Purchase Invoice",
+				tax_doctype="Purchase Taxes and Charges",
+				add_columns=False,
+			)
 
-		scrubbed_tax_fields = {}
+		for d in item_list:
+			d.taxes = itemised_tax.get(d.name, {})
 
-		for tax in tax_columns:
-			scrubbed_tax_fields.update(
-				{
-					tax + " Rate": frappe.scrub(tax + " Rate"),
-					tax + " Amount": frappe.scrub(tax + " Amount"),
-				}
-			)
+		po_pr_map = get_purchase_receipts_against_purchase_order(item_list)
 
-	po_pr_map = get_purchase_receipts_against_purchase_order(item_list)
+	scrubbed_tax_fields = {}
+	for tax in tax_columns:
+		scrubbed_tax_fields.update(
+			{
+				tax + " Rate": frappe.scrub(tax + " Rate"),
+				tax + " Amount": frappe.scrub(tax + " Amount"),
+			}
+		)
 
 	data = []
 	total_row_map = {}
@@ -97,7 +115,7 @@ def _execute(filters=None, additional_table_columns=None):
 
 		total_tax = 0
 		for tax in tax_columns:
-			item_tax = itemised_tax.get(d.name, {}).get(tax, {})
+			item_tax = d.taxes.get(tax, {})
 			row.update(
 				{
 					scrubbed_tax_fields[tax + " Rate"]: item_tax.get("tax_rate", 0),
@@ -128,7 +146,10 @@ def _execute(filters=None, additional_table_columns=None):
 
 		data.append(row)
 
-	if filters.get("group_by") and item_list:
+	if data:
+		add_tax_columns(columns, tax_columns)
+
+	if filters.get("group_by") and data:
 		total_row = total_row_map.get(prev_group_by_value or d.get("item_name"))
 		total_row["percent_gt"] = flt(total_row["total"] / grand_total * 100)
 		data.append(total_row)
@@ -315,6 +336,12 @@ def apply_conditions(query, pi, pii, filters):
 
 
 def get_items(filters, additional_table_columns):
+	return get_items_query(filters, additional_table_columns).run(as_dict=True)
+
+
+def get_invoice_items_query(filters):
+	"""Query on the submitted invoice items matching `filters`, without the fields"""
+
 	doctype = "Purchase Invoice"
 	pi = frappe.qb.DocType(doctype)
 	pii = frappe.qb.DocType(f"{doctype} Item")
@@ -325,34 +352,6 @@ def get_items(filters, additional_table_columns):
 		.on(pi.name == pii.parent)
 		.left_join(Item)
 		.on(pii.item_code == Item.name)
-		.select(
-			pii.name,
-			pii.parent,
-			pi.posting_date,
-			pi.credit_to,
-			pi.company,
-			pi.supplier,
-			pi.remarks,
-			pi.base_net_total,
-			pi.unrealized_profit_loss_account,
-			pii.item_code,
-			pii.description,
-			pii.item_group,
-			pii.item_name.as_("pi_item_name"),
-			pii.item_group.as_("pi_item_group"),
-			Item.item_name.as_("i_item_name"),
-			Item.item_group.as_("i_item_group"),
-			pii.project,
-			pii.purchase_order,
-			pii.purchase_receipt,
-			pii.po_detail,
-			pii.expense_account,
-			pii.stock_qty,
-			pii.stock_uom,
-			pii.base_net_amount,
-			pi.supplier_name,
-			pi.mode_of_payment,
-		)
 		.where(pi.docstatus == 1)
 		.where(pii.parenttype == doctype)
 	)
@@ -362,6 +361,42 @@ def get_items(filters, additional_table_columns):
 	if filters.get("company"):
 		query = query.where(pi.company == filters["company"])
 
+	return apply_conditions(query, pi, pii, filters)
+
+
+def get_items_query(filters, additional_table_columns):
+	pi = frappe.qb.DocType("Purchase Invoice")
+	pii = frappe.qb.DocType("Purchase Invoice Item")
+	Item = frappe.qb.DocType("Item")
+	query = get_invoice_items_query(filters).select(
+		pii.name,
+		pii.parent,
+		pi.posting_date,
+		pi.credit_to,
+		pi.company,
+		pi.supplier,
+		pi.remarks,
+		pi.base_net_total,
+		pi.unrealized_profit_loss_account,
+		pii.item_code,
+		pii.description,
+		pii.item_group,
+		pii.item_name.as_("pi_item_name"),
+		pii.item_group.as_("pi_item_group"),
+		Item.item_name.as_("i_item_name"),
+		Item.item_group.as_("i_item_group"),
+		pii.project,
+		pii.purchase_order,
+		pii.purchase_receipt,
+		pii.po_detail,
+		pii.expense_account,
+		pii.stock_qty,
+		pii.stock_uom,
+		pii.base_net_amount,
+		pi.supplier_name,
+		pi.mode_of_payment,
+	)
+
 	if additional_table_columns:
 		for column in additional_table_columns:
 			if column.get("_doctype"):
@@ -370,9 +405,7 @@ def get_items(filters, additional_table_columns):
 			else:
 				query = query.select(pi[column.get("fieldname")])
 
-	query = apply_conditions(query, pi, pii, filters)
-
-	return query.run(as_dict=True)
+	return query
 
 
 def get_aii_accounts():
@@ -400,3 +433,20 @@ def get_purchase_receipts_against_purchase_order(item_list):
 			po_pr_map.setdefault(pr.po_detail, []).append(pr.parent)
 
 	return po_pr_map
+
+
+def get_purchase_receipts_against_po_details(po_details):
+	"""Purchase receipts against the purchase order items in the subquery `po_details`"""
+
+	po_pr_map = frappe._dict()
+	pr_item = frappe.qb.DocType("Purchase Receipt Item")
+	for pr in (
+		frappe.qb.from_(pr_item)
+		.select(pr_item.parent, pr_item.purchase_order_item)
+		.where((pr_item.docstatus == 1) & (pr_item.purchase_order_item.isin(po_details)))
+		.groupby(pr_item.purchase_order_item, pr_item.parent)
+		.run(as_dict=True)
+	):
+		po_pr_map.setdefault(pr.purchase_order_item, []).append(pr.parent)
+
+	return po_pr_map
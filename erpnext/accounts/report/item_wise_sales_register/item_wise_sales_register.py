@@ -9,6 +9,7 @@ from frappe.utils import cstr, flt
 from frappe.utils.xlsxutils import handle_html
 from pypika import Order
 
+from erpnext.accounts.doctype.invoice_item_tax.invoice_item_tax import is_invoice_item_tax_built
 from erpnext.accounts.report.sales_register.sales_register import get_mode_of_payments
 from erpnext.accounts.report.utils import get_query_columns, get_values_for_columns
 from erpnext.selling.report.item_wise_sales_history.item_wise_sales_history import (
@@ -27,22 +28,38 @@ def _execute(filters=None, additional_table_columns=None, additional_conditions=
 
 	company_currency = frappe.get_cached_value("Company", filters.get("company"), "default_currency")
 
-	item_list = get_items(filters, additional_table_columns, additional_conditions)
-	if item_list:
-		itemised_tax, tax_columns = get_tax_accounts(item_list, columns, company_currency)
+	if is_invoice_item_tax_built():
+		items_query = get_invoice_items_query(filters, additional_conditions)
+		sii = frappe.qb.DocType("Sales Invoice Item")
 
-		scrubbed_tax_fields = {}
-
-		for tax in tax_columns:
-			scrubbed_tax_fields.update(
-				{
-					tax + " Rate": frappe.scrub(tax + " Rate"),
-					tax + " Amount": frappe.scrub(tax + " Amount"),
-				}
+		tax_columns = get_invoice_item_tax_columns("Sales Invoice", items_query)
+		mode_of_payments = get_mode_of_payments_of_invoices(items_query.select(sii.parent))
+		so_dn_map = get_delivery_notes_against_so_details(items_query.select(sii.so_detail))
+		item_list = iter_items_with_taxes(
+			"Sales Invoice", get_items_query(filters, additional_table_columns, additional_conditions)
+		)
+	else:
+		item_list = get_items(filters, additional_table_columns, additional_conditions)
+		itemised_tax, tax_columns = {}, []
+		if item_list:
+			itemised_tax, tax_columns = get_tax_accounts(
+				item_list, columns, company_currency, add_columns=False
 			)
 
-	mode_of_payments = get_mode_of_payments(set(d.parent for d in item_list))
-	so_dn_map = get_delivery_notes_against_sales_order(item_list)
+		for d in item_list:
+			d.taxes = itemised_tax.get(d.name, {})
+
+		mode_of_payments = get_mode_of_payments(set(d.parent for d in item_list))
+		so_dn_map = get_delivery_notes_against_sales_order(item_list)
+
+	scrubbed_tax_fields = {}
+	for tax in tax_columns:
+		scrubbed_tax_fields.update(
+			{
+				tax + " Rate": frappe.scrub(tax + " Rate"),
+				tax + " Amount": frappe.scrub(tax + " Amount"),
+			}
+		)
 
 	data = []
 	total_row_map = {}
@@ -98,7 +115,7 @@ def _execute(filters=None, additional_table_columns=None, additional_conditions=
 		total_tax = 0
 		total_other_charges = 0
 		for tax in tax_columns:
-			item_tax = itemised_tax.get(d.name, {}).get(tax, {})
+			item_tax = d.taxes.get(tax, {})
 			row.update(
 				{
 					scrubbed_tax_fields[tax + " Rate"]: item_tax.get("tax_rate", 0),
@@ -137,7 +154,10 @@ def _execute(filters=None, additional_table_columns=None, additional_conditions=
 
 		data.append(row)
 
-	if filters.get("group_by") and item_list:
+	if data:
+		add_tax_columns(columns, tax_columns)
+
+	if filters.get("group_by") and data:
 		total_row = total_row_map.get(prev_group_by_value or d.get("item_name"))
 		total_row["percent_gt"] = flt(total_row["total"] / grand_total * 100)
 		data.append(total_row)
@@ -410,6 +430,12 @@ def apply_group_by_conditions(query, si, ii, filters):
 
 
 def get_items(filters, additional_query_columns, additional_conditions=None):
+	return get_items_query(filters, additional_query_columns, additional_conditions).run(as_dict=True)
+
+
+def get_invoice_items_query(filters, additional_conditions=None):
+	"""Query on the submitted invoice items matching `filters`, without the fields"""
+
 	doctype = "Sales Invoice"
 	si = frappe.qb.DocType(doctype)
 	sii = frappe.qb.DocType(f"{doctype} Item")
@@ -421,48 +447,63 @@ def get_items(filters, additional_query_columns, additional_conditions=None):
 		.on(si.name == sii.parent)
 		.left_join(item)
 		.on(sii.item_code == item.name)
-		.select(
-			sii.name,
-			sii.parent,
-			si.posting_date,
-			si.debit_to,
-			si.unrealized_profit_loss_account,
-			si.is_internal_customer,
-			si.customer,
-			si.remarks,
-			si.territory,
-			si.company,
-			si.base_net_total,
-			sii.project,
-			sii.item_code,
-			sii.description,
-			sii.item_name,
-			sii.item_group,
-			sii.item_name.as_("si_item_name"),
-			sii.item_group.as_("si_item_group"),
-			item.item_name.as_("i_item_name"),
-			item.item_group.as_("i_item_group"),
-			sii.sales_order,
-			sii.delivery_note,
-			sii.income_account,
-			sii.cost_center,
-			sii.enable_deferred_revenue,
-			sii.deferred_revenue_account,
-			sii.stock_qty,
-			sii.stock_uom,
-			sii.base_net_rate,
-			sii.base_net_amount,
-			si.customer_name,
-			si.customer_group,
-			sii.so_detail,
-			si.update_stock,
-			sii.uom,
-			sii.qty,
-		)
 		.where(si.docstatus == 1)
 		.where(sii.parenttype == doctype)
 	)
 
+	if filters.get("customer"):
+		query = query.where(si.customer == filters["customer"])
+
+	if filters.get("customer_group"):
+		query = query.where(si.customer_group == filters["customer_group"])
+
+	return apply_conditions(query, si, sii, filters, additional_conditions)
+
+
+def get_items_query(filters, additional_query_columns, additional_conditions=None):
+	si = frappe.qb.DocType("Sales Invoice")
+	sii = frappe.qb.DocType("Sales Invoice Item")
+	item = frappe.qb.DocType("Item")
+
+	query = get_invoice_items_query(filters, additional_conditions).select(
+		sii.name,
+		sii.parent,
+		si.posting_date,
+		si.debit_to,
+		si.unrealized_profit_loss_account,
+		si.is_internal_customer,
+		si.customer,
+		si.remarks,
+		si.territory,
+		si.company,
+		si.base_net_total,
+		sii.project,
+		sii.item_code,
+		sii.description,
+		sii.item_name,
+		sii.item_group,
+		sii.item_name.as_("si_item_name"),
+		sii.item_group.as_("si_item_group"),
+		item.item_name.as_("i_item_name"),
+		item.item_group.as_("i_item_group"),
+		sii.sales_order,
+		sii.delivery_note,
+		sii.income_account,
+		sii.cost_center,
+		sii.enable_deferred_revenue,
+		sii.deferred_revenue_account,
+		sii.stock_qty,
+		sii.stock_uom,
+		sii.base_net_rate,
+		sii.base_net_amount,
+		si.customer_name,
+		si.customer_group,
+		sii.so_detail,
+		si.update_stock,
+		sii.uom,
+		sii.qty,
+	)
+
 	if additional_query_columns:
 		for column in additional_query_columns:
 			if column.get("_doctype"):
@@ -471,36 +512,120 @@ def get_items(filters, additional_query_columns, additional_conditions=None):
 			else:
 				query = query.select(si[column.get("fieldname")])
 
-	if filters.get("customer"):
-		query = query.where(si.customer == filters["customer"])
+	return query
 
-	if filters.get("customer_group"):
-		query = query.where(si.customer_group == filters["customer_group"])
 
-	query = apply_conditions(query, si, sii, filters, additional_conditions)
+def get_delivery_notes_against_sales_order(item_list):
+	so_item_rows = list(set([d.so_detail for d in item_list]))
+
+	if so_item_rows:
+		return get_delivery_notes_against_so_details(so_item_rows)
 
-	return query.run(as_dict=True)
+	return frappe._dict()
 
 
-def get_delivery_notes_against_sales_order(item_list):
+def get_delivery_notes_against_so_details(so_details):
+	"""Delivery notes against the sales order items `so_details`, a list or a subquery"""
+
 	so_dn_map = frappe._dict()
-	so_item_rows = list(set([d.so_detail for d in item_list]))
+	dn_item = frappe.qb.DocType("Delivery Note Item")
+	delivery_notes = (
+		frappe.qb.from_(dn_item)
+		.select(dn_item.parent, dn_item.so_detail)
+		.where(dn_item.docstatus == 1)
+		.where(dn_item.so_detail.isin(so_details))
+		.groupby(dn_item.so_detail, dn_item.parent)
+		.run(as_dict=True)
+	)
 
-	if so_item_rows:
-		dn_item = frappe.qb.DocType("Delivery Note Item")
-		delivery_notes = (
-			frappe.qb.from_(dn_item)
-			.select(dn_item.parent, dn_item.so_detail)
-			.where(dn_item.docstatus == 1)
-			.where(dn_item.so_detail.isin(so_item_rows))
-			.groupby(dn_item.so_detail, dn_item.parent)
-			.run(as_dict=True)
+	for dn in delivery_notes:
+		so_dn_map.setdefault(dn.so_detail, []).append(dn.parent)
+
+	return so_dn_map
+
+
+def get_mode_of_payments_of_invoices(invoices):
+	"""Modes of payment of the sales invoices in the subquery `invoices`"""
+
+	mode_of_payments = {}
+	payment = frappe.qb.DocType("Sales Invoice Payment")
+	for d in (
+		frappe.qb.from_(payment)
+		.select(payment.parent, payment.mode_of_payment)
+		.where(payment.parent.isin(invoices))
+		.groupby(payment.parent, payment.mode_of_payment)
+		.run(as_dict=True)
+	):
+		mode_of_payments.setdefault(d.parent, []).append(d.mode_of_payment)
+
+	return mode_of_payments
+
+
+def get_invoice_item_tax_columns(doctype, items_query):
+	"""Descriptions of the taxes of the invoice items of `items_query`"""
+
+	invoice_item = frappe.qb.DocType(f"{doctype} Item")
+	invoice_item_tax = frappe.qb.DocType("Invoice Item Tax")
+
+	return sorted(
+		frappe.qb.from_(invoice_item_tax)
+		.select(invoice_item_tax.description)
+		.distinct()
+		.where(
+			(invoice_item_tax.voucher_type == doctype)
+			& (invoice_item_tax.voucher_detail_no.isin(items_query.select(invoice_item.name)))
 		)
+		.run(pluck=True)
+	)
 
-		for dn in delivery_notes:
-			so_dn_map.setdefault(dn.so_detail, []).append(dn.parent)
 
-	return so_dn_map
+def iter_items_with_taxes(doctype, items_query):
+	"""Yield the invoice items of `items_query` with their taxes by description in `taxes`,
+	joined from the Invoice Item Tax in the same query"""
+
+	invoice_item = frappe.qb.DocType(f"{doctype} Item")
+	invoice_item_tax = frappe.qb.DocType("Invoice Item Tax")
+
+	query = (
+		items_query.left_join(invoice_item_tax)
+		.on(
+			(invoice_item_tax.voucher_detail_no == invoice_item.name)
+			& (invoice_item_tax.voucher_type == doctype)
+		)
+		.select(
+			invoice_item_tax.description.as_("tax_description"),
+			invoice_item_tax.tax_rate.as_("item_tax_rate"),
+			invoice_item_tax.tax_amount.as_("item_tax_amount"),
+			invoice_item_tax.is_other_charges,
+		)
+		# keep the taxes of an item together after the order of the report
+		.orderby(invoice_item.name)
+		.orderby(invoice_item_tax.description)
+	)
+
+	item = None
+	with frappe.db.unbuffered_cursor():
+		for row in query.run(as_dict=True, as_iterator=True):
+			if not item or item.name != row.name:
+				if item:
+					yield item
+
+				item = row
+				item.taxes = {}
+
+			if row.tax_description:
+				item.taxes[row.tax_description] = frappe._dict(
+					{
+						"tax_rate": row.item_tax_rate
+						if row.item_tax_rate == "NA"
+						else flt(row.item_tax_rate),
+						"tax_amount": row.item_tax_amount,
+						"is_other_charges": row.is_other_charges,
+					}
+				)
+
+	if item:
+		yield item
 
 
 def get_grand_total(filters, doctype):
@@ -522,6 +647,7 @@ def get_tax_accounts(
 	company_currency,
 	doctype="Sales Invoice",
 	tax_doctype="Sales Taxes and Charges",
+	add_columns=True,
 ):
 	import json
 
@@ -643,6 +769,13 @@ def get_tax_accounts(
 				)
 
 	tax_columns.sort()
+	if add_columns:
+		add_tax_columns(columns, tax_columns)
+
+	return itemised_tax, tax_columns
+
+
+def add_tax_columns(columns, tax_columns):
 	for desc in tax_columns:
 		columns.append(
 			{
@@ -694,8 +827,6 @@ def get_tax_accounts(
 		},
 	]
 
-	return itemised_tax, tax_columns
-
 
 def add_total_row(
 	data,
@@ -0,0 +1,94 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# MIT License. See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import add_months, get_first_day, today
+
+from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+from erpnext.accounts.report import financial_statements
+from erpnext.accounts.report.financial_statements import get_data, get_period_list, set_gl_entries_by_account
+
+
+def set_gl_entries_per_entry(*args, period_list=None, **kwargs):
+	return set_gl_entries_by_account(*args, **kwargs)
+
+
+class TestFinancialStatements(IntegrationTestCase):
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_grouped_values_match_per_entry_values(self):
+		# entries before the first period, spread over the periods and across fiscal years
+		for months, amount in ((-24, 100), (-17, 250), (-12, 75), (-11, 40), (-6, 310), (-1, 20), (0, 5)):
+			make_journal_entry(
+				"_Test Bank - _TC",
+				"Sales - _TC",
+				amount,
+				posting_date=add_months(today(), months),
+				submit=True,
+			)
+
+		for accumulated_values in (0, 1):
+			period_list = get_period_list(
+				None,
+				None,
+				get_first_day(add_months(today(), -18)),
+				today(),
+				"Date Range",
+				"Quarterly",
+				accumulated_values=accumulated_values,
+				company="_Test Company",
+			)
+			filters = frappe._dict(company="_Test Company", accumulated_values=accumulated_values)
+
+			for ignore_accumulated_values_for_fy in (False, True):
+				# the balance sheet reads all the years, the profit and loss statement only the current one
+				for root_type, balance_must_be, only_current_fiscal_year in (
+					("Asset", "Debit", False),
+					("Income", "Credit", True),
+				):
+					args = (
+						"_Test Company",
+						root_type,
+						balance_must_be,
+						period_list,
+						filters,
+						accumulated_values,
+						only_current_fiscal_year,
+						False,
+						ignore_accumulated_values_for_fy,
+					)
+
+					grouped = get_data(*args)
+					with patch.object(
+						financial_statements, "set_gl_entries_by_account", set_gl_entries_per_entry
+					):
+						per_entry = get_data(*args)
+
+					with self.subTest(
+						accumulated_values=accumulated_values,
+						ignore_accumulated_values_for_fy=ignore_accumulated_values_for_fy,
+						root_type=root_type,
+					):
+						self.assertTrue(per_entry)
+						self.assertEqual(grouped, per_entry)
+
+	def test_values_accumulated_into_parents(self):
+		# root (1, 12) > group (2, 7) > leaf (3, 4), leaf (5, 6); root > leaf (8, 9), leaf (10, 11)
+		accounts = [
+			frappe._dict(name="Root", parent_account=None, lft=1, rgt=12, value=1.0),
+			frappe._dict(name="Group", parent_account="Root", lft=2, rgt=7, value=2.0),
+			frappe._dict(name="Leaf 1", parent_account="Group", lft=3, rgt=4, value=4.0),
+			frappe._dict(name="Leaf 2", parent_account="Group", lft=5, rgt=6, value=8.0),
+			frappe._dict(name="Leaf 3", parent_account="Root", lft=8, rgt=9, value=16.0),
+			frappe._dict(name="Leaf 4", parent_account="Root", lft=10, rgt=11),
+		]
+		financial_statements.accumulate_values_by_lft_rgt(reversed(accounts), ["value"])
+
+		self.assertEqual(
+			{d.name: d.value for d in accounts},
+			{"Root": 31.0, "Group": 14.0, "Leaf 1": 4.0, "Leaf 2": 8.0, "Leaf 3": 16.0, "Leaf 4": 0.0},
+		)
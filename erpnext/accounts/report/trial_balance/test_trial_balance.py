@@ -3,9 +3,12 @@
 
 import frappe
 from frappe.tests import IntegrationTestCase
-from frappe.utils import today
+from frappe.utils import add_days, today
 
-from erpnext.accounts.report.trial_balance.trial_balance import execute
+from erpnext.accounts.doctype.account_closing_balance.account_closing_balance import (
+	OPENING_BALANCE_CACHE_VERSION_KEY,
+)
+from erpnext.accounts.report.trial_balance.trial_balance import execute, get_opening_balances
 
 
 class TestTrialBalance(IntegrationTestCase):
@@ -14,6 +17,9 @@ class TestTrialBalance(IntegrationTestCase):
 		from erpnext.accounts.doctype.cost_center.test_cost_center import create_cost_center
 		from erpnext.accounts.utils import get_fiscal_year
 
+		# entries rolled back or deleted by other tests are part of the cached opening balances
+		frappe.cache.delete_value(OPENING_BALANCE_CACHE_VERSION_KEY)
+
 		self.company = create_company()
 		create_cost_center(
 			cost_center_name="Test Cost Center",
@@ -62,6 +68,22 @@ class TestTrialBalance(IntegrationTestCase):
 		total_row = execute(filters)[1][-1]
 		self.assertEqual(total_row["debit"], total_row["credit"])
 
+	def test_cached_opening_balances(self):
+		from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+		from erpnext.accounts.utils import get_fiscal_year
+
+		from_date = get_fiscal_year(today(), company="_Test Company")[1]
+		filters = frappe._dict(company="_Test Company", from_date=from_date, year_start_date=from_date)
+
+		opening = get_opening_balances(filters).get("_Test Bank - _TC", {}).get("opening_debit", 0)
+		self.assertEqual(get_opening_balances(filters)["_Test Bank - _TC"]["opening_debit"], opening)
+
+		# backdated entry drops the cached openings
+		make_journal_entry(
+			"_Test Bank - _TC", "_Test Cash - _TC", 100, posting_date=add_days(from_date, -1), submit=True
+		)
+		self.assertEqual(get_opening_balances(filters)["_Test Bank - _TC"]["opening_debit"], opening + 100)
+
 	def tearDown(self):
 		clear_dimension_defaults("Branch")
 		disable_dimension()
@@ -8,11 +8,15 @@ from frappe.query_builder.functions import Sum
 from frappe.utils import add_days, cstr, flt, formatdate, getdate
 
 import erpnext
+from erpnext.accounts.doctype.account_closing_balance.account_closing_balance import (
+	get_cached_opening_balance,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimension_with_children,
 )
 from erpnext.accounts.report.financial_statements import (
+	accumulate_values_by_lft_rgt,
 	filter_accounts,
 	filter_out_zero_value_rows,
 	set_gl_entries_by_account,
@@ -112,6 +116,7 @@ def get_data(filters):
 		root_rgt=None,
 		ignore_closing_entries=not flt(filters.with_period_closing_entry_for_current_period),
 		ignore_opening_entries=True,
+		period_list=[frappe._dict(from_date=filters.from_date, to_date=filters.to_date)],
 	)
 
 	calculate_values(accounts, gl_entries_by_account, opening_balances, filters.get("show_net_values"))
@@ -290,7 +295,7 @@ def get_opening_balance(
 						closing_balance[dimension.fieldname].isin(filters[dimension.fieldname])
 					)
 
-	gle = opening_balance.run(as_dict=1)
+	gle = get_cached_opening_balance(filters.company, filters.from_date, opening_balance)
 
 	if filters and filters.get("presentation_currency"):
 		convert_to_presentation_currency(gle, get_currency(filters))
@@ -353,10 +358,7 @@ def calculate_total_row(accounts, company_currency):
 
 
 def accumulate_values_into_parents(accounts, accounts_by_name):
-	for d in reversed(accounts):
-		if d.parent_account:
-			for key in value_fields:
-				accounts_by_name[d.parent_account][key] += d[key]
+	accumulate_values_by_lft_rgt(accounts_by_name.values(), value_fields)
 
 
 def prepare_data(accounts, filters, parent_children_map, company_currency):
@@ -204,6 +204,7 @@ class AccountsTestMixin:
 			"Exchange Rate Revaluation",
 			"Bank Account",
 			"Bank Transaction",
+			"Voucher Outstanding",
 		]
 		for doctype in doctype_list:
 			qb.from_(qb.DocType(doctype)).delete().where(qb.DocType(doctype).company == self.company).run()
@@ -32,7 +32,22 @@ import erpnext
 
 # imported to enable erpnext.accounts.utils.get_account_currency
 from erpnext.accounts.doctype.account.account import get_account_currency
+from erpnext.accounts.doctype.account_closing_balance.account_closing_balance import (
+	clear_opening_balance_cache,
+)
+from erpnext.accounts.doctype.account_daily_balance.account_daily_balance import (
+	check_account_daily_balances,
+	get_balance_from_daily_balances,
+	get_gl_entry_balances,
+	rebuild_account_daily_balances,
+	update_account_daily_balances,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import get_dimensions
+from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import (
+	get_against_vouchers,
+	lock_vouchers,
+	update_voucher_outstandings,
+)
 from erpnext.stock import get_warehouse_account_map
 from erpnext.stock.utils import get_stock_value_on
 
@@ -294,17 +309,23 @@ def get_balance_on(
 	if account or (party_type and party) or account_type:
 		precision = get_currency_precision()
 		if in_account_currency:
-			select_field = (
-				"sum(round(debit_in_account_currency, %s)) - sum(round(credit_in_account_currency, %s))"
-			)
+			fields = ("debit_in_account_currency", "credit_in_account_currency")
 		else:
-			select_field = "sum(round(debit, %s)) - sum(round(credit, %s))"
+			fields = ("debit", "credit")
+
+		# days rolled up into Account Daily Balance are read from there, it only has
+		# entries which are not cancelled so the first condition is not applied
+		bal = get_balance_from_daily_balances(
+			company or (acc.company if account else None), cond[1:], fields, precision
+		)
+		if bal is not None:
+			return bal
 
 		bal = frappe.db.sql(
 			"""
-			SELECT {}
+			SELECT sum(round({0}, %s)) - sum(round({1}, %s))
 			FROM `tabGL Entry` gle
-			WHERE {}""".format(select_field, " and ".join(cond)),
+			WHERE {2}""".format(*fields, " and ".join(cond)),
 			(precision, precision),
 		)[0][0]
 		# if bal is None, return 0
@@ -909,6 +930,18 @@ def update_accounting_ledgers_after_reference_removal(
 	gle_update_query.run()
 
 	# Payment Ledger
+	relinked_filters = {"against_voucher_type": ref_type, "against_voucher_no": ref_no}
+	if payment_name:
+		relinked_filters["voucher_no"] = payment_name
+	relinked_vouchers = frappe.get_all(
+		"Payment Ledger Entry",
+		filters={**relinked_filters, "delinked": 0},
+		fields=["voucher_type", "voucher_no"],
+		distinct=True,
+		as_list=True,
+	)
+	lock_vouchers([(ref_type, ref_no), *relinked_vouchers])
+
 	ple = qb.DocType("Payment Ledger Entry")
 	ple_update_query = (
 		qb.update(ple)
@@ -924,6 +957,7 @@ def update_accounting_ledgers_after_reference_removal(
 	if payment_name:
 		ple_update_query = ple_update_query.where(ple.voucher_no == payment_name)
 	ple_update_query.run()
+	update_voucher_outstandings([(ref_type, ref_no), *relinked_vouchers])
 
 
 def remove_ref_from_advance_section(ref_doc: object = None):
@@ -1451,12 +1485,18 @@ def repost_gle_for_stock_vouchers(
 
 def _delete_pl_entries(voucher_type, voucher_no):
 	ple = qb.DocType("Payment Ledger Entry")
+	against_vouchers = get_against_vouchers({"voucher_type": voucher_type, "voucher_no": voucher_no})
+	lock_vouchers(against_vouchers)
 	qb.from_(ple).delete().where((ple.voucher_type == voucher_type) & (ple.voucher_no == voucher_no)).run()
+	update_voucher_outstandings(against_vouchers)
 
 
 def _delete_gl_entries(voucher_type, voucher_no):
 	gle = qb.DocType("GL Entry")
+	gl_entries = get_gl_entry_balances({"voucher_type": voucher_type, "voucher_no": voucher_no})
 	qb.from_(gle).delete().where((gle.voucher_type == voucher_type) & (gle.voucher_no == voucher_no)).run()
+	update_account_daily_balances(gl_entries, cancelled=True)
+	clear_opening_balance_cache(gl_entries)
 
 
 def _delete_accounting_ledger_entries(voucher_type, voucher_no):
@@ -1801,10 +1841,22 @@ def get_payment_ledger_entries(gl_entries, cancel=0):
 
 
 def create_payment_ledger_entry(
-	gl_entries, cancel=0, adv_adj=0, update_outstanding="Yes", from_repost=0, partial_cancel=False
+	gl_entries,
+	cancel=0,
+	adv_adj=0,
+	update_outstanding="Yes",
+	from_repost=0,
+	partial_cancel=False,
+	bulk_insert=False,
 ):
 	if gl_entries:
 		ple_map = get_payment_ledger_entries(gl_entries, cancel=cancel)
+		# outstanding of the vouchers is updated by one transaction at a time
+		lock_vouchers({(entry.against_voucher_type, entry.against_voucher_no) for entry in ple_map})
+
+		if bulk_insert and not cancel:
+			make_payment_ledger_entries_in_bulk(ple_map, adv_adj, update_outstanding, from_repost)
+			return
 
 		for entry in ple_map:
 			ple = frappe.get_doc(entry)
@@ -1819,6 +1871,133 @@ def create_payment_ledger_entry(
 			ple.submit()
 
 
+def make_payment_ledger_entries_in_bulk(ple_map, adv_adj=0, update_outstanding="Yes", from_repost=0):
+	"""Submit all entries of `ple_map` at once, with the validations of `PaymentLedgerEntry`.
+
+	Accounts are read with a single query, balances are checked once per account and
+	outstanding amounts are updated once per against voucher."""
+	from erpnext.accounts.doctype.gl_entry.gl_entry import (
+		get_account_details,
+		validate_balance_type,
+		validate_frozen_account,
+	)
+
+	if not ple_map:
+		return
+
+	pl_entries = []
+	for entry in ple_map:
+		ple = frappe.get_doc(entry)
+		ple.name = frappe.generate_hash(length=10)
+		pl_entries.append(ple)
+
+	validate_links_in_bulk(pl_entries)
+
+	accounts = list(dict.fromkeys(ple.account for ple in pl_entries))
+	account_details = get_account_details(accounts)
+	for ple in pl_entries:
+		ple.validate_account(account_details)
+		if not from_repost:
+			ple.validate_account_details(account_details)
+			ple.validate_dimensions_for_pl_and_bs()
+			ple.validate_allowed_dimensions()
+
+	if not from_repost:
+		for account in accounts:
+			validate_frozen_account(account, adv_adj)
+
+	bulk_insert_docs(pl_entries)
+	update_voucher_outstandings({(ple.against_voucher_type, ple.against_voucher_no) for ple in pl_entries})
+
+	if not from_repost:
+		for account in accounts:
+			validate_balance_type(account, adv_adj)
+
+	if update_outstanding == "Yes" and not frappe.flags.is_reverse_depr_entry:
+		against_vouchers = {
+			(ple.against_voucher_type, ple.against_voucher_no, ple.account, ple.party_type, ple.party): None
+			for ple in pl_entries
+			if ple.against_voucher_type in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
+		}
+		for against_voucher in against_vouchers:
+			update_voucher_outstanding(*against_voucher)
+
+
+def validate_links_in_bulk(docs):
+	"""Check that the linked records of `docs` exist, with one query per link field and
+	per doctype of a dynamic link field"""
+
+	meta = docs[0].meta
+	for df in meta.get_link_fields():
+		validate_link_values(df, df.options, {doc.get(df.fieldname) for doc in docs})
+
+	for df in meta.get_dynamic_link_fields():
+		values_by_doctype = {}
+		for doc in docs:
+			if value := doc.get(df.fieldname):
+				if not doc.get(df.options):
+					frappe.throw(_("{0} must be set first").format(_(meta.get_label(df.options))))
+
+				values_by_doctype.setdefault(doc.get(df.options), set()).add(value)
+
+		for doctype, values in values_by_doctype.items():
+			validate_link_values(df, doctype, values)
+
+
+def validate_link_values(df, doctype, values):
+	values = values - {None, ""}
+	if not values:
+		return
+
+	existing = {
+		cstr(name).casefold()
+		for name in frappe.get_all(doctype, filters={"name": ("in", list(values))}, pluck="name")
+	}
+	for value in values:
+		if cstr(value).casefold() not in existing:
+			frappe.throw(
+				_("Could not find {0}: {1}").format(_(df.label), frappe.bold(value)),
+				frappe.LinkValidationError,
+			)
+
+
+def bulk_insert_docs(docs):
+	"""Insert `docs` as submitted records with multi-row inserts, without running their
+	controller methods. The docs must be validated and named. The standard checks of the
+	fields and the `doc_events` hooks set for all doctypes that `submit` runs are run for
+	each doc."""
+
+	run_wildcard_doc_events(docs, ("before_insert", "before_validate", "validate", "before_submit"))
+
+	timestamp = now()
+	rows = []
+	for doc in docs:
+		doc._validate_mandatory()
+		doc._validate_length()
+		doc._validate_selects()
+		doc._validate_non_negative()
+
+		doc.docstatus = 1
+		doc.owner = doc.modified_by = frappe.session.user
+		doc.creation = doc.modified = timestamp
+		rows.append(doc.get_valid_dict(convert_dates_to_str=True))
+
+	fields = list(rows[0])
+	frappe.db.bulk_insert(docs[0].doctype, fields, [[row.get(field) for field in fields] for row in rows])
+
+	run_wildcard_doc_events(docs, ("on_submit", "on_change", "after_insert"))
+
+
+def run_wildcard_doc_events(docs, events):
+	"""Run the `doc_events` hooks of `events` set for all doctypes ("*") on each of `docs`"""
+	doc_events = frappe.get_doc_hooks().get("*", {})
+	for event in events:
+		for handler in doc_events.get(event, []):
+			method = frappe.get_attr(handler)
+			for doc in docs:
+				method(doc, event)
+
+
 def update_voucher_outstanding(voucher_type, voucher_no, account, party_type, party):
 	ple = frappe.qb.DocType("Payment Ledger Entry")
 	vouchers = [frappe._dict({"voucher_type": voucher_type, "voucher_no": voucher_no})]
@@ -2249,3 +2428,18 @@ def run_ledger_health_checks():
 					doc.general_and_payment_ledger_mismatch = True
 					doc.checked_on = run_date
 					doc.save()
+
+		# Account Daily Balance and General Ledger discrepancy
+		if health_monitor_settings.account_balance_mismatch:
+			for x in health_monitor_settings.companies:
+				mismatches = check_account_daily_balances(x.company, period_start, period_end)
+				for account, posting_date in mismatches:
+					doc = frappe.new_doc("Ledger Health")
+					doc.account = account
+					doc.posting_date = posting_date
+					doc.account_balance_mismatch = True
+					doc.checked_on = run_date
+					doc.save()
+
+				# balances are read from the rollup, so fix them right away
+				rebuild_account_daily_balances(mismatches)
@@ -28,6 +28,13 @@ from frappe.utils import (
 )
 
 import erpnext
+from erpnext.accounts.doctype.account_closing_balance.account_closing_balance import (
+	clear_opening_balance_cache,
+)
+from erpnext.accounts.doctype.account_daily_balance.account_daily_balance import (
+	get_gl_entry_balances,
+	update_account_daily_balances,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimensions,
@@ -369,9 +376,12 @@ class AccountsController(TransactionBase):
 					== 1
 				)
 			).run()
+			gl_entries = get_gl_entry_balances({"voucher_type": self.doctype, "voucher_no": self.name})
 			frappe.db.sql(
 				"delete from `tabGL Entry` where voucher_type=%s and voucher_no=%s", (self.doctype, self.name)
 			)
+			update_account_daily_balances(gl_entries, cancelled=True)
+			clear_opening_balance_cache(gl_entries)
 			frappe.db.sql(
 				"delete from `tabStock Ledger Entry` where voucher_type=%s and voucher_no=%s",
 				(self.doctype, self.name),
@@ -5,6 +5,7 @@
 import json
 
 import frappe
+import numpy as np
 from frappe import _, scrub
 from frappe.model.document import Document
 from frappe.utils import cint, flt, round_based_on_smallest_currency_fraction
@@ -23,6 +24,9 @@ from erpnext.utilities.regional import temporary_flag
 
 
 class calculate_taxes_and_totals:
+	# number of item rows from which taxes are computed for all items at once using numpy
+	vectorized_taxes_min_rows = 100
+
 	def __init__(self, doc: Document):
 		self.doc = doc
 		frappe.flags.round_off_applicable_accounts = []
@@ -363,6 +367,9 @@ class calculate_taxes_and_totals:
 			self._calculate()
 
 	def calculate_taxes(self):
+		if self.use_vectorized_taxes():
+			return self.calculate_taxes_vectorized()
+
 		rounding_adjustment_computed = self.doc.get("is_consolidated") and self.doc.get("rounding_adjustment")
 		if not rounding_adjustment_computed:
 			self.doc.rounding_adjustment = 0
@@ -418,26 +425,158 @@ class calculate_taxes_and_totals:
 
 				# set precision in the last item iteration
 				if n == len(self._items) - 1:
-					self.round_off_totals(tax)
-					self._set_in_company_currency(tax, ["tax_amount", "tax_amount_after_discount_amount"])
+					self.set_tax_totals(i, tax, rounding_adjustment_computed)
 
-					self.round_off_base_values(tax)
-					self.set_cumulative_total(i, tax)
+	def set_tax_totals(self, row_idx, tax, rounding_adjustment_computed):
+		self.round_off_totals(tax)
+		self._set_in_company_currency(tax, ["tax_amount", "tax_amount_after_discount_amount"])
 
-					self._set_in_company_currency(tax, ["total"])
+		self.round_off_base_values(tax)
+		self.set_cumulative_total(row_idx, tax)
 
-					# adjust Discount Amount loss in last tax iteration
-					if (
-						i == (len(self.doc.get("taxes")) - 1)
-						and self.discount_amount_applied
-						and self.doc.discount_amount
-						and self.doc.apply_discount_on == "Grand Total"
-						and not rounding_adjustment_computed
-					):
-						self.doc.rounding_adjustment = flt(
-							self.doc.grand_total - flt(self.doc.discount_amount) - tax.total,
-							self.doc.precision("rounding_adjustment"),
-						)
+		self._set_in_company_currency(tax, ["total"])
+
+		# adjust Discount Amount loss in last tax iteration
+		if (
+			row_idx == (len(self.doc.get("taxes")) - 1)
+			and self.discount_amount_applied
+			and self.doc.discount_amount
+			and self.doc.apply_discount_on == "Grand Total"
+			and not rounding_adjustment_computed
+		):
+			self.doc.rounding_adjustment = flt(
+				self.doc.grand_total - flt(self.doc.discount_amount) - tax.total,
+				self.doc.precision("rounding_adjustment"),
+			)
+
+	def use_vectorized_taxes(self):
+		# subclasses overriding the per item calculation keep using it
+		return (
+			len(self._items) >= self.vectorized_taxes_min_rows
+			and type(self).get_current_tax_amount is calculate_taxes_and_totals.get_current_tax_amount
+			and type(self).set_item_wise_tax is calculate_taxes_and_totals.set_item_wise_tax
+		)
+
+	def calculate_taxes_vectorized(self):
+		"""Same as `calculate_taxes`, but each tax row is computed for all items at once.
+
+		Every amount goes through the same floating point operations in the same order,
+		so the results are identical to the row by row calculation."""
+
+		rounding_adjustment_computed = self.doc.get("is_consolidated") and self.doc.get("rounding_adjustment")
+		if not rounding_adjustment_computed:
+			self.doc.rounding_adjustment = 0
+
+		taxes = self.doc.get("taxes")
+		net_amount = np.array([item.net_amount for item in self._items], dtype=float)
+		qty = np.array([item.qty for item in self._items], dtype=float)
+
+		item_tax_maps = {}
+		for item in self._items:
+			if item.item_tax_rate not in item_tax_maps:
+				item_tax_maps[item.item_tax_rate] = self._load_item_tax_rate(item.item_tax_rate)
+		item_tax_maps = [item_tax_maps[item.item_tax_rate] for item in self._items]
+
+		tax_amounts = []
+		grand_totals = []
+		for i, tax in enumerate(taxes):
+			tax_rates = self.get_tax_rates_for_items(tax, item_tax_maps)
+			current_tax_amounts = self.get_current_tax_amounts(
+				tax, np.array(tax_rates, dtype=float), net_amount, qty, tax_amounts, grand_totals
+			)
+
+			if not (self.doc.get("is_consolidated") or tax.get("dont_recompute_tax")):
+				self.set_item_wise_tax_for_items(tax, tax_rates, current_tax_amounts)
+
+			if frappe.flags.round_row_wise_tax:
+				precision = tax.precision("tax_amount")
+				current_tax_amounts = np.array([flt(d, precision) for d in current_tax_amounts.tolist()])
+
+			# Adjust divisional loss to the last item
+			if tax.charge_type == "Actual":
+				actual = flt(tax.tax_amount, tax.precision("tax_amount"))
+				current_tax_amounts[-1] += accumulate(actual, -current_tax_amounts)
+
+			if tax.charge_type != "Actual" and not (
+				self.discount_amount_applied and self.doc.apply_discount_on == "Grand Total"
+			):
+				tax.tax_amount = accumulate(tax.tax_amount, current_tax_amounts)
+
+			tax.tax_amount_for_current_item = float(current_tax_amounts[-1])
+			tax.tax_amount_after_discount_amount = accumulate(
+				tax.tax_amount_after_discount_amount, current_tax_amounts
+			)
+
+			previous_total = grand_totals[i - 1] if i else net_amount
+			grand_total = previous_total + self.get_tax_amount_if_for_valuation_or_deduction(
+				current_tax_amounts, tax
+			)
+			tax.grand_total_for_current_item = float(grand_total[-1])
+
+			tax_amounts.append(current_tax_amounts)
+			grand_totals.append(grand_total)
+
+			self.set_tax_totals(i, tax, rounding_adjustment_computed)
+
+	def get_tax_rates_for_items(self, tax, item_tax_maps):
+		precision = self.doc.precision("rate", tax)
+		return [
+			flt(item_tax_map.get(tax.account_head), precision)
+			if tax.account_head in item_tax_map
+			else tax.rate
+			for item_tax_map in item_tax_maps
+		]
+
+	def get_current_tax_amounts(self, tax, tax_rates, net_amount, qty, tax_amounts, grand_totals):
+		"""Vectorized `get_current_tax_amount`, `tax_amounts` and `grand_totals` hold the
+		amounts of the previous tax rows for all items"""
+
+		if tax.charge_type == "Actual":
+			# distribute the tax amount proportionally to each item row
+			actual = flt(tax.tax_amount, tax.precision("tax_amount"))
+
+			if tax.get("is_tax_withholding_account") and self._items[0].meta.get_field("apply_tds"):
+				if not self.doc.tax_withholding_net_total:
+					return np.zeros(len(net_amount))
+
+				apply_tds = np.array([bool(item.get("apply_tds")) for item in self._items])
+				return np.where(apply_tds, net_amount * actual / self.doc.tax_withholding_net_total, 0.0)
+
+			if not self.doc.net_total:
+				return np.zeros(len(net_amount))
+
+			return net_amount * actual / self.doc.net_total
+
+		elif tax.charge_type == "On Net Total":
+			return tax_rates / 100.0 * net_amount
+		elif tax.charge_type == "On Previous Row Amount":
+			return tax_rates / 100.0 * tax_amounts[cint(tax.row_id) - 1]
+		elif tax.charge_type == "On Previous Row Total":
+			return tax_rates / 100.0 * grand_totals[cint(tax.row_id) - 1]
+		elif tax.charge_type == "On Item Quantity":
+			return tax_rates * qty
+
+		return np.zeros(len(net_amount))
+
+	def set_item_wise_tax_for_items(self, tax, tax_rates, current_tax_amounts):
+		item_wise_tax_amounts = (current_tax_amounts * self.doc.conversion_rate).tolist()
+		item_wise_tax_detail = tax.item_wise_tax_detail
+		precision = tax.precision("tax_amount")
+
+		for item, tax_rate, item_wise_tax_amount in zip(
+			self._items, tax_rates, item_wise_tax_amounts, strict=True
+		):
+			key = item.item_code or item.item_name
+			if frappe.flags.round_row_wise_tax:
+				item_wise_tax_amount = flt(item_wise_tax_amount, precision)
+				if item_wise_tax_detail.get(key):
+					item_wise_tax_amount += flt(item_wise_tax_detail[key][1], precision)
+				item_wise_tax_detail[key] = [tax_rate, flt(item_wise_tax_amount, precision)]
+			else:
+				if item_wise_tax_detail.get(key):
+					item_wise_tax_amount += item_wise_tax_detail[key][1]
+
+				item_wise_tax_detail[key] = [tax_rate, item_wise_tax_amount]
 
 	def get_tax_amount_if_for_valuation_or_deduction(self, tax_amount, tax):
 		# if just for valuation, do not add the tax amount in total
@@ -450,7 +589,8 @@ class calculate_taxes_and_totals:
 				"Purchase Receipt",
 				"Supplier Quotation",
 			]:
-				tax_amount *= -1.0 if (tax.add_deduct_tax == "Deduct") else 1.0
+				# not in place, the tax amounts of all items are read by the later rows
+				tax_amount = tax_amount * (-1.0 if (tax.add_deduct_tax == "Deduct") else 1.0)
 		return tax_amount
 
 	def set_cumulative_total(self, row_idx, tax):
@@ -992,6 +1132,11 @@ class calculate_taxes_and_totals:
 				)
 
 
+def accumulate(start, values):
+	"""Returns `start` plus each of `values` added one by one, like a `+=` loop"""
+	return float(np.cumsum(np.concatenate(([start], values)))[-1])
+
+
 def get_itemised_tax_breakup_html(doc):
 	if not doc.taxes:
 		return
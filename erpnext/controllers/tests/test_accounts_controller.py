@@ -2,6 +2,8 @@
 # For license information, please see license.txt
 
 
+from unittest.mock import patch
+
 import frappe
 from frappe import qb
 from frappe.query_builder.functions import Sum
@@ -14,6 +16,7 @@ from erpnext.accounts.doctype.purchase_invoice.test_purchase_invoice import make
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
 from erpnext.accounts.party import get_party_account
 from erpnext.buying.doctype.purchase_order.test_purchase_order import prepare_data_for_internal_transfer
+from erpnext.controllers import taxes_and_totals
 from erpnext.stock.doctype.item.test_item import create_item
 
 
@@ -1955,3 +1958,100 @@ class TestAccountsController(IntegrationTestCase):
 		self.assertEqual(len(exc_je_for_adv), 0)
 
 		self.remove_advance_accounts_from_party_master()
+
+	def test_80_vectorized_taxes_match_row_wise_calculation(self):
+		si = self.create_sales_invoice(qty=3, rate=17.35, do_not_save=True)
+		for i in range(1, 150):
+			si.append(
+				"items",
+				{
+					"item_code": self.item,
+					"qty": i % 7 + 1,
+					"rate": 13.37 * (i % 11) + 0.015 * i,
+					"income_account": self.income_account,
+					"cost_center": self.cost_center,
+					"item_tax_rate": '{"_Test Account Excise Duty - _TC": 12.5}' if i % 3 else None,
+				},
+			)
+
+		for charge_type, account_head, rate, row_id in [
+			("On Net Total", "_Test Account Excise Duty - _TC", 10, None),
+			("On Previous Row Amount", "_Test Account Education Cess - _TC", 2, 1),
+			("Actual", "_Test Account Shipping Charges - _TC", 0, None),
+			("On Previous Row Total", "_Test Account Customs Duty - _TC", 3.33, 3),
+			("On Item Quantity", "_Test Account S&H Education Cess - _TC", 0.77, None),
+		]:
+			si.append(
+				"taxes",
+				{
+					"charge_type": charge_type,
+					"account_head": account_head,
+					"description": account_head,
+					"cost_center": self.cost_center,
+					"rate": rate,
+					"row_id": row_id,
+					"tax_amount": 100.01 if charge_type == "Actual" else 0,
+				},
+			)
+
+		self.assert_vectorized_taxes_match_row_wise_calculation(si)
+
+	def test_81_vectorized_purchase_taxes_match_row_wise_calculation(self):
+		pi = make_purchase_invoice(qty=3, rate=17.35, do_not_save=True)
+		for i in range(1, 150):
+			pi.append(
+				"items",
+				{
+					"item_code": "_Test Item",
+					"qty": i % 7 + 1,
+					"rate": 13.37 * (i % 11) + 0.015 * i,
+					"expense_account": "_Test Account Cost for Goods Sold - _TC",
+					"cost_center": "_Test Cost Center - _TC",
+					"conversion_factor": 1.0,
+				},
+			)
+
+		# the deducted and valuation only taxes are read by the taxes on previous rows
+		for charge_type, account_head, rate, row_id, category, add_deduct_tax in [
+			("On Net Total", "_Test Account Excise Duty - _TC", 10, None, "Total", "Deduct"),
+			("On Previous Row Amount", "_Test Account Education Cess - _TC", 2, 1, "Total", "Add"),
+			("On Net Total", "_Test Account Shipping Charges - _TC", 4.5, None, "Valuation", "Add"),
+			("On Previous Row Amount", "_Test Account Customs Duty - _TC", 3.33, 3, "Total", "Add"),
+			("On Previous Row Total", "_Test Account S&H Education Cess - _TC", 1.5, 2, "Total", "Deduct"),
+		]:
+			pi.append(
+				"taxes",
+				{
+					"charge_type": charge_type,
+					"account_head": account_head,
+					"description": account_head,
+					"cost_center": "_Test Cost Center - _TC",
+					"rate": rate,
+					"row_id": row_id,
+					"category": category,
+					"add_deduct_tax": add_deduct_tax,
+				},
+			)
+
+		self.assert_vectorized_taxes_match_row_wise_calculation(pi)
+
+	def assert_vectorized_taxes_match_row_wise_calculation(self, invoice):
+		def calculate(vectorized):
+			doc = frappe.copy_doc(invoice)
+			min_rows = 0 if vectorized else len(doc.items) + 1
+			with patch.object(
+				taxes_and_totals.calculate_taxes_and_totals, "vectorized_taxes_min_rows", min_rows
+			):
+				doc.calculate_taxes_and_totals()
+
+			fields = ["tax_amount", "base_tax_amount", "tax_amount_after_discount_amount", "total"]
+			return (
+				[[tax.get(field) for field in [*fields, "item_wise_tax_detail"]] for tax in doc.taxes],
+				[doc.grand_total, doc.total_taxes_and_charges, doc.rounding_adjustment],
+			)
+
+		for round_row_wise_tax, discount_percentage in [(0, 0), (1, 0), (0, 7.5), (1, 7.5)]:
+			frappe.db.set_single_value("Accounts Settings", "round_row_wise_tax", round_row_wise_tax)
+			invoice.apply_discount_on = "Grand Total"
+			invoice.additional_discount_percentage = discount_percentage
+			self.assertEqual(calculate(vectorized=True), calculate(vectorized=False))
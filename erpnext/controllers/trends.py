@@ -4,8 +4,18 @@
 
 import frappe
 from frappe import _
+from frappe.query_builder import Case
+from frappe.query_builder.functions import Max, Sum
 from frappe.utils import getdate
 
+from erpnext.setup.doctype.item_transaction_summary.item_transaction_summary import (
+	SUMMARY_VOUCHER_TYPES,
+	is_item_transaction_summary_built,
+)
+
+# Based On options which can be read from the Item Transaction Summary
+SUMMARY_BASED_ON = ("Item", "Item Group", "Customer", "Supplier", "Supplier Group", "Territory")
+
 
 def get_columns(filters, trans):
 	validate_filters(filters)
@@ -57,6 +67,9 @@ def validate_filters(filters):
 
 
 def get_data(filters, conditions):
+	if use_item_transaction_summary(filters, conditions):
+		return get_data_from_item_transaction_summary(filters, conditions)
+
 	data = []
 	inc, cond = "", ""
 	query_details = conditions["based_on_select"] + conditions["period_wise_select"]
@@ -213,6 +226,71 @@ def get_data(filters, conditions):
 	return data
 
 
+def use_item_transaction_summary(filters, conditions):
+	"""Whether the report can be read from the Item Transaction Summary, which has
+	neither the status of orders nor dates other than the posting date"""
+	trans = conditions.get("trans")
+
+	return (
+		trans in SUMMARY_VOUCHER_TYPES
+		and filters.get("based_on") in SUMMARY_BASED_ON
+		and not filters.get("group_by")
+		and filters.get("period_based_on") in (None, "", "posting_date")
+		and (filters.get("include_closed_orders") or trans not in ("Sales Order", "Purchase Order"))
+		and is_item_transaction_summary_built()
+	)
+
+
+def get_data_from_item_transaction_summary(filters, conditions):
+	summary = frappe.qb.DocType("Item Transaction Summary")
+	based_on = filters.get("based_on")
+
+	year_start_date, year_end_date = frappe.get_cached_value(
+		"Fiscal Year", filters.get("fiscal_year"), ["year_start_date", "year_end_date"]
+	)
+
+	query = frappe.qb.from_(summary).where(
+		(summary.voucher_type == conditions["trans"])
+		& (summary.company == filters.get("company"))
+		& (summary.posting_date.between(year_start_date, year_end_date))
+	)
+
+	if based_on == "Item":
+		item = frappe.qb.DocType("Item")
+		query = query.left_join(item).on(item.name == summary.item_code)
+		fields, group_by = [summary.item_code, Max(item.item_name)], summary.item_code
+	elif based_on == "Item Group":
+		fields, group_by = [summary.item_group], summary.item_group
+	elif based_on == "Customer":
+		customer = frappe.qb.DocType("Customer")
+		query = query.left_join(customer).on(customer.name == summary.party)
+		fields, group_by = [Max(customer.customer_name), Max(summary.territory)], summary.party
+	elif based_on == "Supplier":
+		supplier = frappe.qb.DocType("Supplier")
+		query = query.inner_join(supplier).on(supplier.name == summary.party)
+		fields, group_by = [summary.party, Max(supplier.supplier_group)], summary.party
+	elif based_on == "Supplier Group":
+		supplier = frappe.qb.DocType("Supplier")
+		query = query.inner_join(supplier).on(supplier.name == summary.party)
+		fields, group_by = [supplier.supplier_group], supplier.supplier_group
+	else:
+		fields, group_by = [summary.territory], summary.territory
+
+	if filters.get("period") != "Yearly":
+		for from_date, to_date in get_period_date_ranges(filters.get("period"), filters.get("fiscal_year")):
+			in_period = summary.posting_date.between(from_date, to_date)
+			fields += [
+				Sum(Case().when(in_period, summary.stock_qty)),
+				Sum(Case().when(in_period, summary.base_net_amount)),
+			]
+	else:
+		fields += [Sum(summary.stock_qty), Sum(summary.base_net_amount)]
+
+	fields += [Sum(summary.stock_qty), Sum(summary.base_net_amount)]
+
+	return query.select(*fields).groupby(group_by).run(as_list=True)
+
+
 def get_mon(dt):
 	return getdate(dt).strftime("%b")
 
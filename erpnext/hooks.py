@@ -320,6 +320,39 @@ doc_events = {
 	tuple(period_closing_doctypes): {
 		"validate": "erpnext.accounts.doctype.accounting_period.accounting_period.validate_accounting_period_on_doc_save",
 	},
+	(
+		"Sales Order",
+		"Delivery Note",
+		"Sales Invoice",
+		"Purchase Order",
+		"Purchase Receipt",
+		"Purchase Invoice",
+	): {
+		"on_submit": "erpnext.setup.doctype.item_transaction_summary.item_transaction_summary.update_item_transaction_summary",
+		"on_cancel": "erpnext.setup.doctype.item_transaction_summary.item_transaction_summary.update_item_transaction_summary",
+	},
+	("Sales Invoice", "Purchase Invoice"): {
+		"on_submit": "erpnext.accounts.doctype.invoice_item_tax.invoice_item_tax.make_invoice_item_taxes",
+		"on_cancel": "erpnext.accounts.doctype.invoice_item_tax.invoice_item_tax.delete_invoice_item_taxes",
+	},
+	(
+		"Company",
+		"Item",
+		"Item Group",
+		"Brand",
+		"Customer",
+		"Customer Group",
+		"Territory",
+		"Sales Partner",
+		"UTM Campaign",
+		"Supplier",
+		"Supplier Group",
+		"Warehouse",
+		"Price List",
+		"UOM",
+	): {
+		"after_rename": "erpnext.accounts.doctype.pricing_rule.utils.clear_pricing_rule_index_on_rename",
+	},
 	"Stock Entry": {
 		"on_submit": "erpnext.stock.doctype.material_request.material_request.update_completed_and_requested_qty",
 		"on_cancel": "erpnext.stock.doctype.material_request.material_request.update_completed_and_requested_qty",
@@ -424,6 +457,7 @@ scheduler_events = {
 	],
 	"daily": [
 		"erpnext.support.doctype.issue.issue.auto_close_tickets",
+		"erpnext.utilities.doctype.report_run.report_run.delete_expired_report_runs",
 		"erpnext.crm.doctype.opportunity.opportunity.auto_close_opportunity",
 		"erpnext.controllers.accounts_controller.update_invoice_status",
 		"erpnext.accounts.doctype.fiscal_year.fiscal_year.auto_create_fiscal_year",
@@ -456,6 +490,12 @@ scheduler_events = {
 		"erpnext.manufacturing.doctype.bom_update_tool.bom_update_tool.auto_update_latest_price_in_all_boms",
 		"erpnext.crm.utils.open_leads_opportunities_based_on_todays_event",
 		"erpnext.assets.doctype.asset.depreciation.post_depreciation_entries",
+		"erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot.create_stock_balance_snapshots",
+		"erpnext.stock.doctype.stock_ageing_snapshot.stock_ageing_snapshot.create_stock_ageing_snapshots",
+		"erpnext.accounts.doctype.account_daily_balance.account_daily_balance.build_account_daily_balances",
+		"erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding.build_voucher_outstandings",
+		"erpnext.setup.doctype.item_transaction_summary.item_transaction_summary.build_item_transaction_summaries",
+		"erpnext.accounts.doctype.invoice_item_tax.invoice_item_tax.build_invoice_item_taxes",
 	],
 	"monthly_long": [
 		"erpnext.accounts.deferred_revenue.process_deferred_accounting",
@@ -14,6 +14,11 @@ from frappe.utils import cint, cstr, flt, parse_json, today
 from frappe.website.website_generator import WebsiteGenerator
 
 import erpnext
+from erpnext.manufacturing.doctype.bom.bom_explosion import (
+	clear_bom_explosion_cache,
+	get_bom_explosions,
+	get_bom_structure,
+)
 from erpnext.setup.utils import get_exchange_rate
 from erpnext.stock.doctype.item.item import get_item_details
 from erpnext.stock.get_item_details import get_conversion_factor, get_price_list_rate
@@ -45,15 +50,15 @@ class BOMTree:
 			self.__create_tree()
 
 	def __create_tree(self):
-		bom = frappe.get_cached_doc("BOM", self.name)
+		bom = get_bom_structure(self.name, with_item_details=False)
 		self.item_code = bom.item
 		self.bom_qty = bom.quantity
 
 		for item in bom.get("items", []):
 			qty = item.stock_qty / bom.quantity  # quantity per unit
 			exploded_qty = self.exploded_qty * qty
-			if item.bom_no:
-				child = BOMTree(item.bom_no, exploded_qty=exploded_qty, qty=qty)
+			if item.value:
+				child = BOMTree(item.value, exploded_qty=exploded_qty, qty=qty)
 				self.child_items.append(child)
 			else:
 				self.child_items.append(
@@ -270,6 +275,7 @@ class BOM(WebsiteGenerator):
 
 	def on_update(self):
 		frappe.cache().hdel("bom_children", self.name)
+		clear_bom_explosion_cache([self.name])
 		self.check_recursion()
 
 	def on_submit(self):
@@ -279,6 +285,7 @@ class BOM(WebsiteGenerator):
 	def on_cancel(self):
 		self.db_set("is_active", 0)
 		self.db_set("is_default", 0)
+		clear_bom_explosion_cache([self.name])
 
 		# check if used in any other bom
 		self.validate_bom_links()
@@ -304,6 +311,7 @@ class BOM(WebsiteGenerator):
 	def on_update_after_submit(self):
 		self.validate_bom_links()
 		self.manage_default_bom()
+		clear_bom_explosion_cache([self.name])
 
 	def get_item_det(self, item_code):
 		item = get_item_details(item_code)
@@ -859,6 +867,8 @@ class BOM(WebsiteGenerator):
 				# Only db_update if changed
 				row.db_update()
 
+		clear_bom_explosion_cache([self.name])
+
 	def get_rm_rate_map(self) -> dict[str, float]:
 		"Create Raw Material-Rate map for Exploded Items. Fetch rate from Items table or Subassembly BOM."
 		rm_rate_map = {}
@@ -887,6 +897,10 @@ class BOM(WebsiteGenerator):
 	def get_exploded_items(self):
 		"""Get all raw materials including items from child bom"""
 		self.cur_exploded_items = {}
+
+		# read the explosions of all the sub-assemblies at once
+		get_bom_explosions([d.bom_no for d in self.get("items") if d.bom_no])
+
 		for d in self.get("items"):
 			if d.bom_no:
 				self.get_child_exploded_items(d.bom_no, d.stock_qty)
@@ -920,32 +934,7 @@ class BOM(WebsiteGenerator):
 
 	def get_child_exploded_items(self, bom_no, stock_qty):
 		"""Add all items from Flat BOM of child BOM"""
-		# Did not use qty_consumed_per_unit in the query, as it leads to rounding loss
-		child_fb_items = frappe.db.sql(
-			"""
-			SELECT
-				bom_item.item_code,
-				bom_item.item_name,
-				bom_item.description,
-				bom_item.source_warehouse,
-				bom_item.operation,
-				bom_item.stock_uom,
-				bom_item.stock_qty,
-				bom_item.rate,
-				bom_item.include_item_in_manufacturing,
-				bom_item.sourced_by_supplier,
-				bom_item.stock_qty / ifnull(bom.quantity, 1) AS qty_consumed_per_unit
-			FROM `tabBOM Explosion Item` bom_item, `tabBOM` bom
-			WHERE
-				bom_item.parent = bom.name
-				AND bom.name = %s
-				AND bom.docstatus = 1
-		""",
-			bom_no,
-			as_dict=1,
-		)
-
-		for d in child_fb_items:
+		for d in get_bom_explosions([bom_no])[bom_no]:
 			self.add_to_cur_exploded_items(
 				frappe._dict(
 					{
@@ -981,6 +970,9 @@ class BOM(WebsiteGenerator):
 			if save:
 				ch.db_insert()
 
+		if save:
+			clear_bom_explosion_cache([self.name])
+
 	def validate_bom_links(self):
 		if not self.is_active:
 			act_pbom = frappe.db.sql(
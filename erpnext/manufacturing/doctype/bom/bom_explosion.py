@@ -0,0 +1,189 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# License: GNU General Public License v3. See license.txt
+
+"""Memoized BOM explosions.
+
+A submitted BOM keeps its raw materials flattened over all levels in its BOM Explosion Items.
+The per unit explosion and the direct children of a BOM are read once and cached, so that
+sub-assemblies shared by many BOMs are not read again for every BOM they are a part of.
+A BOM is removed from the cache when it changes. The BOM Update Tool removes the BOM replaced
+and all its ancestors (`get_ancestor_boms`), whose items and explosions it updates. Renaming an
+item removes the BOMs it is a part of. The details of the items in a BOM structure are not
+cached, they are read from the Item unless the caller does not need them."""
+
+import frappe
+from frappe import _
+from frappe.utils import flt
+
+# BOM: raw materials to make one unit of its item
+BOM_EXPLOSION_CACHE_KEY = "bom_explosion"
+
+# BOM: item, quantity and the rows of its items
+BOM_STRUCTURE_CACHE_KEY = "bom_structure"
+
+ITEM_FIELDS = ("item_name", "description", "stock_uom", "is_sub_contracted_item")
+
+
+def get_bom_explosions(boms: list[str]) -> dict[str, list[dict]]:
+	"""Per unit raw materials of each of the submitted BOMs. The BOMs not cached yet are
+	read with one query."""
+
+	explosions = {}
+	for bom in set(boms):
+		explosion = frappe.cache().hget(BOM_EXPLOSION_CACHE_KEY, bom)
+		if explosion is not None:
+			explosions[bom] = explosion
+
+	if missing_boms := list(set(boms) - set(explosions)):
+		bom = frappe.qb.DocType("BOM")
+		bom_explosion_item = frappe.qb.DocType("BOM Explosion Item")
+		rows = (
+			frappe.qb.from_(bom_explosion_item)
+			.join(bom)
+			.on(bom_explosion_item.parent == bom.name)
+			.select(
+				bom_explosion_item.parent,
+				bom_explosion_item.item_code,
+				bom_explosion_item.item_name,
+				bom_explosion_item.description,
+				bom_explosion_item.source_warehouse,
+				bom_explosion_item.operation,
+				bom_explosion_item.stock_uom,
+				bom_explosion_item.stock_qty,
+				bom_explosion_item.rate,
+				bom_explosion_item.include_item_in_manufacturing,
+				bom_explosion_item.sourced_by_supplier,
+				bom.quantity,
+			)
+			.where((bom.name.isin(missing_boms)) & (bom.docstatus == 1))
+			.orderby(bom_explosion_item.idx)
+		).run(as_dict=True)
+
+		for bom in missing_boms:
+			explosions[bom] = []
+
+		for row in rows:
+			# qty_consumed_per_unit of the rows is rounded, see get_child_exploded_items
+			row.qty_consumed_per_unit = flt(row.stock_qty) / (flt(row.pop("quantity")) or 1)
+			explosions[row.pop("parent")].append(row)
+
+		for bom in missing_boms:
+			frappe.cache().hset(BOM_EXPLOSION_CACHE_KEY, bom, explosions[bom])
+
+	return explosions
+
+
+def explode_boms(boms_and_qty: list[tuple[str, float]]) -> dict[str, frappe._dict]:
+	"""Raw materials to make the qty of the item of each BOM, summed up by item code
+	over all the BOMs. Each raw material has the `stock_qty` required."""
+
+	explosions = get_bom_explosions([bom for bom, _qty in boms_and_qty])
+
+	items = {}
+	for bom, qty in boms_and_qty:
+		for row in explosions[bom]:
+			stock_qty = row["qty_consumed_per_unit"] * flt(qty)
+			if row["item_code"] in items:
+				items[row["item_code"]].stock_qty += stock_qty
+			else:
+				items[row["item_code"]] = frappe._dict(row, stock_qty=stock_qty)
+
+	return items
+
+
+def get_bom_structures(boms: list[str], with_item_details: bool = True) -> dict[str, frappe._dict]:
+	"""Item, quantity and items of each of the BOMs, as in `get_children` of BOM. The BOMs
+	not cached yet are read with a query for their BOMs and one for their items. With
+	`with_item_details`, the details of the items of all the BOMs are read with one more query."""
+
+	structures = {}
+	for bom in set(boms):
+		structure = frappe.cache().hget(BOM_STRUCTURE_CACHE_KEY, bom)
+		if structure is not None:
+			structures[bom] = structure
+
+	if missing_boms := list(set(boms) - set(structures)):
+		for d in frappe.get_all(
+			"BOM", filters={"name": ("in", missing_boms)}, fields=["name", "item", "quantity"]
+		):
+			structures[d.name] = frappe._dict(item=d.item, quantity=d.quantity, items=[])
+
+		bom_item = frappe.qb.DocType("BOM Item")
+		rows = (
+			frappe.qb.from_(bom_item)
+			.select(
+				bom_item.parent,
+				bom_item.item_code,
+				bom_item.bom_no.as_("value"),
+				bom_item.stock_qty,
+			)
+			.where((bom_item.parent.isin(missing_boms)) & (bom_item.parenttype == "BOM"))
+			.orderby(bom_item.parent)
+			.orderby(bom_item.idx)
+		).run(as_dict=True)
+
+		for row in rows:
+			if structure := structures.get(row.pop("parent")):
+				row.parent_bom_qty = structure.quantity
+				row.expandable = 1 if row.value else 0
+				structure["items"].append(row)
+
+		for bom in missing_boms:
+			if bom in structures:
+				frappe.cache().hset(BOM_STRUCTURE_CACHE_KEY, bom, structures[bom])
+
+	if with_item_details:
+		set_item_details([row for structure in structures.values() for row in structure["items"]])
+
+	return structures
+
+
+def set_item_details(rows, item_code_field: str = "item_code") -> None:
+	"""Set the `ITEM_FIELDS` of the rows from their Item, read with one query"""
+
+	if not rows:
+		return
+
+	items = {
+		d.name: d
+		for d in frappe.get_all(
+			"Item",
+			filters={"name": ("in", list({row[item_code_field] for row in rows}))},
+			fields=["name", *ITEM_FIELDS],
+		)
+	}
+
+	for row in rows:
+		item = items.get(row[item_code_field]) or {}
+		for field in ITEM_FIELDS:
+			row[field] = item.get(field)
+
+
+def get_bom_structure(bom: str, with_item_details: bool = True) -> frappe._dict:
+	if structure := get_bom_structures([bom], with_item_details=with_item_details).get(bom):
+		return structure
+
+	frappe.throw(_("BOM {0} not found").format(bom), frappe.DoesNotExistError)
+
+
+def clear_bom_explosion_cache(boms: list[str]) -> None:
+	for bom in boms:
+		frappe.cache().hdel(BOM_EXPLOSION_CACHE_KEY, bom)
+		frappe.cache().hdel(BOM_STRUCTURE_CACHE_KEY, bom)
+
+
+def clear_item_bom_explosion_cache(item_code: str) -> None:
+	"""Remove the BOMs of the item and the BOMs it is a raw material or sub-assembly of"""
+
+	boms = set(frappe.get_all("BOM", filters={"item": item_code}, pluck="name"))
+	for doctype in ("BOM Item", "BOM Explosion Item"):
+		boms.update(
+			frappe.get_all(
+				doctype,
+				filters={"item_code": item_code, "parenttype": "BOM"},
+				pluck="parent",
+				distinct=True,
+			)
+		)
+
+	clear_bom_explosion_cache(list(boms))
@@ -13,6 +13,11 @@ from erpnext.controllers.tests.test_subcontracting_controller import (
 	set_backflush_based_on,
 )
 from erpnext.manufacturing.doctype.bom.bom import BOMRecursionError, item_query, make_variant_bom
+from erpnext.manufacturing.doctype.bom.bom_explosion import (
+	explode_boms,
+	get_bom_explosions,
+	get_bom_structure,
+)
 from erpnext.manufacturing.doctype.bom_update_log.test_bom_update_log import (
 	update_cost_in_all_boms_in_test,
 )
@@ -352,6 +357,63 @@ class TestBOM(IntegrationTestCase):
 		for reqd_item, created_item in zip(reqd_order, created_order, strict=False):
 			self.assertEqual(reqd_item, created_item.item_code)
 
+	def test_bom_explosions(self):
+		bom_tree = {
+			"Explosion Assembly": {
+				"Explosion SubAssembly": {"Explosion Part 1": {}, "Explosion Part 2": {}},
+				"Explosion Part 1": {},
+			}
+		}
+		parent_bom = create_nested_bom(bom_tree)
+		sub_assembly_bom = parent_bom.items[0].bom_no
+
+		explosions = get_bom_explosions([parent_bom.name, sub_assembly_bom])
+		self.assertEqual(
+			{d["item_code"]: d["qty_consumed_per_unit"] for d in explosions[parent_bom.name]},
+			{"_Test bom Explosion Part 1": 2, "_Test bom Explosion Part 2": 1},
+		)
+
+		items = explode_boms([(parent_bom.name, 2), (sub_assembly_bom, 3)])
+		self.assertEqual(items["_Test bom Explosion Part 1"].stock_qty, 7)
+		self.assertEqual(items["_Test bom Explosion Part 2"].stock_qty, 5)
+
+		structure = get_bom_structure(parent_bom.name)
+		self.assertEqual(structure.item, "_Test bom Explosion Assembly")
+		self.assertEqual([d.value for d in structure["items"]], [sub_assembly_bom, None])
+
+		# the cached explosion is cleared when the BOM changes
+		frappe.db.set_value("BOM Item", {"parent": sub_assembly_bom, "idx": 1}, "stock_qty", 2)
+		sub_assembly = frappe.get_doc("BOM", sub_assembly_bom)
+		sub_assembly.update_exploded_items()
+		explosion = get_bom_explosions([sub_assembly_bom])[sub_assembly_bom]
+		self.assertEqual(explosion[0]["item_code"], "_Test bom Explosion Part 1")
+		self.assertEqual(explosion[0]["qty_consumed_per_unit"], 2)
+
+		self.assertRaises(frappe.DoesNotExistError, get_bom_structure, "_Test BOM Does Not Exist")
+
+	def test_bom_structure_after_item_changes(self):
+		bom_tree = {"Structure Assembly": {"Structure Part 1": {}, "Structure Part 2": {}}}
+		parent_bom = create_nested_bom(bom_tree)
+		get_bom_structure(parent_bom.name)
+		get_bom_explosions([parent_bom.name])
+
+		# the item details are read from the item
+		frappe.db.set_value("Item", "_Test bom Structure Part 1", "item_name", "_Test Structure Part Renamed")
+		structure = get_bom_structure(parent_bom.name)
+		self.assertEqual(structure["items"][0].item_name, "_Test Structure Part Renamed")
+
+		# the BOMs of a renamed item are read again
+		frappe.rename_doc("Item", "_Test bom Structure Part 2", "_Test bom Structure Part 3", force=True)
+		structure = get_bom_structure(parent_bom.name)
+		self.assertEqual(
+			[d.item_code for d in structure["items"]],
+			["_Test bom Structure Part 1", "_Test bom Structure Part 3"],
+		)
+		self.assertIn(
+			"_Test bom Structure Part 3",
+			[d["item_code"] for d in get_bom_explosions([parent_bom.name])[parent_bom.name]],
+		)
+
 	@timeout
 	def test_generated_variant_bom(self):
 		from erpnext.controllers.item_variant import create_variant
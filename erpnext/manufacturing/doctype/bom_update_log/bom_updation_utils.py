@@ -12,6 +12,8 @@ if TYPE_CHECKING:
 import frappe
 from frappe import _
 
+from erpnext.manufacturing.doctype.bom.bom_explosion import clear_bom_explosion_cache
+
 
 def replace_bom(boms: dict, log_name: str) -> None:
 	"Replace current BOM with new BOM in parent BOMs."
@@ -24,6 +26,7 @@ def replace_bom(boms: dict, log_name: str) -> None:
 
 	frappe.cache().delete_key("bom_children")
 	parent_boms = get_ancestor_boms(new_bom)
+	clear_bom_explosion_cache([current_bom, new_bom, *parent_boms])
 
 	for bom in parent_boms:
 		bom_obj = frappe.get_doc("BOM", bom)
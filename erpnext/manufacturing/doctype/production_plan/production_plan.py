@@ -23,8 +23,13 @@ from frappe.utils import (
 from frappe.utils.csvutils import build_csv_response
 from pypika.terms import ExistsCriterion
 
-from erpnext.manufacturing.doctype.bom.bom import get_children as get_bom_children
 from erpnext.manufacturing.doctype.bom.bom import validate_bom_no
+from erpnext.manufacturing.doctype.bom.bom_explosion import (
+	explode_boms,
+	get_bom_explosions,
+	get_bom_structure,
+	set_item_details,
+)
 from erpnext.manufacturing.doctype.work_order.work_order import get_item_details
 from erpnext.setup.doctype.item_group.item_group import get_item_group_defaults
 from erpnext.stock.get_item_details import get_conversion_factor
@@ -1128,46 +1133,49 @@ def download_raw_materials(doc, warehouses=None):
 
 
 def get_exploded_items(item_details, company, bom_no, include_non_stock_items, planned_qty=1, doc=None):
-	bei = frappe.qb.DocType("BOM Explosion Item")
-	bom = frappe.qb.DocType("BOM")
+	exploded_items = explode_boms([(bom_no, planned_qty)])
+	if not exploded_items:
+		return item_details
+
 	item = frappe.qb.DocType("Item")
 	item_default = frappe.qb.DocType("Item Default")
 	item_uom = frappe.qb.DocType("UOM Conversion Detail")
 
-	data = (
-		frappe.qb.from_(bei)
-		.join(bom)
-		.on(bom.name == bei.parent)
-		.join(item)
-		.on(item.name == bei.item_code)
+	items = (
+		frappe.qb.from_(item)
 		.left_join(item_default)
 		.on((item_default.parent == item.name) & (item_default.company == company))
 		.left_join(item_uom)
 		.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
 		.select(
-			(IfNull(Sum(bei.stock_qty / IfNull(bom.quantity, 1)), 0) * planned_qty).as_("qty"),
 			item.item_name,
 			item.name.as_("item_code"),
-			bei.description,
-			bei.stock_uom,
 			item.min_order_qty,
-			bei.source_warehouse,
 			item.default_material_request_type,
-			item.min_order_qty,
 			item_default.default_warehouse,
 			item.purchase_uom,
 			item_uom.conversion_factor,
 			item.safety_stock,
 		)
 		.where(
-			(bei.docstatus < 2)
-			& (bom.name == bom_no)
+			(item.name.isin(list(exploded_items)))
 			& (item.is_stock_item.isin([0, 1]) if include_non_stock_items else item.is_stock_item == 1)
 		)
-		.groupby(bei.item_code, bei.stock_uom)
 	).run(as_dict=True)
+	items = {d.item_code: d for d in items}
 
-	for d in data:
+	for item_code, exploded_item in exploded_items.items():
+		if not (d := items.get(item_code)):
+			continue
+
+		d.update(
+			{
+				"qty": exploded_item.stock_qty,
+				"description": exploded_item.description,
+				"stock_uom": exploded_item.stock_uom,
+				"source_warehouse": exploded_item.source_warehouse,
+			}
+		)
 		if not d.conversion_factor and d.purchase_uom:
 			d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
 		item_details.setdefault(d.get("item_code"), d)
@@ -1519,6 +1527,16 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 		for d in doc.get("sub_assembly_items"):
 			sub_assembly_items.setdefault((d.get("production_item"), d.get("bom_no")), d.get("qty"))
 
+	# read the explosions of the BOMs of all the exploded rows at once
+	get_bom_explosions(
+		[
+			bom_no
+			for row in po_items
+			if (row.get("include_exploded_items") or doc.get("sub_assembly_items"))
+			and (bom_no := row.get("bom") or row.get("bom_no"))
+		]
+	)
+
 	for data in po_items:
 		if not data.get("include_exploded_items") and doc.get("sub_assembly_items"):
 			data["include_exploded_items"] = 1
@@ -1723,10 +1741,11 @@ def get_item_data(item_code):
 
 
 def get_sub_assembly_items(bom_no, bom_data, to_produce_qty, company, warehouse=None, indent=0):
-	data = get_bom_children(parent=bom_no)
-	for d in data:
+	start = len(bom_data)
+	bom = get_bom_structure(bom_no, with_item_details=False)
+	for d in bom["items"]:
 		if d.expandable:
-			parent_item_code = frappe.get_cached_value("BOM", bom_no, "item")
+			parent_item_code = bom.item
 			stock_qty = (d.stock_qty / d.parent_bom_qty) * flt(to_produce_qty)
 
 			if warehouse:
@@ -1745,13 +1764,8 @@ def get_sub_assembly_items(bom_no, bom_data, to_produce_qty, company, warehouse=
 					frappe._dict(
 						{
 							"parent_item_code": parent_item_code,
-							"description": d.description,
 							"production_item": d.item_code,
-							"item_name": d.item_name,
-							"stock_uom": d.stock_uom,
-							"uom": d.stock_uom,
 							"bom_no": d.value,
-							"is_sub_contracted_item": d.is_sub_contracted_item,
 							"bom_level": indent,
 							"indent": indent,
 							"stock_qty": stock_qty,
@@ -1764,6 +1778,13 @@ def get_sub_assembly_items(bom_no, bom_data, to_produce_qty, company, warehouse=
 						d.value, bom_data, stock_qty, company, warehouse, indent=indent + 1
 					)
 
+	if not indent:
+		# the item details of all the levels, read with one query
+		rows = bom_data[start:]
+		set_item_details(rows, item_code_field="production_item")
+		for row in rows:
+			row.uom = row.stock_uom
+
 
 def set_default_warehouses(row, default_warehouses):
 	for field in ["wip_warehouse", "fg_warehouse"]:
@@ -1340,6 +1340,33 @@ class TestProductionPlan(IntegrationTestCase):
 				self.assertTrue(row.warehouse == mrp_warhouse)
 				self.assertEqual(row.quantity, 12.0)
 
+	def test_mr_qty_for_exploded_items(self):
+		from erpnext.manufacturing.doctype.bom.test_bom import create_nested_bom
+
+		bom_tree = {
+			"Test Exploded FG": {
+				"Test Exploded SubAssy": {"Test Exploded Item1": {}, "Test Exploded Item2": {}},
+				"Test Exploded Item1": {},
+			}
+		}
+		parent_bom = create_nested_bom(bom_tree, prefix="")
+
+		plan = create_production_plan(
+			item_code=parent_bom.item,
+			planned_qty=3,
+			include_subcontracted_items=1,
+			skip_getting_mr_items=1,
+			do_not_save=1,
+			warehouse="_Test Warehouse - _TC",
+		)
+		plan.po_items[0].include_exploded_items = 1
+
+		items = get_items_for_material_requests(plan.as_dict(), warehouses=[])
+		self.assertEqual(
+			{row["item_code"]: row["quantity"] for row in items},
+			{"Test Exploded Item1": 6, "Test Exploded Item2": 3},
+		)
+
 	def test_mr_qty_for_complex_bom(self):
 		from erpnext.manufacturing.doctype.bom.test_bom import create_nested_bom
 		from erpnext.stock.doctype.warehouse.test_warehouse import create_warehouse
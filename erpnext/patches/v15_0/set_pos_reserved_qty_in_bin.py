@@ -0,0 +1,31 @@
+import frappe
+from frappe.query_builder.functions import IfNull, Sum
+from frappe.utils import flt
+
+from erpnext.stock.utils import get_or_make_bin
+
+
+def execute():
+	pos_invoice = frappe.qb.DocType("POS Invoice")
+	pos_invoice_item = frappe.qb.DocType("POS Invoice Item")
+
+	reserved_qty = (
+		frappe.qb.from_(pos_invoice)
+		.join(pos_invoice_item)
+		.on(pos_invoice.name == pos_invoice_item.parent)
+		.select(pos_invoice_item.item_code, pos_invoice_item.warehouse, Sum(pos_invoice_item.stock_qty))
+		.where(
+			(pos_invoice.docstatus == 1)
+			& (IfNull(pos_invoice.consolidated_invoice, "") == "")
+			& (IfNull(pos_invoice_item.warehouse, "") != "")
+		)
+		.groupby(pos_invoice_item.item_code, pos_invoice_item.warehouse)
+	).run()
+
+	for item_code, warehouse, qty in reserved_qty:
+		if not flt(qty) or not frappe.get_cached_value("Item", item_code, "is_stock_item"):
+			continue
+
+		frappe.db.set_value(
+			"Bin", get_or_make_bin(item_code, warehouse), "pos_reserved_qty", flt(qty), update_modified=False
+		)
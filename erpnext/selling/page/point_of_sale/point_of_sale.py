@@ -5,13 +5,22 @@
 import json
 
 import frappe
-from frappe.utils import cint
+from frappe import _
+from frappe.utils import cint, cstr, flt, now_datetime
 from frappe.utils.nestedset import get_root_of
 
-from erpnext.accounts.doctype.pos_invoice.pos_invoice import get_stock_availability
+from erpnext.accounts.doctype.pos_invoice.pos_invoice import (
+	get_stock_availability,
+	get_stock_availability_for_items,
+)
 from erpnext.accounts.doctype.pos_profile.pos_profile import get_child_nodes, get_item_groups
 from erpnext.stock.utils import scan_barcode
 
+POS_CATALOG_CACHE_KEY = "erpnext:pos_catalog"
+
+# the snapshot of a POS profile is rebuilt after this, clients sync the changes in between
+POS_CATALOG_EXPIRY = 24 * 60 * 60
+
 
 def search_by_term(search_term, warehouse, price_list):
 	result = search_for_serial_or_batch_or_barcode_number(search_term) or {}
@@ -105,12 +114,53 @@ def get_items(start, page_length, price_list, item_group, pos_profile, search_te
 		if result:
 			return result
 
+	items_data = get_items_data(
+		item_group, pos_profile, search_term, warehouse, hide_unavailable_items, page_length, start=start
+	)
+
+	# return (empty) list if there are no results
+	if not items_data:
+		return result
+
+	return {"items": get_items_details(items_data, warehouse, price_list)}
+
+
+@frappe.whitelist()
+def get_catalog_items(price_list, item_group, pos_profile, search_term="", after=None, page_length=40):
+	"""A page of the items of the POS profile ordered by item code, starting after the item
+	code `after`. Pass the returned `next` as `after` for the following page."""
+	warehouse, hide_unavailable_items = frappe.db.get_value(
+		"POS Profile", pos_profile, ["warehouse", "hide_unavailable_items"]
+	)
+
+	if search_term and not after:
+		result = search_by_term(search_term, warehouse, price_list)
+		if result:
+			return {**result, "next": None}
+
+	items_data = get_items_data(
+		item_group, pos_profile, search_term, warehouse, hide_unavailable_items, page_length, after=after
+	)
+
+	return {
+		"items": get_items_details(items_data, warehouse, price_list),
+		"next": items_data[-1].item_code if len(items_data) == cint(page_length) else None,
+	}
+
+
+def get_items_data(
+	item_group, pos_profile, search_term, warehouse, hide_unavailable_items, page_length, start=0, after=None
+):
 	if not frappe.db.exists("Item Group", item_group):
 		item_group = get_root_of("Item Group")
 
 	condition = get_conditions(search_term)
 	condition += get_item_group_condition(pos_profile)
 
+	# keyset pagination does not have to skip the rows of the previous pages
+	if after:
+		condition += " and item.name > %(after)s"
+
 	lft, rgt = frappe.db.get_value("Item Group", item_group, ["lft", "rgt"])
 
 	bin_join_selection, bin_join_condition = "", ""
@@ -120,7 +170,7 @@ def get_items(start, page_length, price_list, item_group, pos_profile, search_te
 			"AND bin.warehouse = %(warehouse)s AND bin.item_code = item.name AND bin.actual_qty > 0"
 		)
 
-	items_data = frappe.db.sql(
+	return frappe.db.sql(
 		"""
 		SELECT
 			item.name AS item_code,
@@ -151,29 +201,48 @@ def get_items(start, page_length, price_list, item_group, pos_profile, search_te
 			bin_join_selection=bin_join_selection,
 			bin_join_condition=bin_join_condition,
 		),
-		{"warehouse": warehouse},
+		{"warehouse": warehouse, "after": after},
 		as_dict=1,
 	)
 
-	# return (empty) list if there are no results
+
+def get_items_details(items_data, warehouse, price_list):
+	"""Rows of the items for each of their prices, with the UOMs, prices and stock of all the
+	items read with a query each"""
 	if not items_data:
-		return result
+		return []
+
+	item_codes = [d.item_code for d in items_data]
+	stock_availability = get_stock_availability_for_items(item_codes, warehouse)
+
+	uoms_by_item = {}
+	for d in frappe.get_all(
+		"UOM Conversion Detail",
+		filters={"parent": ("in", item_codes), "parenttype": "Item"},
+		fields=["parent", "uom", "conversion_factor"],
+	):
+		uoms_by_item.setdefault(d.parent, []).append(d)
+
+	prices_by_item = {}
+	for d in frappe.get_all(
+		"Item Price",
+		fields=["item_code", "price_list_rate", "currency", "uom", "batch_no"],
+		filters={
+			"price_list": price_list,
+			"item_code": ("in", item_codes),
+			"selling": True,
+		},
+	):
+		prices_by_item.setdefault(d.item_code, []).append(d)
 
+	result = []
 	for item in items_data:
-		uoms = frappe.get_doc("Item", item.item_code).get("uoms", [])
+		uoms = uoms_by_item.get(item.item_code, [])
 
-		item.actual_qty, _ = get_stock_availability(item.item_code, warehouse)
+		item.actual_qty, _ = stock_availability[item.item_code]
 		item.uom = item.stock_uom
 
-		item_price = frappe.get_all(
-			"Item Price",
-			fields=["price_list_rate", "currency", "uom", "batch_no"],
-			filters={
-				"price_list": price_list,
-				"item_code": item.item_code,
-				"selling": True,
-			},
-		)
+		item_price = prices_by_item.get(item.item_code, [])
 
 		if not item_price:
 			result.append(item)
@@ -193,7 +262,257 @@ def get_items(start, page_length, price_list, item_group, pos_profile, search_te
 					"batch_no": price.batch_no,
 				}
 			)
-	return {"items": result}
+
+	return result
+
+
+@frappe.whitelist()
+def get_pos_catalog(pos_profile, modified_since=None):
+	"""Items, prices and barcodes of the POS profile for the client to keep. Without
+	`modified_since` the snapshot of the profile is returned, built once and cached for
+	`POS_CATALOG_EXPIRY`. With it only the changes after it are returned, and `synced_at`
+	of the response is the `modified_since` of the next sync."""
+	if modified_since:
+		return build_pos_catalog(pos_profile, modified_since)
+
+	key = f"{POS_CATALOG_CACHE_KEY}:{pos_profile}"
+	catalog = frappe.cache.get_value(key)
+	if not catalog:
+		catalog = build_pos_catalog(pos_profile)
+		frappe.cache.set_value(key, catalog, expires_in_sec=POS_CATALOG_EXPIRY)
+
+	return catalog
+
+
+def build_pos_catalog(pos_profile, modified_since=None):
+	# changes made while the catalog is read are sent again in the next sync
+	synced_at = str(now_datetime())
+	price_list = frappe.get_cached_value("POS Profile", pos_profile, "selling_price_list")
+
+	values = {"price_list": price_list, "modified_since": modified_since}
+	item_group_condition = get_item_group_condition(pos_profile)
+	item_modified_condition = "and item.modified > %(modified_since)s" if modified_since else ""
+
+	# items modified since the last sync are read from all item groups, so that the items
+	# moved out of the item groups of the profile are sent as removed
+	item_condition = item_modified_condition or f"and item.disabled = 0 {item_group_condition}"
+
+	items = frappe.db.sql(
+		f"""
+		SELECT
+			item.name AS item_code,
+			item.item_name,
+			item.description,
+			item.stock_uom,
+			item.image AS item_image,
+			item.is_stock_item,
+			item.item_group,
+			(item.disabled = 0 AND item.has_variants = 0 AND item.is_sales_item = 1
+				AND item.is_fixed_asset = 0 {item_group_condition}) AS is_pos_item
+		FROM
+			`tabItem` item
+		WHERE
+			1 = 1 {item_condition}
+		ORDER BY
+			item.name asc""",
+		values,
+		as_dict=1,
+	)
+
+	catalog_items, removed_items = [], []
+	for d in items:
+		if d.pop("is_pos_item"):
+			catalog_items.append(d)
+		elif modified_since:
+			removed_items.append(d.item_code)
+
+	# UOMs and barcodes are sent for all the items sent, they change with their item
+	uoms = frappe.db.sql(
+		f"""
+		SELECT uom.parent AS item_code, uom.uom, uom.conversion_factor
+		FROM `tabUOM Conversion Detail` uom
+		{get_catalog_item_join("uom.parent", item_group_condition, item_modified_condition)}
+		WHERE uom.parenttype = 'Item'""",
+		values,
+		as_dict=1,
+	)
+	barcodes = frappe.db.sql(
+		f"""
+		SELECT barcode.parent AS item_code, barcode.barcode, barcode.uom
+		FROM `tabItem Barcode` barcode
+		{get_catalog_item_join("barcode.parent", item_group_condition, item_modified_condition)}
+		WHERE barcode.parenttype = 'Item'""",
+		values,
+		as_dict=1,
+	)
+	# items sent again, which may have just been added to the profile, are sent with all their prices
+	price_modified_condition = (
+		"AND (price.modified > %(modified_since)s OR item.modified > %(modified_since)s)"
+		if modified_since
+		else ""
+	)
+	prices = frappe.db.sql(
+		f"""
+		SELECT price.name, price.item_code, price.uom, price.batch_no, price.price_list_rate, price.currency
+		FROM `tabItem Price` price
+		{get_catalog_item_join("price.item_code", item_group_condition)}
+		WHERE price.price_list = %(price_list)s AND price.selling = 1
+			{price_modified_condition}""",
+		values,
+		as_dict=1,
+	)
+
+	removed_prices = []
+	if modified_since:
+		removed_prices = frappe.get_all(
+			"Deleted Document",
+			filters={"deleted_doctype": "Item Price", "creation": (">", modified_since)},
+			pluck="deleted_name",
+		)
+
+	return {
+		"synced_at": synced_at,
+		"items": catalog_items,
+		"uoms": uoms,
+		"barcodes": barcodes,
+		"prices": prices,
+		"removed_items": removed_items,
+		"removed_prices": removed_prices,
+	}
+
+
+def get_catalog_item_join(item_code_field, item_group_condition, item_modified_condition=""):
+	return f"""INNER JOIN `tabItem` item ON item.name = {item_code_field}
+		AND item.disabled = 0 AND item.has_variants = 0 AND item.is_sales_item = 1
+		AND item.is_fixed_asset = 0 {item_group_condition} {item_modified_condition}"""
+
+
+@frappe.whitelist()
+def get_items_stock_availability(item_codes, warehouse):
+	"""Available qty of the items in the warehouse, net of the qty sold in unconsolidated POS Invoices"""
+	if isinstance(item_codes, str):
+		item_codes = json.loads(item_codes)
+
+	return {
+		item_code: {"actual_qty": actual_qty, "is_stock_item": is_stock_item}
+		for item_code, (actual_qty, is_stock_item) in get_stock_availability_for_items(
+			item_codes, warehouse
+		).items()
+	}
+
+
+@frappe.whitelist(methods=["POST"])
+def sync_pos_invoices(pos_profile, invoices):
+	"""Create and submit the POS Invoices queued by a POS while it was offline, in one
+	transaction. Each invoice needs an `idempotency_key` generated by the POS, an invoice
+	synced before with the key is not created again. Returns the result of each invoice."""
+	if isinstance(invoices, str):
+		invoices = json.loads(invoices)
+
+	frappe.has_permission("POS Invoice", "submit", throw=True)
+
+	pos_profile = frappe.get_cached_doc("POS Profile", pos_profile)
+	validate_pos_profile_for_sync(pos_profile)
+
+	keys = [d.get("idempotency_key") for d in invoices if d.get("idempotency_key")]
+	synced_invoices = {}
+	if keys:
+		synced_invoices = frappe._dict(
+			frappe.get_all(
+				"POS Invoice",
+				filters={"idempotency_key": ("in", keys)},
+				fields=["idempotency_key", "name"],
+				as_list=True,
+			)
+		)
+
+	stock_availability_validated = validate_batch_stock_availability(pos_profile, invoices)
+
+	results = []
+	for invoice in invoices:
+		key = invoice.get("idempotency_key")
+		if not key:
+			results.append(
+				{"idempotency_key": key, "status": "Failed", "error": _("Idempotency Key is missing")}
+			)
+			continue
+
+		if key in synced_invoices:
+			results.append({"idempotency_key": key, "name": synced_invoices[key], "status": "Synced"})
+			continue
+
+		frappe.db.savepoint("sync_pos_invoice")
+		try:
+			doc = frappe.get_doc(
+				{
+					**{k: v for k, v in invoice.items() if k not in ("name", "consolidated_invoice")},
+					"doctype": "POS Invoice",
+					"pos_profile": pos_profile.name,
+					"is_pos": 1,
+					"docstatus": 1,
+				}
+			)
+			doc.flags.stock_availability_validated = stock_availability_validated
+			# inserted as submitted, so that it is validated once
+			doc.insert()
+		except Exception as e:
+			frappe.db.rollback(save_point="sync_pos_invoice")
+			frappe.clear_messages()
+
+			# synced by another request meanwhile
+			if isinstance(e, frappe.UniqueValidationError) and (
+				name := frappe.db.get_value("POS Invoice", {"idempotency_key": key})
+			):
+				results.append({"idempotency_key": key, "name": name, "status": "Synced"})
+			else:
+				results.append({"idempotency_key": key, "status": "Failed", "error": cstr(e)})
+		else:
+			synced_invoices[key] = doc.name
+			results.append({"idempotency_key": key, "name": doc.name, "status": "Created"})
+
+	return results
+
+
+def validate_pos_profile_for_sync(pos_profile):
+	if pos_profile.disabled:
+		frappe.throw(_("POS Profile {0} is disabled").format(pos_profile.name))
+
+	if pos_profile.selling_price_list and not frappe.get_cached_value(
+		"Price List", pos_profile.selling_price_list, "enabled"
+	):
+		frappe.throw(_("Price List {0} is disabled").format(pos_profile.selling_price_list))
+
+	if pos_profile.taxes_and_charges and frappe.get_cached_value(
+		"Sales Taxes and Charges Template", pos_profile.taxes_and_charges, "disabled"
+	):
+		frappe.throw(
+			_("Sales Taxes and Charges Template {0} is disabled").format(pos_profile.taxes_and_charges)
+		)
+
+
+def validate_batch_stock_availability(pos_profile, invoices):
+	"""Whether the stock sold in all the invoices is available, in which case it need not be
+	checked for each invoice"""
+	qty_by_warehouse = {}
+	for invoice in invoices:
+		if invoice.get("is_return"):
+			continue
+
+		for d in invoice.get("items") or []:
+			warehouse = d.get("warehouse") or invoice.get("set_warehouse") or pos_profile.warehouse
+			qty = qty_by_warehouse.setdefault(warehouse, {})
+			qty[d.get("item_code")] = qty.get(d.get("item_code"), 0) + (
+				flt(d.get("stock_qty")) or flt(d.get("qty")) * (flt(d.get("conversion_factor")) or 1)
+			)
+
+	for warehouse, qty in qty_by_warehouse.items():
+		for item_code, (available_qty, is_stock_item) in get_stock_availability_for_items(
+			list(qty), warehouse
+		).items():
+			if is_stock_item and flt(available_qty) < qty[item_code]:
+				return False
+
+	return True
 
 
 @frappe.whitelist()
@@ -4,9 +4,14 @@
 
 import frappe
 from frappe import _, scrub
+from frappe.query_builder.functions import Max, Sum
 from frappe.utils import add_days, add_to_date, flt, getdate
 
 from erpnext.accounts.utils import get_fiscal_year
+from erpnext.setup.doctype.item_transaction_summary.item_transaction_summary import (
+	SUMMARY_VOUCHER_TYPES,
+	is_item_transaction_summary_built,
+)
 
 
 def execute(filters=None):
@@ -188,6 +193,17 @@ class Analytics:
 		self.get_teams()
 
 	def get_sales_transactions_based_on_customers_or_suppliers(self):
+		if self.use_item_transaction_summary():
+			party = frappe.qb.DocType(self.filters.tree_type)
+			self.entries = self.get_entries_from_item_transaction_summary(
+				"party",
+				"base_net_amount" if self.filters["value_quantity"] == "Value" else "qty",
+				party,
+				Max(party[scrub(self.filters.tree_type) + "_name"]).as_("entity_name"),
+			)
+			self.entity_names = {d.entity: d.entity_name for d in self.entries}
+			return
+
 		if self.filters["value_quantity"] == "Value":
 			value_field = "base_net_total as value_field"
 		else:
@@ -231,6 +247,18 @@ class Analytics:
 		else:
 			value_field = "stock_qty"
 
+		if self.use_item_transaction_summary():
+			item = frappe.qb.DocType("Item")
+			self.entries = self.get_entries_from_item_transaction_summary(
+				"item_code",
+				value_field,
+				item,
+				Max(item.item_name).as_("entity_name"),
+				Max(item.stock_uom).as_("stock_uom"),
+			)
+			self.entity_names = {d.entity: d.entity_name for d in self.entries}
+			return
+
 		self.entries = frappe.db.sql(
 			"""
 			select i.item_code as entity, i.item_name as entity_name, i.stock_uom, i.{value_field} as value_field, s.{date_field}
@@ -260,6 +288,14 @@ class Analytics:
 		else:
 			entity_field = "territory as entity"
 
+		if self.filters.tree_type != "Customer Group" and self.use_item_transaction_summary():
+			self.entries = self.get_entries_from_item_transaction_summary(
+				"party" if self.filters.tree_type == "Supplier Group" else "territory",
+				"base_net_amount" if self.filters["value_quantity"] == "Value" else "qty",
+			)
+			self.get_groups()
+			return
+
 		self.entries = frappe.get_all(
 			self.filters.doc_type,
 			fields=[entity_field, value_field, self.date_field],
@@ -277,6 +313,11 @@ class Analytics:
 		else:
 			value_field = "qty"
 
+		if self.use_item_transaction_summary():
+			self.entries = self.get_entries_from_item_transaction_summary("item_group", value_field)
+			self.get_groups()
+			return
+
 		self.entries = frappe.db.sql(
 			f"""
 			select i.item_group as entity, i.{value_field} as value_field, s.{self.date_field}
@@ -312,6 +353,42 @@ class Analytics:
 			},
 		)
 
+	def use_item_transaction_summary(self):
+		"""Whether the transactions can be read from the Item Transaction Summary. Header totals
+		are read as the sum of the items' net amounts and quantities."""
+		voucher_type = self.filters.doc_type
+
+		return (
+			voucher_type in SUMMARY_VOUCHER_TYPES
+			and self.date_field == SUMMARY_VOUCHER_TYPES[voucher_type][0]
+			and is_item_transaction_summary_built()
+		)
+
+	def get_entries_from_item_transaction_summary(self, entity, value_field, entity_table=None, *fields):
+		"""Entries summed per `entity` and day. `fields` are read from `entity_table`."""
+		summary = frappe.qb.DocType("Item Transaction Summary")
+
+		query = (
+			frappe.qb.from_(summary)
+			.select(
+				summary[entity].as_("entity"),
+				Sum(summary[value_field]).as_("value_field"),
+				summary.posting_date.as_(self.date_field),
+				*fields,
+			)
+			.where(
+				(summary.voucher_type == self.filters.doc_type)
+				& (summary.company == self.filters.company)
+				& (summary.posting_date.between(self.filters.from_date, self.filters.to_date))
+			)
+			.groupby(summary[entity], summary.posting_date)
+		)
+
+		if entity_table:
+			query = query.left_join(entity_table).on(entity_table.name == summary[entity])
+
+		return query.run(as_dict=True)
+
 	def get_rows(self):
 		self.data = []
 		self.get_periodic_data()
@@ -25,7 +25,20 @@ class Brand(Document):
 		image: DF.AttachImage | None
 	# end: auto-generated types
 
-	pass
+	def on_update(self):
+		from erpnext.stock.get_item_details import clear_item_details_cache
+
+		clear_item_details_cache()
+
+	def on_trash(self):
+		from erpnext.stock.get_item_details import clear_item_details_cache
+
+		clear_item_details_cache()
+
+	def after_rename(self, old_name, new_name, merge=False):
+		from erpnext.stock.get_item_details import clear_item_details_cache
+
+		clear_item_details_cache()
 
 
 def get_brand_defaults(item, company):
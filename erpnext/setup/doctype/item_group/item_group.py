@@ -57,14 +57,25 @@ class ItemGroup(NestedSet):
 		NestedSet.on_update(self)
 		self.validate_one_root()
 		self.delete_child_item_groups_key()
+		self.clear_item_details_cache()
 
 	def on_trash(self):
 		NestedSet.on_trash(self, allow_root_deletion=True)
 		self.delete_child_item_groups_key()
+		self.clear_item_details_cache()
+
+	def after_rename(self, old_name, new_name, merge=False):
+		NestedSet.after_rename(self, old_name, new_name, merge)
+		self.clear_item_details_cache()
 
 	def delete_child_item_groups_key(self):
 		frappe.cache().hdel("child_item_groups", self.name)
 
+	def clear_item_details_cache(self):
+		from erpnext.stock.get_item_details import clear_item_details_cache
+
+		clear_item_details_cache()
+
 	def validate_item_group_defaults(self):
 		from erpnext.stock.doctype.item.item import validate_item_default_company_links
 
@@ -0,0 +1,251 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import hashlib
+
+import frappe
+from frappe import scrub
+from frappe.model.document import Document
+from frappe.query_builder.functions import Min
+from frappe.utils import add_years, cint, flt, getdate, now
+
+# Transactions of all days are summed up, reports can read the summary instead of the transactions
+ITEM_TRANSACTION_SUMMARY_BUILT_KEY = "item_transaction_summary_built"
+
+# transactions modified after this time are summed up again by the daily refresh
+ITEM_TRANSACTION_SUMMARY_REFRESHED_KEY = "item_transaction_summary_refreshed_at"
+
+# voucher type: (date field, party type)
+SUMMARY_VOUCHER_TYPES = {
+	"Sales Order": ("transaction_date", "Customer"),
+	"Delivery Note": ("posting_date", "Customer"),
+	"Sales Invoice": ("posting_date", "Customer"),
+	"Purchase Order": ("transaction_date", "Supplier"),
+	"Purchase Receipt": ("posting_date", "Supplier"),
+	"Purchase Invoice": ("posting_date", "Supplier"),
+}
+
+SUMMARY_VALUE_FIELDS = ("qty", "stock_qty", "base_net_amount")
+
+
+class ItemTransactionSummary(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		base_net_amount: DF.Currency
+		company: DF.Link | None
+		item_code: DF.Link
+		item_group: DF.Link | None
+		party: DF.DynamicLink | None
+		party_type: DF.Link | None
+		posting_date: DF.Date
+		qty: DF.Float
+		stock_qty: DF.Float
+		territory: DF.Link | None
+		voucher_type: DF.Link
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Item Transaction Summary", ["voucher_type", "company", "posting_date"])
+	frappe.db.add_index("Item Transaction Summary", ["item_code", "posting_date"])
+
+
+def is_item_transaction_summary_built():
+	return cint(frappe.db.get_global(ITEM_TRANSACTION_SUMMARY_BUILT_KEY))
+
+
+def build_item_transaction_summaries():
+	"""Sum up all submitted transactions once, and afterwards the transactions modified since
+	the last run. Submitting and cancelling transactions updates the summary in between."""
+
+	refreshed_at = now()
+
+	if is_item_transaction_summary_built():
+		last_refreshed_at = frappe.db.get_global(ITEM_TRANSACTION_SUMMARY_REFRESHED_KEY)
+		for voucher_type in SUMMARY_VOUCHER_TYPES:
+			refresh_item_transaction_summaries(voucher_type, last_refreshed_at)
+			commit()
+	else:
+		frappe.db.delete("Item Transaction Summary")
+		for voucher_type, (date_field, _party_type) in SUMMARY_VOUCHER_TYPES.items():
+			parent = frappe.qb.DocType(voucher_type)
+			from_date = frappe.qb.from_(parent).select(Min(parent[date_field])).run()[0][0]
+			if not from_date:
+				continue
+
+			# a year at a time, to keep transactions short
+			while getdate(from_date) <= getdate(refreshed_at):
+				to_date = add_years(from_date, 1)
+				make_item_transaction_summaries(
+					voucher_type,
+					f"t1.{date_field} >= %(from_date)s and t1.{date_field} < %(to_date)s",
+					{"from_date": from_date, "to_date": to_date},
+				)
+				commit()
+				from_date = to_date
+
+		frappe.db.set_global(ITEM_TRANSACTION_SUMMARY_BUILT_KEY, 1)
+
+	frappe.db.set_global(ITEM_TRANSACTION_SUMMARY_REFRESHED_KEY, refreshed_at)
+	commit()
+
+
+def commit():
+	if not frappe.flags.in_test:
+		frappe.db.commit()
+
+
+def refresh_item_transaction_summaries(voucher_type, modified_since):
+	"""Sum up again the days and items of transactions modified since `modified_since`, in case
+	they were changed without being submitted or cancelled"""
+
+	date_field = SUMMARY_VOUCHER_TYPES[voucher_type][0]
+	modified = frappe.db.sql(
+		f"""
+		select distinct t1.company, t1.{date_field}, t2.item_code
+		from `tab{voucher_type}` t1
+		inner join `tab{voucher_type} Item` t2 on t2.parent = t1.name
+		where t1.docstatus > 0 and t1.modified >= %s
+		""",
+		modified_since,
+	)
+
+	item_codes_by_day = {}
+	for company, posting_date, item_code in modified:
+		item_codes_by_day.setdefault((company, posting_date), set()).add(item_code)
+
+	for (company, posting_date), item_codes in item_codes_by_day.items():
+		frappe.db.delete(
+			"Item Transaction Summary",
+			{
+				"voucher_type": voucher_type,
+				"company": company,
+				"posting_date": posting_date,
+				"item_code": ("in", list(item_codes)),
+			},
+		)
+		make_item_transaction_summaries(
+			voucher_type,
+			f"t1.company = %(company)s and t1.{date_field} = %(posting_date)s and t2.item_code in %(item_codes)s",
+			{"company": company, "posting_date": posting_date, "item_codes": tuple(item_codes)},
+		)
+
+
+def make_item_transaction_summaries(voucher_type, conditions, values):
+	"""Sum up the items of submitted `voucher_type` transactions matching `conditions` per day,
+	item and party. The name is derived from the key, like in `get_summary_name`."""
+
+	date_field, party_type = SUMMARY_VOUCHER_TYPES[voucher_type]
+	party_field = scrub(party_type)
+	territory = "t1.territory" if party_type == "Customer" else "null"
+	group_by = f"t1.{date_field}, t1.company, t2.item_code, t2.item_group, t1.{party_field}"
+	if party_type == "Customer":
+		group_by += ", t1.territory"
+
+	frappe.db.sql(
+		f"""
+		insert into `tabItem Transaction Summary`
+			(name, creation, modified, owner, modified_by, docstatus, idx,
+			voucher_type, posting_date, company, item_code, item_group, party_type, party, territory,
+			qty, stock_qty, base_net_amount)
+		select
+			md5(concat_ws('::', %(voucher_type)s, t1.{date_field}, t1.company, t2.item_code,
+				coalesce(t2.item_group, ''), coalesce(t1.{party_field}, ''), coalesce({territory}, ''))),
+			%(timestamp)s, %(timestamp)s, %(user)s, %(user)s, 0, 0,
+			%(voucher_type)s, t1.{date_field}, t1.company, t2.item_code, t2.item_group,
+			%(party_type)s, t1.{party_field}, {territory},
+			sum(t2.qty), sum(t2.stock_qty), sum(t2.base_net_amount)
+		from `tab{voucher_type}` t1
+		inner join `tab{voucher_type} Item` t2 on t2.parent = t1.name
+		where t1.docstatus = 1 and {conditions}
+		group by {group_by}
+		""",
+		{
+			**values,
+			"voucher_type": voucher_type,
+			"party_type": party_type,
+			"timestamp": now(),
+			"user": frappe.session.user,
+		},
+	)
+
+
+def get_summary_name(*key):
+	return hashlib.md5("::".join(str(value or "") for value in key).encode()).hexdigest()
+
+
+def update_item_transaction_summary(doc, method=None):
+	"""Add the items of a submitted transaction to the summary, or subtract them on cancel"""
+
+	if doc.doctype not in SUMMARY_VOUCHER_TYPES or not is_item_transaction_summary_built():
+		return
+
+	date_field, party_type = SUMMARY_VOUCHER_TYPES[doc.doctype]
+	posting_date = getdate(doc.get(date_field))
+	party = doc.get(scrub(party_type))
+	territory = doc.get("territory") if party_type == "Customer" else None
+	sign = -1 if doc.docstatus == 2 else 1
+
+	rows = {}
+	for item in doc.get("items"):
+		key = (doc.doctype, posting_date, doc.company, item.item_code, item.item_group, party, territory)
+		row = rows.setdefault(key, dict.fromkeys(SUMMARY_VALUE_FIELDS, 0.0))
+		for field in SUMMARY_VALUE_FIELDS:
+			row[field] += sign * flt(item.get(field))
+
+	if not rows:
+		return
+
+	timestamp = now()
+	values = []
+	for key, row in rows.items():
+		voucher_type, posting_date, company, item_code, item_group, party, territory = key
+		values.append(
+			(
+				get_summary_name(*key),
+				timestamp,
+				timestamp,
+				frappe.session.user,
+				frappe.session.user,
+				voucher_type,
+				posting_date,
+				company,
+				item_code,
+				item_group or None,
+				party_type,
+				party or None,
+				territory or None,
+				*(row[field] for field in SUMMARY_VALUE_FIELDS),
+			)
+		)
+
+	if frappe.db.db_type == "postgres":
+		on_conflict = "on conflict (name) do update set " + ", ".join(
+			f'{field} = "tabItem Transaction Summary".{field} + excluded.{field}'
+			for field in SUMMARY_VALUE_FIELDS
+		)
+	else:
+		on_conflict = "on duplicate key update " + ", ".join(
+			f"{field} = {field} + values({field})" for field in SUMMARY_VALUE_FIELDS
+		)
+
+	placeholders = ", ".join(["(" + ", ".join(["%s"] * len(values[0])) + ")"] * len(values))
+	frappe.db.sql(
+		f"""
+		insert into `tabItem Transaction Summary`
+			(name, creation, modified, owner, modified_by,
+			voucher_type, posting_date, company, item_code, item_group, party_type, party, territory,
+			{", ".join(SUMMARY_VALUE_FIELDS)})
+		values {placeholders}
+		{on_conflict}
+		""",
+		[value for row in values for value in row],
+	)
@@ -0,0 +1,67 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import nowdate
+
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+from erpnext.accounts.report.sales_invoice_trends.sales_invoice_trends import execute as sales_invoice_trends
+from erpnext.accounts.utils import get_fiscal_year
+from erpnext.selling.report.sales_analytics.sales_analytics import execute as sales_analytics
+from erpnext.setup.doctype.item_transaction_summary.item_transaction_summary import (
+	ITEM_TRANSACTION_SUMMARY_BUILT_KEY,
+	build_item_transaction_summaries,
+)
+
+
+class TestItemTransactionSummary(IntegrationTestCase):
+	def tearDown(self):
+		frappe.db.set_global(ITEM_TRANSACTION_SUMMARY_BUILT_KEY, None)
+
+	def get_summary(self, voucher_type="Sales Invoice"):
+		return frappe.get_all(
+			"Item Transaction Summary",
+			filters={
+				"voucher_type": voucher_type,
+				"item_code": "_Test Item",
+				"posting_date": nowdate(),
+				"company": "_Test Company",
+			},
+			fields=["party", "qty", "base_net_amount"],
+		)
+
+	def test_summary_follows_transactions(self):
+		create_sales_invoice(qty=2, rate=100)
+		build_item_transaction_summaries()
+		before = self.get_summary()
+
+		si = create_sales_invoice(qty=3, rate=100)
+		(row,) = [d for d in self.get_summary() if d.party == si.customer]
+		(before_row,) = [d for d in before if d.party == si.customer]
+		self.assertEqual(row.qty, before_row.qty + 3)
+		self.assertEqual(row.base_net_amount, before_row.base_net_amount + 300)
+
+		si.cancel()
+		self.assertEqual(self.get_summary(), before)
+
+		fiscal_year = get_fiscal_year(nowdate(), company="_Test Company")[0]
+		trends_filters = frappe._dict(
+			company="_Test Company", fiscal_year=fiscal_year, period="Monthly", based_on="Item"
+		)
+		analytics_filters = frappe._dict(
+			company="_Test Company",
+			doc_type="Sales Invoice",
+			tree_type="Item Group",
+			value_quantity="Value",
+			range="Monthly",
+			from_date=nowdate(),
+			to_date=nowdate(),
+		)
+
+		from_summary = sorted(sales_invoice_trends(trends_filters.copy())[1])
+		analytics_from_summary = sales_analytics(analytics_filters.copy())[1]
+
+		frappe.db.set_global(ITEM_TRANSACTION_SUMMARY_BUILT_KEY, None)
+		self.assertEqual(from_summary, sorted(sales_invoice_trends(trends_filters.copy())[1]))
+		self.assertEqual(analytics_from_summary, sales_analytics(analytics_filters.copy())[1])
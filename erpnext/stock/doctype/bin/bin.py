@@ -23,6 +23,7 @@ class Bin(Document):
 		item_code: DF.Link
 		ordered_qty: DF.Float
 		planned_qty: DF.Float
+		pos_reserved_qty: DF.Float
 		projected_qty: DF.Float
 		reserved_qty: DF.Float
 		reserved_qty_for_production: DF.Float
@@ -221,6 +221,12 @@ class Item(Document):
 	def on_update(self):
 		self.update_variants()
 		self.update_item_price()
+		self.clear_item_details_cache()
+
+	def clear_item_details_cache(self, item_code=None):
+		from erpnext.stock.get_item_details import clear_item_details_cache
+
+		clear_item_details_cache(item_code or self.name)
 
 	def validate_description(self):
 		"""Clean HTML description if set"""
@@ -547,6 +553,8 @@ class Item(Document):
 		for variant_of in frappe.get_all("Item", filters={"variant_of": self.name}):
 			frappe.delete_doc("Item", variant_of.name)
 
+		self.clear_item_details_cache()
+
 	def before_rename(self, old_name, new_name, merge=False):
 		if self.item_name == old_name:
 			frappe.db.set_value("Item", old_name, "item_name", new_name)
@@ -566,6 +574,9 @@ class Item(Document):
 			)
 
 		frappe.db.set_value("Item", new_name, "item_code", new_name)
+		self.clear_item_details_cache(old_name)
+		self.clear_item_details_cache(new_name)
+		self.clear_bom_explosion_cache(new_name)
 
 		if merge:
 			self.set_last_purchase_rate(new_name)
@@ -707,6 +718,13 @@ class Item(Document):
 				(self.description, self.name),
 			)
 
+			self.clear_bom_explosion_cache(self.name)
+
+	def clear_bom_explosion_cache(self, item_code):
+		from erpnext.manufacturing.doctype.bom.bom_explosion import clear_item_bom_explosion_cache
+
+		clear_item_bom_explosion_cache(item_code)
+
 	def validate_item_defaults(self):
 		companies = {row.company for row in self.item_defaults}
 
@@ -1285,12 +1303,14 @@ def set_item_default(item_code, company, fieldname, value):
 		if d.company == company:
 			if not d.get(fieldname):
 				frappe.db.set_value(d.doctype, d.name, fieldname, value)
+				item.clear_item_details_cache()
 			return
 
 	# no row found, add a new row for the company
 	d = item.append("item_defaults", {fieldname: value, "company": company})
 	d.db_insert()
 	item.clear_cache()
+	item.clear_item_details_cache()
 
 
 @frappe.whitelist()
@@ -9,20 +9,30 @@ from frappe.model.document import Document
 from frappe.query_builder import DocType, Interval
 from frappe.query_builder.functions import Max, Now
 from frappe.utils import cint, get_link_to_form, get_weekday, getdate, now, nowtime
+from frappe.utils.background_jobs import is_job_enqueued
 from frappe.utils.user import get_users_with_role
 from rq.timeouts import JobTimeoutException
 
 import erpnext
 from erpnext.accounts.general_ledger import validate_accounting_period
 from erpnext.accounts.utils import get_future_stock_vouchers, repost_gle_for_stock_vouchers
+from erpnext.stock.doctype.stock_ageing_snapshot.stock_ageing_snapshot import (
+	invalidate_stock_ageing_snapshots,
+)
 from erpnext.stock.stock_ledger import (
+	RepostTimeBudgetExceeded,
 	get_affected_transactions,
+	get_distinct_item_warehouse,
 	get_items_to_be_repost,
 	repost_future_sle,
 )
+from erpnext.stock.utils import get_combine_datetime
 
 RecoverableErrors = (JobTimeoutException, QueryDeadlockError, QueryTimeoutError)
 
+# Redis hash of Repost Item Valuation name -> job id of the worker processing it
+REPOST_CLAIMS_KEY = "repost_item_valuation_claims"
+
 
 class RepostItemValuation(Document):
 	# begin: auto-generated types
@@ -47,6 +57,7 @@ class RepostItemValuation(Document):
 		items_to_be_repost: DF.Code | None
 		posting_date: DF.Date
 		posting_time: DF.Time | None
+		reposting_checkpoint: DF.Code | None
 		reposting_data_file: DF.Attach | None
 		status: DF.Literal["Queued", "In Progress", "Completed", "Skipped", "Failed"]
 		total_reposting_count: DF.Int
@@ -189,6 +200,9 @@ class RepostItemValuation(Document):
 		        These flags are useful for asserting real time behaviour like quantity updates.
 		"""
 
+		# ageing up to the repost date changes once reposted
+		invalidate_stock_ageing_snapshots(self.posting_date, self.item_code, self.warehouse)
+
 		if not frappe.flags.in_test:
 			return
 		if self.flags.dont_run_in_test or frappe.flags.dont_execute_stock_reposts:
@@ -213,6 +227,7 @@ class RepostItemValuation(Document):
 		self.current_index = 0
 		self.distinct_item_and_warehouse = None
 		self.items_to_be_repost = None
+		self.reposting_checkpoint = None
 		self.gl_reposting_index = 0
 		self.clear_attachment()
 		self.db_update()
@@ -270,6 +285,10 @@ def repost(doc):
 		doc.db_set("reposting_data_file", None)
 		remove_attached_file(doc.name)
 
+	except RepostTimeBudgetExceeded:
+		# progress is saved in the checkpoint, status stays In Progress
+		enqueue_repost_continuation(doc)
+
 	except Exception as e:
 		if frappe.flags.in_test:
 			# Don't silently fail in tests,
@@ -313,6 +332,32 @@ def repost(doc):
 			frappe.db.commit()
 
 
+def enqueue_repost_continuation(doc):
+	"""Continue a repost which has used its time budget from its last checkpoint."""
+	job_id = f"repost_item_valuation::continue::{doc.name}::{frappe.generate_hash(length=8)}"
+	frappe.cache.hset(REPOST_CLAIMS_KEY, doc.name, job_id)
+
+	frappe.enqueue(
+		repost_continuation,
+		queue="long",
+		timeout=6000,
+		job_id=job_id,
+		enqueue_after_commit=True,
+		name=doc.name,
+		claim=job_id,
+	)
+
+
+def repost_continuation(name, claim=None):
+	try:
+		doc = frappe.get_doc("Repost Item Valuation", name, for_update=True)
+		if doc.status == "In Progress":
+			repost(doc)
+			doc.deduplicate_similar_repost()
+	finally:
+		release_repost_claims([name], claim)
+
+
 def remove_attached_file(docname):
 	if file_name := frappe.db.get_value(
 		"File", {"attached_to_name": docname, "attached_to_doctype": "Repost Item Valuation"}, "name"
@@ -321,6 +366,8 @@ def remove_attached_file(docname):
 
 
 def repost_sl_entries(doc):
+	batched = cint(frappe.db.get_single_value("Stock Reposting Settings", "use_batched_reposting"))
+
 	if doc.based_on == "Transaction":
 		repost_future_sle(
 			voucher_type=doc.voucher_type,
@@ -328,6 +375,7 @@ def repost_sl_entries(doc):
 			allow_negative_stock=doc.allow_negative_stock,
 			via_landed_cost_voucher=doc.via_landed_cost_voucher,
 			doc=doc,
+			batched=batched,
 		)
 	else:
 		repost_future_sle(
@@ -344,6 +392,7 @@ def repost_sl_entries(doc):
 			allow_negative_stock=doc.allow_negative_stock,
 			via_landed_cost_voucher=doc.via_landed_cost_voucher,
 			doc=doc,
+			batched=batched,
 		)
 
 
@@ -433,12 +482,24 @@ def repost_entries():
 
 	riv_entries = get_repost_item_valuation_entries()
 
+	if cint(frappe.db.get_single_value("Stock Reposting Settings", "repost_in_parallel")):
+		enqueue_repost_partitions([row.name for row in riv_entries])
+		return
+
+	claimed = get_claimed_reposts()
 	for row in riv_entries:
+		if row.name in claimed:
+			# being continued by another job, later reposts have to wait for it
+			break
+
 		doc = frappe.get_doc("Repost Item Valuation", row.name)
 		if doc.status in ("Queued", "In Progress"):
 			repost(doc)
 			doc.deduplicate_similar_repost()
 
+			if row.name in get_claimed_reposts():
+				break
+
 	riv_entries = get_repost_item_valuation_entries()
 	if riv_entries:
 		return
@@ -455,6 +516,203 @@ def get_repost_item_valuation_entries():
 	)
 
 
+def enqueue_repost_partitions(riv_names):
+	"""Distribute independent partitions of reposts over background workers.
+
+	Partitions are assigned to the least loaded worker, each worker reposts its
+	partitions one after another. Reposts still claimed by a running worker are
+	left out along with the rest of their partition.
+	"""
+	max_workers = cint(frappe.db.get_single_value("Stock Reposting Settings", "max_reposting_workers")) or 1
+	claimed = get_claimed_reposts()
+
+	workers = [[] for _ in range(max_workers)]
+	for partition in get_repost_partitions(riv_names):
+		if claimed.intersection(partition):
+			continue
+
+		min(workers, key=len).extend(partition)
+
+	for worker_riv_names in workers:
+		if not worker_riv_names:
+			continue
+
+		job_id = f"repost_item_valuation::{worker_riv_names[0]}"
+		if is_job_enqueued(job_id):
+			continue
+
+		for name in worker_riv_names:
+			frappe.cache.hset(REPOST_CLAIMS_KEY, name, job_id)
+
+		frappe.enqueue(
+			repost_partition,
+			queue="long",
+			timeout=6000,
+			job_id=job_id,
+			riv_names=worker_riv_names,
+			claim=job_id,
+			now=frappe.flags.in_test,
+		)
+
+
+def repost_partition(riv_names, claim=None):
+	"""Repost the given entries in order, the row of each entry is locked while it is claimed."""
+	try:
+		for name in riv_names:
+			if not frappe.db.exists("Repost Item Valuation", name):
+				continue
+
+			doc = frappe.get_doc("Repost Item Valuation", name, for_update=True)
+			if doc.status in ("Queued", "In Progress"):
+				repost(doc)
+				doc.deduplicate_similar_repost()
+
+				if frappe.db.get_value("Repost Item Valuation", name, "status") == "In Progress":
+					# to be continued by another job, rest of the partition has to wait for it
+					break
+
+			release_repost_claims([name], claim)
+	finally:
+		release_repost_claims(riv_names, claim)
+
+
+def release_repost_claims(riv_names, claim):
+	for name in riv_names:
+		if frappe.cache.hget(REPOST_CLAIMS_KEY, name) == claim:
+			frappe.cache.hdel(REPOST_CLAIMS_KEY, name)
+
+
+def get_claimed_reposts(remove_expired: bool = True) -> set[str]:
+	"""Reposts claimed by workers that are still queued or running. The claims of jobs
+	which are done are removed, unless `remove_expired` is false."""
+	claims = frappe.cache.hgetall(REPOST_CLAIMS_KEY) or {}
+
+	claimed = set()
+	for name, job_id in claims.items():
+		if is_job_enqueued(job_id):
+			claimed.add(name)
+		elif remove_expired:
+			frappe.cache.hdel(REPOST_CLAIMS_KEY, name)
+
+	return claimed
+
+
+def get_repost_partitions(riv_names) -> list[list[str]]:
+	"""Group reposts which can affect the same item-warehouse pair or voucher.
+
+	Two reposts depend on each other when their item-warehouse pairs overlap, either
+	directly or through future entries linked by `dependant_sle_voucher_detail_no`
+	(transfers, manufacture, repack), or when a future voucher has entries in the pairs
+	of both, as its GL Entries are reposted by each. Order within a partition is the
+	order of `riv_names`.
+	"""
+	parent = {}
+
+	def find(node):
+		while parent.setdefault(node, node) != node:
+			parent[node] = parent[parent[node]]
+			node = parent[node]
+		return node
+
+	def union(a, b):
+		parent[find(a)] = find(b)
+
+	for name in riv_names:
+		union(("Repost Item Valuation", name), ("Repost Item Valuation", name))
+		item_warehouses, posting_datetime = get_repost_item_warehouses(name)
+		for item_warehouse in item_warehouses:
+			union(("Repost Item Valuation", name), item_warehouse)
+
+		for voucher in get_future_vouchers(item_warehouses, posting_datetime):
+			union(("Repost Item Valuation", name), voucher)
+
+	partitions = {}
+	for name in riv_names:
+		partitions.setdefault(find(("Repost Item Valuation", name)), []).append(name)
+
+	return list(partitions.values())
+
+
+def get_repost_item_warehouses(riv_name) -> tuple[set[tuple[str, str]], str]:
+	"""Item-warehouse pairs reposted by the entry, and the posting datetime it reposts from."""
+	doc = frappe.get_doc("Repost Item Valuation", riv_name)
+	posting_datetime = get_combine_datetime(doc.posting_date, doc.posting_time or "00:00:00")
+
+	if doc.based_on == "Item and Warehouse":
+		item_warehouses = {(doc.item_code, doc.warehouse)}
+	else:
+		item_warehouses = {
+			(row.get("item_code"), row.get("warehouse"))
+			for row in get_items_to_be_repost(doc.voucher_type, doc.voucher_no, doc=doc)
+		}
+
+	if doc.distinct_item_and_warehouse or doc.reposting_data_file:
+		item_warehouses.update(get_distinct_item_warehouse([], doc=doc).keys())
+
+	return item_warehouses | get_linked_item_warehouses(item_warehouses, posting_datetime), posting_datetime
+
+
+def get_future_vouchers(item_warehouses, posting_datetime) -> set[tuple[str, str, str]]:
+	"""Vouchers whose GL Entries are reposted along with `item_warehouses`.
+
+	Like `_get_directly_dependent_vouchers`, all entries of the items in any of the
+	warehouses are considered."""
+	if not item_warehouses:
+		return set()
+
+	vouchers = frappe.db.sql(
+		"""
+		select distinct voucher_type, voucher_no
+		from `tabStock Ledger Entry`
+		where item_code in %(item_codes)s
+			and warehouse in %(warehouses)s
+			and posting_datetime >= %(posting_datetime)s
+			and is_cancelled = 0
+		""",
+		{
+			"item_codes": tuple({item_code for item_code, _ in item_warehouses}),
+			"warehouses": tuple({warehouse for _, warehouse in item_warehouses}),
+			"posting_datetime": posting_datetime,
+		},
+	)
+
+	# tagged so that a voucher node can not equal an item-warehouse pair
+	return {("Voucher", voucher_type, voucher_no) for voucher_type, voucher_no in vouchers}
+
+
+def get_linked_item_warehouses(item_warehouses, posting_datetime) -> set[tuple[str, str]]:
+	"""Item-warehouse pairs reached from `item_warehouses` through future dependent entries."""
+	linked = set()
+	to_check = set(item_warehouses)
+
+	while to_check:
+		dependent_pairs = frappe.db.sql(
+			"""
+			select distinct dependent.item_code, dependent.warehouse
+			from `tabStock Ledger Entry` sle
+			inner join `tabStock Ledger Entry` dependent
+				on dependent.voucher_detail_no = sle.dependant_sle_voucher_detail_no
+				and dependent.name != sle.name
+			where sle.item_code in %(item_codes)s
+				and sle.warehouse in %(warehouses)s
+				and sle.is_cancelled = 0
+				and dependent.is_cancelled = 0
+				and sle.posting_datetime >= %(posting_datetime)s
+				and ifnull(sle.dependant_sle_voucher_detail_no, '') != ''
+			""",
+			{
+				"item_codes": tuple({item_code for item_code, _ in to_check}),
+				"warehouses": tuple({warehouse for _, warehouse in to_check}),
+				"posting_datetime": posting_datetime,
+			},
+		)
+
+		to_check = {tuple(pair) for pair in dependent_pairs} - linked - set(item_warehouses)
+		linked.update(to_check)
+
+	return linked
+
+
 def in_configured_timeslot(repost_settings=None, current_time=None):
 	"""Check if current time is in configured timeslot for reposting."""
 
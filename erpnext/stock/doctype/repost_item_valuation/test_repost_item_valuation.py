@@ -14,6 +14,7 @@ from erpnext.controllers.stock_controller import create_item_wise_repost_entries
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.purchase_receipt.test_purchase_receipt import make_purchase_receipt
 from erpnext.stock.doctype.repost_item_valuation.repost_item_valuation import (
+	get_repost_partitions,
 	in_configured_timeslot,
 )
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
@@ -454,3 +455,247 @@ class TestRepostItemValuation(IntegrationTestCase, StockTestMixin):
 						"name",
 					)
 				)
+
+	def test_batched_repost_matches_item_wise_repost(self):
+		from erpnext.stock.stock_ledger import repost_future_sle
+
+		warehouses = ["_Test Warehouse - _TC", "Stores - _TC"]
+		items = [
+			make_item(f"_Test Batched Repost Item {i}", properties={"is_stock_item": 1}).name
+			for i in range(3)
+		]
+		fields = [
+			"name",
+			"qty_after_transaction",
+			"valuation_rate",
+			"stock_value",
+			"stock_queue",
+			"stock_value_difference",
+		]
+
+		for idx, item_code in enumerate(items):
+			for days, rate in ((-10, 100), (-8, 120), (-6, 90)):
+				make_stock_entry(
+					item_code=item_code,
+					qty=10,
+					rate=rate + idx,
+					to_warehouse=warehouses[0],
+					posting_date=add_days(today(), days),
+				)
+			make_stock_entry(
+				item_code=item_code,
+				qty=15,
+				from_warehouse=warehouses[0],
+				to_warehouse=warehouses[1],
+				posting_date=add_days(today(), -5),
+			)
+			make_stock_entry(
+				item_code=item_code, qty=5, from_warehouse=warehouses[1], posting_date=add_days(today(), -4)
+			)
+
+		def get_ledger():
+			return frappe.get_all(
+				"Stock Ledger Entry",
+				filters={"item_code": ("in", items), "is_cancelled": 0},
+				fields=fields,
+				order_by="name",
+			)
+
+		def reset_ledger():
+			frappe.db.sql(
+				"""update `tabStock Ledger Entry`
+				set qty_after_transaction = 0, valuation_rate = 0, stock_value = 0, stock_queue = '[]'
+				where item_code in %s""",
+				(tuple(items),),
+			)
+
+		def repost(batched):
+			args = [
+				frappe._dict(
+					item_code=item_code,
+					warehouse=warehouse,
+					posting_date=add_days(today(), -11),
+					posting_time="00:00:00",
+				)
+				for item_code in items
+				for warehouse in warehouses
+			]
+			repost_future_sle(args=args, allow_negative_stock=True, batched=batched)
+
+		expected_ledger = get_ledger()
+
+		reset_ledger()
+		repost(batched=False)
+		self.assertEqual(expected_ledger, get_ledger())
+
+		reset_ledger()
+		repost(batched=True)
+		self.assertEqual(expected_ledger, get_ledger())
+
+		for item_code in items:
+			for warehouse in warehouses:
+				bin_values = frappe.db.get_value(
+					"Bin", {"item_code": item_code, "warehouse": warehouse}, ["actual_qty", "stock_value"]
+				)
+				last_sle = frappe.db.get_value(
+					"Stock Ledger Entry",
+					{"item_code": item_code, "warehouse": warehouse, "is_cancelled": 0},
+					["qty_after_transaction", "stock_value"],
+					order_by="posting_datetime desc, creation desc",
+				)
+				self.assertEqual(bin_values, last_sle)
+
+	def test_repost_partitions(self):
+		items = [
+			make_item(f"_Test Repost Partition Item {i}", properties={"is_stock_item": 1}).name
+			for i in range(3)
+		]
+		posting_date = add_days(today(), -5)
+
+		make_stock_entry(
+			item_code=items[0], qty=5, rate=10, to_warehouse="Stores - _TC", posting_date=posting_date
+		)
+		# transfer links item 0 in both warehouses
+		make_stock_entry(
+			item_code=items[0],
+			qty=2,
+			from_warehouse="Stores - _TC",
+			to_warehouse="_Test Warehouse - _TC",
+			posting_date=add_days(posting_date, 1),
+		)
+
+		def make_riv(item_code, warehouse):
+			riv = frappe.get_doc(
+				doctype="Repost Item Valuation",
+				item_code=item_code,
+				warehouse=warehouse,
+				based_on="Item and Warehouse",
+				posting_date=posting_date,
+				posting_time="00:00:00",
+			)
+			riv.flags.dont_run_in_test = True
+			riv.submit()
+			self.addCleanup(riv.set_status, "Skipped")
+			return riv.name
+
+		riv1 = make_riv(items[0], "Stores - _TC")
+		riv2 = make_riv(items[1], "Stores - _TC")
+		riv3 = make_riv(items[0], "_Test Warehouse - _TC")
+		riv4 = make_riv(items[2], "Stores - _TC")
+		riv5 = make_riv(items[1], "Stores - _TC")
+
+		partitions = get_repost_partitions([riv1, riv2, riv3, riv4, riv5])
+		self.assertEqual(sorted(partitions), sorted([[riv1, riv3], [riv2, riv5], [riv4]]))
+
+	def test_repost_partitions_with_shared_voucher(self):
+		items = [
+			make_item(f"_Test Repost Partition Voucher Item {i}", properties={"is_stock_item": 1}).name
+			for i in range(3)
+		]
+		posting_date = add_days(today(), -5)
+
+		# one voucher has entries of item 0 and 1, its GL Entries are reposted for both
+		se = make_stock_entry(
+			item_code=items[0],
+			qty=5,
+			rate=10,
+			to_warehouse="Stores - _TC",
+			posting_date=add_days(posting_date, 1),
+			do_not_save=True,
+		)
+		se.append("items", {**se.items[0].as_dict(), "name": None, "idx": None, "item_code": items[1]})
+		se.save()
+		se.submit()
+
+		make_stock_entry(
+			item_code=items[2], qty=5, rate=10, to_warehouse="Stores - _TC", posting_date=posting_date
+		)
+
+		rivs = []
+		for item_code in items:
+			riv = frappe.get_doc(
+				doctype="Repost Item Valuation",
+				item_code=item_code,
+				warehouse="Stores - _TC",
+				based_on="Item and Warehouse",
+				posting_date=posting_date,
+				posting_time="00:00:00",
+			)
+			riv.flags.dont_run_in_test = True
+			riv.submit()
+			self.addCleanup(riv.set_status, "Skipped")
+			rivs.append(riv.name)
+
+		partitions = get_repost_partitions(rivs)
+		self.assertEqual(sorted(partitions), sorted([[rivs[0], rivs[1]], [rivs[2]]]))
+
+	def test_repost_resumes_from_checkpoint(self):
+		from unittest.mock import patch
+
+		from erpnext.stock.doctype.repost_item_valuation.repost_item_valuation import repost
+		from erpnext.stock.stock_ledger import RepostCheckpoint
+
+		item_code = make_item("_Test Repost Checkpoint Item", properties={"is_stock_item": 1}).name
+		warehouse = "Stores - _TC"
+		posting_date = add_days(today(), -10)
+
+		for days in range(6):
+			make_stock_entry(
+				item_code=item_code,
+				qty=10,
+				rate=100 + days,
+				to_warehouse=warehouse,
+				posting_date=add_days(posting_date, days),
+			)
+
+		def get_ledger():
+			return frappe.get_all(
+				"Stock Ledger Entry",
+				filters={"item_code": item_code, "is_cancelled": 0},
+				fields=["name", "qty_after_transaction", "stock_value", "stock_queue"],
+				order_by="posting_datetime, creation",
+			)
+
+		expected_ledger = get_ledger()
+		frappe.db.sql(
+			"""update `tabStock Ledger Entry` set qty_after_transaction = 0, stock_value = 0
+			where item_code = %s""",
+			item_code,
+		)
+
+		riv = frappe.get_doc(
+			doctype="Repost Item Valuation",
+			item_code=item_code,
+			warehouse=warehouse,
+			based_on="Item and Warehouse",
+			posting_date=posting_date,
+			posting_time="00:00:00",
+		)
+		riv.flags.dont_run_in_test = True
+		riv.submit()
+
+		# stop after the first checkpoint
+		with (
+			patch.object(RepostCheckpoint, "interval", 2),
+			patch.object(
+				RepostCheckpoint,
+				"is_time_budget_exceeded",
+				lambda checkpoint: bool(checkpoint.doc.reposting_checkpoint),
+			),
+		):
+			repost(riv)
+
+		riv.reload()
+		self.assertEqual(riv.status, "In Progress")
+		checkpoint = frappe.parse_json(riv.reposting_checkpoint)
+		self.assertEqual(checkpoint.sle["name"], expected_ledger[1].name)
+
+		# entries before the checkpoint are not reposted again
+		frappe.db.set_value("Stock Ledger Entry", expected_ledger[0].name, "stock_value", 1)
+		repost(riv)
+
+		riv.reload()
+		self.assertEqual(riv.status, "Completed")
+		self.assertFalse(riv.reposting_checkpoint)
+		self.assertEqual(get_ledger()[0].stock_value, 1)
+		self.assertEqual(get_ledger()[1:], expected_ledger[1:])
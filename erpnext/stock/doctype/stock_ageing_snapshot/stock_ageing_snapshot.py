@@ -0,0 +1,185 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import json
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Max
+from frappe.utils import add_days, add_months, get_first_day, get_last_day, getdate, now
+
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	create_month_end_snapshots,
+	get_snapshot_pending_from,
+	reopen_snapshots,
+)
+
+# Snapshots are complete for every month that ends before this date
+SNAPSHOT_PENDING_FROM_KEY = "stock_ageing_snapshot_pending_from"
+
+
+class StockAgeingSnapshot(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		company: DF.Link | None
+		fifo_queue: DF.LongText | None
+		item_code: DF.Link
+		period_end_date: DF.Date
+		qty_after_transaction: DF.Float
+		total_qty: DF.Float
+		warehouse: DF.Link
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Stock Ageing Snapshot", ["item_code", "warehouse", "period_end_date"])
+
+
+def get_snapshot_period_end(to_date):
+	"""Returns the last period end up to `to_date` for which snapshots of all
+	item-warehouses are complete"""
+
+	pending_from = get_snapshot_pending_from(SNAPSHOT_PENDING_FROM_KEY)
+	if not pending_from:
+		return None
+
+	to_date = getdate(to_date)
+	period_end = to_date if to_date == get_last_day(to_date) else get_last_day(add_months(to_date, -1))
+	return min(period_end, add_days(getdate(pending_from), -1))
+
+
+def create_stock_ageing_snapshots():
+	create_month_end_snapshots(make_stock_ageing_snapshots, SNAPSHOT_PENDING_FROM_KEY)
+
+
+def make_stock_ageing_snapshots(period_end):
+	"""Snapshot the FIFO slots of every item-warehouse which had a transaction in the
+	month ending on `period_end`, replaying the month's entries on the previous snapshots.
+
+	Items with serial nos are not snapshotted, their slots depend on the purchase date of
+	each serial no across warehouses."""
+	from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots
+
+	period_end = getdate(period_end)
+	frappe.db.delete("Stock Ageing Snapshot", {"period_end_date": period_end})
+
+	fields = [
+		"name",
+		"item_code",
+		"warehouse",
+		"company",
+		"period_end_date",
+		"qty_after_transaction",
+		"total_qty",
+		"fifo_queue",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+	]
+
+	timestamp = now()
+	for company in frappe.get_all("Company", pluck="name"):
+		item_warehouses = get_item_warehouses_with_entries(company, get_first_day(period_end), period_end)
+		if not item_warehouses:
+			continue
+
+		filters = frappe._dict(
+			company=company, to_date=period_end, show_warehouse_wise_stock=True, has_serial_no=0
+		)
+		item_details = FIFOSlots(filters).generate()
+
+		values = [
+			(
+				frappe.generate_hash(length=10),
+				item_code,
+				warehouse,
+				company,
+				period_end,
+				row.get("qty_after_transaction"),
+				row.get("total_qty"),
+				json.dumps(row["fifo_queue"], default=str),
+				timestamp,
+				timestamp,
+				frappe.session.user,
+				frappe.session.user,
+			)
+			for (item_code, warehouse), row in item_details.items()
+			if (item_code, warehouse) in item_warehouses
+		]
+
+		frappe.db.bulk_insert("Stock Ageing Snapshot", fields, values)
+
+
+def get_item_warehouses_with_entries(company, from_date, to_date):
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	item = frappe.qb.DocType("Item")
+
+	return set(
+		frappe.qb.from_(sle)
+		.inner_join(item)
+		.on(sle.item_code == item.name)
+		.select(sle.item_code, sle.warehouse)
+		.distinct()
+		.where(
+			(sle.company == company)
+			& (sle.is_cancelled == 0)
+			& (sle.posting_date.between(from_date, to_date))
+			& (item.has_serial_no == 0)
+		)
+		.run()
+	)
+
+
+def invalidate_stock_ageing_snapshots(posting_date, item_code=None, warehouse=None):
+	"""Reopen the month of a backdated entry or repost, so that snapshots from it are
+	rebuilt, and drop the stale snapshots of the item-warehouse"""
+
+	if not reopen_snapshots(posting_date, SNAPSHOT_PENDING_FROM_KEY):
+		return
+
+	if item_code and warehouse:
+		frappe.db.delete(
+			"Stock Ageing Snapshot",
+			{"item_code": item_code, "warehouse": warehouse, "period_end_date": (">=", posting_date)},
+		)
+
+
+def get_latest_stock_ageing_snapshots_query(period_end, query_filters=None):
+	"""Query on the latest snapshot up to `period_end` of every item-warehouse.
+
+	`query_filters` is called with the query and the snapshot table to apply
+	company and warehouse filters."""
+
+	snapshot = frappe.qb.DocType("Stock Ageing Snapshot")
+	latest = (
+		frappe.qb.from_(snapshot)
+		.select(
+			snapshot.item_code,
+			snapshot.warehouse,
+			Max(snapshot.period_end_date).as_("period_end_date"),
+		)
+		.where(snapshot.period_end_date <= period_end)
+		.groupby(snapshot.item_code, snapshot.warehouse)
+	)
+
+	if query_filters:
+		latest = query_filters(latest, snapshot)
+
+	return (
+		frappe.qb.from_(snapshot)
+		.inner_join(latest)
+		.on(
+			(snapshot.item_code == latest.item_code)
+			& (snapshot.warehouse == latest.warehouse)
+			& (snapshot.period_end_date == latest.period_end_date)
+		)
+	)
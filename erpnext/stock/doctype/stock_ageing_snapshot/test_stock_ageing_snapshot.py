@@ -0,0 +1,116 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import add_days, add_months, get_first_day, get_last_day, getdate, today
+
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.stock_ageing_snapshot.stock_ageing_snapshot import (
+	SNAPSHOT_PENDING_FROM_KEY,
+	make_stock_ageing_snapshots,
+)
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	get_snapshot_pending_from,
+	set_snapshot_pending_from,
+)
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots
+
+
+class TestStockAgeingSnapshot(IntegrationTestCase):
+	def tearDown(self):
+		frappe.db.set_global(SNAPSHOT_PENDING_FROM_KEY, None)
+
+	def get_slots(self, item_code, **filters):
+		filters = frappe._dict(
+			company="_Test Company",
+			to_date=today(),
+			item_code=item_code,
+			show_warehouse_wise_stock=True,
+			**filters,
+		)
+		return FIFOSlots(filters).generate()
+
+	def test_slots_from_snapshot(self):
+		item_code = make_item("_Test Item Stock Ageing Snapshot", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+		first_month = get_first_day(add_months(today(), -3))
+		period_end = get_last_day(first_month)
+
+		make_stock_entry(
+			item_code=item_code, to_warehouse=warehouse, qty=10, rate=100, posting_date=first_month
+		)
+		make_stock_entry(
+			item_code=item_code, from_warehouse=warehouse, qty=4, posting_date=add_days(first_month, 5)
+		)
+		make_stock_entry(
+			item_code=item_code,
+			to_warehouse=warehouse,
+			qty=5,
+			rate=100,
+			posting_date=add_days(period_end, 10),
+		)
+
+		make_stock_ageing_snapshots(period_end)
+		set_snapshot_pending_from(add_days(period_end, 1), SNAPSHOT_PENDING_FROM_KEY)
+
+		snapshot = frappe.get_value(
+			"Stock Ageing Snapshot",
+			{"item_code": item_code, "warehouse": warehouse},
+			["period_end_date", "total_qty"],
+			as_dict=True,
+		)
+		self.assertEqual(getdate(snapshot.period_end_date), period_end)
+		self.assertEqual(snapshot.total_qty, 6)
+
+		slots = self.get_slots(item_code)[(item_code, warehouse)]
+		self.assertEqual(slots["fifo_queue"], [[6, first_month], [5, getdate(add_days(period_end, 10))]])
+		self.assertEqual(slots["total_qty"], 11)
+
+		replayed = self.get_slots(item_code, ignore_ageing_snapshots=1)[(item_code, warehouse)]
+		self.assertEqual(replayed["fifo_queue"], slots["fifo_queue"])
+		self.assertEqual(replayed["qty_after_transaction"], slots["qty_after_transaction"])
+
+		# Backdated entry reopens the month of the snapshot
+		make_stock_entry(
+			item_code=item_code,
+			to_warehouse=warehouse,
+			qty=2,
+			rate=100,
+			posting_date=add_days(first_month, 1),
+		)
+		self.assertEqual(getdate(get_snapshot_pending_from(SNAPSHOT_PENDING_FROM_KEY)), first_month)
+		self.assertFalse(frappe.db.exists("Stock Ageing Snapshot", {"item_code": item_code}))
+		self.assertEqual(self.get_slots(item_code)[(item_code, warehouse)]["total_qty"], 13)
+
+	def test_backdated_entries_of_items_in_same_closed_month(self):
+		items = [
+			make_item(f"_Test Item Stock Ageing Snapshot {i}", {"is_stock_item": 1}).name for i in (1, 2)
+		]
+		warehouse = "_Test Warehouse - _TC"
+		first_month = get_first_day(add_months(today(), -3))
+		period_end = get_last_day(first_month)
+
+		for item_code in items:
+			make_stock_entry(
+				item_code=item_code, to_warehouse=warehouse, qty=10, rate=100, posting_date=first_month
+			)
+
+		make_stock_ageing_snapshots(period_end)
+		set_snapshot_pending_from(add_days(period_end, 1), SNAPSHOT_PENDING_FROM_KEY)
+
+		# the first entry reopens the month, the second one finds it already reopened
+		for item_code in items:
+			make_stock_entry(
+				item_code=item_code,
+				to_warehouse=warehouse,
+				qty=3,
+				rate=100,
+				posting_date=add_days(first_month, 10),
+			)
+			self.assertFalse(frappe.db.exists("Stock Ageing Snapshot", {"item_code": item_code}))
+
+		self.assertEqual(getdate(get_snapshot_pending_from(SNAPSHOT_PENDING_FROM_KEY)), first_month)
+		for item_code in items:
+			self.assertEqual(self.get_slots(item_code)[(item_code, warehouse)]["total_qty"], 13)
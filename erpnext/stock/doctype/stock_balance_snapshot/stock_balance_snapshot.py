@@ -0,0 +1,302 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Order
+from frappe.query_builder.functions import Max, Min
+from frappe.utils import add_days, add_months, get_first_day, get_last_day, getdate, now, nowdate
+
+# Snapshots are complete for every month that ends before this date
+SNAPSHOT_PENDING_FROM_KEY = "stock_balance_snapshot_pending_from"
+
+
+class StockBalanceSnapshot(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		balance_value: DF.Currency
+		company: DF.Link | None
+		item_code: DF.Link
+		period_end_date: DF.Date
+		qty_after_transaction: DF.Float
+		stock_ledger_entry: DF.Link | None
+		stock_queue: DF.LongText | None
+		stock_value: DF.Currency
+		valuation_rate: DF.Currency
+		warehouse: DF.Link
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Stock Balance Snapshot", ["item_code", "warehouse", "period_end_date"])
+
+
+def get_snapshot_pending_from(key=SNAPSHOT_PENDING_FROM_KEY):
+	return frappe.db.get_global(key)
+
+
+def set_snapshot_pending_from(date, key=SNAPSHOT_PENDING_FROM_KEY):
+	frappe.db.set_global(key, str(getdate(date)))
+
+
+def lock_snapshot_pending_from(key=SNAPSHOT_PENDING_FROM_KEY, shared=False):
+	lock = "for update"
+	if shared:
+		lock = "for share" if frappe.db.db_type == "postgres" else "lock in share mode"
+
+	value = frappe.db.sql(
+		f"""select defvalue from `tabDefaultValue`
+		where parent = '__global' and defkey = %s {lock}""",
+		key,
+	)
+
+	return value and value[0][0] or None
+
+
+def move_snapshot_pending_from_back(date, key=SNAPSHOT_PENDING_FROM_KEY):
+	"""Set the marker to `date` only if it is after it, with a single update"""
+
+	date = str(getdate(date))
+	frappe.db.sql(
+		"""update `tabDefaultValue` set defvalue = %s
+		where parent = '__global' and defkey = %s and defvalue > %s""",
+		(date, key, date),
+	)
+	frappe.defaults.clear_cache("__global")
+
+
+def get_snapshot_period_end(posting_date):
+	"""Returns the last period end before `posting_date` for which snapshots of all
+	item-warehouses are complete"""
+
+	pending_from = get_snapshot_pending_from()
+	if not pending_from:
+		return None
+
+	period_end = get_last_day(add_months(posting_date, -1))
+	return min(period_end, add_days(getdate(pending_from), -1))
+
+
+def create_stock_balance_snapshots():
+	create_month_end_snapshots(make_stock_balance_snapshots)
+
+
+def create_month_end_snapshots(make_snapshots, key=SNAPSHOT_PENDING_FROM_KEY):
+	"""Call `make_snapshots` with the end of all completed months, starting from the
+	first month which is missing or was reopened by a backdated entry.
+
+	`key` is the global keeping the first month whose snapshots are pending."""
+
+	last_period_end = get_last_day(add_months(nowdate(), -1))
+	if not get_snapshot_pending_from(key):
+		sle = frappe.qb.DocType("Stock Ledger Entry")
+		first_posting_date = (
+			frappe.qb.from_(sle).select(Min(sle.posting_date)).where(sle.is_cancelled == 0).run()[0][0]
+		)
+		if not first_posting_date:
+			return
+
+		set_snapshot_pending_from(get_first_day(first_posting_date), key)
+		commit()
+
+	while True:
+		# Lock the marker so that a reopening waits for the month being built
+		pending_from = getdate(lock_snapshot_pending_from(key))
+		if pending_from > last_period_end:
+			break
+
+		period_end = get_last_day(pending_from)
+		make_snapshots(period_end)
+		set_snapshot_pending_from(add_days(period_end, 1), key)
+		commit()
+
+
+def reopen_snapshots(posting_date, key=SNAPSHOT_PENDING_FROM_KEY):
+	"""Mark the snapshots from the month of a backdated `posting_date` as pending.
+
+	Returns True if `posting_date` is in a month which may have snapshots, in which case
+	the caller drops the stale snapshots of the item-warehouse, even if an earlier entry
+	already moved the marker."""
+
+	# months are snapshotted once they are over, entries of the current month are in none
+	if getdate(posting_date) > get_last_day(add_months(nowdate(), -1)):
+		return False
+
+	pending_from = get_snapshot_pending_from(key)
+	if not pending_from:
+		return False
+
+	if getdate(posting_date) >= getdate(pending_from):
+		# wait for the month being built, it may have read the ledger without this entry.
+		# The lock is shared so that stock transactions do not wait for each other.
+		pending_from = lock_snapshot_pending_from(key, shared=True)
+
+	if getdate(posting_date) < getdate(pending_from):
+		move_snapshot_pending_from_back(get_first_day(posting_date), key)
+
+	return True
+
+
+def commit():
+	if not frappe.flags.in_test:
+		frappe.db.commit()
+
+
+def make_stock_balance_snapshots(period_end):
+	"""Snapshot the last entry of the month for every item-warehouse which had a
+	transaction in the month ending on `period_end`"""
+
+	period_end = getdate(period_end)
+	frappe.db.delete("Stock Balance Snapshot", {"period_end_date": period_end})
+
+	previous_balances = {
+		(d.item_code, d.warehouse): d.balance_value
+		for d in get_latest_stock_balance_snapshots(add_days(get_first_day(period_end), -1))
+	}
+
+	last_entries = {}
+	with frappe.db.unbuffered_cursor():
+		entries = frappe.db.sql(
+			"""
+			select
+				name, company, item_code, warehouse, qty_after_transaction, valuation_rate,
+				stock_value, stock_value_difference, stock_queue
+			from `tabStock Ledger Entry`
+			where is_cancelled = 0 and posting_date between %s and %s
+			order by posting_datetime, creation
+			""",
+			(get_first_day(period_end), period_end),
+			as_dict=True,
+			as_iterator=True,
+		)
+
+		for entry in entries:
+			key = (entry.item_code, entry.warehouse)
+			previous_balances[key] = (previous_balances.get(key) or 0.0) + entry.stock_value_difference
+			last_entries[key] = entry
+
+	fields = [
+		"name",
+		"item_code",
+		"warehouse",
+		"company",
+		"period_end_date",
+		"stock_ledger_entry",
+		"qty_after_transaction",
+		"valuation_rate",
+		"stock_value",
+		"balance_value",
+		"stock_queue",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+	]
+
+	timestamp = now()
+	values = [
+		(
+			frappe.generate_hash(length=10),
+			entry.item_code,
+			entry.warehouse,
+			entry.company,
+			period_end,
+			entry.name,
+			entry.qty_after_transaction,
+			entry.valuation_rate,
+			entry.stock_value,
+			previous_balances[key],
+			entry.stock_queue,
+			timestamp,
+			timestamp,
+			frappe.session.user,
+			frappe.session.user,
+		)
+		for key, entry in last_entries.items()
+	]
+
+	frappe.db.bulk_insert("Stock Balance Snapshot", fields, values)
+
+
+def invalidate_stock_balance_snapshots(item_code, warehouse, posting_date):
+	"""Drop snapshots made stale by a backdated entry and rebuild them from its month"""
+
+	if not reopen_snapshots(posting_date):
+		return
+
+	frappe.db.delete(
+		"Stock Balance Snapshot",
+		{"item_code": item_code, "warehouse": warehouse, "period_end_date": (">=", posting_date)},
+	)
+
+
+def get_stock_balance_snapshot(item_code, warehouse, posting_date):
+	"""Returns the latest complete snapshot of the item-warehouse before `posting_date`"""
+
+	period_end = get_snapshot_period_end(posting_date)
+	if not period_end:
+		return None
+
+	snapshot = frappe.qb.DocType("Stock Balance Snapshot")
+	data = (
+		frappe.qb.from_(snapshot)
+		.select(snapshot.star)
+		.where(
+			(snapshot.item_code == item_code)
+			& (snapshot.warehouse == warehouse)
+			& (snapshot.period_end_date <= period_end)
+		)
+		.orderby(snapshot.period_end_date, order=Order.desc)
+		.limit(1)
+	).run(as_dict=True)
+
+	return data[0] if data else None
+
+
+def get_latest_stock_balance_snapshots(period_end, query_filters=None):
+	"""Returns the latest snapshot up to `period_end` for every item-warehouse"""
+
+	snapshot = frappe.qb.DocType("Stock Balance Snapshot")
+	query = get_latest_stock_balance_snapshots_query(period_end, query_filters)
+
+	return query.select(snapshot.star).run(as_dict=True)
+
+
+def get_latest_stock_balance_snapshots_query(period_end, query_filters=None):
+	"""Query on the latest snapshot up to `period_end` of every item-warehouse.
+
+	`query_filters` is called with the query and the snapshot table to apply
+	item and warehouse filters."""
+
+	snapshot = frappe.qb.DocType("Stock Balance Snapshot")
+	latest = (
+		frappe.qb.from_(snapshot)
+		.select(
+			snapshot.item_code,
+			snapshot.warehouse,
+			Max(snapshot.period_end_date).as_("period_end_date"),
+		)
+		.where(snapshot.period_end_date <= period_end)
+		.groupby(snapshot.item_code, snapshot.warehouse)
+	)
+
+	if query_filters:
+		latest = query_filters(latest, snapshot)
+
+	return (
+		frappe.qb.from_(snapshot)
+		.inner_join(latest)
+		.on(
+			(snapshot.item_code == latest.item_code)
+			& (snapshot.warehouse == latest.warehouse)
+			& (snapshot.period_end_date == latest.period_end_date)
+		)
+	)
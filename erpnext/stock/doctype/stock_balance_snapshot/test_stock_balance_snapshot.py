@@ -0,0 +1,142 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+from frappe.tests import IntegrationTestCase
+from frappe.utils import add_days, add_months, get_first_day, get_last_day, getdate, today
+
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	get_snapshot_pending_from,
+	get_stock_balance_snapshot,
+	make_stock_balance_snapshots,
+	set_snapshot_pending_from,
+)
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+from erpnext.stock.stock_ledger import get_previous_sle
+from erpnext.stock.utils import get_stock_balance, get_stock_value_on
+
+
+class TestStockBalanceSnapshot(IntegrationTestCase):
+	def test_snapshot_bounds_previous_sle_and_stock_value(self):
+		item_code = make_item("_Test Item Stock Balance Snapshot", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+		first_month = get_first_day(add_months(today(), -3))
+		period_end = get_last_day(first_month)
+
+		make_stock_entry(
+			item_code=item_code,
+			to_warehouse=warehouse,
+			qty=10,
+			rate=100,
+			posting_date=add_days(first_month, 5),
+		)
+		make_stock_entry(
+			item_code=item_code,
+			to_warehouse=warehouse,
+			qty=5,
+			rate=200,
+			posting_date=add_days(period_end, 10),
+		)
+
+		make_stock_balance_snapshots(period_end)
+		set_snapshot_pending_from(add_days(period_end, 1))
+
+		snapshot = get_stock_balance_snapshot(item_code, warehouse, add_days(period_end, 1))
+		self.assertEqual(snapshot.qty_after_transaction, 10)
+		self.assertEqual(snapshot.balance_value, 1000)
+
+		args = {"item_code": item_code, "warehouse": warehouse, "posting_time": "00:00:00"}
+		previous_sle = get_previous_sle({**args, "posting_date": add_days(period_end, 5)})
+		self.assertEqual(previous_sle.name, snapshot.stock_ledger_entry)
+
+		previous_sle = get_previous_sle({**args, "posting_date": today()})
+		self.assertEqual(previous_sle.qty_after_transaction, 15)
+		self.assertEqual(get_stock_value_on(warehouse, today(), item_code), 2000)
+
+		# Backdated entry drops the stale snapshot and reopens its month
+		make_stock_entry(
+			item_code=item_code,
+			to_warehouse=warehouse,
+			qty=2,
+			rate=100,
+			posting_date=add_days(first_month, 1),
+		)
+		self.assertFalse(get_stock_balance_snapshot(item_code, warehouse, add_days(period_end, 1)))
+		self.assertEqual(getdate(get_snapshot_pending_from()), first_month)
+
+		# reopened months are skipped until they are rebuilt
+		self.assertFalse(get_stock_balance_snapshot(item_code, warehouse, add_days(period_end, 1)))
+
+		make_stock_balance_snapshots(period_end)
+		set_snapshot_pending_from(add_days(period_end, 1))
+		snapshot = get_stock_balance_snapshot(item_code, warehouse, add_days(period_end, 1))
+		self.assertEqual(snapshot.qty_after_transaction, 12)
+		self.assertEqual(get_stock_value_on(warehouse, today(), item_code), 2200)
+
+	def test_backdated_entries_of_items_in_same_closed_month(self):
+		items = [
+			make_item(f"_Test Item Stock Balance Snapshot {i}", {"is_stock_item": 1}).name for i in (1, 2)
+		]
+		warehouse = "_Test Warehouse - _TC"
+		first_month = get_first_day(add_months(today(), -3))
+		period_end = get_last_day(first_month)
+
+		for item_code in items:
+			make_stock_entry(
+				item_code=item_code,
+				to_warehouse=warehouse,
+				qty=10,
+				rate=100,
+				posting_date=add_days(first_month, 5),
+			)
+
+		make_stock_balance_snapshots(period_end)
+		set_snapshot_pending_from(add_days(period_end, 1))
+
+		# the first entry reopens the month, the second one finds it already reopened
+		for item_code in items:
+			make_stock_entry(
+				item_code=item_code,
+				to_warehouse=warehouse,
+				qty=3,
+				rate=100,
+				posting_date=add_days(first_month, 10),
+			)
+			self.assertFalse(get_stock_balance_snapshot(item_code, warehouse, add_days(period_end, 1)))
+
+		self.assertEqual(getdate(get_snapshot_pending_from()), first_month)
+
+		args = {"warehouse": warehouse, "posting_date": add_days(period_end, 5), "posting_time": "00:00:00"}
+		for item_code in items:
+			self.assertEqual(get_previous_sle({**args, "item_code": item_code}).qty_after_transaction, 13)
+			self.assertEqual(get_stock_balance(item_code, warehouse, add_days(period_end, 5)), 13)
+
+	def test_cancelled_snapshot_entry(self):
+		item_code = make_item("_Test Item Stock Balance Snapshot Cancel", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+		first_month = get_first_day(add_months(today(), -3))
+		period_end = get_last_day(first_month)
+
+		make_stock_entry(
+			item_code=item_code,
+			to_warehouse=warehouse,
+			qty=10,
+			rate=100,
+			posting_date=add_days(first_month, 5),
+		)
+		stock_entry = make_stock_entry(
+			item_code=item_code,
+			to_warehouse=warehouse,
+			qty=5,
+			rate=100,
+			posting_date=add_days(first_month, 10),
+		)
+
+		make_stock_balance_snapshots(period_end)
+		set_snapshot_pending_from(add_days(period_end, 1))
+		snapshot = get_stock_balance_snapshot(item_code, warehouse, add_days(period_end, 1))
+		self.assertEqual(snapshot.qty_after_transaction, 15)
+
+		stock_entry.cancel()
+		self.assertEqual(get_stock_balance(item_code, warehouse, add_days(period_end, 5)), 10)
+		self.assertEqual(get_stock_balance(item_code, warehouse, today()), 10)
@@ -4,6 +4,33 @@
 frappe.ui.form.on("Stock Reposting Settings", {
 	refresh: function (frm) {
 		frm.trigger("convert_to_item_based_reposting");
+		frm.trigger("show_reposting_metrics");
+	},
+
+	show_reposting_metrics: function (frm) {
+		frm.call({
+			method: "get_reposting_metrics",
+			doc: frm.doc,
+			callback: function (r) {
+				if (!r.message) return;
+
+				const metrics = r.message;
+				const rows = [
+					[__("Queued"), metrics.queued],
+					[__("In Progress"), metrics.in_progress],
+					[__("Failed"), metrics.failed],
+					[__("Claimed by Workers"), metrics.claimed_by_workers],
+					[__("Completed in the last hour"), metrics.completed_last_hour],
+					[__("Completed in the last 24 hours"), metrics.completed_last_day],
+				];
+
+				frm.get_field("reposting_metrics").$wrapper.html(`
+					<table class="table table-bordered small">
+						${rows.map(([label, value]) => `<tr><td>${label}</td><td>${value}</td></tr>`).join("")}
+					</table>
+				`);
+			},
+		});
 	},
 
 	convert_to_item_based_reposting: function (frm) {
@@ -4,7 +4,7 @@
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import add_to_date, get_datetime, get_time_str, time_diff_in_hours
+from frappe.utils import add_to_date, get_datetime, get_time_str, now_datetime, time_diff_in_hours
 
 
 class StockRepostingSettings(Document):
@@ -23,8 +23,12 @@ class StockRepostingSettings(Document):
 		limits_dont_apply_on: DF.Literal[
 			"", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"
 		]
+		max_reposting_workers: DF.Int
 		notify_reposting_error_to_role: DF.Link | None
+		repost_in_parallel: DF.Check
+		reposting_time_budget: DF.Int
 		start_time: DF.Time | None
+		use_batched_reposting: DF.Check
 	# end: auto-generated types
 
 	def validate(self):
@@ -77,6 +81,41 @@ class StockRepostingSettings(Document):
 		self.db_set("item_based_reposting", 1)
 		frappe.msgprint(_("Item Warehouse based reposting has been enabled."))
 
+	@frappe.whitelist()
+	def get_reposting_metrics(self):
+		"""Queue depth and throughput of Repost Item Valuation entries."""
+		from erpnext.stock.doctype.repost_item_valuation.repost_item_valuation import get_claimed_reposts
+
+		status_count = dict(
+			frappe.get_all(
+				"Repost Item Valuation",
+				filters={"docstatus": 1, "status": ("in", ["Queued", "In Progress", "Failed"])},
+				fields=["status", "count(name) as count"],
+				group_by="status",
+				as_list=True,
+			)
+		)
+
+		def get_completed_since(hours):
+			return frappe.db.count(
+				"Repost Item Valuation",
+				{
+					"docstatus": 1,
+					"status": "Completed",
+					"modified": (">=", add_to_date(now_datetime(), hours=-hours)),
+				},
+			)
+
+		return {
+			"queued": status_count.get("Queued", 0),
+			"in_progress": status_count.get("In Progress", 0),
+			"failed": status_count.get("Failed", 0),
+			# read only, the claims of done jobs are removed when reposts are claimed
+			"claimed_by_workers": len(get_claimed_reposts(remove_expired=False)),
+			"completed_last_hour": get_completed_since(1),
+			"completed_last_day": get_completed_since(24),
+		}
+
 
 def get_reposting_entries():
 	return frappe.get_all(
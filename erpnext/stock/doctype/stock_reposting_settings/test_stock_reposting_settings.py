@@ -86,3 +86,16 @@ class TestStockRepostingSettings(IntegrationTestCase):
 
 		riv = frappe.get_all("Repost Item Valuation", filters={"voucher_no": stock_entry.name}, pluck="name")
 		self.assertFalse(riv)
+
+	def test_reposting_metrics_do_not_remove_claims(self):
+		from erpnext.stock.doctype.repost_item_valuation.repost_item_valuation import REPOST_CLAIMS_KEY
+
+		frappe.cache.hset(REPOST_CLAIMS_KEY, "_Test Done Repost", "_test-done-repost-job")
+		try:
+			metrics = frappe.get_doc("Stock Reposting Settings").get_reposting_metrics()
+			self.assertEqual(metrics["claimed_by_workers"], 0)
+			self.assertEqual(
+				frappe.cache.hget(REPOST_CLAIMS_KEY, "_Test Done Repost"), "_test-done-repost-job"
+			)
+		finally:
+			frappe.cache.hdel(REPOST_CLAIMS_KEY, "_Test Done Repost")
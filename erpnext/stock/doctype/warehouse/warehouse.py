@@ -179,7 +179,10 @@ class Warehouse(NestedSet):
 			return 1
 
 	def unlink_from_items(self):
+		from erpnext.stock.get_item_details import clear_item_details_cache
+
 		frappe.db.set_value("Item Default", {"default_warehouse": self.name}, "default_warehouse", None)
+		clear_item_details_cache()
 
 
 @frappe.whitelist()
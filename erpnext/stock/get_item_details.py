@@ -24,6 +24,8 @@ from erpnext.stock.doctype.item.item import get_item_defaults, get_uom_conv_fact
 from erpnext.stock.doctype.item_manufacturer.item_manufacturer import get_item_manufacturer_part_no
 from erpnext.stock.doctype.price_list.price_list import get_price_list_details
 
+ITEM_DETAILS_CACHE_KEY = "item_details_cache"
+
 sales_doctypes = ["Quotation", "Sales Order", "Delivery Note", "Sales Invoice", "POS Invoice"]
 purchase_doctypes = [
 	"Material Request",
@@ -129,12 +131,96 @@ def get_item_details(args, doc=None, for_validate=False, overwrite_warehouse=Tru
 	return out
 
 
+@frappe.whitelist()
+def get_items_details(items, doc=None, for_validate=False, overwrite_warehouse=True):
+	"""Batched `get_item_details` for a list of item args.
+
+	The parent document is parsed once and the cached item details are shared by
+	all rows of the same item."""
+
+	items = process_string_args(items)
+	if isinstance(doc, str):
+		doc = json.loads(doc)
+
+	return [
+		get_item_details(args, doc, for_validate=for_validate, overwrite_warehouse=overwrite_warehouse)
+		for args in items
+	]
+
+
 def remove_standard_fields(details):
 	for key in child_table_fields + default_fields:
 		details.pop(key, None)
 	return details
 
 
+def get_cached_item_details(item, company):
+	"""Returns the static details of the item for the company: item, item group and
+	brand defaults, item tax templates and UOM conversion factors.
+
+	Cached for the request and in redis, cleared by `clear_item_details_cache`."""
+
+	if not hasattr(frappe.local, "item_details_cache"):
+		frappe.local.item_details_cache = {}
+
+	key = f"{item.name}::{company}"
+	if key not in frappe.local.item_details_cache:
+		frappe.local.item_details_cache[key] = frappe.cache.hget(
+			ITEM_DETAILS_CACHE_KEY, key, generator=lambda: _get_item_details_for_cache(item, company)
+		)
+
+	return frappe.local.item_details_cache[key]
+
+
+def _get_item_details_for_cache(item, company):
+	details = frappe._dict(
+		{
+			"item_defaults": get_item_defaults(item.name, company),
+			"item_group_defaults": get_item_group_defaults(item.name, company),
+			"brand_defaults": get_brand_defaults(item.name, company),
+			"item_tax_levels": [],
+			"conversion_factors": {},
+		}
+	)
+
+	templates = [frappe.get_cached_doc("Item", item.variant_of)] if item.variant_of else []
+
+	# item (or its template's) taxes, then the taxes of each item group up the tree
+	levels = [item.taxes or (templates and templates[0].taxes) or []]
+	item_group = item.item_group
+	while item_group:
+		item_group_doc = frappe.get_cached_doc("Item Group", item_group)
+		levels.append(item_group_doc.taxes)
+		item_group = item_group_doc.parent_item_group
+
+	for taxes in levels:
+		details.item_tax_levels.append(
+			[
+				frappe._dict(tax.as_dict())
+				for tax in taxes
+				if frappe.get_cached_value("Item Tax Template", tax.item_tax_template, "company") == company
+			]
+		)
+
+	for d in [item, *templates]:
+		for row in d.get("uoms"):
+			details.conversion_factors.setdefault(row.uom, row.conversion_factor)
+
+	return details
+
+
+def clear_item_details_cache(item_code=None):
+	"""Clear the cached details of the item, or of all items"""
+	frappe.local.item_details_cache = {}
+
+	if not item_code or frappe.get_cached_value("Item", item_code, "has_variants"):
+		frappe.cache.delete_value(ITEM_DETAILS_CACHE_KEY)
+		return
+
+	for company in frappe.get_all("Company", pluck="name"):
+		frappe.cache.hdel(ITEM_DETAILS_CACHE_KEY, f"{item_code}::{company}")
+
+
 def set_valuation_rate(out, args):
 	if frappe.db.exists("Product Bundle", {"name": args.item_code, "disabled": 0}, cache=True):
 		valuation_rate = 0.0
@@ -271,9 +357,10 @@ def get_basic_details(args, item, overwrite_warehouse=True):
 	if item.variant_of and not item.taxes and frappe.db.exists("Item Tax", {"parent": item.variant_of}):
 		item.update_template_tables()
 
-	item_defaults = get_item_defaults(item.name, args.company)
-	item_group_defaults = get_item_group_defaults(item.name, args.company)
-	brand_defaults = get_brand_defaults(item.name, args.company)
+	cached_details = get_cached_item_details(item, args.company)
+	item_defaults = cached_details.item_defaults
+	item_group_defaults = cached_details.item_group_defaults
+	brand_defaults = cached_details.brand_defaults
 
 	defaults = frappe._dict(
 		{
@@ -395,8 +482,10 @@ def get_basic_details(args, item, overwrite_warehouse=True):
 	if item.stock_uom == args.uom:
 		out.conversion_factor = 1.0
 	else:
-		out.conversion_factor = args.conversion_factor or get_conversion_factor(item.name, args.uom).get(
-			"conversion_factor"
+		out.conversion_factor = (
+			args.conversion_factor
+			or cached_details.conversion_factors.get(args.uom)
+			or get_conversion_factor(item.name, args.uom).get("conversion_factor")
 		)
 
 	args.conversion_factor = out.conversion_factor
@@ -434,18 +523,13 @@ def get_basic_details(args, item, overwrite_warehouse=True):
 			out["manufacturer_part_no"] = None
 			out["manufacturer"] = None
 	else:
-		data = frappe.get_value(
-			"Item", item.name, ["default_item_manufacturer", "default_manufacturer_part_no"], as_dict=1
+		out.update(
+			{
+				"manufacturer": item.default_item_manufacturer,
+				"manufacturer_part_no": item.default_manufacturer_part_no,
+			}
 		)
 
-		if data:
-			out.update(
-				{
-					"manufacturer": data.default_item_manufacturer,
-					"manufacturer_part_no": data.default_manufacturer_part_no,
-				}
-			)
-
 	child_doctype = args.doctype + " Item"
 	meta = frappe.get_meta(child_doctype)
 	if meta.get_field("barcode"):
@@ -579,15 +663,12 @@ def get_item_tax_template(args, item, out):
 	}
 	"""
 	item_tax_template = None
-	if item.taxes:
-		item_tax_template = _get_item_tax_template(args, item.taxes, out)
-
-	if not item_tax_template:
-		item_group = item.item_group
-		while item_group and not item_tax_template:
-			item_group_doc = frappe.get_cached_doc("Item Group", item_group)
-			item_tax_template = _get_item_tax_template(args, item_group_doc.taxes, out)
-			item_group = item_group_doc.parent_item_group
+	for taxes in get_cached_item_details(item, args.get("company")).item_tax_levels:
+		if taxes:
+			item_tax_template = _get_item_tax_template(args, taxes, out)
+
+		if item_tax_template:
+			break
 
 	if args.get("child_doctype") and item_tax_template:
 		out.update(get_fetch_values(args.get("child_doctype"), "item_tax_template", item_tax_template))
@@ -2,14 +2,19 @@
 # License: GNU General Public License v3. See license.txt
 
 
+import json
 from collections.abc import Iterator
 from operator import itemgetter
 
 import frappe
 from frappe import _
-from frappe.utils import cint, date_diff, flt
+from frappe.utils import cint, date_diff, flt, getdate
 
 from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
+from erpnext.stock.doctype.stock_ageing_snapshot.stock_ageing_snapshot import (
+	get_latest_stock_ageing_snapshots_query,
+	get_snapshot_period_end,
+)
 
 Filters = frappe._dict
 
@@ -214,6 +219,7 @@ class FIFOSlots:
 		self.serial_no_batch_purchase_details = {}
 		self.filters = filters
 		self.sle = sle
+		self.snapshot_period_end = None
 
 	def generate(self) -> dict:
 		"""
@@ -235,6 +241,7 @@ class FIFOSlots:
 		bundle_wise_serial_nos = frappe._dict({})
 		if stock_ledger_entries is None:
 			bundle_wise_serial_nos = self.__get_bundle_wise_serial_nos()
+			self.__set_fifo_queues_from_snapshots()
 
 		with frappe.db.unbuffered_cursor():
 			if stock_ledger_entries is None:
@@ -396,6 +403,51 @@ class FIFOSlots:
 
 		return item_aggregated_data
 
+	def __set_fifo_queues_from_snapshots(self):
+		"Start from the latest Stock Ageing Snapshots up to the report date."
+		if self.filters.get("ignore_ageing_snapshots"):
+			return
+
+		self.snapshot_period_end = get_snapshot_period_end(self.filters.get("to_date"))
+		if not self.snapshot_period_end:
+			return
+
+		snapshot = frappe.qb.DocType("Stock Ageing Snapshot")
+		item = self.__get_item_query()
+
+		def apply_filters(query, snapshot):
+			query = query.where(snapshot.company == self.filters.get("company"))
+			return self.__apply_warehouse_filters(snapshot, query)
+
+		snapshots = (
+			get_latest_stock_ageing_snapshots_query(self.snapshot_period_end, apply_filters)
+			.inner_join(item)
+			.on(snapshot.item_code == item.name)
+			.select(
+				item.name,
+				item.item_name,
+				item.item_group,
+				item.brand,
+				item.description,
+				item.stock_uom,
+				item.has_serial_no,
+				snapshot.warehouse,
+				snapshot.qty_after_transaction,
+				snapshot.total_qty,
+				snapshot.fifo_queue,
+			)
+		).run(as_dict=True)
+
+		for d in snapshots:
+			fifo_queue = [[slot[0], getdate(slot[1])] for slot in json.loads(d.pop("fifo_queue") or "[]")]
+			self.item_details[(d.name, d.warehouse)] = {
+				"details": d,
+				"fifo_queue": fifo_queue,
+				"qty_after_transaction": d.qty_after_transaction,
+				"total_qty": d.total_qty,
+				"has_serial_no": d.has_serial_no,
+			}
+
 	def __get_stock_ledger_entries(self) -> Iterator[dict]:
 		sle = frappe.qb.DocType("Stock Ledger Entry")
 		item = self.__get_item_query()  # used as derived table in sle query
@@ -429,8 +481,21 @@ class FIFOSlots:
 			)
 		)
 
+		sle_query = self.__apply_warehouse_filters(sle, sle_query)
+
+		if self.snapshot_period_end:
+			# slots of items without serial nos up to the period end are restored from the snapshots
+			sle_query = sle_query.where(
+				(sle.posting_date > self.snapshot_period_end) | (item.has_serial_no == 1)
+			)
+
+		sle_query = sle_query.orderby(sle.posting_date, sle.posting_time, sle.creation, sle.actual_qty)
+
+		return sle_query.run(as_dict=True, as_iterator=True)
+
+	def __apply_warehouse_filters(self, table, query):
 		if self.filters.get("warehouse"):
-			sle_query = self.__get_warehouse_conditions(sle, sle_query)
+			query = self.__get_warehouse_conditions(table, query)
 		elif self.filters.get("warehouse_type"):
 			warehouses = frappe.get_all(
 				"Warehouse",
@@ -439,13 +504,14 @@ class FIFOSlots:
 			)
 
 			if warehouses:
-				sle_query = sle_query.where(sle.warehouse.isin(warehouses))
+				query = query.where(table.warehouse.isin(warehouses))
 
-		sle_query = sle_query.orderby(sle.posting_date, sle.posting_time, sle.creation, sle.actual_qty)
-
-		return sle_query.run(as_dict=True, as_iterator=True)
+		return query
 
 	def __get_bundle_wise_serial_nos(self) -> dict:
+		if self.filters.get("has_serial_no") == 0:
+			return frappe._dict({})
+
 		bundle = frappe.qb.DocType("Serial and Batch Bundle")
 		entry = frappe.qb.DocType("Serial and Batch Entry")
 
@@ -488,6 +554,9 @@ class FIFOSlots:
 		if self.filters.get("brand"):
 			item = item.where(item_table.brand == self.filters.get("brand"))
 
+		if self.filters.get("has_serial_no") is not None:
+			item = item.where(item_table.has_serial_no == self.filters.get("has_serial_no"))
+
 		return item
 
 	def __get_warehouse_conditions(self, sle, sle_query) -> str:
@@ -14,6 +14,10 @@ from frappe.utils.nestedset import get_descendants_of
 
 import erpnext
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	get_latest_stock_balance_snapshots,
+	get_snapshot_period_end,
+)
 from erpnext.stock.doctype.warehouse.warehouse import apply_warehouse_filter
 from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots, get_average_age
 from erpnext.stock.utils import add_additional_uom_columns
@@ -77,18 +81,63 @@ class StockBalanceReport:
 
 		closing_balance = self.get_closing_balance()
 		if not closing_balance:
+			self.prepare_opening_data_from_snapshots()
 			return
 
 		self.start_from = add_days(closing_balance[0].to_date, 1)
 		res = frappe.get_doc("Closing Stock Balance", closing_balance[0].name).get_prepared_data()
+		item_codes = set(self.filters.get("item_codes") or [])
 
 		for entry in res.data:
 			entry = frappe._dict(entry)
+			if item_codes and entry.item_code not in item_codes:
+				continue
 
 			group_by_key = self.get_group_by_key(entry)
 			if group_by_key not in self.opening_data:
 				self.opening_data.setdefault(group_by_key, entry)
 
+	def prepare_opening_data_from_snapshots(self) -> None:
+		if (
+			self.filters.get("ignore_closing_balance")
+			or self.filters.get("show_stock_ageing_data")
+			or self.filters.get("show_dimension_wise_stock")
+			or any(self.filters.get(fieldname) for fieldname in self.inventory_dimensions)
+		):
+			return
+
+		period_end = get_snapshot_period_end(self.from_date)
+		if not period_end:
+			return
+
+		item_table = frappe.qb.DocType("Item")
+
+		def apply_filters(query, snapshot):
+			query = query.inner_join(item_table).on(snapshot.item_code == item_table.name)
+			query = self.apply_warehouse_filters(query, snapshot)
+			query = self.apply_items_filters(query, item_table)
+
+			if self.filters.get("company"):
+				query = query.where(snapshot.company == self.filters.get("company"))
+
+			return query
+
+		snapshots = get_latest_stock_balance_snapshots(period_end, apply_filters)
+		item_details = get_item_details_for_snapshots({d.item_code for d in snapshots})
+
+		self.start_from = add_days(period_end, 1)
+		for entry in snapshots:
+			entry.update(item_details.get(entry.item_code, {}))
+			entry.update(
+				{
+					"bal_qty": entry.qty_after_transaction,
+					"bal_val": entry.balance_value,
+					"val_rate": entry.valuation_rate,
+				}
+			)
+
+			self.opening_data[self.get_group_by_key(entry)] = entry
+
 	def prepare_new_data(self):
 		self.item_warehouse_map = self.get_item_warehouse_map()
 
@@ -244,7 +293,7 @@ class StockBalanceReport:
 				"out_val": 0.0,
 				"bal_qty": opening_data.get("bal_qty") or 0.0,
 				"bal_val": opening_data.get("bal_val") or 0.0,
-				"val_rate": 0.0,
+				"val_rate": opening_data.get("val_rate") or 0.0,
 			}
 		)
 
@@ -367,6 +416,10 @@ class StockBalanceReport:
 			else:
 				query = query.where(item_table[field] == self.filters.get(field))
 
+		# items of a chunk of a background report run
+		if item_codes := self.filters.get("item_codes"):
+			query = query.where(item_table.name.isin(item_codes))
+
 		return query
 
 	def apply_date_filters(self, query, sle) -> str:
@@ -608,6 +661,20 @@ class StockBalanceReport:
 		return opening_fifo_queue
 
 
+def get_item_details_for_snapshots(item_codes) -> dict:
+	if not item_codes:
+		return {}
+
+	return {
+		d.name: d
+		for d in frappe.get_all(
+			"Item",
+			filters={"name": ("in", list(item_codes))},
+			fields=["name", "item_group", "item_name", "stock_uom"],
+		)
+	}
+
+
 def filter_items_with_no_transactions(
 	iwb_map, float_precision: float, inventory_dimensions: list | None = None
 ):
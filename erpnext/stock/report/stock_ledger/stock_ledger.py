@@ -409,6 +409,10 @@ def get_stock_ledger_entries(filters, items):
 	if items:
 		query = query.where(sle.item_code.isin(items))
 
+	# items of a chunk of a background report run
+	if item_codes := filters.get("item_codes"):
+		query = query.where(sle.item_code.isin(item_codes))
+
 	for field in ["voucher_no", "project", "company"]:
 		if filters.get(field) and field not in inventory_dimension_fields:
 			query = query.where(sle[field] == filters.get(field))
@@ -595,14 +599,19 @@ def get_opening_balance(filters, columns, sl_entries):
 
 	from erpnext.stock.stock_ledger import get_previous_sle
 
-	last_entry = get_previous_sle(
-		{
-			"item_code": filters.item_code,
-			"warehouse_condition": get_warehouse_condition(filters.warehouse),
-			"posting_date": filters.from_date,
-			"posting_time": "00:00:00",
-		}
-	)
+	args = {
+		"item_code": filters.item_code,
+		"posting_date": filters.from_date,
+		"posting_time": "00:00:00",
+	}
+
+	# a single warehouse can start from its month end snapshot
+	if frappe.get_cached_value("Warehouse", filters.warehouse, "is_group"):
+		args["warehouse_condition"] = get_warehouse_condition(filters.warehouse)
+	else:
+		args["warehouse"] = filters.warehouse
+
+	last_entry = get_previous_sle(args)
 
 	# check if any SLEs are actually Opening Stock Reconciliation
 	for sle in list(sl_entries):
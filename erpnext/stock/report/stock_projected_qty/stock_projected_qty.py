@@ -7,7 +7,6 @@ from frappe import _
 from frappe.utils import flt, today
 from pypika.terms import ExistsCriterion
 
-from erpnext.accounts.doctype.pos_invoice.pos_invoice import get_pos_reserved_qty
 from erpnext.stock.utils import (
 	is_reposting_item_valuation_in_progress,
 	update_included_uom_in_report,
@@ -57,9 +56,8 @@ def execute(filters=None):
 		if (re_order_level or re_order_qty) and re_order_level > bin.projected_qty:
 			shortage_qty = re_order_level - flt(bin.projected_qty)
 
-		reserved_qty_for_pos = get_pos_reserved_qty(bin.item_code, bin.warehouse)
-		if reserved_qty_for_pos:
-			bin.projected_qty -= reserved_qty_for_pos
+		if bin.pos_reserved_qty:
+			bin.projected_qty -= bin.pos_reserved_qty
 
 		data.append(
 			[
@@ -78,7 +76,7 @@ def execute(filters=None):
 				bin.reserved_qty_for_production,
 				bin.reserved_qty_for_production_plan,
 				bin.reserved_qty_for_sub_contract,
-				reserved_qty_for_pos,
+				bin.pos_reserved_qty,
 				bin.projected_qty,
 				re_order_level,
 				re_order_qty,
@@ -242,6 +240,7 @@ def get_bin_list(filters):
 			bin.reserved_qty_for_sub_contract,
 			bin.reserved_qty_for_production_plan,
 			bin.projected_qty,
+			bin.pos_reserved_qty,
 		)
 		.orderby(bin.item_code, bin.warehouse)
 	)
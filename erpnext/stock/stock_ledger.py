@@ -4,12 +4,14 @@
 import copy
 import gzip
 import json
+import time
 
 import frappe
 from frappe import _, bold, scrub
 from frappe.model.meta import get_field_precision
 from frappe.query_builder.functions import Sum
 from frappe.utils import (
+	add_days,
 	add_to_date,
 	cint,
 	cstr,
@@ -29,6 +31,13 @@ from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_in
 from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
 	get_available_batches,
 )
+from erpnext.stock.doctype.stock_ageing_snapshot.stock_ageing_snapshot import (
+	invalidate_stock_ageing_snapshots,
+)
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	get_stock_balance_snapshot,
+	invalidate_stock_balance_snapshots,
+)
 from erpnext.stock.doctype.stock_reservation_entry.stock_reservation_entry import (
 	get_sre_reserved_batch_nos_details,
 	get_sre_reserved_serial_nos_details,
@@ -42,7 +51,12 @@ from erpnext.stock.utils import (
 	get_stock_balance,
 	get_valuation_method,
 )
-from erpnext.stock.valuation import FIFOValuation, LIFOValuation, round_off_if_near_zero
+from erpnext.stock.valuation import (
+	IncrementalBinWiseValuation,
+	IncrementalFIFOValuation,
+	IncrementalLIFOValuation,
+	round_off_if_near_zero,
+)
 
 
 class NegativeStockError(frappe.ValidationError):
@@ -53,6 +67,12 @@ class SerialNoExistsInFutureTransaction(frappe.ValidationError):
 	pass
 
 
+class RepostTimeBudgetExceeded(Exception):
+	"""Raised when a repost has used its time budget, progress is saved in a checkpoint."""
+
+	pass
+
+
 def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_voucher=False):
 	"""Create SL entries from SL entry dicts
 
@@ -240,7 +260,12 @@ def repost_future_sle(
 	allow_negative_stock=None,
 	via_landed_cost_voucher=False,
 	doc=None,
+	batched=False,
 ):
+	"""Repost future stock ledger entries of the given item-warehouse pairs.
+
+	With `batched`, future entries of upcoming pairs are fetched together and
+	SLE/Bin updates are written in bulk, see `BatchedRepost`."""
 	if not args:
 		args = []  # set args to empty list if None to avoid enumerate error
 
@@ -257,10 +282,20 @@ def repost_future_sle(
 	distinct_item_warehouses = get_distinct_item_warehouse(args, doc, reposting_data=reposting_data)
 	affected_transactions = get_affected_transactions(doc, reposting_data=reposting_data)
 
+	repost_batch = BatchedRepost(args) if batched else None
+	checkpoint = RepostCheckpoint(doc, args, distinct_item_warehouses, affected_transactions) if doc else None
+
 	i = get_current_index(doc) or 0
 	while i < len(args):
 		validate_item_warehouse(args[i])
 
+		if checkpoint:
+			checkpoint.index = i
+			checkpoint.check_time_budget()
+
+		if repost_batch:
+			repost_batch.prefetch(i)
+
 		obj = update_entries_after(
 			{
 				"item_code": args[i].get("item_code"),
@@ -274,6 +309,8 @@ def repost_future_sle(
 			},
 			allow_negative_stock=allow_negative_stock,
 			via_landed_cost_voucher=via_landed_cost_voucher,
+			repost_batch=repost_batch,
+			checkpoint=checkpoint,
 		)
 		affected_transactions.update(obj.affected_transactions)
 
@@ -295,6 +332,9 @@ def repost_future_sle(
 		i += 1
 
 		if doc:
+			if doc.reposting_checkpoint:
+				doc.db_set("reposting_checkpoint", None, update_modified=False)
+
 			update_args_in_repost_item_valuation(
 				doc, i, args, distinct_item_warehouses, affected_transactions
 			)
@@ -508,6 +548,204 @@ def get_current_index(doc=None):
 		return doc.current_index
 
 
+class RepostCheckpoint:
+	"""Periodic checkpoint of the item-warehouse pair being reposted by a Repost Item Valuation.
+
+	Every `interval` entries the running qty, value and queue of the pair are saved in
+	`reposting_checkpoint` along with the reposting progress, so that a restarted repost
+	resumes from the last saved entry instead of the beginning of the pair.
+
+	If the time budget from Stock Reposting Settings is used up, the checkpoint is saved
+	and `RepostTimeBudgetExceeded` is raised so that the repost can continue in a new job.
+	"""
+
+	interval = 1000
+
+	def __init__(self, doc, items_to_be_repost, distinct_item_warehouses, affected_transactions):
+		self.doc = doc
+		self.items_to_be_repost = items_to_be_repost
+		self.distinct_item_warehouses = distinct_item_warehouses
+		self.affected_transactions = affected_transactions
+		self.index = 0
+
+		self.started_at = time.monotonic()
+		self.time_budget = (
+			cint(frappe.db.get_single_value("Stock Reposting Settings", "reposting_time_budget")) * 60
+		)
+
+	def get_state(self, item_code, warehouse):
+		"""Saved state of the pair if the repost was interrupted while reposting it."""
+		if not self.doc.reposting_checkpoint:
+			return None
+
+		state = frappe.parse_json(self.doc.reposting_checkpoint)
+		if (state.index, state.item_code, state.warehouse) != (self.index, item_code, warehouse):
+			return None
+
+		return state
+
+	def is_due(self, processed_entries) -> bool:
+		return not processed_entries % self.interval or self.is_time_budget_exceeded()
+
+	def is_time_budget_exceeded(self) -> bool:
+		return bool(self.time_budget) and time.monotonic() - self.started_at > self.time_budget
+
+	def check_time_budget(self):
+		if self.is_time_budget_exceeded():
+			raise RepostTimeBudgetExceeded
+
+	def save(self, obj, sle):
+		wh_data = obj.data[sle.warehouse]
+		self.affected_transactions.update(obj.affected_transactions)
+
+		self.doc.reposting_checkpoint = frappe.as_json(
+			{
+				"index": self.index,
+				"item_code": sle.item_code,
+				"warehouse": sle.warehouse,
+				"sle": {
+					"name": sle.name,
+					"posting_date": sle.posting_date,
+					"posting_time": sle.posting_time,
+					"creation": sle.creation,
+					"qty_after_transaction": wh_data.qty_after_transaction,
+				},
+				"qty_after_transaction": wh_data.qty_after_transaction,
+				"valuation_rate": wh_data.valuation_rate,
+				"stock_value": wh_data.stock_value,
+				"prev_stock_value": wh_data.prev_stock_value,
+				"stock_queue": list(wh_data.stock_queue),
+				"new_items_found": obj.new_items_found,
+			},
+			indent=None,
+		)
+		self.doc.db_set("reposting_checkpoint", self.doc.reposting_checkpoint, update_modified=False)
+
+		# commits the checkpoint along with the pairs discovered so far
+		update_args_in_repost_item_valuation(
+			self.doc,
+			self.index,
+			self.items_to_be_repost,
+			self.distinct_item_warehouses,
+			self.affected_transactions,
+		)
+
+		self.check_time_budget()
+
+
+class BatchedRepost:
+	"""Shared state of a batched `repost_future_sle` run.
+
+	- Future SLEs of the next `chunk_size` item-warehouse pairs are fetched in one
+	  query instead of one query per pair.
+	- SLE and Bin updates are buffered and written with `frappe.db.bulk_update`.
+
+	A pair is served from the prefetched rows only the first time it is reposted,
+	later passes over the same pair (dependent vouchers) query the ledger again.
+	"""
+
+	# fields of a Stock Ledger Entry that are recomputed while reposting
+	sle_fields = (
+		"qty_after_transaction",
+		"valuation_rate",
+		"stock_value",
+		"stock_queue",
+		"stock_value_difference",
+		"incoming_rate",
+		"outgoing_rate",
+	)
+
+	def __init__(self, items_to_be_repost, chunk_size=100):
+		self.items_to_be_repost = items_to_be_repost
+		self.chunk_size = chunk_size
+		self.future_entries = {}
+		self.reposted = set()
+		self.sle_updates = {}
+		self.bin_updates = {}
+
+	def prefetch(self, index):
+		"""Fetch future SLEs of the pairs starting at `index` unless already fetched."""
+		args = self.items_to_be_repost[index]
+		if (args.get("item_code"), args.get("warehouse")) in self.future_entries:
+			return
+
+		from_datetimes = {}
+		for row in self.items_to_be_repost[index : index + self.chunk_size]:
+			key = (row.get("item_code"), row.get("warehouse"))
+			if key in self.reposted or key in self.future_entries:
+				continue
+
+			posting_datetime = get_combine_datetime(row.get("posting_date"), row.get("posting_time"))
+			from_datetimes[key] = min(from_datetimes.get(key, posting_datetime), posting_datetime)
+
+		if not from_datetimes:
+			return
+
+		for key, from_datetime in from_datetimes.items():
+			self.future_entries[key] = (from_datetime, [])
+
+		# only the entries of the pairs, from their own posting datetime, are read and locked
+		pair_conditions = " or ".join(
+			["(item_code = %s and warehouse = %s and posting_datetime >= %s)"] * len(from_datetimes)
+		)
+		sl_entries = frappe.db.sql(
+			f"""
+			select *, posting_datetime as "timestamp"
+			from `tabStock Ledger Entry`
+			where is_cancelled = 0
+				and ({pair_conditions})
+			order by posting_date asc, posting_time asc, creation asc
+			for update""",
+			[value for key, from_datetime in from_datetimes.items() for value in (*key, from_datetime)],
+			as_dict=1,
+		)
+
+		for sle in sl_entries:
+			key = (sle.item_code, sle.warehouse)
+			if key in from_datetimes:
+				self.future_entries[key][1].append(sle)
+
+	def get_future_entries(self, args, previous_sle):
+		"""Prefetched equivalent of `update_entries_after.get_sle_after_datetime`.
+
+		Returns None if the pair has to be queried again."""
+		key = (args.item_code, args.warehouse)
+		if key not in self.future_entries:
+			return None
+
+		from_datetime, sl_entries = self.future_entries.pop(key)
+		self.reposted.add(key)
+
+		# posting date of the pair can be moved back by a dependent voucher
+		if get_combine_datetime(args.posting_date, args.posting_time or "00:00:00") < from_datetime:
+			return None
+
+		if not previous_sle:
+			return sl_entries
+
+		previous_datetime = get_combine_datetime(
+			previous_sle.posting_date, previous_sle.posting_time or "00:00:00"
+		)
+		return [
+			sle for sle in sl_entries if sle.timestamp > previous_datetime and sle.name != previous_sle.name
+		]
+
+	def update_sle(self, sle):
+		self.sle_updates[sle.name] = {field: sle.get(field) for field in self.sle_fields}
+
+	def update_bin(self, bin_name, values):
+		self.bin_updates[bin_name] = values
+
+	def flush(self):
+		if self.sle_updates:
+			frappe.db.bulk_update("Stock Ledger Entry", self.sle_updates, update_modified=False)
+			self.sle_updates = {}
+
+		if self.bin_updates:
+			frappe.db.bulk_update("Bin", self.bin_updates)
+			self.bin_updates = {}
+
+
 class update_entries_after:
 	"""
 	update valution rate and qty after transaction
@@ -530,8 +768,13 @@ class update_entries_after:
 		allow_negative_stock=None,
 		via_landed_cost_voucher=False,
 		verbose=1,
+		repost_batch=None,
+		checkpoint=None,
 	):
 		self.exceptions = {}
+		self.repost_batch = repost_batch
+		self.checkpoint = checkpoint
+		self.resumed_from = None
 		self.verbose = verbose
 		self.allow_zero_rate = allow_zero_rate
 		self.via_landed_cost_voucher = via_landed_cost_voucher
@@ -559,6 +802,7 @@ class update_entries_after:
 
 		self.data = frappe._dict()
 		self.initialize_previous_data(self.args)
+		self.resume_from_checkpoint()
 		self.build()
 
 	def set_precision(self):
@@ -589,6 +833,8 @@ class update_entries_after:
 		"""
 		self.data.setdefault(args.warehouse, frappe._dict())
 		warehouse_dict = self.data[args.warehouse]
+		invalidate_stock_balance_snapshots(args.item_code, args.warehouse, args.posting_date)
+		invalidate_stock_ageing_snapshots(args.posting_date, args.item_code, args.warehouse)
 		previous_sle = get_previous_sle_of_current_voucher(args)
 		warehouse_dict.previous_sle = previous_sle
 
@@ -603,6 +849,29 @@ class update_entries_after:
 			}
 		)
 
+	def resume_from_checkpoint(self):
+		"""Continue after the last entry saved by an interrupted repost of this pair."""
+		if not self.checkpoint or self.args.get("sle_id"):
+			return
+
+		state = self.checkpoint.get_state(self.item_code, self.args.warehouse)
+		if not state:
+			return
+
+		self.resumed_from = frappe._dict(state.sle)
+		self.new_items_found = state.new_items_found
+		self.data[self.args.warehouse].update(
+			{
+				"previous_sle": self.resumed_from,
+				"qty_after_transaction": flt(state.qty_after_transaction),
+				"valuation_rate": flt(state.valuation_rate),
+				"stock_value": flt(state.stock_value),
+				"prev_stock_value": flt(state.prev_stock_value),
+				"stock_queue": state.stock_queue or [],
+				"stock_value_difference": 0.0,
+			}
+		)
+
 	def build(self):
 		from erpnext.controllers.stock_controller import future_sle_exists
 
@@ -624,9 +893,21 @@ class update_entries_after:
 				if sle.dependant_sle_voucher_detail_no:
 					entries_to_fix = self.get_dependent_entries_to_fix(entries_to_fix, sle)
 
+				if self.checkpoint and self.checkpoint.is_due(i):
+					self.save_checkpoint(sle)
+
+			if self.repost_batch:
+				self.repost_batch.flush()
+
 		if self.exceptions:
 			self.raise_exceptions()
 
+	def save_checkpoint(self, sle):
+		if self.repost_batch:
+			self.repost_batch.flush()
+
+		self.checkpoint.save(self, sle)
+
 	def process_sle_against_current_timestamp(self):
 		sl_entries = self.get_sle_against_current_voucher()
 		for sle in sl_entries:
@@ -659,9 +940,35 @@ class update_entries_after:
 
 	def get_future_entries_to_fix(self):
 		# includes current entry!
-		args = self.data[self.args.warehouse].previous_sle or frappe._dict(
-			{"item_code": self.item_code, "warehouse": self.args.warehouse}
-		)
+		previous_sle = self.data[self.args.warehouse].previous_sle
+		if self.resumed_from:
+			# entries posted at the same time as the last processed entry but created after it
+			return list(
+				get_stock_ledger_entries(
+					frappe._dict(
+						{
+							"item_code": self.item_code,
+							"warehouse": self.args.warehouse,
+							"posting_date": previous_sle.posting_date,
+							"posting_time": previous_sle.posting_time,
+							"name": previous_sle.name,
+							"creation": previous_sle.creation,
+						}
+					),
+					">=",
+					"asc",
+					for_update=True,
+					check_serial_no=False,
+					extra_cond=" and name != %(name)s and (posting_datetime > %(posting_datetime)s or creation > %(creation)s)",
+				)
+			)
+
+		if self.repost_batch:
+			sl_entries = self.repost_batch.get_future_entries(self.args, previous_sle)
+			if sl_entries is not None:
+				return sl_entries
+
+		args = previous_sle or frappe._dict({"item_code": self.item_code, "warehouse": self.args.warehouse})
 
 		return list(self.get_sle_after_datetime(args))
 
@@ -768,6 +1075,10 @@ class update_entries_after:
 		# previous sle data for this warehouse
 		self.wh_data = self.data[sle.warehouse]
 
+		defer_update = self.can_defer_sle_update(sle)
+		if self.repost_batch and not defer_update:
+			self.repost_batch.flush()
+
 		self.validate_previous_sle_qty(sle)
 		self.affected_transactions.add((sle.voucher_type, sle.voucher_no))
 
@@ -864,13 +1175,21 @@ class update_entries_after:
 		sle.qty_after_transaction = self.wh_data.qty_after_transaction
 		sle.valuation_rate = self.wh_data.valuation_rate
 		sle.stock_value = self.wh_data.stock_value
-		sle.stock_queue = json.dumps(self.wh_data.stock_queue)
+		# backdated entries start from the queue of the entry before them
+		if isinstance(self.wh_data.stock_queue, IncrementalBinWiseValuation):
+			# only the bins changed since the previous entry are encoded again
+			sle.stock_queue = self.wh_data.stock_queue.as_json()
+		else:
+			sle.stock_queue = json.dumps(self.wh_data.stock_queue, default=list)
 
 		if not sle.is_adjustment_entry:
 			sle.stock_value_difference = stock_value_difference
 
 		sle.doctype = "Stock Ledger Entry"
-		frappe.get_doc(sle).db_update()
+		if self.repost_batch and defer_update:
+			self.repost_batch.update_sle(sle)
+		else:
+			frappe.get_doc(sle).db_update()
 
 		if (
 			sle.serial_and_batch_bundle
@@ -886,6 +1205,31 @@ class update_entries_after:
 		):
 			self.update_outgoing_rate_on_transaction(sle)
 
+	def can_defer_sle_update(self, sle) -> bool:
+		"""Whether the update of `sle` can be buffered in a batched repost.
+
+		Serial/batch valuation, rates recalculated from the voucher and stock entry or
+		stock reconciliation amounts read earlier ledger entries back from the database,
+		so pending updates are flushed before such entries are processed."""
+		if not self.repost_batch or self.args.get("sle_id"):
+			return False
+
+		if sle.serial_no or sle.batch_no or sle.serial_and_batch_bundle or sle.recalculate_rate:
+			return False
+
+		if sle.voucher_type == "Stock Reconciliation":
+			return False
+
+		if flt(sle.actual_qty) < 0 and sle.voucher_type in (
+			"Stock Entry",
+			"Purchase Receipt",
+			"Purchase Invoice",
+			"Subcontracting Receipt",
+		):
+			return False
+
+		return True
+
 	def get_serialized_values(self, sle):
 		from erpnext.stock.serial_batch_bundle import SerialNoValuation
 
@@ -1341,10 +1685,7 @@ class update_entries_after:
 			self.wh_data.qty_after_transaction + actual_qty
 		)
 
-		if self.valuation_method == "LIFO":
-			stock_queue = LIFOValuation(self.wh_data.stock_queue)
-		else:
-			stock_queue = FIFOValuation(self.wh_data.stock_queue)
+		stock_queue = self.get_stock_queue_engine()
 
 		_prev_qty, prev_stock_value = stock_queue.get_total_stock_and_value()
 
@@ -1369,17 +1710,32 @@ class update_entries_after:
 
 		stock_value_difference = stock_value - prev_stock_value
 
-		self.wh_data.stock_queue = stock_queue.state
+		# the engine is the queue of the warehouse, not copied per entry
+		self.wh_data.stock_queue = stock_queue
 		self.wh_data.stock_value = round_off_if_near_zero(self.wh_data.stock_value + stock_value_difference)
 
-		if not self.wh_data.stock_queue:
-			self.wh_data.stock_queue.append(
+		if not len(stock_queue):
+			# bins appended to the queue are picked up by the totals of the engine
+			stock_queue.append(
 				[0, sle.incoming_rate or sle.outgoing_rate or self.wh_data.valuation_rate]
 			)
 
 		if self.wh_data.qty_after_transaction:
 			self.wh_data.valuation_rate = self.wh_data.stock_value / self.wh_data.qty_after_transaction
 
+	def get_stock_queue_engine(self):
+		"""Reuse the queue engine of the previous entry of this warehouse.
+
+		The engine is built from `stock_queue` if the queue was replaced in between,
+		e.g. by a Stock Reconciliation."""
+		if isinstance(self.wh_data.stock_queue, IncrementalBinWiseValuation):
+			return self.wh_data.stock_queue
+
+		if self.valuation_method == "LIFO":
+			return IncrementalLIFOValuation(self.wh_data.stock_queue)
+
+		return IncrementalFIFOValuation(self.wh_data.stock_queue)
+
 	def update_batched_values(self, sle):
 		from erpnext.stock.serial_batch_bundle import BatchNoValuation
 
@@ -1434,6 +1790,9 @@ class update_entries_after:
 	def get_fallback_rate(self, sle) -> float:
 		"""When exact incoming rate isn't available use any of other "average" rates as fallback.
 		This should only get used for negative stock."""
+		if self.repost_batch:
+			self.repost_batch.flush()
+
 		return get_valuation_rate(
 			sle.item_code,
 			sle.warehouse,
@@ -1510,7 +1869,10 @@ class update_entries_after:
 		if sle.valuation_rate is not None:
 			values_to_update["valuation_rate"] = sle.valuation_rate
 
-		frappe.db.set_value("Bin", bin_name, values_to_update)
+		if self.repost_batch:
+			self.repost_batch.update_bin(bin_name, values_to_update)
+		else:
+			frappe.db.set_value("Bin", bin_name, values_to_update)
 
 	def update_bin(self):
 		# update bin for each warehouse
@@ -1582,12 +1944,51 @@ def get_previous_sle(args, for_update=False, extra_cond=None):
 	}
 	"""
 	args["name"] = args.get("sle", None) or ""
+
+	if not extra_cond and (sle := get_previous_sle_from_snapshot(args, for_update)):
+		return sle
+
 	sle = get_stock_ledger_entries(
 		args, "<=", "desc", "limit 1", for_update=for_update, extra_cond=extra_cond
 	)
 	return sle and sle[0] or {}
 
 
+def get_previous_sle_from_snapshot(args, for_update=False):
+	"""Look for the previous sle only after the latest month end snapshot of the
+	item-warehouse, falling back to the sle of the snapshot itself"""
+
+	if not (args.get("warehouse") and args.get("posting_date")) or args.get("serial_no"):
+		return
+
+	snapshot = get_stock_balance_snapshot(args["item_code"], args["warehouse"], args["posting_date"])
+	if not snapshot or snapshot.stock_ledger_entry == args["name"]:
+		return
+
+	args["snapshot_next_date"] = add_days(snapshot.period_end_date, 1)
+	sle = get_stock_ledger_entries(
+		args,
+		"<=",
+		"desc",
+		"limit 1",
+		for_update=for_update,
+		extra_cond=" and posting_datetime >= %(snapshot_next_date)s",
+	)
+
+	if not sle:
+		sle = frappe.db.sql(
+			"""
+			select *, posting_datetime as "timestamp"
+			from `tabStock Ledger Entry`
+			where name = %s and is_cancelled = 0
+			{for_update}""".format(for_update=for_update and "for update" or ""),
+			snapshot.stock_ledger_entry,
+			as_dict=1,
+		)
+
+	return sle and sle[0] or None
+
+
 def get_stock_ledger_entries(
 	previous_sle,
 	operator=None,
@@ -0,0 +1,64 @@
+"""Compare the incremental FIFO/LIFO engines with the existing classes.
+
+Replays the way reposting uses a queue, reading the totals before and after every
+transaction and encoding the queue into the stock ledger entry after it. Wall clock times are not asserted in tests as they depend on the load
+of the machine, run this instead:
+
+        bench --site <site> execute erpnext.stock.tests.benchmark_valuation.run
+"""
+
+import json
+import time
+
+from erpnext.stock.valuation import (
+	FIFOValuation,
+	IncrementalFIFOValuation,
+	IncrementalLIFOValuation,
+	LIFOValuation,
+)
+
+
+def get_transactions(bins=1000):
+	return [(5, 10 + (i % 97)) for i in range(bins)] + [(-3, 0)] * bins
+
+
+def replay(queue, transactions):
+	as_json = getattr(queue, "as_json", None) or (lambda: json.dumps(queue.state))
+
+	start = time.perf_counter()
+	for qty, rate in transactions:
+		queue.get_total_stock_and_value()
+		if qty > 0:
+			queue.add_stock(qty, rate)
+		else:
+			queue.remove_stock(abs(qty))
+		queue.get_total_stock_and_value()
+		as_json()
+	return time.perf_counter() - start
+
+
+def run(bins=1000):
+	transactions = get_transactions(int(bins))
+	results = {}
+
+	for klass, incremental_klass in (
+		(FIFOValuation, IncrementalFIFOValuation),
+		(LIFOValuation, IncrementalLIFOValuation),
+	):
+		queue, incremental_queue = klass([]), incremental_klass([])
+		existing_time = replay(queue, transactions)
+		incremental_time = replay(incremental_queue, transactions)
+
+		if json.dumps(queue.state) != incremental_queue.as_json():
+			raise AssertionError(f"{incremental_klass.__name__} does not match {klass.__name__}")
+
+		results[klass.__name__] = {"existing": existing_time, "incremental": incremental_time}
+		print(
+			f"{klass.__name__}: {existing_time:.3f}s, {incremental_klass.__name__}: {incremental_time:.3f}s"
+		)
+
+	return results
+
+
+if __name__ == "__main__":
+	run()
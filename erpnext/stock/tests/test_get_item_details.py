@@ -1,7 +1,12 @@
 import frappe
 from frappe.tests import IntegrationTestCase
 
-from erpnext.stock.get_item_details import get_item_details
+from erpnext.stock.get_item_details import (
+	ITEM_DETAILS_CACHE_KEY,
+	get_item_details,
+	get_item_tax_info,
+	get_items_details,
+)
 
 EXTRA_TEST_RECORD_DEPENDENCIES = ["Customer", "Supplier", "Item", "Price List", "Item Price"]
 
@@ -28,3 +33,74 @@ class TestGetItemDetail(IntegrationTestCase):
 		)
 		details = get_item_details(args)
 		self.assertEqual(details.get("price_list_rate"), 100)
+
+	def test_item_details_cache_is_cleared_on_item_update(self):
+		args = frappe._dict(
+			{
+				"item_code": "_Test Item",
+				"company": "_Test Company",
+				"doctype": "Sales Order",
+				"name": None,
+				"customer": "_Test Customer",
+				"price_list": "_Test Price List",
+				"currency": "INR",
+				"conversion_rate": 1.0,
+				"price_list_currency": "INR",
+				"plc_conversion_rate": 1.0,
+				"ignore_pricing_rule": 1,
+				"qty": 1,
+			}
+		)
+
+		item = frappe.get_doc("Item", "_Test Item")
+		item_default = item.get("item_defaults", {"company": "_Test Company"})[0]
+		income_account = item_default.income_account
+
+		details = get_items_details([args.copy(), args.copy()])
+		self.assertEqual(len(details), 2)
+		self.assertEqual(details[0].income_account, details[1].income_account)
+
+		item_default.income_account = "_Test Account Sales - _TC"
+		item.save()
+
+		details = get_item_details(args.copy())
+		self.assertEqual(details.income_account, "_Test Account Sales - _TC")
+
+		item_default.income_account = income_account
+		item.save()
+
+	def test_get_item_tax_info(self):
+		out = get_item_tax_info(
+			"_Test Company",
+			"_Test Tax Category 1",
+			[["_Test Item With Item Tax Template", "row-1"]],
+			item_tax_templates={"row-1": "_Test Account Excise Duty @ 15 - _TC"},
+		)
+		self.assertEqual(out["row-1"]["item_tax_template"], "_Test Account Excise Duty @ 12 - _TC")
+		self.assertEqual(
+			frappe.parse_json(out["row-1"]["item_tax_rate"]), {"_Test Account Excise Duty - _TC": 12}
+		)
+
+	def test_item_details_cache_is_cleared_on_brand_rename(self):
+		get_item_details(
+			frappe._dict(
+				{
+					"item_code": "_Test Item",
+					"company": "_Test Company",
+					"doctype": "Sales Order",
+					"name": None,
+					"customer": "_Test Customer",
+					"price_list": "_Test Price List",
+					"currency": "INR",
+					"conversion_rate": 1.0,
+					"price_list_currency": "INR",
+					"plc_conversion_rate": 1.0,
+					"ignore_pricing_rule": 1,
+					"qty": 1,
+				}
+			)
+		)
+		self.assertTrue(frappe.cache.hget(ITEM_DETAILS_CACHE_KEY, "_Test Item::_Test Company"))
+
+		frappe.rename_doc("Brand", "_Test Brand", "_Test Brand Renamed", force=True)
+		self.assertFalse(frappe.cache.hget(ITEM_DETAILS_CACHE_KEY, "_Test Item::_Test Company"))
@@ -1,4 +1,5 @@
 import json
+import random
 import unittest
 
 import frappe
@@ -8,7 +9,13 @@ from hypothesis import strategies as st
 
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
-from erpnext.stock.valuation import FIFOValuation, LIFOValuation, round_off_if_near_zero
+from erpnext.stock.valuation import (
+	FIFOValuation,
+	IncrementalFIFOValuation,
+	IncrementalLIFOValuation,
+	LIFOValuation,
+	round_off_if_near_zero,
+)
 
 qty_gen = st.floats(min_value=-1e6, max_value=1e6)
 value_gen = st.floats(min_value=1, max_value=1e6)
@@ -317,6 +324,100 @@ class TestLIFOValuation(IntegrationTestCase):
 			self.assertTotalValue(total_value)
 
 
+class TestIncrementalValuation(IntegrationTestCase):
+	def assertSameValuation(self, queue, incremental_queue):
+		"""Same bins and bit for bit the same totals"""
+		self.assertEqual(queue.state, incremental_queue.state)
+		self.assertEqual(json.dumps(queue.state), incremental_queue.as_json())
+		self.assertEqual(queue.get_total_stock_and_value(), incremental_queue.get_total_stock_and_value())
+
+	def replay(self, queue, incremental_queue, transactions, outgoing_rate=0.0):
+		for qty, rate in transactions:
+			if round_off_if_near_zero(qty) == 0:
+				continue
+			if qty > 0:
+				queue.add_stock(qty, rate)
+				incremental_queue.add_stock(qty, rate)
+			else:
+				consumed = queue.remove_stock(abs(qty), outgoing_rate, rate_generator=lambda: 42.0)
+				incremental_consumed = incremental_queue.remove_stock(
+					abs(qty), outgoing_rate, rate_generator=lambda: 42.0
+				)
+				self.assertEqual(consumed, incremental_consumed)
+			self.assertSameValuation(queue, incremental_queue)
+
+	@given(stock_queue_generator, st.sampled_from([0.0, 10.0]))
+	def test_fifo_matches_fifo_valuation(self, stock_queue, outgoing_rate):
+		self.replay(FIFOValuation([]), IncrementalFIFOValuation([]), stock_queue, outgoing_rate)
+
+	@given(stock_queue_generator)
+	def test_lifo_matches_lifo_valuation(self, stock_stack):
+		self.replay(LIFOValuation([]), IncrementalLIFOValuation([]), stock_stack)
+
+	def test_random_transactions_match_exactly(self):
+		# long histories with fractional qty and rates, so that consumed bins are dropped
+		rng = random.Random(42)
+		for klass, incremental_klass in (
+			(FIFOValuation, IncrementalFIFOValuation),
+			(LIFOValuation, IncrementalLIFOValuation),
+		):
+			for _ in range(20):
+				transactions = [
+					(
+						round(rng.uniform(-30, 40), rng.choice([0, 2, 3])),
+						rng.choice([1, 9.99, round(rng.uniform(0.01, 500), 2), 0.1 * rng.randint(1, 10)]),
+					)
+					for _ in range(500)
+				]
+				self.replay(
+					klass([]), incremental_klass([]), transactions, rng.choice([0.0, 9.99, 0.3])
+				)
+
+	def test_fifo_receipts_match_exactly(self):
+		queue, incremental_queue = FIFOValuation([]), IncrementalFIFOValuation([])
+		self.replay(queue, incremental_queue, [(0.1, 1), (0.2, 3), (0.3, 1), (0.7, 3)])
+
+	def test_fifo_consumed_bins_are_dropped(self):
+		queue = IncrementalFIFOValuation([[1, 10 + i] for i in range(200)])
+		queue.remove_stock(150)
+		self.assertLess(len(queue.bins), 200)
+		self.assertEqual(len(queue), 50)
+		self.assertEqual(queue.state, [[1, 10 + i] for i in range(150, 200)])
+		self.assertEqual(queue.get_total_stock_and_value(), (50, sum(10 + i for i in range(150, 200))))
+
+	def test_totals_are_summed_in_bin_order(self):
+		# 0.1 + 0.2 + 0.3 is not 0.6 in floats, stored stock values depend on the order of the sums
+		for klass, incremental_klass in (
+			(FIFOValuation, IncrementalFIFOValuation),
+			(LIFOValuation, IncrementalLIFOValuation),
+		):
+			queue = klass([[0.1, 1], [0.2, 1], [0.3, 1]])
+			incremental_queue = incremental_klass([[0.1, 1], [0.2, 1], [0.3, 1]])
+			self.assertEqual(queue.get_total_stock_and_value(), (0.1 + 0.2 + 0.3, 0.1 + 0.2 + 0.3))
+			self.assertSameValuation(queue, incremental_queue)
+
+			for stock_queue in (queue, incremental_queue):
+				stock_queue.remove_stock(0.05)
+				stock_queue.add_stock(0.7, 1)
+			self.assertSameValuation(queue, incremental_queue)
+
+	def test_existing_state(self):
+		queue = IncrementalFIFOValuation([[1, 10], [2, 20]])
+		self.assertEqual(queue.get_total_stock_and_value(), (3, 50))
+
+		queue.remove_stock(3)
+		self.assertEqual(queue, [])
+		self.assertEqual(queue.get_total_stock_and_value(), (0, 0))
+
+		queue.remove_stock(1, 5)
+		self.assertEqual(queue, [[-1, 5]])
+		self.assertEqual(queue.get_total_stock_and_value(), (-1, -5))
+
+		queue.add_stock(3, 10)
+		self.assertEqual(queue, [[2, 10]])
+		self.assertEqual(queue.get_total_stock_and_value(), (2, 20))
+
+
 class TestLIFOValuationSLE(IntegrationTestCase):
 	ITEM_CODE = "_Test LIFO item"
 	WAREHOUSE = "_Test Warehouse - _TC"
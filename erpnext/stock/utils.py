@@ -7,12 +7,16 @@ import json
 import frappe
 from frappe import _
 from frappe.query_builder.functions import CombineDatetime, IfNull, Sum
-from frappe.utils import cstr, flt, get_link_to_form, get_time, getdate, nowdate, nowtime
+from frappe.utils import add_days, cstr, flt, get_link_to_form, get_time, getdate, nowdate, nowtime
 
 import erpnext
 from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
 	get_available_serial_nos,
 )
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	get_latest_stock_balance_snapshots_query,
+	get_snapshot_period_end,
+)
 from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
 from erpnext.stock.serial_batch_bundle import BatchNoValuation, SerialNoValuation
 from erpnext.stock.valuation import FIFOValuation, LIFOValuation
@@ -79,12 +83,29 @@ def get_stock_value_on(
 			if frappe.db.get_value("Warehouse", wh, "is_group"):
 				warehouses.update(get_child_warehouses(wh))
 
-		query = query.where(sle.warehouse.isin(warehouses))
+	def apply_filters(query, table):
+		if warehouses:
+			query = query.where(table.warehouse.isin(warehouses))
 
-	if item_code:
-		query = query.where(sle.item_code == item_code)
+		if item_code:
+			query = query.where(table.item_code == item_code)
+
+		return query
+
+	query = apply_filters(query, sle)
+
+	# Start from the month end balances and only add the entries after them
+	opening_value = 0.0
+	if period_end := get_snapshot_period_end(add_days(posting_date, 1)):
+		snapshot = frappe.qb.DocType("Stock Balance Snapshot")
+		opening_value = (
+			get_latest_stock_balance_snapshots_query(period_end, apply_filters)
+			.select(IfNull(Sum(snapshot.balance_value), 0))
+			.run()[0][0]
+		)
+		query = query.where(sle.posting_date > period_end)
 
-	return query.run(as_list=True)[0][0]
+	return flt(opening_value) + flt(query.run(as_list=True)[0][0])
 
 
 @frappe.whitelist()
@@ -1,3 +1,4 @@
+import json
 from abc import ABC, abstractmethod, abstractproperty
 from collections.abc import Callable
 from typing import NewType
@@ -245,6 +246,198 @@ class LIFOValuation(BinWiseValuation):
 		return consumed_bins
 
 
+class IncrementalBinWiseValuation(BinWiseValuation):
+	"""List backed bin-wise valuation which keeps running totals of qty and value.
+
+	Bins are consumed and added with exactly the same rules (and rounding) as
+	`FIFOValuation`/`LIFOValuation`. Consumed bins at the head of the queue are skipped
+	with a head pointer instead of being removed from the front of the list, and are
+	dropped once they make up half of the list.
+
+	Totals are the same left to right sums over the open bins as in `FIFOValuation`,
+	kept per bin, so that only the sums from the first changed bin onwards are redone by
+	`get_total_stock_and_value`. Bins added or changed at the end of the queue (all LIFO
+	transactions and FIFO receipts) cost O(1) instead of a scan of the whole queue.
+	FIFO consumption changes the first bin, so it still redoes the whole sum.
+	"""
+
+	__slots__ = ["bins", "head", "running_totals", "bin_json"]
+
+	# consumed bins are dropped from the list only once there are at least these many
+	MIN_BINS_TO_DROP = 64
+
+	def __init__(self, state: list[StockBin] | None):
+		self.bins: list[StockBin] = list(state or [])
+		# index of the first bin which is not consumed
+		self.head = 0
+		# running_totals[i] is the (qty, value) of bins[head] to bins[head + i]
+		self.running_totals: list[tuple[float, float]] = []
+		# JSON of each bin, see `as_json`
+		self.bin_json: list[str | None] = []
+
+	@property
+	def state(self) -> list[StockBin]:
+		"""Get current state of bins as a list."""
+		return self.bins[self.head :]
+
+	def __len__(self):
+		return len(self.bins) - self.head
+
+	def append(self, stock_bin: StockBin) -> None:
+		"""Add a bin at the end of the queue as is"""
+		self.bins.append(stock_bin)
+
+	def as_json(self) -> str:
+		"""Same as `json.dumps(self.state)`, only the bins changed since the last call are encoded"""
+
+		if len(self.bin_json) > len(self.bins):
+			del self.bin_json[len(self.bins) :]
+		self.bin_json.extend([None] * (len(self.bins) - len(self.bin_json)))
+
+		for idx in range(self.head, len(self.bins)):
+			if self.bin_json[idx] is None:
+				self.bin_json[idx] = json.dumps(self.bins[idx], default=list)
+
+		return "[" + ", ".join(self.bin_json[self.head :]) + "]"
+
+	def get_total_stock_and_value(self) -> tuple[float, float]:
+		total_qty, total_value = self.running_totals[-1] if self.running_totals else (0.0, 0.0)
+		for qty, rate in self.bins[self.head + len(self.running_totals) :]:
+			total_qty += flt(qty)
+			total_value += flt(qty) * flt(rate)
+			self.running_totals.append((total_qty, total_value))
+
+		return round_off_if_near_zero(total_qty), round_off_if_near_zero(total_value)
+
+	def _bin_changed(self, index: int) -> None:
+		"""Drop the running totals from the bin at `index`, which is changed or removed"""
+		if index < 0:
+			index += len(self.bins)
+
+		del self.running_totals[max(index - self.head, 0) :]
+		if index < len(self.bin_json):
+			self.bin_json[index] = None
+
+	def _drop_consumed_bins(self) -> None:
+		del self.bins[: self.head]
+		del self.bin_json[: self.head]
+		self.head = 0
+
+	def _pop_bin(self, index: int) -> StockBin:
+		if index < 0:
+			index += len(self.bins)
+
+		self._bin_changed(index)
+		if index != self.head:
+			if index < len(self.bin_json):
+				del self.bin_json[index]
+			return self.bins.pop(index)
+
+		stock_bin = self.bins[index]
+		self.head += 1
+
+		if not len(self):
+			self.bins.clear()
+			self.bin_json.clear()
+			self.head = 0
+		elif self.head >= self.MIN_BINS_TO_DROP and self.head * 2 >= len(self.bins):
+			self._drop_consumed_bins()
+
+		return stock_bin
+
+	@abstractmethod
+	def _get_consumption_index(self, outgoing_rate: float) -> int:
+		pass
+
+	def add_stock(self, qty: float, rate: float) -> None:
+		"""Add new stock, see `FIFOValuation.add_stock`."""
+
+		if not len(self):
+			self.append([0, 0])
+
+		last_bin = self.bins[-1]
+
+		# last row has the same rate, merge new bin.
+		if last_bin[RATE] == rate:
+			self._bin_changed(-1)
+			last_bin[QTY] += qty
+		elif last_bin[QTY] > 0:
+			# Item has a positive balance qty, add new entry
+			self.append([qty, rate])
+		else:  # negative balance qty
+			self._bin_changed(-1)
+
+			qty = last_bin[QTY] + qty
+			if qty > 0:  # new balance qty is positive
+				self.bins[-1] = [qty, rate]
+			else:  # new balance qty is still negative, maintain same rate
+				last_bin[QTY] = qty
+
+	def remove_stock(
+		self, qty: float, outgoing_rate: float = 0.0, rate_generator: Callable[[], float] | None = None
+	) -> list[StockBin]:
+		"""Remove stock and return popped bins, see `FIFOValuation.remove_stock`."""
+		if not rate_generator:
+			rate_generator = lambda: 0.0  # noqa
+
+		consumed_bins = []
+		while qty:
+			if not len(self):
+				# rely on rate generator.
+				self.append([0, rate_generator()])
+
+			index = self._get_consumption_index(outgoing_rate)
+			if index < 0:
+				index += len(self.bins)
+
+			stock_bin = self.bins[index]
+			if qty >= stock_bin[QTY]:
+				# consume current bin
+				qty = round_off_if_near_zero(qty - stock_bin[QTY])
+				to_consume = self._pop_bin(index)
+				consumed_bins.append(list(to_consume))
+
+				if not len(self) and qty:
+					# stock finished, qty still remains to be withdrawn
+					# negative stock, keep in as a negative bin
+					self.append([-qty, outgoing_rate or stock_bin[RATE]])
+					consumed_bins.append([qty, outgoing_rate or stock_bin[RATE]])
+					break
+			else:
+				# qty found in current bin consume it and exit
+				self._bin_changed(index)
+				stock_bin[QTY] = round_off_if_near_zero(stock_bin[QTY] - qty)
+				consumed_bins.append([qty, stock_bin[RATE]])
+				qty = 0
+
+		return consumed_bins
+
+
+class IncrementalFIFOValuation(IncrementalBinWiseValuation):
+	"""`FIFOValuation` with O(1) consumption from the head of the queue and running totals."""
+
+	__slots__ = []
+
+	def _get_consumption_index(self, outgoing_rate: float) -> int:
+		if outgoing_rate > 0:
+			# Find the entry where rate matched with outgoing rate
+			for idx in range(self.head, len(self.bins)):
+				if self.bins[idx][RATE] == outgoing_rate:
+					return idx
+
+		# If no entry found with outgoing rate, consume as per FIFO
+		return self.head
+
+
+class IncrementalLIFOValuation(IncrementalBinWiseValuation):
+	"""`LIFOValuation` with running totals. Outgoing rate is ignored as in `LIFOValuation`."""
+
+	__slots__ = []
+
+	def _get_consumption_index(self, outgoing_rate: float) -> int:
+		return -1
+
+
 def round_off_if_near_zero(number: float, precision: int = 7) -> float:
 	"""Rounds off the number to zero only if number is close to zero for decimal
 	specified in precision. Precision defaults to 7.
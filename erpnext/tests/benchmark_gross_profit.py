@@ -0,0 +1,156 @@
+"""Compare loading the stock ledger entries of the Gross Profit report's vouchers with
+loading the whole stock ledger history of each of its item-warehouses, which is how the
+report read them before.
+
+Needs the test records of a test site. Wall clock times are not asserted in tests as they
+depend on the load of the machine, run this instead:
+
+        bench --site <site> execute erpnext.tests.benchmark_gross_profit.run
+
+The history and the invoice made are rolled back.
+"""
+
+import time
+import tracemalloc
+
+import frappe
+from frappe import qb
+from frappe.query_builder import Order
+from frappe.utils import add_days, add_to_date, now_datetime, today
+
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+from erpnext.accounts.report.gross_profit.gross_profit import GrossProfitGenerator
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+
+ITEM_CODE = "_Test Item"
+WAREHOUSE = "_Test Warehouse - _TC"
+COMPANY = "_Test Company"
+
+
+def run(history=100000):
+	history = int(history)
+	try:
+		make_stock_entry(item_code=ITEM_CODE, qty=10, to_warehouse=WAREHOUSE, rate=100)
+		add_stock_ledger_history(history)
+		create_sales_invoice(update_stock=1, qty=1, rate=200, warehouse=WAREHOUSE)
+
+		report = GrossProfitGenerator(
+			frappe._dict(
+				{
+					"company": COMPANY,
+					"from_date": today(),
+					"to_date": today(),
+					"group_by": "Invoice",
+					"currency": frappe.get_cached_value("Company", COMPANY, "default_currency"),
+				}
+			)
+		)
+		item_warehouses = {(row.item_code, row.warehouse) for row in report.si_list if row.warehouse}
+
+		voucher_time, voucher_memory = measure(report.load_stock_ledger_entries)
+		history_time, history_memory = measure(lambda: load_stock_ledger_history(item_warehouses))
+	finally:
+		frappe.db.rollback()
+
+	print(
+		f"voucher entries: {voucher_time:.3f}s, {voucher_memory / 1024:.0f} KiB, "
+		f"item-warehouse history: {history_time:.3f}s, {history_memory / 1024:.0f} KiB"
+	)
+	return {
+		"voucher_entries": {"time": voucher_time, "memory": voucher_memory},
+		"history": {"time": history_time, "memory": history_memory},
+	}
+
+
+def measure(method):
+	"""Returns the time taken and the peak memory allocated by `method`"""
+
+	tracemalloc.start()
+	start = time.perf_counter()
+	try:
+		method()
+		return time.perf_counter() - start, tracemalloc.get_traced_memory()[1]
+	finally:
+		tracemalloc.stop()
+
+
+def add_stock_ledger_history(count):
+	"""Add `count` past stock ledger entries of the item-warehouse, which are not part of the report"""
+
+	fields = [
+		"name",
+		"item_code",
+		"warehouse",
+		"company",
+		"posting_date",
+		"posting_time",
+		"posting_datetime",
+		"voucher_type",
+		"voucher_no",
+		"voucher_detail_no",
+		"actual_qty",
+		"qty_after_transaction",
+		"valuation_rate",
+		"stock_value",
+		"stock_value_difference",
+		"is_cancelled",
+		"docstatus",
+		"creation",
+		"modified",
+	]
+	start = add_days(now_datetime(), -5 * 365)
+	values = []
+	for i in range(count):
+		posting_datetime = add_to_date(start, minutes=i)
+		values.append(
+			(
+				frappe.generate_hash(length=10),
+				ITEM_CODE,
+				WAREHOUSE,
+				COMPANY,
+				posting_datetime.date(),
+				posting_datetime.time(),
+				posting_datetime,
+				"Stock Entry",
+				f"benchmark-{i}",
+				f"benchmark-{i}",
+				1,
+				i + 1,
+				100,
+				(i + 1) * 100,
+				100,
+				0,
+				1,
+				posting_datetime,
+				posting_datetime,
+			)
+		)
+
+	frappe.db.bulk_insert("Stock Ledger Entry", fields, values)
+
+
+def load_stock_ledger_history(item_warehouses):
+	sle = qb.DocType("Stock Ledger Entry")
+	return {
+		(item_code, warehouse): (
+			qb.from_(sle)
+			.select(
+				sle.item_code,
+				sle.voucher_type,
+				sle.voucher_no,
+				sle.voucher_detail_no,
+				sle.stock_value,
+				sle.warehouse,
+				sle.actual_qty.as_("qty"),
+			)
+			.where(
+				(sle.company == COMPANY)
+				& (sle.item_code == item_code)
+				& (sle.warehouse == warehouse)
+				& (sle.is_cancelled == 0)
+			)
+			.orderby(sle.posting_datetime, sle.creation, order=Order.desc)
+			.run(as_dict=True)
+		)
+		for item_code, warehouse in item_warehouses
+	}
@@ -0,0 +1,50 @@
+"""Compare syncing a batch of POS invoices with saving and then submitting each invoice,
+which is how the POS makes them online.
+
+Needs the test records of a test site. Wall clock times are not asserted in tests as they
+depend on the load of the machine, run this instead:
+
+        bench --site <site> execute erpnext.tests.benchmark_point_of_sale.run
+
+The invoices made are rolled back.
+"""
+
+import time
+
+import frappe
+
+from erpnext.accounts.doctype.pos_profile.test_pos_profile import make_pos_profile
+from erpnext.selling.page.point_of_sale.point_of_sale import sync_pos_invoices
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+from erpnext.tests.test_point_of_sale import make_pos_invoice_for_sync
+
+
+def run(count=20):
+	count = int(count)
+	try:
+		pos_profile = make_pos_profile(name="Test POS Profile for Sync")
+		make_stock_entry(
+			item_code="_Test Item", qty=count * 2, to_warehouse="_Test Warehouse - _TC", rate=100
+		)
+		invoices = [
+			make_pos_invoice_for_sync(pos_profile, f"benchmark-{frappe.generate_hash(length=10)}")
+			for _i in range(count * 2)
+		]
+
+		start = time.perf_counter()
+		for invoice in invoices[:count]:
+			doc = frappe.get_doc({**invoice, "doctype": "POS Invoice"}).insert()
+			frappe.get_doc("POS Invoice", doc.name).submit()
+		per_document_time = time.perf_counter() - start
+
+		start = time.perf_counter()
+		results = sync_pos_invoices(pos_profile.name, invoices[count:])
+		sync_time = time.perf_counter() - start
+	finally:
+		frappe.db.rollback()
+
+	if {d["status"] for d in results} != {"Created"}:
+		raise AssertionError("Not all the synced invoices were created")
+
+	print(f"{count / sync_time:.1f} synced against {count / per_document_time:.1f} invoices per second")
+	return {"sync": sync_time, "per_document": per_document_time}
@@ -5,8 +5,14 @@ import unittest
 import frappe
 from frappe.tests import IntegrationTestCase
 
+from erpnext.accounts.doctype.pos_invoice.test_pos_invoice import create_pos_invoice
 from erpnext.accounts.doctype.pos_profile.test_pos_profile import make_pos_profile
-from erpnext.selling.page.point_of_sale.point_of_sale import get_items
+from erpnext.selling.page.point_of_sale.point_of_sale import (
+	build_pos_catalog,
+	get_catalog_items,
+	get_items,
+	sync_pos_invoices,
+)
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
 
@@ -53,3 +59,120 @@ class TestPointOfSale(IntegrationTestCase):
 
 		self.assertEqual(len(filtered_items), 1)
 		self.assertEqual(filtered_items[0]["item_code"], item2.item_code)
+
+	def test_catalog_items_pagination(self):
+		pos_profile = make_pos_profile(name="Test POS Profile for Catalog")
+		items = [make_item(f"Test Catalog Item {i}", {"is_stock_item": 0}) for i in range(3)]
+
+		kwargs = dict(
+			price_list=None,
+			item_group=items[0].item_group,
+			pos_profile=pos_profile.name,
+			search_term="Test Catalog Item",
+			page_length=2,
+		)
+		result = get_catalog_items(**kwargs)
+		self.assertEqual([d["item_code"] for d in result["items"]], [d.name for d in items[:2]])
+		self.assertEqual(result["next"], items[1].name)
+
+		result = get_catalog_items(after=result["next"], **kwargs)
+		self.assertEqual([d["item_code"] for d in result["items"]], [items[2].name])
+		self.assertIsNone(result["next"])
+
+	def test_pos_catalog_sync(self):
+		pos_profile = make_pos_profile(name="Test POS Profile for Catalog")
+		item = make_item("Test Catalog Sync Item", {"is_stock_item": 0})
+		item2 = make_item("Test Catalog Sync Item 2", {"is_stock_item": 0})
+
+		catalog = build_pos_catalog(pos_profile.name)
+		item_codes = [d.item_code for d in catalog["items"]]
+		self.assertIn(item.name, item_codes)
+		self.assertIn(item2.name, item_codes)
+
+		item_price = frappe.get_doc(
+			{
+				"doctype": "Item Price",
+				"item_code": item.name,
+				"price_list": pos_profile.selling_price_list,
+				"price_list_rate": 100,
+			}
+		).insert()
+		item2.disabled = 1
+		item2.save()
+
+		changes = build_pos_catalog(pos_profile.name, modified_since=catalog["synced_at"])
+		self.assertEqual([d.name for d in changes["prices"]], [item_price.name])
+		self.assertEqual(changes["removed_items"], [item2.name])
+		self.assertNotIn(item.name, [d.item_code for d in changes["items"]])
+
+	def test_pos_catalog_sync_item_moved_out_of_item_groups(self):
+		pos_profile = make_pos_profile(name="Test POS Profile for Catalog Item Groups", do_not_insert=1)
+		pos_profile.append("item_groups", {"item_group": "_Test Item Group"})
+		pos_profile.insert()
+		item = make_item("Test Catalog Moved Item", {"is_stock_item": 0, "item_group": "_Test Item Group"})
+
+		catalog = build_pos_catalog(pos_profile.name)
+		self.assertIn(item.name, [d.item_code for d in catalog["items"]])
+
+		item.item_group = "_Test Item Group Desktops"
+		item.save()
+
+		changes = build_pos_catalog(pos_profile.name, modified_since=catalog["synced_at"])
+		self.assertIn(item.name, changes["removed_items"])
+		self.assertNotIn(item.name, [d.item_code for d in changes["items"]])
+
+	def test_pos_catalog_sync_item_moved_into_item_groups(self):
+		pos_profile = make_pos_profile(name="Test POS Profile for Catalog Item Groups", do_not_insert=1)
+		pos_profile.append("item_groups", {"item_group": "_Test Item Group"})
+		pos_profile.insert()
+		item = make_item(
+			"Test Catalog Added Item", {"is_stock_item": 0, "item_group": "_Test Item Group Desktops"}
+		)
+		item_price = frappe.get_doc(
+			{
+				"doctype": "Item Price",
+				"item_code": item.name,
+				"price_list": pos_profile.selling_price_list,
+				"price_list_rate": 100,
+			}
+		).insert()
+
+		catalog = build_pos_catalog(pos_profile.name)
+		self.assertNotIn(item.name, [d.item_code for d in catalog["items"]])
+		self.assertNotIn(item_price.name, [d.name for d in catalog["prices"]])
+
+		item.item_group = "_Test Item Group"
+		item.save()
+
+		# the price is older than the last sync, but new to the client
+		changes = build_pos_catalog(pos_profile.name, modified_since=catalog["synced_at"])
+		self.assertIn(item.name, [d.item_code for d in changes["items"]])
+		self.assertIn(item_price.name, [d.name for d in changes["prices"]])
+
+	def test_sync_pos_invoices(self):
+		pos_profile = make_pos_profile(name="Test POS Profile for Sync")
+		make_stock_entry(item_code="_Test Item", qty=10, to_warehouse="_Test Warehouse - _TC", rate=100)
+
+		invoices = [
+			make_pos_invoice_for_sync(pos_profile, "test-sync-1"),
+			make_pos_invoice_for_sync(pos_profile, "test-sync-2"),
+			make_pos_invoice_for_sync(pos_profile, "test-sync-3", qty=100000),
+		]
+
+		results = sync_pos_invoices(pos_profile.name, invoices)
+		self.assertEqual([d["status"] for d in results], ["Created", "Created", "Failed"])
+		self.assertTrue(results[2]["error"])
+		self.assertEqual(frappe.db.get_value("POS Invoice", results[0]["name"], "docstatus"), 1)
+
+		# synced again after a lost response
+		synced_again = sync_pos_invoices(pos_profile.name, invoices[:2])
+		self.assertEqual([d["status"] for d in synced_again], ["Synced", "Synced"])
+		self.assertEqual([d["name"] for d in synced_again], [d["name"] for d in results[:2]])
+
+
+def make_pos_invoice_for_sync(pos_profile, idempotency_key, qty=1, rate=100):
+	pos_inv = create_pos_invoice(pos_profile=pos_profile.name, qty=qty, rate=rate, do_not_save=1)
+	pos_inv.append("payments", {"mode_of_payment": "Cash", "account": "Cash - _TC", "amount": qty * rate})
+	pos_inv.idempotency_key = idempotency_key
+
+	return pos_inv.as_dict(no_default_fields=True, convert_dates_to_str=True)
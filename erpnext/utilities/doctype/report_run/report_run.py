@@ -0,0 +1,358 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import gzip
+import hashlib
+import json
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.utils import add_days, add_to_date, getdate, now_datetime
+from frappe.utils.nestedset import get_descendants_of
+
+# completed runs are returned for identical filters of the same user within this time
+REPORT_RUN_TTL = 10 * 60
+
+# completed runs are deleted after this many days
+REPORT_RUN_RETENTION_DAYS = 1
+
+DATE_CHUNK_DAYS = 31
+PARTY_CHUNK_SIZE = 500
+ITEM_CHUNK_SIZE = 500
+
+# rows of a report run in one chunk are published in slices of this size
+PUBLISH_BATCH_SIZE = 1000
+
+
+class ReportRun(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		chunks: DF.Int
+		completed_at: DF.Datetime | None
+		completed_chunks: DF.Int
+		error_message: DF.LongText | None
+		filters: DF.Code | None
+		filters_hash: DF.Data | None
+		report_name: DF.Link
+		row_count: DF.Int
+		status: DF.Literal["Queued", "Running", "Completed", "Failed"]
+	# end: auto-generated types
+
+	pass
+
+
+def get_date_chunks(filters):
+	"""Split the report into windows of `DATE_CHUNK_DAYS` between the from and to date"""
+
+	if not (filters.get("from_date") and filters.get("to_date")):
+		return [filters]
+
+	chunks = []
+	from_date, to_date = getdate(filters.from_date), getdate(filters.to_date)
+	while from_date <= to_date:
+		chunk_to_date = min(add_days(from_date, DATE_CHUNK_DAYS - 1), to_date)
+		chunks.append(frappe._dict(filters, from_date=str(from_date), to_date=str(chunk_to_date)))
+		from_date = add_days(chunk_to_date, 1)
+
+	return chunks
+
+
+def get_party_chunks(filters):
+	"""Split the report into ranges of `PARTY_CHUNK_SIZE` parties with ledger entries"""
+
+	if filters.get("group_by_party") or not filters.get("party_type") or len(filters.get("party") or []) == 1:
+		return [filters]
+
+	parties = filters.get("party") or frappe.get_all(
+		"Payment Ledger Entry",
+		filters={"company": filters.company, "party_type": filters.party_type, "delinked": 0},
+		pluck="party",
+		distinct=True,
+		order_by="party",
+	)
+
+	return [
+		frappe._dict(filters, party=parties[i : i + PARTY_CHUNK_SIZE])
+		for i in range(0, len(parties), PARTY_CHUNK_SIZE)
+	] or [filters]
+
+
+def get_item_chunks(filters):
+	"""Split the report into sets of `ITEM_CHUNK_SIZE` items with stock ledger entries"""
+
+	if filters.get("item_code"):
+		return [filters]
+
+	sle_filters = {"is_cancelled": 0}
+	if filters.get("company"):
+		sle_filters["company"] = filters.company
+	if filters.get("to_date"):
+		sle_filters["posting_date"] = ("<=", filters.to_date)
+	if filters.get("warehouse"):
+		sle_filters["warehouse"] = (
+			"in",
+			[filters.warehouse, *get_descendants_of("Warehouse", filters.warehouse, ignore_permissions=True)],
+		)
+
+	items = frappe.get_all(
+		"Stock Ledger Entry", filters=sle_filters, pluck="item_code", distinct=True, order_by="item_code"
+	)
+
+	return [
+		frappe._dict(filters, item_codes=items[i : i + ITEM_CHUNK_SIZE])
+		for i in range(0, len(items), ITEM_CHUNK_SIZE)
+	] or [filters]
+
+
+def get_stock_ledger_item_chunks(filters):
+	from erpnext.stock.report.stock_ledger.stock_ledger import check_inventory_dimension_filters_applied
+
+	# balances of batches and inventory dimensions run over the rows of all items
+	if filters.get("batch_no") or check_inventory_dimension_filters_applied(filters):
+		return [filters]
+
+	return get_item_chunks(filters)
+
+
+def get_invoice_date_chunks(filters):
+	# rows grouped by anything but the invoice are summed up over the whole period
+	return get_date_chunks(filters) if filters.group_by == "Invoice" else [filters]
+
+
+def get_ungrouped_date_chunks(filters):
+	# subtotals of groups are for the whole period
+	return [filters] if filters.group_by else get_date_chunks(filters)
+
+
+# report: function splitting the filters into chunks whose rows can be concatenated.
+# Reports with running balances or opening rows over the whole period run in one chunk.
+CHUNKED_REPORTS = {
+	"Accounts Receivable": get_party_chunks,
+	"General Ledger": None,
+	"Gross Profit": get_invoice_date_chunks,
+	"Item-wise Sales Register": get_ungrouped_date_chunks,
+	"Stock Balance": get_item_chunks,
+	"Stock Ledger": get_stock_ledger_item_chunks,
+}
+
+
+def get_filters_hash(report_name, filters):
+	# results depend on the permissions of the user
+	key = json.dumps([report_name, frappe.session.user, filters], sort_keys=True, default=str)
+	return hashlib.md5(key.encode()).hexdigest()
+
+
+@frappe.whitelist()
+def run_report(report_name, filters):
+	"""Run a heavy report in the background, or return the run of identical filters
+	completed within `REPORT_RUN_TTL`. Rows are published to the user as chunks complete."""
+
+	if report_name not in CHUNKED_REPORTS:
+		frappe.throw(_("Report {0} cannot be run in the background").format(report_name))
+
+	if not frappe.get_cached_doc("Report", report_name).is_permitted():
+		frappe.throw(
+			_("You are not permitted to run the report {0}").format(report_name), frappe.PermissionError
+		)
+
+	filters = frappe._dict(frappe.parse_json(filters))
+	filters_hash = get_filters_hash(report_name, filters)
+
+	existing_run = frappe.db.get_value(
+		"Report Run",
+		{
+			"filters_hash": filters_hash,
+			"status": ("in", ["Queued", "Running", "Completed"]),
+			"creation": (">", add_to_date(now_datetime(), seconds=-REPORT_RUN_TTL)),
+		},
+		["name", "status"],
+		order_by="creation desc",
+		as_dict=True,
+	)
+
+	if existing_run:
+		if existing_run.status == "Completed":
+			return {
+				"name": existing_run.name,
+				"status": existing_run.status,
+				**get_report_run_result(existing_run.name),
+			}
+
+		return existing_run
+
+	report_run = frappe.get_doc(
+		{
+			"doctype": "Report Run",
+			"report_name": report_name,
+			"filters": frappe.as_json(filters),
+			"filters_hash": filters_hash,
+			"status": "Queued",
+		}
+	).insert(ignore_permissions=True)
+
+	frappe.enqueue(
+		execute_report_run,
+		queue="long",
+		timeout=14400,
+		report_run=report_run.name,
+		enqueue_after_commit=True,
+	)
+
+	return {"name": report_run.name, "status": report_run.status}
+
+
+def execute_report_run(report_run):
+	"""Run the report chunk by chunk, publish the rows of each chunk to the user and
+	store the result as gzipped columns"""
+
+	doc = frappe.get_doc("Report Run", report_run)
+	report = frappe.get_doc("Report", doc.report_name)
+	filters = frappe._dict(json.loads(doc.filters))
+
+	get_chunks = CHUNKED_REPORTS[doc.report_name]
+	chunks = get_chunks(filters) if get_chunks else [filters]
+	doc.db_set({"status": "Running", "chunks": len(chunks), "completed_chunks": 0})
+	commit()
+
+	columns, data = [], []
+	try:
+		for index, chunk_filters in enumerate(chunks):
+			chunk_columns, chunk_data = report.execute_script_report(frappe._dict(chunk_filters))[:2]
+			columns = merge_columns(columns, chunk_columns)
+			data.extend(chunk_data)
+
+			publish_rows(doc, index, chunk_columns, chunk_data)
+			doc.db_set("completed_chunks", index + 1)
+			commit()
+	except Exception:
+		frappe.db.rollback()
+		doc.db_set({"status": "Failed", "error_message": frappe.get_traceback()})
+		commit()
+		frappe.publish_realtime("report_run_status", {"name": doc.name, "status": "Failed"}, user=doc.owner)
+		return
+
+	save_result(doc, columns, data)
+	doc.db_set({"status": "Completed", "row_count": len(data), "completed_at": now_datetime()})
+	commit()
+	frappe.publish_realtime("report_run_status", {"name": doc.name, "status": "Completed"}, user=doc.owner)
+
+
+def commit():
+	if not frappe.flags.in_test:
+		frappe.db.commit()
+
+
+def merge_columns(columns, chunk_columns):
+	"""Columns of all chunks, chunks may add columns like the taxes of their invoices"""
+
+	fieldnames = {get_column_key(column) for column in columns}
+	return columns + [column for column in chunk_columns if get_column_key(column) not in fieldnames]
+
+
+def get_column_key(column):
+	return column.get("fieldname") if isinstance(column, dict) else column
+
+
+def publish_rows(doc, index, columns, data):
+	for start in range(0, len(data), PUBLISH_BATCH_SIZE):
+		frappe.publish_realtime(
+			"report_run_progress",
+			{
+				"name": doc.name,
+				"chunk": index + 1,
+				"chunks": doc.chunks,
+				"columns": columns if not start else None,
+				"rows": data[start : start + PUBLISH_BATCH_SIZE],
+			},
+			user=doc.owner,
+		)
+
+
+def to_columnar(data):
+	"""Rows as a list of values per column, which compresses better than rows"""
+
+	if not data:
+		return {"keys": [], "values": []}
+
+	if not isinstance(data[0], dict):
+		width = max(len(row) for row in data)
+		return {
+			"keys": None,
+			"values": [[row[i] if i < len(row) else None for row in data] for i in range(width)],
+		}
+
+	keys = list(dict.fromkeys(key for row in data for key in row))
+	columnar = {"keys": keys, "values": [[row.get(key) for row in data] for key in keys]}
+
+	# the rows without a key, which are not the same as the rows with None for it
+	missing = {key: [i for i, row in enumerate(data) if key not in row] for key in keys}
+	if missing := {key: indexes for key, indexes in missing.items() if indexes}:
+		columnar["missing"] = missing
+
+	return columnar
+
+
+def from_columnar(columnar):
+	rows = zip(*columnar["values"], strict=True)
+	if columnar["keys"] is None:
+		return [list(row) for row in rows]
+
+	missing = {key: set(indexes) for key, indexes in (columnar.get("missing") or {}).items()}
+	return [
+		{
+			key: value
+			for key, value in zip(columnar["keys"], row, strict=True)
+			if key not in missing or i not in missing[key]
+		}
+		for i, row in enumerate(rows)
+	]
+
+
+def save_result(doc, columns, data):
+	content = frappe.as_json({"columns": columns, "data": to_columnar(data)}, indent=None)
+	frappe.get_doc(
+		{
+			"doctype": "File",
+			"file_name": f"{doc.name}.json.gz",
+			"attached_to_doctype": doc.doctype,
+			"attached_to_name": doc.name,
+			"content": gzip.compress(content.encode()),
+			"is_private": 1,
+		}
+	).insert(ignore_permissions=True)
+
+
+@frappe.whitelist()
+def get_report_run_result(name):
+	"""Columns and rows of a completed report run of the user"""
+
+	doc = frappe.get_doc("Report Run", name)
+	if doc.owner != frappe.session.user:
+		doc.check_permission("read")
+
+	file_name = frappe.db.get_value(
+		"File", {"attached_to_doctype": doc.doctype, "attached_to_name": doc.name}, "name"
+	)
+	if doc.status != "Completed" or not file_name:
+		frappe.throw(_("Report {0} has not completed yet").format(doc.report_name))
+
+	result = json.loads(gzip.decompress(frappe.get_doc("File", file_name).get_content()))
+	return {"columns": result["columns"], "result": from_columnar(result["data"])}
+
+
+def delete_expired_report_runs():
+	"""Delete report runs and their results after `REPORT_RUN_RETENTION_DAYS`"""
+
+	for name in frappe.get_all(
+		"Report Run",
+		filters={"creation": ("<", add_to_date(now_datetime(), days=-REPORT_RUN_RETENTION_DAYS))},
+		pluck="name",
+	):
+		frappe.delete_doc("Report Run", name, ignore_permissions=True, force=True)
@@ -0,0 +1,89 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+from itertools import pairwise
+from unittest.mock import patch
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import add_days, add_months, nowdate
+
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+from erpnext.utilities.doctype.report_run.report_run import (
+	execute_report_run,
+	from_columnar,
+	get_date_chunks,
+	get_item_chunks,
+	get_report_run_result,
+	run_report,
+	to_columnar,
+)
+
+
+class TestReportRun(IntegrationTestCase):
+	def test_date_chunks(self):
+		filters = frappe._dict(company="_Test Company", from_date="2026-01-01", to_date="2026-03-15")
+		chunks = get_date_chunks(filters)
+
+		self.assertEqual(chunks[0].from_date, "2026-01-01")
+		self.assertEqual(chunks[-1].to_date, "2026-03-15")
+		for previous, chunk in pairwise(chunks):
+			self.assertEqual(chunk.from_date, add_days(previous.to_date, 1).isoformat())
+
+	def test_columnar_round_trip(self):
+		rows = [
+			{"item_code": "_Test Item", "qty": 2},
+			{"item_code": "_Test Item 2", "amount": 10.5},
+			{"item_code": None, "qty": None, "amount": 0},
+		]
+		self.assertEqual(from_columnar(to_columnar(rows)), rows)
+		self.assertEqual(from_columnar(to_columnar([[1, "a"], [2, "b"]])), [[1, "a"], [2, "b"]])
+
+	def test_chunked_run_matches_report(self):
+		create_sales_invoice(qty=2, rate=100, posting_date=add_months(nowdate(), -2), set_posting_time=1)
+		create_sales_invoice(qty=3, rate=100)
+
+		filters = frappe._dict(
+			company="_Test Company", from_date=add_months(nowdate(), -3), to_date=nowdate()
+		)
+		run = run_report("Item-wise Sales Register", frappe.as_json(filters))
+		execute_report_run(run["name"])
+
+		self.assertGreater(frappe.db.get_value("Report Run", run["name"], "chunks"), 1)
+		expected = frappe.get_doc("Report", "Item-wise Sales Register").execute_script_report(filters)[1]
+		result = get_report_run_result(run["name"])["result"]
+		self.assertEqual(
+			sorted((row["invoice"], row["item_code"], row["amount"]) for row in result),
+			sorted((row["invoice"], row["item_code"], row["amount"]) for row in expected),
+		)
+
+		# identical filters return the completed run
+		self.assertEqual(run_report("Item-wise Sales Register", frappe.as_json(filters))["name"], run["name"])
+
+	@patch("erpnext.utilities.doctype.report_run.report_run.ITEM_CHUNK_SIZE", 1)
+	def test_item_chunks_match_report(self):
+		for item_code in ("_Test Item", "_Test Item 2"):
+			make_stock_entry(item_code=item_code, qty=5, rate=100, to_warehouse="_Test Warehouse - _TC")
+
+		filters = frappe._dict(
+			company="_Test Company",
+			from_date=add_months(nowdate(), -1),
+			to_date=nowdate(),
+			warehouse="_Test Warehouse - _TC",
+		)
+		self.assertGreater(len(get_item_chunks(filters)), 1)
+
+		for report_name, fields in (
+			("Stock Balance", ("item_code", "warehouse", "bal_qty", "bal_val")),
+			("Stock Ledger", ("item_code", "voucher_no", "actual_qty", "qty_after_transaction")),
+		):
+			run = run_report(report_name, frappe.as_json(filters))
+			execute_report_run(run["name"])
+
+			expected = frappe.get_doc("Report", report_name).execute_script_report(filters)[1]
+			result = get_report_run_result(run["name"])["result"]
+			self.assertEqual(
+				sorted(tuple(row.get(field) for field in fields) for row in result),
+				sorted(tuple(row.get(field) for field in fields) for row in expected),
+			)